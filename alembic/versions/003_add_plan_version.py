@@ -0,0 +1,24 @@
+"""Add plans.version for plan cache validation
+
+Revision ID: 003_add_plan_version
+Revises: 6d0f0408be80
+Create Date: 2026-10-18 23:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '003_add_plan_version'
+down_revision = '6d0f0408be80'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('plans', sa.Column('version', sa.Integer(), nullable=False, server_default='1'))
+
+
+def downgrade() -> None:
+    op.drop_column('plans', 'version')
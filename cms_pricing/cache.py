@@ -1,18 +1,27 @@
 """Caching system for dataset slices and computed results"""
 
 import asyncio
+import copy
 import hashlib
 import json
 import os
 import pickle
+from collections import OrderedDict
 from typing import Any, Dict, Optional, Tuple
 from datetime import datetime, timedelta
 import structlog
+from prometheus_client import Counter
 
 from cms_pricing.config import settings
 
 logger = structlog.get_logger()
 
+PLAN_CACHE_REQUESTS = Counter(
+    'plan_cache_requests_total',
+    'Stored plan cache lookups',
+    ['result']
+)
+
 
 class LRUCache:
     """Simple LRU cache implementation"""
@@ -254,3 +263,171 @@ class CacheManager:
             'disk_dir': self.disk_cache.cache_dir,
             'active_locks': len(self.locks)
         }
+
+
+class StatsCache:
+    """Release-scoped cache for dataset summary statistics.
+
+    Entries are keyed by (dataset, filters, dataset digest). The digest is the
+    identifier of the last release published for the dataset, so publishing a
+    new release moves every reader onto a fresh key. The TTL bounds staleness
+    when the publish happens in another process (CLI ingest, worker).
+    """
+
+    def __init__(self, ttl_seconds: int = 300, max_items: int = 256):
+        self.ttl_seconds = ttl_seconds
+        self.max_items = max_items
+        self.cache: Dict[Tuple[str, str, str], Tuple[Any, datetime]] = {}
+        self.digests: Dict[str, str] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get_digest(self, dataset: str) -> str:
+        """Current digest for a dataset"""
+        return self.digests.get(dataset, "initial")
+
+    def _make_key(self, dataset: str, filters: Dict[str, Any]) -> Tuple[str, str, str]:
+        filters_key = json.dumps(filters, sort_keys=True, default=str)
+        return (dataset, filters_key, self.get_digest(dataset))
+
+    def get(self, dataset: str, filters: Dict[str, Any]) -> Optional[Any]:
+        """Get cached stats for a dataset and filter set"""
+        key = self._make_key(dataset, filters)
+        entry = self.cache.get(key)
+        if entry is None or entry[1] < datetime.utcnow():
+            self.cache.pop(key, None)
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return entry[0]
+
+    def put(self, dataset: str, filters: Dict[str, Any], value: Any):
+        """Store stats for a dataset and filter set"""
+        if len(self.cache) >= self.max_items:
+            # Drop the entry closest to expiry
+            oldest_key = min(self.cache, key=lambda k: self.cache[k][1])
+            del self.cache[oldest_key]
+
+        expires_at = datetime.utcnow() + timedelta(seconds=self.ttl_seconds)
+        self.cache[self._make_key(dataset, filters)] = (value, expires_at)
+
+    def invalidate(self, dataset: str, release_id: Optional[str] = None):
+        """Invalidate a dataset after a new release is published"""
+        self.digests[dataset] = release_id or datetime.utcnow().isoformat()
+        stale_keys = [key for key in self.cache if key[0] == dataset]
+        for key in stale_keys:
+            del self.cache[key]
+
+        logger.info(
+            "Invalidated dataset stats cache",
+            dataset=dataset,
+            digest=self.digests[dataset],
+            evicted=len(stale_keys)
+        )
+
+    def clear(self):
+        """Clear all items"""
+        self.cache.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        return {
+            'items': len(self.cache),
+            'hits': self.hits,
+            'misses': self.misses,
+            'digests': dict(self.digests)
+        }
+
+
+# Process-wide stats cache shared by the /stats endpoints and publishers
+stats_cache = StatsCache(ttl_seconds=settings.stats_cache_ttl_seconds)
+
+
+class PlanCache:
+    """Bounded LRU cache of normalized stored-plan components.
+
+    Entries are versioned by ``Plan.version``, which every update bumps,
+    so a lookup that passes the current version never sees a plan changed
+    through another process. The /plans router also drops entries on PUT
+    and DELETE.
+    """
+
+    def __init__(self, max_items: int = 1024, ttl_seconds: int = 300):
+        self.max_items = max_items
+        self.ttl_seconds = ttl_seconds
+        self.cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, plan_id: Any, version: Any = None) -> Optional[Dict[str, Any]]:
+        """Get a cached plan as {'name', 'version', 'components'}.
+
+        When ``version`` is given, an entry cached for a different version
+        is treated as a miss.
+        """
+        key = str(plan_id)
+        entry = self.cache.get(key)
+        if (
+            entry is None
+            or entry['expires_at'] < datetime.utcnow()
+            or (version is not None and entry['version'] != version)
+        ):
+            if entry is not None:
+                del self.cache[key]
+            self.misses += 1
+            PLAN_CACHE_REQUESTS.labels(result='miss').inc()
+            return None
+
+        self.cache.move_to_end(key)
+        self.hits += 1
+        PLAN_CACHE_REQUESTS.labels(result='hit').inc()
+        return {
+            'name': entry['name'],
+            'version': entry['version'],
+            # Callers get their own copy so per-request tweaks never leak
+            'components': copy.deepcopy(entry['components']),
+        }
+
+    def put(self, plan_id: Any, version: Any, name: str, components: list):
+        """Cache a plan's name and normalized components"""
+        key = str(plan_id)
+        self.cache[key] = {
+            'name': name,
+            'version': version,
+            'components': copy.deepcopy(components),
+            'expires_at': datetime.utcnow() + timedelta(seconds=self.ttl_seconds),
+        }
+        self.cache.move_to_end(key)
+
+        while len(self.cache) > self.max_items:
+            self.cache.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, plan_id: Any):
+        """Drop a plan after it is updated or deleted"""
+        self.cache.pop(str(plan_id), None)
+
+    def clear(self):
+        """Clear all items"""
+        self.cache.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        lookups = self.hits + self.misses
+        return {
+            'items': len(self.cache),
+            'max_items': self.max_items,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
+
+
+# Process-wide plan cache shared by PricingService and the /plans router
+plan_cache = PlanCache(
+    max_items=settings.plan_cache_max_items,
+    ttl_seconds=settings.plan_cache_ttl_seconds
+)
@@ -22,7 +22,10 @@ import structlog
 
 from cms_pricing.ingestion.ingestors.opps_ingestor import OPPSIngestor
 from cms_pricing.ingestion.scrapers.cms_opps_scraper import CMSOPPSScraper
+from cms_pricing.ingestion.scrapers.crawler import close_shared_client
 from cms_pricing.ingestion.contracts.schema_registry import SchemaRegistry
+from cms_pricing.ingestion.run.opps_backfill import OPPSBackfillExecutor, plan_batch_ids
+from cms_pricing.config import settings
 
 
 class OPPSCLI:
@@ -245,6 +248,8 @@ class OPPSCLI:
         self.logger.info("Starting OPPS backfill", args=vars(args))
         
         try:
+            # Coordinator-side ingestor only loads the per-year reference tables;
+            # batches run in the executor's worker processes
             ingester = OPPSIngestor(
                 output_dir=Path(args.output_dir),
                 database_url=args.database_url,
@@ -252,43 +257,28 @@ class OPPSCLI:
             )
             
             # Generate batch IDs for backfill period
-            start_year = args.start_year
-            end_year = args.end_year
-            quarters = args.quarters
-            
-            batch_ids = []
-            for year in range(start_year, end_year + 1):
-                for quarter in range(1, 5):
-                    if year == end_year and quarter > quarters:
-                        break
-                    batch_id = f"opps_{year}q{quarter}_r01"
-                    batch_ids.append(batch_id)
-            
+            batch_ids = plan_batch_ids(args.start_year, args.end_year, args.quarters)
             self.logger.info("Backfill batch IDs generated", count=len(batch_ids))
             
-            # Process each batch
-            success_count = 0
-            failed_count = 0
-            
-            for batch_id in batch_ids:
-                try:
-                    result = await ingester.ingest_batch(batch_id)
-                    if result["status"] == "success":
-                        success_count += 1
-                        self.logger.info("Batch backfilled successfully", batch_id=batch_id)
-                    else:
-                        failed_count += 1
-                        self.logger.error("Batch backfill failed", batch_id=batch_id, result=result)
-                except Exception as e:
-                    failed_count += 1
-                    self.logger.error("Batch backfill failed", batch_id=batch_id, error=str(e))
-            
-            self.logger.info("Backfill completed", 
-                           success_count=success_count, 
-                           failed_count=failed_count)
+            executor = OPPSBackfillExecutor(
+                output_dir=Path(args.output_dir),
+                reference_loader=ingester.load_reference_data,
+                database_url=args.database_url,
+                cpt_masking=args.cpt_masking,
+                max_workers=args.workers,
+                checkpoint_path=args.checkpoint
+            )
+            report = await executor.run(batch_ids, resume=not args.no_resume)
             
-            print(f"Backfill completed: {success_count} successful, {failed_count} failed")
-            return 0 if failed_count == 0 else 1
+            if args.output_format == 'json':
+                print(json.dumps(report.to_dict(), indent=2))
+            else:
+                print(
+                    f"Backfill completed: {len(report.succeeded)} successful, {len(report.failed)} failed, "
+                    f"{report.skipped} already checkpointed "
+                    f"({report.batches_per_minute:.2f} batches/min, {report.records_per_second:.0f} records/s)"
+                )
+            return 0 if not report.failed else 1
             
         except Exception as e:
             self.logger.error("Backfill failed", error=str(e))
@@ -385,7 +375,7 @@ Examples:
   %(prog)s download --latest --quarters 2
   %(prog)s ingest --batch-id opps_2025q1_r01
   %(prog)s reprocess --batch-id opps_2025q1_r01
-  %(prog)s backfill --start-year 2024 --end-year 2025 --quarters 4
+  %(prog)s backfill --start-year 2024 --end-year 2025 --quarters 4 --workers 4
   %(prog)s validate --batch-id opps_2025q1_r01
   %(prog)s status
             """
@@ -444,6 +434,12 @@ Examples:
                                    help='End year for backfill')
         backfill_parser.add_argument('--quarters', type=int, default=4,
                                    help='Number of quarters per year')
+        backfill_parser.add_argument('--workers', type=int, default=settings.backfill_max_workers,
+                                   help='Number of batches ingested in parallel')
+        backfill_parser.add_argument('--checkpoint', type=Path, default=None,
+                                   help='Checkpoint file (default: <output-dir>/backfill/opps_checkpoint.json)')
+        backfill_parser.add_argument('--no-resume', action='store_true',
+                                   help='Ignore the checkpoint and re-run every batch')
         
         # Validate command
         validate_parser = subparsers.add_parser('validate', help='Validate OPPS data')
@@ -504,7 +500,10 @@ Examples:
 async def main():
     """Main CLI entry point."""
     cli = OPPSCLI()
-    return await cli.run()
+    try:
+        return await cli.run()
+    finally:
+        await close_shared_client()
 
 
 if __name__ == "__main__":
@@ -1,23 +1,117 @@
 """Database configuration and session management"""
 
+import time
+from typing import Any, Dict, Optional
+
+from prometheus_client import Gauge, Histogram
 from sqlalchemy import create_engine, MetaData
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
-import asyncpg
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool, StaticPool
+from starlette.concurrency import run_in_threadpool
+
 from cms_pricing.config import settings
 
+# Pool metrics (labelled by engine: "sync" or "async")
+DB_POOL_SIZE = Gauge('db_pool_size', 'Configured connection pool size', ['engine'])
+DB_POOL_CHECKED_OUT = Gauge('db_pool_checked_out', 'Connections currently checked out', ['engine'])
+DB_POOL_OVERFLOW = Gauge('db_pool_overflow', 'Connections open beyond pool_size', ['engine'])
+DB_POOL_WAIT = Histogram(
+    'db_pool_wait_seconds',
+    'Time spent waiting to check out a pooled connection',
+    ['engine'],
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+)
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records checkout wait time"""
+
+    metrics_label = "sync"
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_WAIT.labels(engine=self.metrics_label).observe(time.perf_counter() - start)
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """Asyncio-adapted QueuePool that records checkout wait time"""
+
+    metrics_label = "async"
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_WAIT.labels(engine=self.metrics_label).observe(time.perf_counter() - start)
+
+
+def _is_sqlite(url: str) -> bool:
+    return url.startswith("sqlite")
+
+
+def _pool_kwargs(url: str, poolclass) -> Dict[str, Any]:
+    """Pool arguments for an engine URL.
+
+    SQLite keeps a single shared connection (in-memory databases vanish when
+    their connection closes); every other backend gets a sized QueuePool.
+    """
+    if _is_sqlite(url):
+        return {"poolclass": StaticPool, "connect_args": {"check_same_thread": False}}
+
+    return {
+        "poolclass": poolclass,
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+    }
+
+
+def _register_pool_metrics(label: str, pool) -> None:
+    """Export pool gauges, read lazily at scrape time"""
+    if not isinstance(pool, QueuePool):
+        return
+    DB_POOL_SIZE.labels(engine=label).set_function(pool.size)
+    DB_POOL_CHECKED_OUT.labels(engine=label).set_function(pool.checkedout)
+    DB_POOL_OVERFLOW.labels(engine=label).set_function(lambda: max(pool.overflow(), 0))
+
+
+def get_async_database_url(url: str) -> str:
+    """Translate a sync database URL to its asyncio driver equivalent"""
+    if url.startswith("postgresql+asyncpg://"):
+        return url
+    if url.startswith("postgresql://"):
+        return url.replace("postgresql://", "postgresql+asyncpg://", 1)
+    if url.startswith("postgresql+psycopg2://"):
+        return url.replace("postgresql+psycopg2://", "postgresql+asyncpg://", 1)
+    if url.startswith("sqlite://"):
+        return url.replace("sqlite://", "sqlite+aiosqlite://", 1)
+    return url
+
+
 # Database engine
 engine = create_engine(
     settings.database_url,
-    poolclass=StaticPool,
     pool_pre_ping=True,
     echo=settings.debug,
+    **_pool_kwargs(settings.database_url, InstrumentedQueuePool),
 )
+_register_pool_metrics("sync", engine.pool)
 
 # Session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine and session factory, created on first use so processes that
+# never touch them (CLI, ingestion workers) do not need the async driver
+_async_engine = None
+_async_session_factory: Optional[async_sessionmaker] = None
+
 # Base class for models
 Base = declarative_base()
 
@@ -25,6 +119,75 @@ Base = declarative_base()
 metadata = MetaData()
 
 
+def get_async_engine():
+    """Get (or lazily create) the pooled asyncio engine"""
+    global _async_engine, _async_session_factory
+
+    if _async_engine is None:
+        async_url = get_async_database_url(settings.database_url)
+        _async_engine = create_async_engine(
+            async_url,
+            pool_pre_ping=True,
+            echo=settings.debug,
+            **_pool_kwargs(async_url, InstrumentedAsyncQueuePool),
+        )
+        _register_pool_metrics("async", _async_engine.sync_engine.pool)
+        _async_session_factory = async_sessionmaker(
+            _async_engine, expire_on_commit=False, autoflush=False
+        )
+
+    return _async_engine
+
+
+def AsyncSessionLocal() -> AsyncSession:
+    """Create a new AsyncSession bound to the pooled asyncio engine"""
+    get_async_engine()
+    return _async_session_factory()
+
+
+async def dispose_engines():
+    """Release all pooled connections (application shutdown)"""
+    global _async_engine, _async_session_factory
+
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = None
+        _async_session_factory = None
+    engine.dispose()
+
+
+def get_pool_status() -> Dict[str, Any]:
+    """Snapshot of connection pool usage for health endpoints"""
+    status = {}
+    engines = {"sync": engine}
+    if _async_engine is not None:
+        engines["async"] = _async_engine.sync_engine
+
+    for label, db_engine in engines.items():
+        pool = db_engine.pool
+        if isinstance(pool, QueuePool):
+            status[label] = {
+                "size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "overflow": max(pool.overflow(), 0),
+                "checked_in": pool.checkedin(),
+            }
+        else:
+            status[label] = {"pool": type(pool).__name__}
+    return status
+
+
+async def execute_async(db, statement):
+    """Execute a select without blocking the event loop.
+
+    AsyncSessions are awaited directly; sync Sessions run on the threadpool.
+    The session must not be used concurrently from another task meanwhile.
+    """
+    if isinstance(db, AsyncSession):
+        return await db.execute(statement)
+    return await run_in_threadpool(db.execute, statement)
+
+
 def get_db():
     """Dependency to get database session"""
     db = SessionLocal()
@@ -35,9 +198,9 @@ def get_db():
 
 
 async def get_async_db():
-    """Async database connection for background tasks"""
-    conn = await asyncpg.connect(settings.database_url.replace("postgresql://", "postgresql+asyncpg://"))
+    """Dependency to get a request-scoped AsyncSession"""
+    session = AsyncSessionLocal()
     try:
-        yield conn
+        yield session
     finally:
-        await conn.close()
+        await session.close()
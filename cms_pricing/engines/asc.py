@@ -2,10 +2,9 @@
 
 from typing import Dict, Any, Optional, List
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from sqlalchemy import and_
 
-from cms_pricing.engines.base import BasePricingEngine
-from cms_pricing.database import SessionLocal
+from cms_pricing.engines.base import BasePricingEngine, effective_in_year
 from cms_pricing.models.fee_schedules import FeeASC
 from cms_pricing.schemas.geography import GeographyResolveResponse
 import structlog
@@ -16,9 +15,6 @@ logger = structlog.get_logger()
 class ASCEngine(BasePricingEngine):
     """Ambulatory Surgical Center pricing engine"""
     
-    def __init__(self):
-        self.db = SessionLocal()
-    
     async def price_code(
         self,
         code: str,
@@ -44,13 +40,9 @@ class ASCEngine(BasePricingEngine):
             asc_data = self.db.query(FeeASC).filter(
                 and_(
                     FeeASC.year == year,
-                    FeeASC.quarter == quarter or "1",  # Default to Q1
+                    FeeASC.quarter == (quarter or "1"),  # Default to Q1
                     FeeASC.hcpcs == code,
-                    FeeASC.effective_from <= f"{year}-12-31",
-                    or_(
-                        FeeASC.effective_to.is_(None),
-                        FeeASC.effective_to >= f"{year}-01-01"
-                    )
+                    effective_in_year(FeeASC, year)
                 )
             ).first()
             
@@ -104,8 +96,3 @@ class ASCEngine(BasePricingEngine):
                 exc_info=True
             )
             raise
-    
-    def __del__(self):
-        """Clean up database session"""
-        if hasattr(self, 'db'):
-            self.db.close()
@@ -1,13 +1,78 @@
 """Base pricing engine"""
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional, List
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Dict, Any, Iterator, Optional, List
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session
+
+from cms_pricing.config import settings
 from cms_pricing.schemas.geography import GeographyResolveResponse
+from cms_pricing.services.effective_dates import year_window
+from cms_pricing.services.snapshot_store import ParquetSnapshotStore, snapshot_store
+
+
+@dataclass(frozen=True)
+class PricingContext:
+    """Request-scoped data access for the shared engines"""
+    db: Optional[Session] = None
+    snapshots: Optional[ParquetSnapshotStore] = None
+
+
+_pricing_context: ContextVar[Optional[PricingContext]] = ContextVar("pricing_context", default=None)
+
+
+@contextmanager
+def use_context(context: PricingContext) -> Iterator[PricingContext]:
+    """Run engine calls in this task against the given session/snapshots"""
+    token = _pricing_context.set(context)
+    try:
+        yield context
+    finally:
+        _pricing_context.reset(token)
+
+
+def effective_in_year(model, year: int):
+    """Filter for rows whose effective window overlaps the calendar year"""
+    year_start, year_end = year_window(year)
+    return and_(
+        model.effective_from <= year_end,
+        or_(
+            model.effective_to.is_(None),
+            model.effective_to >= year_start
+        )
+    )
 
 
 class BasePricingEngine(ABC):
     """Base class for all pricing engines"""
     
+    def __init__(self, db: Optional[Session] = None, snapshots: Optional[ParquetSnapshotStore] = None):
+        # Engines are process-wide singletons and never own a session; the
+        # data context of the running task takes precedence over these
+        # defaults (see use_context).
+        self._db = db
+        self._snapshots = snapshots
+    
+    @property
+    def db(self) -> Optional[Session]:
+        context = _pricing_context.get()
+        if context is not None and context.db is not None:
+            return context.db
+        return self._db
+    
+    @property
+    def snapshots(self) -> Optional[ParquetSnapshotStore]:
+        """Snapshot store for reference lookups, or None to query the database"""
+        context = _pricing_context.get()
+        if context is not None and context.snapshots is not None:
+            return context.snapshots
+        if self._snapshots is None and settings.pricing_data_backend == "snapshot":
+            return snapshot_store
+        return self._snapshots
+    
     @abstractmethod
     async def price_code(
         self,
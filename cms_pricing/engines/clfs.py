@@ -2,10 +2,9 @@
 
 from typing import Dict, Any, Optional, List
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from sqlalchemy import and_
 
-from cms_pricing.engines.base import BasePricingEngine
-from cms_pricing.database import SessionLocal
+from cms_pricing.engines.base import BasePricingEngine, effective_in_year
 from cms_pricing.models.fee_schedules import FeeCLFS
 from cms_pricing.schemas.geography import GeographyResolveResponse
 import structlog
@@ -16,9 +15,6 @@ logger = structlog.get_logger()
 class CLFSEngine(BasePricingEngine):
     """Clinical Laboratory Fee Schedule pricing engine"""
     
-    def __init__(self):
-        self.db = SessionLocal()
-    
     async def price_code(
         self,
         code: str,
@@ -44,13 +40,9 @@ class CLFSEngine(BasePricingEngine):
             clfs_data = self.db.query(FeeCLFS).filter(
                 and_(
                     FeeCLFS.year == year,
-                    FeeCLFS.quarter == quarter or "1",  # Default to Q1
+                    FeeCLFS.quarter == (quarter or "1"),  # Default to Q1
                     FeeCLFS.hcpcs == code,
-                    FeeCLFS.effective_from <= f"{year}-12-31",
-                    or_(
-                        FeeCLFS.effective_to.is_(None),
-                        FeeCLFS.effective_to >= f"{year}-01-01"
-                    )
+                    effective_in_year(FeeCLFS, year)
                 )
             ).first()
             
@@ -104,8 +96,3 @@ class CLFSEngine(BasePricingEngine):
                 exc_info=True
             )
             raise
-    
-    def __del__(self):
-        """Clean up database session"""
-        if hasattr(self, 'db'):
-            self.db.close()
@@ -2,10 +2,9 @@
 
 from typing import Dict, Any, Optional, List
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from sqlalchemy import and_
 
-from cms_pricing.engines.base import BasePricingEngine
-from cms_pricing.database import SessionLocal
+from cms_pricing.engines.base import BasePricingEngine, effective_in_year
 from cms_pricing.models.fee_schedules import FeeDMEPOS
 from cms_pricing.schemas.geography import GeographyResolveResponse
 import structlog
@@ -16,9 +15,6 @@ logger = structlog.get_logger()
 class DMEPOSEngine(BasePricingEngine):
     """Durable Medical Equipment, Prosthetics, Orthotics, and Supplies pricing engine"""
     
-    def __init__(self):
-        self.db = SessionLocal()
-    
     async def price_code(
         self,
         code: str,
@@ -49,14 +45,10 @@ class DMEPOSEngine(BasePricingEngine):
             dmepos_data = self.db.query(FeeDMEPOS).filter(
                 and_(
                     FeeDMEPOS.year == year,
-                    FeeDMEPOS.quarter == quarter or "1",  # Default to Q1
+                    FeeDMEPOS.quarter == (quarter or "1"),  # Default to Q1
                     FeeDMEPOS.code == code,
                     FeeDMEPOS.rural_flag == is_rural,
-                    FeeDMEPOS.effective_from <= f"{year}-12-31",
-                    or_(
-                        FeeDMEPOS.effective_to.is_(None),
-                        FeeDMEPOS.effective_to >= f"{year}-01-01"
-                    )
+                    effective_in_year(FeeDMEPOS, year)
                 )
             ).first()
             
@@ -111,8 +103,3 @@ class DMEPOSEngine(BasePricingEngine):
                 exc_info=True
             )
             raise
-    
-    def __del__(self):
-        """Clean up database session"""
-        if hasattr(self, 'db'):
-            self.db.close()
@@ -2,10 +2,9 @@
 
 from typing import Dict, Any, Optional, List
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from sqlalchemy import and_
 
-from cms_pricing.engines.base import BasePricingEngine
-from cms_pricing.database import SessionLocal
+from cms_pricing.engines.base import BasePricingEngine, effective_in_year
 from cms_pricing.models.drugs import DrugASP, DrugNADAC, NDCHCPCSXwalk
 from cms_pricing.schemas.geography import GeographyResolveResponse
 import structlog
@@ -16,9 +15,6 @@ logger = structlog.get_logger()
 class DrugEngine(BasePricingEngine):
     """Drug pricing engine for Part B ASP and NADAC"""
     
-    def __init__(self):
-        self.db = SessionLocal()
-    
     async def price_code(
         self,
         code: str,
@@ -44,13 +40,9 @@ class DrugEngine(BasePricingEngine):
             asp_data = self.db.query(DrugASP).filter(
                 and_(
                     DrugASP.year == year,
-                    DrugASP.quarter == quarter or "1",  # Default to Q1
+                    DrugASP.quarter == (quarter or "1"),  # Default to Q1
                     DrugASP.hcpcs == code,
-                    DrugASP.effective_from <= f"{year}-12-31",
-                    or_(
-                        DrugASP.effective_to.is_(None),
-                        DrugASP.effective_to >= f"{year}-01-01"
-                    )
+                    effective_in_year(DrugASP, year)
                 )
             ).first()
             
@@ -175,8 +167,3 @@ class DrugEngine(BasePricingEngine):
                 error=str(e)
             )
             return None
-    
-    def __del__(self):
-        """Clean up database session"""
-        if hasattr(self, 'db'):
-            self.db.close()
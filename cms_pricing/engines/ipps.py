@@ -2,10 +2,9 @@
 
 from typing import Dict, Any, Optional, List
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from sqlalchemy import and_
 
-from cms_pricing.engines.base import BasePricingEngine
-from cms_pricing.database import SessionLocal
+from cms_pricing.engines.base import BasePricingEngine, effective_in_year
 from cms_pricing.models.fee_schedules import FeeIPPS, IPPSBaseRate, WageIndex
 from cms_pricing.schemas.geography import GeographyResolveResponse
 import structlog
@@ -16,9 +15,6 @@ logger = structlog.get_logger()
 class IPPSEngine(BasePricingEngine):
     """Inpatient Prospective Payment System pricing engine"""
     
-    def __init__(self):
-        self.db = SessionLocal()
-    
     async def price_code(
         self,
         code: str,
@@ -56,11 +52,7 @@ class IPPSEngine(BasePricingEngine):
                 and_(
                     FeeIPPS.fy == fy,
                     FeeIPPS.drg == code,
-                    FeeIPPS.effective_from <= f"{year}-12-31",
-                    or_(
-                        FeeIPPS.effective_to.is_(None),
-                        FeeIPPS.effective_to >= f"{year}-01-01"
-                    )
+                    effective_in_year(FeeIPPS, year)
                 )
             ).first()
             
@@ -71,11 +63,7 @@ class IPPSEngine(BasePricingEngine):
             base_rate_data = self.db.query(IPPSBaseRate).filter(
                 and_(
                     IPPSBaseRate.fy == fy,
-                    IPPSBaseRate.effective_from <= f"{year}-12-31",
-                    or_(
-                        IPPSBaseRate.effective_to.is_(None),
-                        IPPSBaseRate.effective_to >= f"{year}-01-01"
-                    )
+                    effective_in_year(IPPSBaseRate, year)
                 )
             ).first()
             
@@ -153,8 +141,3 @@ class IPPSEngine(BasePricingEngine):
                 exc_info=True
             )
             raise
-    
-    def __del__(self):
-        """Clean up database session"""
-        if hasattr(self, 'db'):
-            self.db.close()
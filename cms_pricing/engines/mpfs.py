@@ -1,24 +1,35 @@
 """Medicare Physician Fee Schedule pricing engine"""
 
-from typing import Dict, Any, Optional, List
+from types import SimpleNamespace
+from typing import Dict, Any, Optional, List, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from sqlalchemy import and_, select
 
-from cms_pricing.engines.base import BasePricingEngine
-from cms_pricing.database import SessionLocal
+from cms_pricing.engines.base import BasePricingEngine, effective_in_year
+from cms_pricing.database import execute_async
 from cms_pricing.models.fee_schedules import FeeMPFS, GPCI, ConversionFactor
 from cms_pricing.schemas.geography import GeographyResolveResponse
+from cms_pricing.services.mpfs_fee_table import mpfs_fee_tables
+from cms_pricing.services.snapshot_store import RVU_PREFIX
 import structlog
 
 logger = structlog.get_logger()
 
+# Office/clinic places of service (non-facility PE RVU)
+NON_FACILITY_POS = {"11", "12", "13", "14", "15", "16", "17", "18", "19", "20", "21"}
+
+# Modifiers with their own PPRRVU rows
+RVU_MODIFIERS = {"26", "TC", "53"}
+
+# RVUIngestor.publish datasets read in snapshot mode (curated/cms_rvu/<vintage>/data/<name>)
+PPRRVU_SNAPSHOT = RVU_PREFIX + "pprrvu"
+GPCI_SNAPSHOT = RVU_PREFIX + "gpci"
+CONVERSION_FACTOR_SNAPSHOT = RVU_PREFIX + "conversion_factor"
+
 
 class MPSFEngine(BasePricingEngine):
     """Medicare Physician Fee Schedule pricing engine"""
     
-    def __init__(self):
-        self.db = SessionLocal()
-    
     async def price_code(
         self,
         code: str,
@@ -48,63 +59,32 @@ class MPSFEngine(BasePricingEngine):
             if not locality_id:
                 raise ValueError("No locality found for ZIP code")
             
-            # Get MPFS data
-            mpfs_data = self.db.query(FeeMPFS).filter(
-                and_(
-                    FeeMPFS.year == year,
-                    FeeMPFS.locality_id == locality_id,
-                    FeeMPFS.hcpcs == code,
-                    FeeMPFS.effective_from <= f"{year}-12-31",
-                    or_(
-                        FeeMPFS.effective_to.is_(None),
-                        FeeMPFS.effective_to >= f"{year}-01-01"
-                    )
-                )
-            ).first()
-            
-            if not mpfs_data:
-                raise ValueError(f"No MPFS data found for code {code} in locality {locality_id}")
-            
-            # Get GPCI
-            gpci_data = self.db.query(GPCI).filter(
-                and_(
-                    GPCI.year == year,
-                    GPCI.locality_id == locality_id
+            # A materialized fee table (published per release) replaces the
+            # RVU x GPCI x CF join with a single lookup
+            fee_table = mpfs_fee_tables.get()
+            fee_cents = None
+            if fee_table is not None:
+                fee_cents = fee_table.lookup(
+                    year, code, locality_id,
+                    modifier=self._rvu_modifier(modifiers),
+                    facility=not self._is_non_facility(pos)
                 )
-            ).first()
-            
-            if not gpci_data:
-                raise ValueError(f"No GPCI data found for locality {locality_id}")
             
-            # Get conversion factor
-            cf_data = self.db.query(ConversionFactor).filter(
-                and_(
-                    ConversionFactor.year == year,
-                    ConversionFactor.source == "MPFS"
+            if fee_cents is not None:
+                base_allowed = fee_cents / 100
+                trace_refs = [
+                    f"mpfs_fee_{year}_{locality_id}_{code}",
+                    f"mpfs_fee_lineage_{fee_table.digest[:16]}"
+                ]
+            else:
+                base_allowed = await self._rvu_base_allowed(
+                    code, year, locality_id, pos, modifier=self._rvu_modifier(modifiers)
                 )
-            ).first()
-            
-            if not cf_data:
-                raise ValueError(f"No conversion factor found for year {year}")
-            
-            # Determine PE RVU based on POS
-            pe_rvu = self._get_pe_rvu(mpfs_data, pos)
-            
-            # Calculate RVUs
-            work_rvu = mpfs_data.work_rvu or 0
-            pe_rvu = pe_rvu or 0
-            mp_rvu = mpfs_data.mp_rvu or 0
-            
-            # Apply GPCI
-            work_rvu_adjusted = work_rvu * gpci_data.gpci_work
-            pe_rvu_adjusted = pe_rvu * gpci_data.gpci_pe
-            mp_rvu_adjusted = mp_rvu * gpci_data.gpci_mp
-            
-            # Calculate total RVUs
-            total_rvu = work_rvu_adjusted + pe_rvu_adjusted + mp_rvu_adjusted
-            
-            # Apply conversion factor
-            base_allowed = total_rvu * cf_data.cf
+                trace_refs = [
+                    f"mpfs_{year}_{locality_id}_{code}",
+                    f"gpci_{year}_{locality_id}",
+                    f"cf_{year}_MPFS"
+                ]
             
             # Apply modifiers
             if modifiers:
@@ -134,11 +114,7 @@ class MPSFEngine(BasePricingEngine):
                 "source": "benchmark",
                 "facility_specific": False,
                 "packaged": False,
-                "trace_refs": [
-                    f"mpfs_{year}_{locality_id}_{code}",
-                    f"gpci_{year}_{locality_id}",
-                    f"cf_{year}_MPFS"
-                ]
+                "trace_refs": trace_refs
             }
             
         except Exception as e:
@@ -153,22 +129,134 @@ class MPSFEngine(BasePricingEngine):
             )
             raise
     
+    async def _rvu_base_allowed(
+        self,
+        code: str,
+        year: int,
+        locality_id: str,
+        pos: Optional[str],
+        modifier: str = ""
+    ) -> float:
+        """Allowed amount for one unit from the RVU, GPCI and CF tables"""
+        if self.snapshots is not None:
+            mpfs_data, gpci_data, cf_data = self._snapshot_rvu_inputs(code, year, locality_id, modifier)
+        else:
+            # Get MPFS data
+            mpfs_data = (await execute_async(self.db, select(FeeMPFS).where(
+                and_(
+                    FeeMPFS.year == year,
+                    FeeMPFS.locality_id == locality_id,
+                    FeeMPFS.hcpcs == code,
+                    effective_in_year(FeeMPFS, year)
+                )
+            ).limit(1))).scalars().first()
+            
+            # Get GPCI
+            gpci_data = (await execute_async(self.db, select(GPCI).where(
+                and_(
+                    GPCI.year == year,
+                    GPCI.locality_id == locality_id
+                )
+            ).limit(1))).scalars().first()
+            
+            # Get conversion factor
+            cf_data = (await execute_async(self.db, select(ConversionFactor).where(
+                and_(
+                    ConversionFactor.year == year,
+                    ConversionFactor.source == "MPFS"
+                )
+            ).limit(1))).scalars().first()
+        
+        if not mpfs_data:
+            raise ValueError(f"No MPFS data found for code {code} in locality {locality_id}")
+        
+        if not gpci_data:
+            raise ValueError(f"No GPCI data found for locality {locality_id}")
+        
+        if not cf_data:
+            raise ValueError(f"No conversion factor found for year {year}")
+        
+        # Determine PE RVU based on POS
+        pe_rvu = self._get_pe_rvu(mpfs_data, pos)
+        
+        # Calculate RVUs
+        work_rvu = mpfs_data.work_rvu or 0
+        pe_rvu = pe_rvu or 0
+        mp_rvu = mpfs_data.mp_rvu or 0
+        
+        # Apply GPCI
+        work_rvu_adjusted = work_rvu * gpci_data.gpci_work
+        pe_rvu_adjusted = pe_rvu * gpci_data.gpci_pe
+        mp_rvu_adjusted = mp_rvu * gpci_data.gpci_mp
+        
+        # Calculate total RVUs
+        total_rvu = work_rvu_adjusted + pe_rvu_adjusted + mp_rvu_adjusted
+        
+        # Apply conversion factor
+        return total_rvu * cf_data.cf
+    
+    def _snapshot_rvu_inputs(
+        self,
+        code: str,
+        year: int,
+        locality_id: str,
+        modifier: str
+    ) -> Tuple[Optional[SimpleNamespace], Optional[SimpleNamespace], Optional[SimpleNamespace]]:
+        """
+        PPRRVU, GPCI and CF rows from the year's curated RVU release.
+        
+        PPRRVU rows are national and keyed by HCPCS and modifier; the
+        locality applies through the GPCI row (GPCI locality_code). The CF
+        comes from the conversion factor dataset, else from the PPRRVU row.
+        Rows are returned with the FeeMPFS/GPCI/ConversionFactor attribute names.
+        """
+        vintage = self.snapshots.vintage_for_year(PPRRVU_SNAPSHOT, year)
+        if vintage is None:
+            return None, None, None
+        
+        rvu = next(
+            (row for row in self.snapshots.find(PPRRVU_SNAPSHOT, vintage, hcpcs=code)
+             if (getattr(row, "modifier", None) or "") == modifier),
+            None
+        )
+        gpci = self.snapshots.first(GPCI_SNAPSHOT, vintage, locality_code=locality_id)
+        cf = self.snapshots.first(CONVERSION_FACTOR_SNAPSHOT, vintage, cf_type="physician")
+        
+        mpfs_data = SimpleNamespace(
+            work_rvu=rvu.rvu_work,
+            pe_nf_rvu=rvu.rvu_pe_nonfac,
+            pe_fac_rvu=rvu.rvu_pe_fac,
+            mp_rvu=rvu.rvu_malp
+        ) if rvu is not None else None
+        gpci_data = SimpleNamespace(
+            gpci_work=gpci.gpci_work,
+            gpci_pe=gpci.gpci_pe,
+            gpci_mp=gpci.gpci_malp
+        ) if gpci is not None else None
+        # The PPRRVU layout carries the release CF on every row
+        cf_value = cf.cf_value if cf is not None else getattr(rvu, "conversion_factor", None)
+        cf_data = SimpleNamespace(cf=float(cf_value)) if cf_value is not None else None
+        return mpfs_data, gpci_data, cf_data
+    
     def _get_pe_rvu(self, mpfs_data: FeeMPFS, pos: Optional[str]) -> Optional[float]:
         """Get appropriate PE RVU based on place of service"""
         
-        if not pos:
-            # Default to facility PE RVU
-            return mpfs_data.pe_fac_rvu
-        
-        # POS mapping logic
-        if pos in ["11", "12", "13", "14", "15", "16", "17", "18", "19", "20", "21"]:
+        if self._is_non_facility(pos):
             # Office/clinic settings - use non-facility PE RVU
             return mpfs_data.pe_nf_rvu
         else:
-            # Facility settings - use facility PE RVU
+            # Facility settings (and no POS) - use facility PE RVU
             return mpfs_data.pe_fac_rvu
     
-    def __del__(self):
-        """Clean up database session"""
-        if hasattr(self, 'db'):
-            self.db.close()
+    @staticmethod
+    def _is_non_facility(pos: Optional[str]) -> bool:
+        """Office/clinic places of service are paid at the non-facility rate"""
+        return pos in NON_FACILITY_POS
+    
+    @staticmethod
+    def _rvu_modifier(modifiers: Optional[List[str]]) -> str:
+        """PPRRVU modifier (26/TC/53) selecting the RVU row; '' for the global service"""
+        for modifier in modifiers or []:
+            if modifier.lstrip("-") in RVU_MODIFIERS:
+                return modifier.lstrip("-")
+        return ""
@@ -1,13 +1,14 @@
 """Outpatient Prospective Payment System pricing engine"""
 
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from sqlalchemy import and_, select
 
-from cms_pricing.engines.base import BasePricingEngine
-from cms_pricing.database import SessionLocal
+from cms_pricing.engines.base import BasePricingEngine, effective_in_year
+from cms_pricing.database import execute_async
 from cms_pricing.models.fee_schedules import FeeOPPS, WageIndex
 from cms_pricing.schemas.geography import GeographyResolveResponse
+from cms_pricing.services.opps_rate_table import opps_rate_tables, wage_adjust
 import structlog
 
 logger = structlog.get_logger()
@@ -16,9 +17,6 @@ logger = structlog.get_logger()
 class OPPSEngine(BasePricingEngine):
     """Outpatient Prospective Payment System pricing engine"""
     
-    def __init__(self):
-        self.db = SessionLocal()
-    
     async def price_code(
         self,
         code: str,
@@ -48,43 +46,26 @@ class OPPSEngine(BasePricingEngine):
             if not cbsa:
                 raise ValueError("No CBSA found for ZIP code")
             
-            # Get OPPS data
-            opps_data = self.db.query(FeeOPPS).filter(
-                and_(
-                    FeeOPPS.year == year,
-                    FeeOPPS.quarter == quarter or "1",  # Default to Q1
-                    FeeOPPS.hcpcs == code,
-                    FeeOPPS.effective_from <= f"{year}-12-31",
-                    or_(
-                        FeeOPPS.effective_to.is_(None),
-                        FeeOPPS.effective_to >= f"{year}-01-01"
-                    )
-                )
-            ).first()
-            
-            if not opps_data:
-                raise ValueError(f"No OPPS data found for code {code}")
-            
-            # Get wage index
-            wage_index_data = self.db.query(WageIndex).filter(
-                and_(
-                    WageIndex.year == year,
-                    WageIndex.quarter == quarter or "1",
-                    WageIndex.cbsa == cbsa
-                )
-            ).first()
-            
-            if not wage_index_data:
-                raise ValueError(f"No wage index found for CBSA {cbsa}")
+            # Precomputed wage-adjusted rate for the quarter, if published
+            rate_table = opps_rate_tables.get(year, quarter or "1")
+            rate = rate_table.lookup(code, cbsa) if rate_table is not None else None
             
-            # Calculate base rate
-            base_rate = opps_data.national_unadj_rate or 0
-            
-            # Apply wage index
-            wage_adjusted_rate = base_rate * wage_index_data.wage_index
+            if rate is not None:
+                status_indicator = rate.status_indicator
+                wage_adjusted_rate = rate.wage_adjusted_rate
+                trace_refs = [
+                    f"opps_{year}_{quarter}_{code}",
+                    f"opps_rate_{year}_{quarter}_{rate.apc}_{cbsa}"
+                ]
+            else:
+                status_indicator, wage_adjusted_rate = await self._wage_adjusted_rate(code, year, quarter, cbsa)
+                trace_refs = [
+                    f"opps_{year}_{quarter}_{code}",
+                    f"wage_index_{year}_{quarter}_{cbsa}"
+                ]
             
             # Check packaging status
-            packaged = self._is_packaged(opps_data.status_indicator)
+            packaged = self._is_packaged(status_indicator)
             
             if packaged:
                 # Packaged items have $0 separate payment
@@ -118,10 +99,7 @@ class OPPSEngine(BasePricingEngine):
                 "source": "benchmark",
                 "facility_specific": False,
                 "packaged": packaged,
-                "trace_refs": [
-                    f"opps_{year}_{quarter}_{code}",
-                    f"wage_index_{year}_{quarter}_{cbsa}"
-                ]
+                "trace_refs": trace_refs
             }
             
         except Exception as e:
@@ -137,6 +115,49 @@ class OPPSEngine(BasePricingEngine):
             )
             raise
     
+    async def _wage_adjusted_rate(
+        self,
+        code: str,
+        year: int,
+        quarter: Optional[str],
+        cbsa: str
+    ) -> Tuple[Optional[str], float]:
+        """Status indicator and wage-adjusted rate from the fee and wage index tables"""
+        
+        # The published rate table (OPPSIngestor) is the only OPPS snapshot;
+        # fee and wage index rows exist only in the database
+        if self.snapshots is not None:
+            raise ValueError(f"No published OPPS rate for code {code} in CBSA {cbsa}")
+        
+        # Get OPPS data
+        opps_data = (await execute_async(self.db, select(FeeOPPS).where(
+            and_(
+                FeeOPPS.year == year,
+                FeeOPPS.quarter == (quarter or "1"),  # Default to Q1
+                FeeOPPS.hcpcs == code,
+                effective_in_year(FeeOPPS, year)
+            )
+        ).limit(1))).scalars().first()
+        
+        if not opps_data:
+            raise ValueError(f"No OPPS data found for code {code}")
+        
+        # Get wage index
+        wage_index_data = (await execute_async(self.db, select(WageIndex).where(
+            and_(
+                WageIndex.year == year,
+                WageIndex.quarter == (quarter or "1"),
+                WageIndex.cbsa == cbsa
+            )
+        ).limit(1))).scalars().first()
+        
+        if not wage_index_data:
+            raise ValueError(f"No wage index found for CBSA {cbsa}")
+        
+        # Only the labor-related share is wage adjusted; cents as in the precomputed table
+        base_rate = opps_data.national_unadj_rate or 0
+        return opps_data.status_indicator, round(wage_adjust(base_rate, wage_index_data.wage_index), 2)
+    
     def _is_packaged(self, status_indicator: Optional[str]) -> bool:
         """Check if item is packaged based on status indicator"""
         if not status_indicator:
@@ -145,8 +166,3 @@ class OPPSEngine(BasePricingEngine):
         # Packaged indicators
         packaged_indicators = ["N", "J1", "Q1", "Q2", "Q3"]
         return status_indicator in packaged_indicators
-    
-    def __del__(self):
-        """Clean up database session"""
-        if hasattr(self, 'db'):
-            self.db.close()
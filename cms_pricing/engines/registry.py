@@ -0,0 +1,67 @@
+"""Process-wide registry of pricing engines"""
+
+from collections.abc import Mapping
+from typing import Dict, Iterator, Optional
+
+import structlog
+
+from cms_pricing.engines.asc import ASCEngine
+from cms_pricing.engines.base import BasePricingEngine
+from cms_pricing.engines.clfs import CLFSEngine
+from cms_pricing.engines.dmepos import DMEPOSEngine
+from cms_pricing.engines.drugs import DrugEngine
+from cms_pricing.engines.ipps import IPPSEngine
+from cms_pricing.engines.mpfs import MPSFEngine
+from cms_pricing.engines.opps import OPPSEngine
+
+logger = structlog.get_logger()
+
+ENGINE_CLASSES = {
+    'MPFS': MPSFEngine,
+    'OPPS': OPPSEngine,
+    'ASC': ASCEngine,
+    'IPPS': IPPSEngine,
+    'CLFS': CLFSEngine,
+    'DMEPOS': DMEPOSEngine,
+    'DRUGS': DrugEngine
+}
+
+
+class EngineRegistry(Mapping):
+    """
+    One engine per setting, shared by every request.
+
+    Engines hold no session of their own; callers run them inside
+    engines.base.use_context with the request's session. Built at startup
+    by the app lifespan, or on first use outside the app.
+    """
+
+    def __init__(self):
+        self._engines: Optional[Dict[str, BasePricingEngine]] = None
+
+    def initialize(self):
+        """Construct the engines (idempotent)"""
+        if self._engines is None:
+            self._engines = {setting: engine_cls() for setting, engine_cls in ENGINE_CLASSES.items()}
+            logger.info("Initialized pricing engines", settings=list(self._engines))
+
+    def close(self):
+        self._engines = None
+
+    @property
+    def engines(self) -> Dict[str, BasePricingEngine]:
+        if self._engines is None:
+            self.initialize()
+        return self._engines
+
+    def __getitem__(self, setting: str) -> BasePricingEngine:
+        return self.engines[setting]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.engines)
+
+    def __len__(self) -> int:
+        return len(self.engines)
+
+
+engine_registry = EngineRegistry()
@@ -2,21 +2,23 @@
 
 import asyncio
 import httpx
-import hashlib
 from pathlib import Path
 from typing import Dict, Any, Optional, List
 from datetime import datetime
 import structlog
 
+from .raw_store import RawStore, raw_store_for
+
 logger = structlog.get_logger()
 
 
 class CMSDownloader:
     """Downloads data files from CMS.gov"""
     
-    def __init__(self, output_dir: str = "./data/cms_raw"):
+    def __init__(self, output_dir: str = "./data/cms_raw", raw_store: Optional[RawStore] = None):
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.raw_store = raw_store or raw_store_for()
         
         # CMS.gov URLs based on PRD section 4 - actual CMS data sources
         # Reference: https://www.cms.gov/medicare/payment/fee-schedules
@@ -111,47 +113,44 @@ class CMSDownloader:
                 )
                 
                 async with httpx.AsyncClient(timeout=timeout) as client:
-                    response = await client.get(url)
+                    # Stored once by content; output_path links to the object
+                    stored = await self.raw_store.download(client, url, output_path)
                     
-                    if response.status_code == 200:
-                        # Save the file
-                        output_path.write_bytes(response.content)
-                        
-                        # Calculate checksum
-                        file_hash = hashlib.sha256(response.content).hexdigest()
-                        
-                        logger.info(
-                            "File downloaded successfully",
-                            filename=filename,
-                            size_bytes=len(response.content),
-                            checksum=file_hash
-                        )
-                        
-                        return {
-                            "success": True,
-                            "filename": filename,
-                            "url": url,
-                            "size_bytes": len(response.content),
-                            "checksum": file_hash,
-                            "download_time": datetime.utcnow().isoformat(),
-                            "local_path": str(output_path)
-                        }
-                    else:
-                        logger.warning(
-                            "Failed to download file",
-                            url=url,
-                            status_code=response.status_code,
-                            attempt=attempt + 1
-                        )
-                        
-                        if attempt == max_retries - 1:
-                            return {
-                                "success": False,
-                                "filename": filename,
-                                "url": url,
-                                "error": f"HTTP {response.status_code}",
-                                "attempts": max_retries
-                            }
+                    logger.info(
+                        "File downloaded successfully",
+                        filename=filename,
+                        size_bytes=stored.size_bytes,
+                        checksum=stored.sha256,
+                        reused=not stored.new
+                    )
+                    
+                    return {
+                        "success": True,
+                        "filename": filename,
+                        "url": url,
+                        "size_bytes": stored.size_bytes,
+                        "checksum": stored.sha256,
+                        "download_time": datetime.utcnow().isoformat(),
+                        "local_path": str(output_path),
+                        "not_modified": stored.not_modified
+                    }
+                
+            except httpx.HTTPStatusError as e:
+                logger.warning(
+                    "Failed to download file",
+                    url=url,
+                    status_code=e.response.status_code,
+                    attempt=attempt + 1
+                )
+                
+                if attempt == max_retries - 1:
+                    return {
+                        "success": False,
+                        "filename": filename,
+                        "url": url,
+                        "error": f"HTTP {e.response.status_code}",
+                        "attempts": max_retries
+                    }
                         
             except Exception as e:
                 logger.error(
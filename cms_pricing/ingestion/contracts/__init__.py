@@ -1,7 +1,10 @@
 """DIS-Compliant Contracts Module"""
 
 from .ingestor_spec import IngestorSpec, BaseDISIngestor, SourceFile, RawBatch, AdaptedBatch, StageFrame, RefData
-from .schema_registry import SchemaRegistry, SchemaContract, ColumnSpec, schema_registry
+from .schema_registry import (
+    SchemaRegistry, SchemaContract, ColumnSpec, SchemaPlan, CategoricalSpec,
+    compile_schema_plan, load_schema_plan, schema_registry
+)
 
 __all__ = [
     "IngestorSpec",
@@ -14,5 +17,9 @@ __all__ = [
     "SchemaRegistry",
     "SchemaContract",
     "ColumnSpec",
+    "SchemaPlan",
+    "CategoricalSpec",
+    "compile_schema_plan",
+    "load_schema_plan",
     "schema_registry"
 ]
@@ -10,13 +10,22 @@ import json
 import os
 from dataclasses import dataclass, asdict
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Any, List, Optional, Union
+from types import MappingProxyType
+from typing import Dict, Any, FrozenSet, List, Mapping, Optional, Tuple, Union
 import pandas as pd
 import structlog
 
 logger = structlog.get_logger()
 
+# Contract JSON files shipped with the package
+CONTRACTS_DIR = Path(__file__).parent
+
+
+def _copy_list(values: Optional[List[Any]]) -> Optional[List[Any]]:
+    return list(values) if values is not None else None
+
 
 @dataclass
 class ColumnSpec:
@@ -83,11 +92,11 @@ class SchemaContract:
                 nullable=col_data["nullable"],
                 description=col_data["description"],
                 unit=col_data.get("unit"),
-                domain=col_data.get("domain"),
+                domain=_copy_list(col_data.get("domain")),
                 min_value=col_data.get("min_value"),
                 max_value=col_data.get("max_value"),
                 pattern=col_data.get("pattern"),
-                sample_values=col_data.get("sample_values")
+                sample_values=_copy_list(col_data.get("sample_values"))
             )
         
         return cls(
@@ -95,13 +104,134 @@ class SchemaContract:
             version=data["version"],
             generated_at=data["generated_at"],
             columns=columns,
-            primary_keys=data.get("primary_keys", []),
-            partition_columns=data.get("partition_columns", []),
-            business_rules=data.get("business_rules", []),
-            quality_thresholds=data.get("quality_thresholds", {})
+            primary_keys=list(data.get("primary_keys", [])),
+            partition_columns=list(data.get("partition_columns", [])),
+            business_rules=list(data.get("business_rules", [])),
+            quality_thresholds=dict(data.get("quality_thresholds", {}))
         )
 
 
+@dataclass(frozen=True)
+class CategoricalSpec:
+    """Compiled categorical column: enum order for the dtype, set for membership"""
+    enum: Tuple[Any, ...]
+    allowed: FrozenSet[Any]
+    nullable: bool
+    
+    @property
+    def accepted(self) -> List[Any]:
+        """Values that pass the domain check (enum plus null/blank)"""
+        return list(self.enum) + [None, pd.NA, '']
+
+
+@dataclass(frozen=True)
+class SchemaPlan:
+    """
+    Immutable, precompiled view of a schema contract.
+    
+    Everything parsers and validators derive from a contract (column order,
+    dtypes, precision/rounding, categorical enums, natural keys) is computed
+    once here so repeated parses share it instead of re-walking the JSON.
+    """
+    schema_id: str
+    version: str
+    columns: FrozenSet[str]
+    column_order: Tuple[str, ...]
+    dtypes: Mapping[str, str]
+    nullable: Mapping[str, bool]
+    precision: Mapping[str, Tuple[int, str]]
+    categorical: Mapping[str, CategoricalSpec]
+    domains: Mapping[str, FrozenSet[Any]]
+    value_ranges: Mapping[str, Tuple[Optional[float], Optional[float]]]
+    natural_keys: Union[Tuple[str, ...], Mapping[str, Tuple[str, ...]]]
+    primary_keys: Tuple[str, ...]
+
+
+def compile_schema_plan(contract: Dict[str, Any], schema_id: Optional[str] = None) -> SchemaPlan:
+    """Compile a schema contract dict into a SchemaPlan"""
+    columns = contract.get("columns", {})
+    dtypes, nullable, precision, categorical, domains, value_ranges = {}, {}, {}, {}, {}, {}
+    
+    for col_name, col_def in columns.items():
+        col_type = col_def.get("type", "str")
+        dtypes[col_name] = col_type
+        nullable[col_name] = col_def.get("nullable", True)
+        
+        if col_type in ("float64", "number"):
+            # Defaults per STD-parser-contracts v1.1 §5.2: 6dp, HALF_UP
+            precision[col_name] = (col_def.get("precision", 6), col_def.get("rounding_mode", "HALF_UP"))
+        
+        if col_type == "categorical":
+            enum = tuple(col_def.get("enum", []))
+            categorical[col_name] = CategoricalSpec(
+                enum=enum, allowed=frozenset(enum), nullable=col_def.get("nullable", True)
+            )
+        
+        if col_def.get("domain"):
+            domains[col_name] = frozenset(col_def["domain"])
+        
+        if col_def.get("min_value") is not None or col_def.get("max_value") is not None:
+            value_ranges[col_name] = (col_def.get("min_value"), col_def.get("max_value"))
+    
+    natural_keys = contract.get("natural_keys", [])
+    if isinstance(natural_keys, dict):
+        # Nested contracts (OPPS) key natural keys by table
+        natural_keys = MappingProxyType({table: tuple(keys) for table, keys in natural_keys.items()})
+    else:
+        natural_keys = tuple(natural_keys)
+    
+    return SchemaPlan(
+        schema_id=schema_id or contract.get("dataset_name", ""),
+        version=str(contract.get("version", "")),
+        columns=frozenset(columns),
+        column_order=tuple(contract.get("column_order", [])),
+        dtypes=MappingProxyType(dtypes),
+        nullable=MappingProxyType(nullable),
+        precision=MappingProxyType(precision),
+        categorical=MappingProxyType(categorical),
+        domains=MappingProxyType(domains),
+        value_ranges=MappingProxyType(value_ranges),
+        natural_keys=natural_keys,
+        primary_keys=tuple(contract.get("primary_keys", [])),
+    )
+
+
+def resolve_contract_path(schema_id: str) -> Path:
+    """
+    Find the contract file for a schema ID.
+    
+    Contract filenames carry the MAJOR version only, so `cms_pprrvu_v1.1`
+    falls back to `cms_pprrvu_v1.0.json` when no exact file exists.
+    """
+    candidates = [schema_id]
+    if "." in schema_id:
+        candidates.append(schema_id.rsplit(".", 1)[0] + ".0")
+    
+    for candidate in candidates:
+        path = CONTRACTS_DIR / f"{candidate}.json"
+        if path.exists():
+            return path
+    
+    raise FileNotFoundError(f"No schema contract found for {schema_id} in {CONTRACTS_DIR}")
+
+
+@lru_cache(maxsize=128)
+def _read_contract_file(path: str, mtime_ns: int) -> Dict[str, Any]:
+    """Parsed contract JSON, cached per file modification time; callers must not mutate it"""
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+@lru_cache(maxsize=64)
+def load_schema_plan(schema_id: str) -> SchemaPlan:
+    """Load and compile a packaged schema contract once per schema ID"""
+    path = resolve_contract_path(schema_id)
+    with open(path, "r", encoding="utf-8") as f:
+        contract = json.load(f)
+    logger.debug("Compiled schema plan", schema_id=schema_id, path=str(path))
+    return compile_schema_plan(contract, schema_id=schema_id)
+
+
 class SchemaRegistry:
     """
     Central registry for schema contracts following DIS standards.
@@ -111,16 +241,18 @@ class SchemaRegistry:
     
     def __init__(self, contracts_dir: str = "cms_pricing/ingestion/contracts"):
         self.contracts_dir = Path(contracts_dir)
-        self.contracts_dir.mkdir(parents=True, exist_ok=True)
         self._schemas: Dict[str, SchemaContract] = {}
-        self._load_existing_schemas()
+        self._plans: Dict[str, SchemaPlan] = {}
+        self._loaded = False
     
     def _load_existing_schemas(self):
-        """Load existing schema contracts from disk"""
+        """Load existing schema contracts from disk (on first use, not at import)"""
+        if self._loaded:
+            return
+        self._loaded = True
         for schema_file in self.contracts_dir.glob("*.json"):
             try:
-                with open(schema_file, 'r') as f:
-                    data = json.load(f)
+                data = _read_contract_file(str(schema_file), schema_file.stat().st_mtime_ns)
                 schema = SchemaContract.from_dict(data)
                 self._schemas[schema.dataset_name] = schema
                 logger.info(f"Loaded schema contract: {schema.dataset_name}")
@@ -129,9 +261,12 @@ class SchemaRegistry:
     
     def register_schema(self, schema: SchemaContract) -> None:
         """Register a new schema contract"""
+        self._load_existing_schemas()
         self._schemas[schema.dataset_name] = schema
+        self._plans.pop(schema.dataset_name, None)
         
         # Save to disk
+        self.contracts_dir.mkdir(parents=True, exist_ok=True)
         schema_file = self.contracts_dir / f"{schema.dataset_name}_v{schema.version}.json"
         with open(schema_file, 'w') as f:
             json.dump(schema.to_dict(), f, indent=2)
@@ -140,10 +275,23 @@ class SchemaRegistry:
     
     def get_schema(self, dataset_name: str) -> Optional[SchemaContract]:
         """Get schema contract for dataset"""
+        self._load_existing_schemas()
         return self._schemas.get(dataset_name)
     
+    def get_plan(self, dataset_name: str) -> Optional[SchemaPlan]:
+        """Get the compiled plan for a registered schema contract"""
+        plan = self._plans.get(dataset_name)
+        if plan is None:
+            schema = self.get_schema(dataset_name)
+            if schema is None:
+                return None
+            plan = compile_schema_plan(schema.to_dict(), schema_id=f"{dataset_name}_v{schema.version}")
+            self._plans[dataset_name] = plan
+        return plan
+    
     def list_schemas(self) -> List[str]:
         """List all registered dataset names"""
+        self._load_existing_schemas()
         return list(self._schemas.keys())
     
     def validate_dataframe(self, df: pd.DataFrame, dataset_name: str) -> Dict[str, Any]:
@@ -152,8 +300,8 @@ class SchemaRegistry:
         
         Returns validation results with errors, warnings, and metrics
         """
-        schema = self.get_schema(dataset_name)
-        if not schema:
+        plan = self.get_plan(dataset_name)
+        if not plan:
             return {
                 "valid": False,
                 "errors": [f"No schema contract found for {dataset_name}"],
@@ -166,12 +314,12 @@ class SchemaRegistry:
         metrics = {}
         
         # Check required columns
-        missing_columns = set(schema.columns.keys()) - set(df.columns)
+        missing_columns = plan.columns - set(df.columns)
         if missing_columns:
-            errors.append(f"Missing required columns: {missing_columns}")
+            errors.append(f"Missing required columns: {set(missing_columns)}")
         
         # Check column types and constraints
-        for col_name, col_spec in schema.columns.items():
+        for col_name, expected_type in plan.dtypes.items():
             if col_name not in df.columns:
                 continue
             
@@ -179,39 +327,40 @@ class SchemaRegistry:
             
             # Check nullability
             null_count = col_data.isnull().sum()
-            if not col_spec.nullable and null_count > 0:
+            if not plan.nullable[col_name] and null_count > 0:
                 errors.append(f"Column {col_name} has {null_count} null values but is not nullable")
             
             # Check data types
-            expected_type = col_spec.type
             actual_type = str(col_data.dtype)
             if expected_type != actual_type:
                 warnings.append(f"Column {col_name} type mismatch: expected {expected_type}, got {actual_type}")
             
             # Check domain values
-            if col_spec.domain:
-                invalid_values = set(col_data.dropna().unique()) - set(col_spec.domain)
+            domain = plan.domains.get(col_name)
+            if domain:
+                invalid_values = set(col_data.dropna().unique()) - domain
                 if invalid_values:
                     errors.append(f"Column {col_name} has invalid values: {invalid_values}")
             
             # Check value ranges
-            if col_spec.min_value is not None:
-                below_min = (col_data < col_spec.min_value).sum()
+            min_value, max_value = plan.value_ranges.get(col_name, (None, None))
+            if min_value is not None:
+                below_min = (col_data < min_value).sum()
                 if below_min > 0:
-                    errors.append(f"Column {col_name} has {below_min} values below minimum {col_spec.min_value}")
+                    errors.append(f"Column {col_name} has {below_min} values below minimum {min_value}")
             
-            if col_spec.max_value is not None:
-                above_max = (col_data > col_spec.max_value).sum()
+            if max_value is not None:
+                above_max = (col_data > max_value).sum()
                 if above_max > 0:
-                    errors.append(f"Column {col_name} has {above_max} values above maximum {col_spec.max_value}")
+                    errors.append(f"Column {col_name} has {above_max} values above maximum {max_value}")
             
             # Calculate quality metrics
             metrics[f"{col_name}_null_rate"] = null_count / len(df)
             metrics[f"{col_name}_unique_count"] = col_data.nunique()
         
         # Check primary key uniqueness
-        if schema.primary_keys:
-            pk_columns = [col for col in schema.primary_keys if col in df.columns]
+        if plan.primary_keys:
+            pk_columns = [col for col in plan.primary_keys if col in df.columns]
             if pk_columns:
                 duplicate_count = df.duplicated(subset=pk_columns).sum()
                 if duplicate_count > 0:
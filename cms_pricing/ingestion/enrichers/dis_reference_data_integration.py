@@ -17,9 +17,12 @@ from datetime import datetime, date, timedelta
 from enum import Enum
 from pathlib import Path
 from typing import Dict, Any, List, Optional, Union, Tuple
+import numpy as np
 import pandas as pd
 import structlog
 
+from cms_pricing.ingestion.enrichers.reference_store import ReferenceTable, reference_store_for
+
 logger = structlog.get_logger()
 
 
@@ -60,6 +63,7 @@ class ReferenceDataMetadata:
     refresh_cadence: str
     confidence_level: str  # "high", "medium", "low"
     coverage_scope: str  # "national", "state", "local", "regional"
+    content_digest: Optional[str] = None  # digest of the indexed reference table
 
 
 @dataclass
@@ -79,6 +83,11 @@ class EnrichmentRule:
     validation_rules: List[str] = None
     business_rules: List[str] = None
     quality_gates: Dict[str, float] = None
+    # NEAREST_NEIGHBOR/INTERPOLATION: max distance on the last join key
+    # (miles when coordinate_keys), None for unbounded
+    tolerance: Optional[float] = None
+    # NEAREST_NEIGHBOR: join_keys are (latitude, longitude) pairs
+    coordinate_keys: bool = False
     
     def __post_init__(self):
         if self.default_values is None:
@@ -122,7 +131,10 @@ class ReferenceDataManager:
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
         self.reference_sources: Dict[str, ReferenceDataMetadata] = {}
-        self.reference_data: Dict[str, pd.DataFrame] = {}
+        self.reference_tables: Dict[str, ReferenceTable] = {}
+        # Sorted, indexed tables are shared by every manager using this
+        # directory and reused across runs while the content is unchanged
+        self.reference_store = reference_store_for(str(self.output_dir / "indexes"))
         self._load_reference_metadata()
     
     def _load_reference_metadata(self):
@@ -134,6 +146,11 @@ class ReferenceDataManager:
                     data = json.load(f)
                 
                 for source_name, metadata_dict in data.items():
+                    metadata_dict['source_type'] = ReferenceDataSource(metadata_dict['source_type'])
+                    metadata_dict['last_updated'] = datetime.fromisoformat(metadata_dict['last_updated'])
+                    for field in ('effective_from', 'effective_to'):
+                        if metadata_dict.get(field):
+                            metadata_dict[field] = date.fromisoformat(metadata_dict[field])
                     metadata = ReferenceDataMetadata(**metadata_dict)
                     self.reference_sources[source_name] = metadata
                     
@@ -182,15 +199,22 @@ class ReferenceDataManager:
         logger.info(f"Registered reference source: {source_name}")
         return metadata
     
+    @property
+    def reference_data(self) -> Dict[str, pd.DataFrame]:
+        """Loaded reference frames by source (read-only, shared)"""
+        return {name: table.data for name, table in self.reference_tables.items()}
+    
     def load_reference_data(self, source_name: str, data: pd.DataFrame) -> bool:
         """Load reference data for a source"""
         try:
-            self.reference_data[source_name] = data.copy()
+            table = self.reference_store.put(source_name, data)
+            self.reference_tables[source_name] = table
             
             # Update metadata
             if source_name in self.reference_sources:
                 self.reference_sources[source_name].record_count = len(data)
                 self.reference_sources[source_name].last_updated = datetime.utcnow()
+                self.reference_sources[source_name].content_digest = table.digest
                 self._save_reference_metadata()
             
             logger.info(f"Loaded reference data for {source_name}: {len(data)} records")
@@ -200,24 +224,43 @@ class ReferenceDataManager:
             logger.error(f"Failed to load reference data for {source_name}: {e}")
             return False
     
+    def get_reference_table(self, source_name: str) -> Optional[ReferenceTable]:
+        """Indexed table for a source, reopened from the store by digest if needed"""
+        table = self.reference_tables.get(source_name)
+        if table is None and source_name in self.reference_sources:
+            digest = self.reference_sources[source_name].content_digest
+            if digest:
+                table = self.reference_store.open(source_name, digest)
+                if table is not None:
+                    self.reference_tables[source_name] = table
+        return table
+    
+    def effective_date_for(self, source_name: str, effective_date: Optional[date]) -> Optional[date]:
+        """Date to filter a source by; only registered sources are effective-dated"""
+        return effective_date if source_name in self.reference_sources else None
+    
     def get_reference_data(self, source_name: str, effective_date: Optional[date] = None) -> Optional[pd.DataFrame]:
-        """Get reference data for a source, optionally filtered by effective date"""
-        if source_name not in self.reference_data:
-            return None
-        
-        data = self.reference_data[source_name].copy()
+        """
+        Get reference data for a source, optionally filtered by effective date.
         
-        if effective_date and source_name in self.reference_sources:
-            metadata = self.reference_sources[source_name]
-            
-            # Filter by effective date if applicable
-            if 'effective_from' in data.columns and 'effective_to' in data.columns:
-                mask = (data['effective_from'] <= effective_date) & (
-                    (data['effective_to'].isna()) | (data['effective_to'] >= effective_date)
-                )
-                data = data[mask]
-        
-        return data
+        The frame is a view of the shared reference table; do not modify it.
+        """
+        table = self.get_reference_table(source_name)
+        if table is None:
+            return None
+        return table.view(self.effective_date_for(source_name, effective_date))
+    
+    def get_keyed_reference(
+        self,
+        source_name: str,
+        keys: List[str],
+        effective_date: Optional[date] = None
+    ) -> Optional[Tuple[pd.DataFrame, int]]:
+        """Reference rows indexed by key columns, plus the duplicate-key count dropped"""
+        table = self.get_reference_table(source_name)
+        if table is None:
+            return None
+        return table.keyed(keys, self.effective_date_for(source_name, effective_date))
     
     def get_available_sources(self, source_type: Optional[ReferenceDataSource] = None) -> List[str]:
         """Get available reference sources, optionally filtered by type"""
@@ -237,15 +280,47 @@ class ReferenceDataManager:
         metadata_dict = {}
         for name, metadata in self.reference_sources.items():
             metadata_dict[name] = asdict(metadata)
-            # Convert datetime objects to ISO strings
+            # Convert enums and datetime objects to JSON values
+            metadata_dict[name]['source_type'] = metadata.source_type.value
             metadata_dict[name]['last_updated'] = metadata.last_updated.isoformat()
             if metadata.effective_from:
                 metadata_dict[name]['effective_from'] = metadata.effective_from.isoformat()
             if metadata.effective_to:
                 metadata_dict[name]['effective_to'] = metadata.effective_to.isoformat()
         
-        with open(metadata_file, 'w') as f:
+        tmp_file = metadata_file.with_suffix('.json.tmp')
+        with open(tmp_file, 'w') as f:
             json.dump(metadata_dict, f, indent=2)
+        tmp_file.replace(metadata_file)
+
+
+EARTH_RADIUS_MILES = 3959.0
+
+
+def _unit_vectors(lat: pd.Series, lon: pd.Series) -> np.ndarray:
+    """Latitude/longitude in degrees to 3D points on the unit sphere"""
+    lat_rad = np.radians(pd.to_numeric(lat, errors="coerce").to_numpy(dtype=float))
+    lon_rad = np.radians(pd.to_numeric(lon, errors="coerce").to_numpy(dtype=float))
+    cos_lat = np.cos(lat_rad)
+    return np.column_stack((cos_lat * np.cos(lon_rad), cos_lat * np.sin(lon_rad), np.sin(lat_rad)))
+
+
+def _asof_key(values: pd.Series) -> pd.Series:
+    """Sortable merge_asof key: datetimes stay datetimes, anything else is coerced to float"""
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values
+    return pd.to_numeric(values, errors="coerce").astype("float64")
+
+
+def _coordinate_tree(lat: pd.Series, lon: pd.Series):
+    """KD-tree over reference coordinates and the view positions of its points"""
+    from scipy.spatial import cKDTree
+    
+    points = _unit_vectors(lat, lon)
+    valid = ~np.isnan(points).any(axis=1)
+    if not valid.any():
+        return None, np.empty(0, dtype=np.int64)
+    return cKDTree(points[valid]), np.flatnonzero(valid)
 
 
 class DISReferenceDataEnricher:
@@ -263,7 +338,8 @@ class DISReferenceDataEnricher:
     ) -> Tuple[pd.DataFrame, List[EnrichmentResult]]:
         """Enrich source data with reference data following DIS standards"""
         
-        enriched_df = source_df.copy()
+        # Strategies return new frames, so the input is never written to
+        enriched_df = source_df.copy(deep=False)
         enrichment_results = []
         
         for rule in enrichment_rules:
@@ -294,23 +370,23 @@ class DISReferenceDataEnricher:
                 # Apply enrichment based on strategy
                 if rule.strategy == EnrichmentStrategy.EXACT_MATCH:
                     enriched_df, result = self._apply_exact_match_enrichment(
-                        enriched_df, ref_data, rule, start_time
+                        enriched_df, ref_data, rule, start_time, effective_date
                     )
                 elif rule.strategy == EnrichmentStrategy.FUZZY_MATCH:
                     enriched_df, result = self._apply_fuzzy_match_enrichment(
-                        enriched_df, ref_data, rule, start_time
+                        enriched_df, ref_data, rule, start_time, effective_date
                     )
                 elif rule.strategy == EnrichmentStrategy.NEAREST_NEIGHBOR:
                     enriched_df, result = self._apply_nearest_neighbor_enrichment(
-                        enriched_df, ref_data, rule, start_time
+                        enriched_df, ref_data, rule, start_time, effective_date
                     )
                 elif rule.strategy == EnrichmentStrategy.INTERPOLATION:
                     enriched_df, result = self._apply_interpolation_enrichment(
-                        enriched_df, ref_data, rule, start_time
+                        enriched_df, ref_data, rule, start_time, effective_date
                     )
                 elif rule.strategy == EnrichmentStrategy.FALLBACK:
                     enriched_df, result = self._apply_fallback_enrichment(
-                        enriched_df, ref_data, rule, start_time
+                        enriched_df, ref_data, rule, start_time, effective_date
                     )
                 else:
                     enriched_df, result = self._apply_default_value_enrichment(
@@ -348,39 +424,56 @@ class DISReferenceDataEnricher:
         source_df: pd.DataFrame, 
         ref_data: pd.DataFrame, 
         rule: EnrichmentRule, 
-        start_time: datetime
+        start_time: datetime,
+        effective_date: Optional[date] = None
     ) -> Tuple[pd.DataFrame, EnrichmentResult]:
-        """Apply exact match enrichment"""
+        """Apply exact match enrichment as one hash join on all key pairs"""
         
-        enriched_df = source_df.copy()
+        enriched_df = source_df.copy(deep=False)
         records_processed = len(enriched_df)
         records_enriched = 0
         errors = []
         warnings = []
         
         try:
-            # Apply joins for each join key pair
-            for source_key, ref_key in rule.join_keys:
-                if source_key in enriched_df.columns and ref_key in ref_data.columns:
-                    # Perform left join
-                    before_count = len(enriched_df)
-                    enriched_df = enriched_df.merge(
-                        ref_data,
-                        left_on=source_key,
-                        right_on=ref_key,
-                        how='left',
-                        suffixes=('', f'_{rule.reference_source}')
+            source_keys = [source_key for source_key, _ in rule.join_keys]
+            ref_keys = [ref_key for _, ref_key in rule.join_keys]
+            missing = [
+                f"{source_key} or {ref_key}" for source_key, ref_key in rule.join_keys
+                if source_key not in enriched_df.columns or ref_key not in ref_data.columns
+            ]
+            
+            if missing:
+                errors.extend(f"Join key not found: {pair}" for pair in missing)
+            elif source_keys:
+                keyed = self.reference_manager.get_keyed_reference(
+                    rule.reference_source, ref_keys, effective_date
+                )
+                if keyed is None:
+                    # Reference frame supplied without a managed table
+                    keyed = ReferenceTable(rule.reference_source, ref_data).keyed(ref_keys)
+                ref_index, duplicates = keyed
+                if duplicates:
+                    warnings.append(
+                        f"Duplicate reference keys for {', '.join(ref_keys)}: "
+                        f"kept latest of {duplicates} duplicate rows"
                     )
-                    
-                    # Count successful enrichments
-                    new_enriched = len(enriched_df) - before_count
-                    records_enriched += new_enriched
-                    
-                    # Check for duplicates
-                    if len(enriched_df) > before_count:
-                        warnings.append(f"Duplicate records found for key {source_key}")
+                
+                # Probe the cached key index; unmatched rows get NaN
+                if len(source_keys) == 1:
+                    lookup = pd.Index(enriched_df[source_keys[0]])
                 else:
-                    errors.append(f"Join key not found: {source_key} or {ref_key}")
+                    lookup = pd.MultiIndex.from_frame(enriched_df[source_keys])
+                positions = ref_index.index.get_indexer(lookup)
+                records_enriched = int(np.count_nonzero(positions >= 0))
+                
+                joined = ref_index.reindex(lookup)
+                joined.index = enriched_df.index
+                joined.columns = [
+                    f"{col}_{rule.reference_source}" if col in enriched_df.columns else col
+                    for col in joined.columns
+                ]
+                enriched_df = pd.concat([enriched_df, joined], axis=1)
             
             # Apply default values for missing enrichments
             for col, default_val in rule.default_values.items():
@@ -420,47 +513,304 @@ class DISReferenceDataEnricher:
         source_df: pd.DataFrame, 
         ref_data: pd.DataFrame, 
         rule: EnrichmentRule, 
-        start_time: datetime
+        start_time: datetime,
+        effective_date: Optional[date] = None
     ) -> Tuple[pd.DataFrame, EnrichmentResult]:
         """Apply fuzzy match enrichment (simplified implementation)"""
         # This would implement fuzzy matching logic
         # For now, fall back to exact match
-        return self._apply_exact_match_enrichment(source_df, ref_data, rule, start_time)
+        return self._apply_exact_match_enrichment(source_df, ref_data, rule, start_time, effective_date)
     
     def _apply_nearest_neighbor_enrichment(
         self, 
         source_df: pd.DataFrame, 
         ref_data: pd.DataFrame, 
         rule: EnrichmentRule, 
-        start_time: datetime
+        start_time: datetime,
+        effective_date: Optional[date] = None
     ) -> Tuple[pd.DataFrame, EnrichmentResult]:
-        """Apply nearest neighbor enrichment (simplified implementation)"""
-        # This would implement nearest neighbor logic
-        # For now, fall back to exact match
-        return self._apply_exact_match_enrichment(source_df, ref_data, rule, start_time)
+        """
+        Apply nearest neighbor enrichment.
+        
+        With coordinate_keys, each row takes the reference row closest by
+        great-circle distance (KD-tree over unit-sphere points). Otherwise
+        the last join key is matched to the nearest reference value with
+        merge_asof, grouped by exact matches on the preceding keys.
+        """
+        errors = self._missing_join_keys(source_df, ref_data, rule)
+        if errors:
+            return source_df, self._strategy_result(rule, source_df, 0, start_time, errors=errors)
+        
+        table, table_date = self._reference_table(rule, ref_data, effective_date)
+        if rule.coordinate_keys:
+            if len(rule.join_keys) != 2:
+                error = "coordinate_keys requires exactly (latitude, longitude) join keys"
+                return source_df, self._strategy_result(rule, source_df, 0, start_time, errors=[error])
+            positions = self._nearest_coordinates(source_df, table, table_date, rule)
+        else:
+            positions = self._nearest_sorted_key(source_df, table, table_date, rule)
+        
+        enriched_df = self._attach_reference_rows(source_df, table.view(table_date), positions, rule)
+        enriched_df = self._fill_defaults(enriched_df, rule)
+        return enriched_df, self._strategy_result(
+            rule, enriched_df, int(np.count_nonzero(positions >= 0)), start_time
+        )
     
     def _apply_interpolation_enrichment(
         self, 
         source_df: pd.DataFrame, 
         ref_data: pd.DataFrame, 
         rule: EnrichmentRule, 
-        start_time: datetime
+        start_time: datetime,
+        effective_date: Optional[date] = None
     ) -> Tuple[pd.DataFrame, EnrichmentResult]:
-        """Apply interpolation enrichment (simplified implementation)"""
-        # This would implement interpolation logic
-        # For now, fall back to exact match
-        return self._apply_exact_match_enrichment(source_df, ref_data, rule, start_time)
+        """
+        Apply linear interpolation enrichment.
+        
+        Numeric target columns are interpolated along the last join key,
+        within groups of exact matches on the preceding keys. Rows outside
+        a group's reference range are clamped to the nearest end point when
+        within tolerance, otherwise left unenriched.
+        """
+        errors = self._missing_join_keys(source_df, ref_data, rule)
+        if errors:
+            return source_df, self._strategy_result(rule, source_df, 0, start_time, errors=errors)
+        
+        warnings = []
+        value_columns = [
+            col for col in rule.target_columns
+            if col in ref_data.columns and pd.api.types.is_numeric_dtype(ref_data[col])
+        ]
+        skipped = [col for col in rule.target_columns if col not in value_columns]
+        if skipped:
+            warnings.append(f"Columns not interpolated (missing or non-numeric): {', '.join(skipped)}")
+        
+        source_keys = [source_key for source_key, _ in rule.join_keys]
+        ref_keys = [ref_key for _, ref_key in rule.join_keys]
+        table, table_date = self._reference_table(rule, ref_data, effective_date)
+        curves = table.derived(
+            "interpolation", ref_keys + value_columns, table_date,
+            lambda view: self._interpolation_curves(view, ref_keys, value_columns)
+        )
+        
+        x = pd.to_numeric(source_df[source_keys[-1]], errors="coerce").to_numpy(dtype=float)
+        interpolated = {col: np.full(len(source_df), np.nan) for col in value_columns}
+        enriched_mask = np.zeros(len(source_df), dtype=bool)
+        
+        if len(source_keys) > 1:
+            groups = source_df.groupby(source_keys[:-1], sort=False, dropna=False).indices
+        else:
+            groups = {(): np.arange(len(source_df))}
+        
+        for group_key, rows in groups.items():
+            group_key = group_key if isinstance(group_key, tuple) else (group_key,)
+            curve = curves.get(group_key)
+            if curve is None:
+                continue
+            xp, values = curve
+            xs = x[rows]
+            in_range = (xs >= xp[0]) & (xs <= xp[-1])
+            if rule.tolerance is not None:
+                in_range |= (xs >= xp[0] - rule.tolerance) & (xs <= xp[-1] + rule.tolerance)
+            for col in value_columns:
+                interpolated[col][rows] = np.where(in_range, np.interp(xs, xp, values[col]), np.nan)
+            enriched_mask[rows] = in_range
+        
+        enriched_df = source_df.copy(deep=False)
+        for col in value_columns:
+            if col in enriched_df.columns:
+                enriched_df[col] = enriched_df[col].fillna(pd.Series(interpolated[col], index=enriched_df.index))
+            else:
+                enriched_df[col] = interpolated[col]
+        enriched_df = self._fill_defaults(enriched_df, rule)
+        
+        return enriched_df, self._strategy_result(
+            rule, enriched_df, int(enriched_mask.sum()), start_time, warnings=warnings
+        )
+    
+    def _missing_join_keys(self, source_df: pd.DataFrame, ref_data: pd.DataFrame, rule: EnrichmentRule) -> List[str]:
+        if not rule.join_keys:
+            return ["Rule has no join keys"]
+        return [
+            f"Join key not found: {source_key} or {ref_key}"
+            for source_key, ref_key in rule.join_keys
+            if source_key not in source_df.columns or ref_key not in ref_data.columns
+        ]
+    
+    def _reference_table(
+        self,
+        rule: EnrichmentRule,
+        ref_data: pd.DataFrame,
+        effective_date: Optional[date]
+    ) -> Tuple[ReferenceTable, Optional[date]]:
+        """Managed table for the rule's source and the date to view it at"""
+        table = self.reference_manager.get_reference_table(rule.reference_source)
+        if table is None:
+            # Reference frame supplied without a managed table
+            return ReferenceTable(rule.reference_source, ref_data), None
+        return table, self.reference_manager.effective_date_for(rule.reference_source, effective_date)
+    
+    def _nearest_sorted_key(
+        self,
+        source_df: pd.DataFrame,
+        table: ReferenceTable,
+        table_date: Optional[date],
+        rule: EnrichmentRule
+    ) -> np.ndarray:
+        """Reference row position nearest on the last key (-1 when none in tolerance)"""
+        source_keys = [source_key for source_key, _ in rule.join_keys]
+        ref_keys = [ref_key for _, ref_key in rule.join_keys]
+        source_on, ref_on = source_keys[-1], ref_keys[-1]
+        
+        # Reference rows sorted on the asof key, with their view positions
+        ref_sorted = table.derived(
+            "asof", ref_keys, table_date,
+            lambda view: view[ref_keys]
+                .assign(**{ref_on: _asof_key(view[ref_on]), "_ref_position": np.arange(len(view))})
+                .dropna(subset=[ref_on])
+                .sort_values(ref_on, kind="stable")
+                .rename(columns=dict(zip(ref_keys, source_keys)))
+        )
+        
+        left = source_df[source_keys].assign(
+            **{source_on: _asof_key(source_df[source_on]), "_source_position": np.arange(len(source_df))}
+        )
+        left = left.dropna(subset=[source_on]).sort_values(source_on, kind="stable")
+        
+        tolerance = rule.tolerance
+        if tolerance is not None and pd.api.types.is_datetime64_any_dtype(left[source_on]):
+            tolerance = pd.Timedelta(days=tolerance)
+        
+        matched = pd.merge_asof(
+            left,
+            ref_sorted,
+            on=source_on,
+            by=source_keys[:-1] or None,
+            direction="nearest",
+            tolerance=tolerance
+        )
+        
+        positions = np.full(len(source_df), -1, dtype=np.int64)
+        found = matched["_ref_position"].notna().to_numpy()
+        positions[matched["_source_position"].to_numpy()[found]] = matched["_ref_position"].to_numpy()[found].astype(np.int64)
+        return positions
+    
+    def _nearest_coordinates(
+        self,
+        source_df: pd.DataFrame,
+        table: ReferenceTable,
+        table_date: Optional[date],
+        rule: EnrichmentRule
+    ) -> np.ndarray:
+        """Reference row position nearest by great-circle distance (-1 when none in tolerance)"""
+        (source_lat, ref_lat), (source_lon, ref_lon) = rule.join_keys
+        tree, ref_positions = table.derived(
+            "kdtree", [ref_lat, ref_lon], table_date,
+            lambda view: _coordinate_tree(view[ref_lat], view[ref_lon])
+        )
+        
+        positions = np.full(len(source_df), -1, dtype=np.int64)
+        points = _unit_vectors(source_df[source_lat], source_df[source_lon])
+        valid = ~np.isnan(points).any(axis=1)
+        if tree is None or not valid.any():
+            return positions
+        
+        upper_bound = np.inf
+        if rule.tolerance is not None:
+            # Great-circle miles to chord length on the unit sphere
+            upper_bound = 2 * np.sin(min(rule.tolerance / EARTH_RADIUS_MILES, np.pi) / 2)
+        _, nearest = tree.query(points[valid], k=1, distance_upper_bound=upper_bound)
+        hit = nearest < len(ref_positions)
+        positions[np.flatnonzero(valid)[hit]] = ref_positions[nearest[hit]]
+        return positions
+    
+    @staticmethod
+    def _interpolation_curves(
+        view: pd.DataFrame,
+        ref_keys: List[str],
+        value_columns: List[str]
+    ) -> Dict[Tuple, Tuple[np.ndarray, Dict[str, np.ndarray]]]:
+        """Sorted (x, values) per group of the preceding keys, last duplicate x wins"""
+        x_key = ref_keys[-1]
+        frame = view[ref_keys + value_columns].assign(
+            **{x_key: pd.to_numeric(view[x_key], errors="coerce")}
+        ).dropna(subset=[x_key])
+        frame = frame.drop_duplicates(ref_keys, keep="last").sort_values(x_key, kind="stable")
+        
+        if len(ref_keys) > 1:
+            grouped = frame.groupby(ref_keys[:-1], sort=False, dropna=False)
+        else:
+            grouped = [((), frame)]
+        
+        curves = {}
+        for group_key, group in grouped:
+            group_key = group_key if isinstance(group_key, tuple) else (group_key,)
+            curves[group_key] = (
+                group[x_key].to_numpy(dtype=float),
+                {col: group[col].to_numpy(dtype=float) for col in value_columns}
+            )
+        return curves
+    
+    def _attach_reference_rows(
+        self,
+        source_df: pd.DataFrame,
+        ref_view: pd.DataFrame,
+        positions: np.ndarray,
+        rule: EnrichmentRule
+    ) -> pd.DataFrame:
+        """Append the reference row at each position (-1 gives NaN) to the source rows"""
+        ref_keys = {ref_key for _, ref_key in rule.join_keys}
+        ref_columns = [col for col in ref_view.columns if col not in ref_keys]
+        joined = ref_view[ref_columns].reset_index(drop=True).reindex(positions)
+        joined.index = source_df.index
+        joined.columns = [
+            f"{col}_{rule.reference_source}" if col in source_df.columns else col
+            for col in joined.columns
+        ]
+        return pd.concat([source_df, joined], axis=1)
+    
+    def _fill_defaults(self, df: pd.DataFrame, rule: EnrichmentRule) -> pd.DataFrame:
+        for col, default_val in rule.default_values.items():
+            if col not in df.columns:
+                df[col] = default_val
+            else:
+                df[col] = df[col].fillna(default_val)
+        return df
+    
+    def _strategy_result(
+        self,
+        rule: EnrichmentRule,
+        enriched_df: pd.DataFrame,
+        records_enriched: int,
+        start_time: datetime,
+        errors: Optional[List[str]] = None,
+        warnings: Optional[List[str]] = None
+    ) -> EnrichmentResult:
+        records_processed = len(enriched_df)
+        return EnrichmentResult(
+            rule_id=rule.rule_id,
+            success=not errors,
+            records_processed=records_processed,
+            records_enriched=records_enriched,
+            records_failed=records_processed - records_enriched,
+            enrichment_rate=records_enriched / records_processed if records_processed > 0 else 0.0,
+            quality_score=self._calculate_quality_score(enriched_df, rule) if not errors else 0.0,
+            processing_time_seconds=(datetime.utcnow() - start_time).total_seconds(),
+            errors=errors or [],
+            warnings=warnings or []
+        )
     
     def _apply_fallback_enrichment(
         self, 
         source_df: pd.DataFrame, 
         ref_data: pd.DataFrame, 
         rule: EnrichmentRule, 
-        start_time: datetime
+        start_time: datetime,
+        effective_date: Optional[date] = None
     ) -> Tuple[pd.DataFrame, EnrichmentResult]:
         """Apply fallback enrichment strategy"""
         # Try primary strategy first
-        enriched_df, result = self._apply_exact_match_enrichment(source_df, ref_data, rule, start_time)
+        enriched_df, result = self._apply_exact_match_enrichment(source_df, ref_data, rule, start_time, effective_date)
         
         # If enrichment rate is below threshold, try fallback
         if result.enrichment_rate < rule.confidence_threshold and rule.fallback_strategy:
@@ -477,7 +827,8 @@ class DISReferenceDataEnricher:
         self, 
         source_df: pd.DataFrame, 
         rule: EnrichmentRule, 
-        start_time: datetime
+        start_time: datetime,
+        effective_date: Optional[date] = None
     ) -> Tuple[pd.DataFrame, EnrichmentResult]:
         """Apply default value enrichment"""
         
@@ -537,7 +888,7 @@ class DISReferenceDataEnricher:
     
     def _add_enrichment_metadata(self, df: pd.DataFrame, results: List[EnrichmentResult]) -> pd.DataFrame:
         """Add enrichment metadata to the dataframe"""
-        enriched_df = df.copy()
+        enriched_df = df.copy(deep=False)
         
         # Add enrichment summary
         total_enriched = sum(r.records_enriched for r in results)
@@ -0,0 +1,261 @@
+"""
+Indexed, effective-dated reference tables for DIS enrichment
+
+Each reference source is held as one immutable table, sorted so that rows
+sharing an effective interval are contiguous. An effective-date lookup
+returns the partitions covering that date as zero-copy slices (a concat
+only when several intervals overlap the date), and key indexes for joins
+are built once per (keys, date partitions) and reused by every rule and
+ingest that enriches against the same reference.
+
+Tables are identified by a content digest. Sorted tables are persisted
+under <cache_dir>/<source>/<digest>.parquet and shared in-process, so a
+reference that has not changed is never re-sorted or re-indexed.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from datetime import date
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+import structlog
+
+logger = structlog.get_logger()
+
+EFFECTIVE_FROM = "effective_from"
+EFFECTIVE_TO = "effective_to"
+
+# Tables kept alive in-process, keyed by content digest
+MAX_SHARED_TABLES = 32
+
+
+def content_digest(data: pd.DataFrame) -> Optional[str]:
+    """SHA-256 over column names, dtypes and row hashes; None if unhashable"""
+    try:
+        row_hashes = pd.util.hash_pandas_object(data, index=False).to_numpy()
+    except TypeError:
+        return None
+    digest = hashlib.sha256()
+    digest.update("|".join(f"{name}:{dtype}" for name, dtype in data.dtypes.items()).encode())
+    digest.update(row_hashes.tobytes())
+    return digest.hexdigest()
+
+
+class ReferenceTable:
+    """
+    One reference source, sorted and partitioned by effective interval.
+
+    Frames returned by this class are views of shared data and must be
+    treated as read-only; enrichment builds new frames instead of writing
+    into them.
+    """
+
+    def __init__(self, source_name: str, data: pd.DataFrame, digest: Optional[str] = None, presorted: bool = False):
+        self.source_name = source_name
+        self.digest = digest
+        self.effective_dated = EFFECTIVE_FROM in data.columns and EFFECTIVE_TO in data.columns
+
+        if self.effective_dated and not presorted:
+            # NaT sorts last, so open-ended intervals follow closed ones
+            data = data.sort_values([EFFECTIVE_FROM, EFFECTIVE_TO], kind="stable", na_position="last")
+        self.data = data.reset_index(drop=True)
+
+        self._bounds: List[Tuple[int, int]] = []
+        self._from: Optional[np.ndarray] = None
+        self._to: Optional[np.ndarray] = None
+        if self.effective_dated:
+            self._partition()
+
+        self._views: Dict[Tuple[int, ...], pd.DataFrame] = {}
+        self._derived: Dict[Tuple[str, Tuple[str, ...], Optional[Tuple[int, ...]]], Any] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def _partition(self):
+        """Record [start, stop) row bounds of each distinct effective interval"""
+        effective_from = pd.to_datetime(self.data[EFFECTIVE_FROM]).to_numpy("datetime64[D]")
+        effective_to = pd.to_datetime(self.data[EFFECTIVE_TO]).to_numpy("datetime64[D]")
+        if len(self.data) == 0:
+            self._from, self._to = effective_from, effective_to
+            return
+
+        same_from = effective_from[1:] == effective_from[:-1]
+        same_to = (effective_to[1:] == effective_to[:-1]) | (np.isnat(effective_to[1:]) & np.isnat(effective_to[:-1]))
+        starts = np.concatenate(([0], np.flatnonzero(~(same_from & same_to)) + 1))
+        stops = np.append(starts[1:], len(self.data))
+        self._bounds = list(zip(starts.tolist(), stops.tolist()))
+        self._from = effective_from[starts]
+        self._to = effective_to[starts]
+
+    def _partitions_for(self, effective_date: Optional[date]) -> Optional[Tuple[int, ...]]:
+        """Partitions covering the date, or None when every row applies"""
+        if not self.effective_dated or effective_date is None:
+            return None
+        target = np.datetime64(effective_date, "D")
+        covering = (self._from <= target) & (np.isnat(self._to) | (self._to >= target))
+        return tuple(np.flatnonzero(covering).tolist())
+
+    def view(self, effective_date: Optional[date] = None) -> pd.DataFrame:
+        """Rows effective on the date (all rows when no date is given)"""
+        partitions = self._partitions_for(effective_date)
+        if partitions is None:
+            return self.data
+
+        with self._lock:
+            cached = self._views.get(partitions)
+            if cached is not None:
+                return cached
+
+            slices = [self.data.iloc[start:stop] for start, stop in (self._bounds[p] for p in partitions)]
+            if not slices:
+                view = self.data.iloc[0:0]
+            elif len(slices) == 1:
+                view = slices[0]
+            else:
+                view = pd.concat(slices, ignore_index=True)
+            self._views[partitions] = view
+            return view
+
+    def derived(
+        self,
+        kind: str,
+        keys: Sequence[str],
+        effective_date: Optional[date],
+        build: Callable[[pd.DataFrame], Any]
+    ) -> Any:
+        """
+        Structure built from the rows effective on the date.
+
+        Cached per (kind, keys, date partitions), so every date falling in
+        the same intervals shares one build.
+        """
+        cache_key = (kind, tuple(keys), self._partitions_for(effective_date))
+
+        with self._lock:
+            cached = self._derived.get(cache_key)
+        if cached is not None:
+            return cached
+
+        built = build(self.view(effective_date))
+        with self._lock:
+            return self._derived.setdefault(cache_key, built)
+
+    def keyed(self, keys: Sequence[str], effective_date: Optional[date] = None) -> Tuple[pd.DataFrame, int]:
+        """
+        Rows effective on the date, indexed by the key columns.
+
+        Duplicate keys keep the row from the latest effective interval, so a
+        join never multiplies source rows. Returns the indexed frame and the
+        number of duplicate key rows dropped.
+        """
+        def build(view: pd.DataFrame) -> Tuple[pd.DataFrame, int]:
+            duplicated = view.duplicated(list(keys), keep="last")
+            dropped = int(duplicated.sum())
+            unique = view[~duplicated] if dropped else view
+            keyed = unique.set_index(list(keys), drop=True)
+            # Build the hash engine once, before the index is shared
+            keyed.index.get_indexer(keyed.index[:1])
+            return keyed, dropped
+
+        return self.derived("keyed", keys, effective_date, build)
+
+
+class ReferenceStore:
+    """
+    Registry of reference tables, cached on disk by digest.
+
+    Use reference_store_for() so that managers pointing at the same cache
+    directory share tables built from identical content.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, max_tables: int = MAX_SHARED_TABLES):
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.max_tables = max_tables
+        self._tables: "OrderedDict[str, ReferenceTable]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _cache_path(self, source_name: str, digest: str) -> Optional[Path]:
+        if self.cache_dir is None:
+            return None
+        return self.cache_dir / source_name / f"{digest}.parquet"
+
+    def _remember(self, digest: str, table: ReferenceTable) -> ReferenceTable:
+        with self._lock:
+            existing = self._tables.get(digest)
+            if existing is not None:
+                self._tables.move_to_end(digest)
+                return existing
+            self._tables[digest] = table
+            while len(self._tables) > self.max_tables:
+                self._tables.popitem(last=False)
+            return table
+
+    def _shared(self, digest: str) -> Optional[ReferenceTable]:
+        with self._lock:
+            table = self._tables.get(digest)
+            if table is not None:
+                self._tables.move_to_end(digest)
+            return table
+
+    def put(self, source_name: str, data: pd.DataFrame) -> ReferenceTable:
+        """Index a reference frame, reusing the stored table for identical content"""
+        digest = content_digest(data)
+        if digest is None:
+            # Unhashable content: index in memory only
+            return ReferenceTable(source_name, data)
+
+        table = self.open(source_name, digest)
+        if table is not None:
+            return table
+
+        table = ReferenceTable(source_name, data, digest=digest)
+        path = self._cache_path(source_name, digest)
+        if path is not None and not path.exists():
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = path.with_suffix(".parquet.tmp")
+                table.data.to_parquet(tmp_path, index=False)
+                tmp_path.replace(path)
+            except Exception as e:
+                logger.warning("Failed to persist reference table", source=source_name, error=str(e))
+        return self._remember(digest, table)
+
+    def open(self, source_name: str, digest: str) -> Optional[ReferenceTable]:
+        """Stored table for a digest, or None if it was never indexed here"""
+        table = self._shared(digest)
+        if table is not None:
+            return table
+
+        path = self._cache_path(source_name, digest)
+        if path is None or not path.exists():
+            return None
+        try:
+            data = pd.read_parquet(path)
+        except Exception as e:
+            logger.warning("Failed to read cached reference table", source=source_name, error=str(e))
+            return None
+        return self._remember(digest, ReferenceTable(source_name, data, digest=digest, presorted=True))
+
+    def clear(self):
+        with self._lock:
+            self._tables.clear()
+
+
+_stores: Dict[Optional[str], ReferenceStore] = {}
+_stores_lock = threading.Lock()
+
+
+def reference_store_for(cache_dir: Optional[str]) -> ReferenceStore:
+    """Shared store for a cache directory (in-memory only when None)"""
+    key = str(Path(cache_dir).resolve()) if cache_dir else None
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = _stores[key] = ReferenceStore(key)
+        return store
@@ -20,7 +20,10 @@ from cms_pricing.ingestion.contracts.ingestor_spec import (
     BaseDISIngestor, SourceFile, ValidationSeverity, ReleaseCadence, DataClass, 
     OutputSpec, SlaSpec, ValidationRule, RawBatch, AdaptedBatch, StageFrame, RefData
 )
+from cms_pricing.ingestion.parsers._parser_kit import add_constant_columns
 from cms_pricing.ingestion.validators.zip9_overrides_validator import ZIP9OverridesValidator
+from cms_pricing.ingestion.quarantine.dis_quarantine import QuarantineManager
+from cms_pricing.services.zip9_index import zip9_index_cache
 from cms_pricing.ingestion.metadata.ingestion_runs_manager import IngestionRunsManager, RunStatus, SourceFileInfo
 
 logger = structlog.get_logger()
@@ -50,6 +53,7 @@ class CMSZip9Ingester(BaseDISIngestor):
         # Initialize components
         self.validator = ZIP9OverridesValidator()
         self.runs_manager = IngestionRunsManager(SessionLocal())
+        self.quarantine_manager = QuarantineManager(str(Path(output_dir) / "quarantine"))
         
         # Current run metadata
         self.current_release_id: Optional[str] = None
@@ -253,6 +257,17 @@ class CMSZip9Ingester(BaseDISIngestor):
         # Run validation
         validation_results = self.validator.validate(zip9_data)
         
+        # Route the offending rows straight into the quarantine store
+        quarantine_results = self.validator.build_quarantine_results(zip9_data)
+        if quarantine_results["validation_rules"]:
+            self.quarantine_manager.quarantine_records(
+                dataset_name=self.dataset_name,
+                batch_id=self.current_batch_id or "unknown",
+                release_id=self.current_release_id or "unknown",
+                validation_results=quarantine_results,
+                raw_data=[]
+            )
+        
         # Check quality gates
         quality_score = validation_results.get("quality_score", 0.0)
         if quality_score < 0.9:
@@ -400,7 +415,8 @@ class CMSZip9Ingester(BaseDISIngestor):
         """Parse fixed-width ZIP9 data based on CMS layout"""
         lines = content.decode('utf-8').strip().split('\n')
         
-        data = []
+        # Accumulate columns rather than one dict per record
+        zip9s, states, localities, rural_flags = [], [], [], []
         for line_num, line in enumerate(lines):
             if len(line) < 80:  # Skip incomplete lines
                 continue
@@ -410,7 +426,6 @@ class CMSZip9Ingester(BaseDISIngestor):
                 # State(1-2) + ZIP5(3-7) + Carrier(8-12) + Locality(13-14) + Rural(15) + PlusFourFlag(21) + PlusFour(22-25)
                 state = line[0:2].strip()
                 zip5 = line[2:7].strip()
-                carrier = line[7:12].strip()
                 locality = line[12:14].strip()
                 rural_flag = line[14:15].strip() if line[14:15].strip() else None
                 plus_four_flag = line[20:21].strip()
@@ -418,27 +433,27 @@ class CMSZip9Ingester(BaseDISIngestor):
                 
                 # Only process records that require +4 extension (PlusFourFlag = '1')
                 if plus_four_flag == '1' and plus_four and plus_four != '0000':
-                    # Create ZIP9 code
-                    zip9 = zip5 + plus_four
-                    
                     # For ZIP9 overrides, we create a range from the specific ZIP9 to itself
-                    data.append({
-                        'zip9_low': zip9,
-                        'zip9_high': zip9,
-                        'state': state,
-                        'locality': locality,
-                        'rural_flag': rural_flag if rural_flag else None,
-                        'effective_from': '2025-08-14',  # From the file date
-                        'effective_to': None,  # Ongoing
-                        'vintage': '2025-08-14'
-                    })
+                    zip9s.append(zip5 + plus_four)
+                    states.append(state)
+                    localities.append(locality)
+                    rural_flags.append(rural_flag)
                     
             except Exception as e:
                 logger.warning("Error parsing ZIP9 line", line_num=line_num, error=str(e))
                 continue
         
-        logger.info("Parsed ZIP9 data", record_count=len(data))
-        return pd.DataFrame(data)
+        logger.info("Parsed ZIP9 data", record_count=len(zip9s))
+        df = pd.DataFrame({
+            'zip9_low': zip9s,
+            'zip9_high': zip9s,
+            'state': states,
+            'locality': localities,
+            'rural_flag': rural_flags,
+            'effective_from': '2025-08-14',  # From the file date
+            'effective_to': None,  # Ongoing
+        })
+        return add_constant_columns(df, {'vintage': '2025-08-14'})
     
     def _normalize_zip9_data(self, df: pd.DataFrame) -> pd.DataFrame:
         """Normalize ZIP9 data"""
@@ -450,10 +465,10 @@ class CMSZip9Ingester(BaseDISIngestor):
         df['rural_flag'] = df['rural_flag'].map({'A': True, 'B': True, None: None})
         
         # Add metadata
-        df['source_filename'] = 'zip_codes_requiring_4_extension.zip'
-        df['ingest_run_id'] = self.current_batch_id
-        
-        return df
+        return add_constant_columns(df, {
+            'source_filename': 'zip_codes_requiring_4_extension.zip',
+            'ingest_run_id': self.current_batch_id
+        })
     
     def _generate_schema_contract(self) -> Dict[str, Any]:
         """Generate schema contract for ZIP9 data"""
@@ -589,6 +604,7 @@ class CMSZip9Ingester(BaseDISIngestor):
                 records_inserted += 1
             
             db.commit()
+            zip9_index_cache.invalidate()
             
             logger.info("ZIP9 data published to database", records_inserted=records_inserted)
             
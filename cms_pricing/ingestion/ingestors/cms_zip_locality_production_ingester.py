@@ -10,7 +10,7 @@ import uuid
 import zipfile
 from datetime import datetime, date
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterator, List, Optional
 import httpx
 import pandas as pd
 import structlog
@@ -21,9 +21,19 @@ from ..contracts.ingestor_spec import SourceFile, ValidationSeverity
 from ..validators.cms_zip_locality_validator import CMSZipLocalityValidator
 from ..observability.cms_observability_collector import CMSObservabilityCollector
 from ..metadata.ingestion_runs_manager import IngestionRunsManager, SourceFileInfo, RunStatus
+from ..publishers.bulk_upsert import DEFAULT_BATCH_SIZE, bulk_upsert
 
 logger = structlog.get_logger()
 
+# cms_zip_locality is keyed on zip5 alone, so a newer vintage for a ZIP
+# replaces its row; the effective window is part of the change check
+UPSERT_KEY_COLUMNS = ["zip5"]
+UPSERT_COMPARE_COLUMNS = [
+    "state", "locality", "carrier_mac", "rural_flag",
+    "effective_from", "effective_to", "vintage", "source_filename"
+]
+PUBLISH_COLUMNS = UPSERT_KEY_COLUMNS + UPSERT_COMPARE_COLUMNS
+
 
 class CMSZipLocalityProductionIngester:
     """
@@ -54,6 +64,9 @@ class CMSZipLocalityProductionIngester:
         # Processing state
         self.current_batch_id = None
         self.current_release_id = None
+        
+        # Rows per staging insert during publish
+        self.publish_batch_size = DEFAULT_BATCH_SIZE
     
     async def ingest(self, release_id: str = None) -> Dict[str, Any]:
         """
@@ -310,47 +323,43 @@ class CMSZipLocalityProductionIngester:
                 "data_completeness_check"
             ]
             
-            # Insert records with full metadata
-            records_inserted = 0
-            for _, row in df.iterrows():
-                try:
-                    cms_zip = CMSZipLocality(
-                        zip5=row['zip5'],
-                        state=row['state'],
-                        locality=row['locality'],
-                        carrier_mac=row.get('carrier_mac'),
-                        rural_flag=row.get('rural_flag'),
-                        effective_from=row['effective_from'],
-                        effective_to=row.get('effective_to'),
-                        vintage=row['vintage'],
-                        source_filename=row.get('source_filename', 'zip_code_carrier_locality.zip'),
-                        ingest_run_id=uuid.UUID(self.current_batch_id),
-                        data_quality_score=quality_score,
-                        validation_results=validation_results,
-                        processing_timestamp=processing_timestamp,
-                        file_checksum=file_checksum,
-                        record_count=record_count,
-                        schema_version=self.schema_version,
-                        business_rules_applied=business_rules_applied
-                    )
-                    
-                    db.add(cms_zip)
-                    records_inserted += 1
-                    
-                except Exception as e:
-                    logger.warning("Failed to insert record", error=str(e), zip5=row.get('zip5'))
-                    continue
+            # Stream rows through a staging table and merge them in one
+            # set-based upsert; reruns leave unchanged rows untouched
+            published = df.drop_duplicates(subset=UPSERT_KEY_COLUMNS, keep="last")
+            duplicates = len(df) - len(published)
+            if duplicates:
+                logger.warning("Dropped duplicate ZIP rows before publish", duplicates=duplicates)
             
+            metadata = {
+                "ingest_run_id": uuid.UUID(self.current_batch_id),
+                "data_quality_score": quality_score,
+                "validation_results": validation_results,
+                "processing_timestamp": processing_timestamp,
+                "file_checksum": file_checksum,
+                "record_count": record_count,
+                "schema_version": self.schema_version,
+                "business_rules_applied": business_rules_applied,
+            }
+            counts = bulk_upsert(
+                db,
+                CMSZipLocality.__table__,
+                self._publish_records(published, metadata),
+                key_columns=UPSERT_KEY_COLUMNS,
+                compare_columns=UPSERT_COMPARE_COLUMNS,
+                batch_size=self.publish_batch_size
+            )
             db.commit()
             
             publish_results[table_name] = {
-                "records_inserted": records_inserted,
-                "records_skipped": len(df) - records_inserted,
+                "records_inserted": counts.inserted,
+                "records_updated": counts.updated,
+                "records_unchanged": counts.unchanged,
+                "records_skipped": duplicates,
                 "quality_score": quality_score,
                 "processing_timestamp": processing_timestamp.isoformat()
             }
             
-            total_records += records_inserted
+            total_records += counts.total
         
         # Update run completion
         self.runs_manager.complete_run(
@@ -366,6 +375,20 @@ class CMSZipLocalityProductionIngester:
             "publish_results": publish_results
         }
     
+    def _publish_records(self, df: pd.DataFrame, metadata: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """CMSZipLocality rows for the upsert, converted one batch at a time"""
+        if 'source_filename' not in df.columns:
+            df = df.assign(source_filename='zip_code_carrier_locality.zip')
+        columns = [name for name in PUBLISH_COLUMNS if name in df.columns]
+        
+        for start in range(0, len(df), self.publish_batch_size):
+            chunk = df.iloc[start:start + self.publish_batch_size][columns]
+            # NaN/NaT -> None so optional columns are written as NULL
+            chunk = chunk.astype(object).where(chunk.notna(), None)
+            for record in chunk.to_dict('records'):
+                record.update(metadata)
+                yield record
+    
     async def run_observability_check(self) -> Dict[str, Any]:
         """Run observability check on the ingested data"""
         
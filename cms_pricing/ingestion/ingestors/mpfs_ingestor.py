@@ -33,6 +33,7 @@ from ..contracts.ingestor_spec import (
     StageFrame, RefData, ValidationRule, OutputSpec, SlaSpec,
     ReleaseCadence, DataClass, ValidationSeverity
 )
+from ..parsers.zip_bundle import ZipBundle
 from ..scrapers.cms_mpfs_scraper import CMSMPFSScraper
 from ..managers.historical_data_manager import HistoricalDataManager
 from ..contracts.schema_registry import schema_registry, SchemaContract
@@ -48,10 +49,26 @@ from ..quarantine.dis_quarantine import QuarantineManager, QuarantineStatus, Qua
 from ..enrichers.dis_reference_data_integration import (
     DISReferenceDataEnricher, ReferenceDataManager, ReferenceDataSource
 )
+from ...cache import stats_cache
 
 logger = structlog.get_logger()
 
 
+def _parse_mpfs_member(file_obj, filename: str) -> Any:
+    """Parse one MPFS bundle member: CSV as a frame, TXT as a frame or text, else bytes"""
+    if filename.endswith('.csv'):
+        return pd.read_csv(file_obj)
+    content = file_obj.read()
+    if filename.endswith('.txt'):
+        # Try to parse as fixed-width or CSV
+        try:
+            return pd.read_csv(io.BytesIO(content))
+        except Exception:
+            # Store as text
+            return content.decode('utf-8')
+    return content
+
+
 class MPFSIngestor(BaseDISIngestor):
     """DIS-compliant MPFS ingestor that creates curated views referencing RVU data"""
     
@@ -471,29 +488,13 @@ class MPFSIngestor(BaseDISIngestor):
         """Parse ZIP file and extract contents"""
         file_path = Path(file_data["path"])
         
-        with zipfile.ZipFile(file_path, 'r') as zf:
-            contents = {}
-            for file_info in zf.filelist:
-                if not file_info.is_dir():
-                    # Extract file content
-                    content = zf.read(file_info.filename)
-                    
-                    # Try to parse based on file extension
-                    if file_info.filename.endswith('.csv'):
-                        df = pd.read_csv(io.BytesIO(content))
-                        contents[file_info.filename] = df
-                    elif file_info.filename.endswith('.txt'):
-                        # Try to parse as fixed-width or CSV
-                        try:
-                            df = pd.read_csv(io.BytesIO(content))
-                            contents[file_info.filename] = df
-                        except:
-                            # Store as text
-                            contents[file_info.filename] = content.decode('utf-8')
-                    else:
-                        contents[file_info.filename] = content
-            
-            return contents
+        def parse() -> Dict[str, Any]:
+            with ZipBundle(file_path) as bundle:
+                results = bundle.parse(bundle.members(), _parse_mpfs_member)
+            return {result.member.name: result.frame for result in results}
+        
+        # Members are parsed in worker processes; keep the event loop free
+        return await asyncio.get_running_loop().run_in_executor(None, parse)
     
     async def _parse_csv_file(self, file_data: Dict[str, Any]) -> Dict[str, Any]:
         """Parse CSV file"""
@@ -536,6 +537,9 @@ class MPFSIngestor(BaseDISIngestor):
         # Store in database
         await self._store_curated_data(curated_views)
         
+        # New release is visible; drop cached /mpfs/stats for the old one
+        stats_cache.invalidate("mpfs", self.current_release_id)
+        
         # Generate observability report
         observability_report = await self._generate_observability_report(stage_frame)
         
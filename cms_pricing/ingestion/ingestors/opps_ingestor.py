@@ -32,10 +32,14 @@ from ..contracts.schema_registry import SchemaRegistry
 from ..contracts.ingestor_spec import IngestorSpec, ValidationRule, SlaSpec, OutputSpec, DataClass, ValidationSeverity
 from ..validators.validation_engine import ValidationEngine
 from ..enrichers.data_enrichers import GeographyEnricher
-from ..publishers.data_publishers import ParquetPublisher
+from ..publishers.data_publishers import ParquetPublisher, PublishSpec
 from ..quarantine.dis_quarantine import QuarantineManager
 from ..observability.dis_observability import DISObservabilityCollector
 from ..scrapers.cms_opps_scraper import CMSOPPSScraper, ScrapedFileInfo
+from ...cache import stats_cache
+from ...config import settings
+from ...services.opps_rate_table import CROSSWALK_DATASET, RATES_DATASET, wage_adjust
+from ...services.snapshot_store import snapshot_store
 
 logger = structlog.get_logger()
 
@@ -72,9 +76,13 @@ class OPPSIngestor(BaseDISIngestor):
     def __init__(self, 
                  output_dir: Path = None,
                  database_url: str = None,
-                 cpt_masking_enabled: bool = True):
+                 cpt_masking_enabled: bool = True,
+                 curated_root: Optional[str] = None):
         super().__init__(output_dir, database_url)
         
+        # Rate snapshots go where the pricing snapshot store reads them
+        self.curated_root = Path(curated_root or settings.curated_data_dir)
+        
         # OPPS-specific configuration
         self.cpt_masking_enabled = cpt_masking_enabled
         self.scraper = CMSOPPSScraper(output_dir=self.output_dir)
@@ -83,10 +91,13 @@ class OPPSIngestor(BaseDISIngestor):
         self.schema_registry = SchemaRegistry()
         self.validation_engine = ValidationEngine()
         self.data_enricher = GeographyEnricher({})  # Empty reference data for now
-        self.data_publisher = ParquetPublisher(str(self.output_dir))
+        self.data_publisher = ParquetPublisher(str(self.curated_root))
         self.quarantine_manager = QuarantineManager()
         self.observability = DISObservabilityCollector()
         
+        # Reference tables keyed by year; shared by every quarter of that year
+        self._reference_data: Dict[int, Dict[str, pd.DataFrame]] = {}
+        
         # OPPS-specific paths
         self.raw_dir = Path(self.output_dir) / "raw" / "opps"
         self.stage_dir = Path(self.output_dir) / "stage" / "opps"
@@ -605,9 +616,10 @@ class OPPSIngestor(BaseDISIngestor):
         enriched_data = normalized_data.copy()
         
         try:
-            # Load reference data
-            wage_index_data = await self._load_wage_index_data()
-            si_lookup_data = await self._load_si_lookup_data()
+            # Load reference data (once per year)
+            reference_data = await self.load_reference_data(batch_info.year)
+            wage_index_data = reference_data["wage_index"]
+            si_lookup_data = reference_data["si_lookup"]
             
             # Enrich APC payment data with wage index
             if "apc_payment" in enriched_data:
@@ -661,9 +673,16 @@ class OPPSIngestor(BaseDISIngestor):
                            records=len(df),
                            path=str(output_path))
             
+            # Precomputed rates and crosswalk for the pricing engine's in-memory index
+            self._publish_rate_snapshots(enriched_data, batch_info)
+            
             # Generate metadata
             await self._generate_curated_metadata(batch_info, publish_results)
             
+            # New release is visible; drop cached /opps/stats and rate snapshots for the old one
+            stats_cache.invalidate("opps", batch_info.batch_id)
+            snapshot_store.invalidate()
+            
             logger.info("Publish stage completed", 
                        batch_id=batch_info.batch_id,
                        tables=len(publish_results["tables_published"]),
@@ -675,6 +694,30 @@ class OPPSIngestor(BaseDISIngestor):
         
         return publish_results
     
+    def _publish_rate_snapshots(self, enriched_data: Dict[str, pd.DataFrame], batch_info: OPPSBatchInfo):
+        """Publish the quarter's rate table and crosswalk under its first-day vintage."""
+        rates = enriched_data.get("opps_rates_enriched")
+        if rates is not None and 'wage_adjusted_rate_usd' in rates.columns:
+            # Unadjusted rows (no wage index for the year) cannot be priced by CBSA
+            rates = rates[rates['wage_adjusted_rate_usd'].notna()]
+        snapshots = {
+            RATES_DATASET: rates,
+            CROSSWALK_DATASET: enriched_data.get("hcpcs_crosswalk"),
+        }
+        if any(df is None or df.empty for df in snapshots.values()):
+            logger.info("Skipping OPPS rate snapshots; rates and crosswalk are both required",
+                       batch_id=batch_info.batch_id)
+            return
+        
+        for table_name, df in snapshots.items():
+            spec = PublishSpec(
+                table_name=table_name,
+                partition_columns=[],
+                output_format="parquet",
+                create_latest_view=False
+            )
+            self.data_publisher.publish_snapshot(df, spec, batch_info.effective_from, batch_info.batch_id)
+    
     def _parse_batch_id(self, batch_id: str) -> Tuple[int, int, int]:
         """Parse batch ID to extract year, quarter, release number."""
         # Format: opps_YYYYqN_rNN
@@ -910,23 +953,49 @@ class OPPSIngestor(BaseDISIngestor):
         return {}
     
     # Enrichment methods
-    async def _load_wage_index_data(self) -> pd.DataFrame:
+    async def load_reference_data(self, year: int) -> Dict[str, pd.DataFrame]:
+        """Load wage index and SI lookup tables for a year, reusing them across quarters."""
+        if year not in self._reference_data:
+            self._reference_data[year] = {
+                "wage_index": await self._load_wage_index_data(year),
+                "si_lookup": await self._load_si_lookup_data(year),
+            }
+        return self._reference_data[year]
+    
+    def set_reference_data(self, year: int, reference_data: Dict[str, pd.DataFrame]):
+        """Seed reference tables loaded elsewhere (e.g. by a backfill coordinator)."""
+        self._reference_data[year] = reference_data
+    
+    async def _load_wage_index_data(self, year: Optional[int] = None) -> pd.DataFrame:
         """Load wage index reference data."""
         # This would load from reference tables
         # For now, return empty DataFrame
         return pd.DataFrame(columns=['ccn', 'cbsa_code', 'wage_index'])
     
-    async def _load_si_lookup_data(self) -> pd.DataFrame:
+    async def _load_si_lookup_data(self, year: Optional[int] = None) -> pd.DataFrame:
         """Load SI lookup reference data."""
         # This would load from reference tables
         # For now, return empty DataFrame
         return pd.DataFrame(columns=['status_indicator', 'description', 'payment_category'])
     
     async def _enrich_with_wage_index(self, apc_data: pd.DataFrame, wage_data: pd.DataFrame) -> pd.DataFrame:
-        """Enrich APC data with wage index."""
-        # This would implement wage index enrichment
-        # For now, return the original data
-        return apc_data
+        """Precompute the wage-adjusted rate of every APC in every CBSA."""
+        wage = wage_data.dropna(subset=['cbsa_code', 'wage_index'])
+        wage = wage.drop_duplicates(subset=['cbsa_code'], keep='first')[['cbsa_code', 'wage_index']]
+        if wage.empty:
+            # Keep the APC rows unadjusted rather than cross-joining them away
+            logger.warning("No CBSA wage index rows; publishing unadjusted OPPS rates", apcs=len(apc_data))
+            return apc_data.assign(cbsa_code=None, wage_index=None, ccn=None, wage_adjusted_rate_usd=None)
+        
+        # Rates are CBSA-level; hospital-specific (CCN) reclassifications are not applied
+        enriched = apc_data.merge(wage, how='cross').assign(ccn=None)
+        rate = pd.to_numeric(enriched['payment_rate_usd'], errors='coerce')
+        wage_index = pd.to_numeric(enriched['wage_index'], errors='coerce')
+        enriched['wage_adjusted_rate_usd'] = wage_adjust(rate, wage_index).round(2)
+        
+        logger.info("Precomputed OPPS wage-adjusted rates",
+                   apcs=len(apc_data), cbsas=len(wage), rows=len(enriched))
+        return enriched
     
     async def _enrich_with_si_lookup(self, hcpcs_data: pd.DataFrame, si_data: pd.DataFrame) -> pd.DataFrame:
         """Enrich HCPCS data with SI lookup."""
@@ -14,31 +14,39 @@ import asyncio
 import hashlib
 import io
 import json
+import re
 import uuid
-import zipfile
 from datetime import datetime, date
 from pathlib import Path
 from typing import Dict, Any, List, Optional
 import httpx
 import pandas as pd
+import pyarrow.parquet as pq
 import structlog
 
+from cms_pricing.config import settings
 from ..contracts.ingestor_spec import (
     BaseDISIngestor, SourceFile, RawBatch, AdaptedBatch, 
     StageFrame, RefData, ValidationRule, OutputSpec, SlaSpec,
     ReleaseCadence, DataClass, ValidationSeverity
 )
+from ..raw_store import raw_store_for
+from ..parsers.zip_bundle import MemberCache, MemberResult, ZipBundle
+from ..parsers.conversion_factor_parser import parse_conversion_factor
 from ..scrapers.cms_rvu_scraper import CMSRVUScraper
 from ..managers.historical_data_manager import HistoricalDataManager
 from ..contracts.schema_registry import schema_registry, SchemaContract
 from ..adapters.data_adapters import AdapterFactory, AdapterConfig
 from ..validators.validation_engine import ValidationEngine
 from ..enrichers.data_enrichers import EnricherFactory
-from ..publishers.data_publishers import PublisherFactory
+from ..publishers.data_publishers import PublisherFactory, to_arrow_table
+from ..publishers.mpfs_fee_materializer import build_lineage, materialize_and_publish
+from ..publishers.rvu_history import publish_rvu_history
 from ..observability.dis_observability import (
     DISObservabilityCollector, FreshnessMetrics, VolumeMetrics, 
     SchemaMetrics, QualityMetrics, LineageMetrics, DISObservabilityReport
 )
+from ..observability.column_profiles import ProfileStore, profile_frame
 from ..quarantine.dis_quarantine import QuarantineManager, QuarantineStatus, QuarantineSeverity
 from ..enrichers.dis_reference_data_integration import (
     DISReferenceDataEnricher, ReferenceDataManager, ReferenceDataSource,
@@ -49,6 +57,33 @@ from ..contracts.schema_registry import SchemaRegistry
 
 logger = structlog.get_logger()
 
+# Bump when a _parse_* / _normalize_* fix changes parsed frames; part of the
+# bundle member cache key together with each dataset's schema contract version
+PARSER_VERSION = "1"
+
+# Routed dataset -> (adapted frame prefix, parser classmethod, schema contract)
+RVU_BUNDLE_DATASETS = {
+    "pprrvu": ("pprrvu", "_parse_pprrvu_file", "cms_pprrvu"),
+    "gpci": ("gpci", "_parse_gpci_file", "cms_gpci"),
+    "oppscap": ("oppscap", "_parse_oppscap_file", "cms_oppscap"),
+    "anes": ("anescf", "_parse_anescf_file", "cms_anescf"),
+    "locality": ("locality", "_parse_locality_file", "cms_localitycounty"),
+}
+
+# Bundle filename keyword -> dataset for members the router does not recognise
+RVU_BUNDLE_KEYWORDS = (
+    ("pprrvu", "pprrvu"),
+    ("gpci", "gpci"),
+    ("oppscap", "oppscap"),
+    ("anescf", "anes"),
+    ("locality", "locality"),
+)
+
+# Conversion factor files landed with a release (PARSER_ROUTING pattern);
+# parsed whole rather than as RVU bundles
+CONVERSION_FACTOR_FILE = re.compile(r"(conversion-factor|cf-).*\.(xlsx|zip)$", re.IGNORECASE)
+CONVERSION_FACTOR_SCHEMA = "cms_conversion_factor_v2.0"
+
 
 class RVUIngestor(BaseDISIngestor):
     """
@@ -62,8 +97,10 @@ class RVUIngestor(BaseDISIngestor):
     - LocalityCounty: Locality to County mapping
     """
     
-    def __init__(self, output_dir: str, db_session: Any = None):
+    def __init__(self, output_dir: str, db_session: Any = None, curated_root: Optional[str] = None):
         super().__init__(output_dir, db_session)
+        # Curated releases go where the pricing snapshot store reads them
+        self.curated_root = Path(curated_root or settings.curated_data_dir)
         self.validation_engine = ValidationEngine()
         self.observability_collector = DISObservabilityCollector(output_dir)
         self.quarantine_manager = QuarantineManager(output_dir)
@@ -74,8 +111,15 @@ class RVUIngestor(BaseDISIngestor):
         self._initialize_reference_data()
         self._initialize_schema_drift_detection()
         
+        # Raw files are stored once by content and linked into each layout
+        self.raw_store = raw_store_for()
+        
+        # Bundle members to parse (None = every RVU dataset) and parsed-member cache
+        self.bundle_datasets: Optional[set] = None
+        self.member_cache = MemberCache(Path(output_dir) / "cache" / "bundle_members")
+        
         # Initialize scraper and historical data manager
-        self.scraper = CMSRVUScraper(str(Path(output_dir) / "scraped_data"))
+        self.scraper = CMSRVUScraper(str(Path(output_dir) / "scraped_data"), raw_store=self.raw_store)
         self.historical_manager = HistoricalDataManager(str(Path(output_dir) / "historical_data"))
     
     @property
@@ -630,11 +674,16 @@ class RVUIngestor(BaseDISIngestor):
                 "drift_history_file": drift_dir / "drift_history.json"
             }
             
+            # Per-column profiles of every published release; statistical
+            # drift is checked against these instead of prior snapshots
+            self.profile_store = ProfileStore(str(Path(self.output_dir) / "monitoring" / "profiles"))
+            
             logger.info("Schema drift detection initialized")
             
         except Exception as e:
             logger.error("Failed to initialize schema drift detection", error=str(e))
             self.schema_drift_config = {"enabled": False}
+            self.profile_store = None
     
     def _detect_schema_drift(self, current_schema: Dict[str, Any], dataset_name: str) -> Dict[str, Any]:
         """Detect schema drift between current and expected schema"""
@@ -672,6 +721,37 @@ class RVUIngestor(BaseDISIngestor):
             logger.error(f"Schema drift detection failed for {dataset_name}", error=str(e))
             return {"drift_detected": False, "drift_score": 0.0, "error": str(e)}
     
+    def _detect_statistical_drift(self, data: Dict[str, Any], vintage_date: str) -> Dict[str, Any]:
+        """
+        Profile each published dataset and compare it with the latest stored
+        profile of an earlier vintage; the new profile is then stored.
+        """
+        if not self.schema_drift_config.get("enabled", False) or self.profile_store is None:
+            return {}
+        
+        reports = {}
+        for dataset_name, df in data.items():
+            if not isinstance(df, pd.DataFrame) or df.empty:
+                continue
+            try:
+                profile = profile_frame(df, f"{self.dataset_name}_{dataset_name}", vintage_date)
+                report = self.profile_store.record(profile)
+            except Exception as e:
+                logger.error("Statistical drift detection failed", dataset=dataset_name, error=str(e))
+                continue
+            
+            if report.drift_detected:
+                logger.warning(
+                    "Statistical drift detected",
+                    dataset=dataset_name,
+                    vintage=vintage_date,
+                    reference_vintage=report.reference_vintage,
+                    findings=[finding.message for finding in report.findings[:10]]
+                )
+            reports[dataset_name] = report.to_dict()
+        
+        return reports
+    
     def _calculate_schema_drift_score(self, current: Dict[str, Any], expected: Dict[str, Any]) -> float:
         """Calculate schema drift score between current and expected schemas"""
         try:
@@ -748,19 +828,23 @@ class RVUIngestor(BaseDISIngestor):
                 # Save as Parquet with partitioning per output spec
                 parquet_path = dataset_dir / f"{dataset_name}_{vintage_date}.parquet"
                 
-                # Add metadata columns for upsert logic
-                df_with_metadata = df.copy()
-                df_with_metadata['_vintage_date'] = vintage_date
-                df_with_metadata['_batch_id'] = str(uuid.uuid4())
-                df_with_metadata['_created_at'] = datetime.now()
+                # Add metadata columns for upsert logic as Arrow constants
+                table = to_arrow_table(df, {
+                    '_vintage_date': vintage_date,
+                    '_batch_id': str(uuid.uuid4()),
+                    '_created_at': datetime.now()
+                })
                 
                 # Save with partitioning
-                df_with_metadata.to_parquet(
-                    parquet_path,
-                    engine='pyarrow',
-                    compression='snappy',
-                    partition_cols=['_vintage_date'] if self.output_spec.partition_columns else None
-                )
+                if self.output_spec.partition_columns:
+                    pq.write_to_dataset(
+                        table,
+                        root_path=parquet_path,
+                        partition_cols=['_vintage_date'],
+                        compression='snappy'
+                    )
+                else:
+                    pq.write_table(table, parquet_path, compression='snappy')
                 
                 # Create upsert manifest for idempotency
                 upsert_manifest = {
@@ -1190,69 +1274,33 @@ class RVUIngestor(BaseDISIngestor):
         
         adapted_dataframes = {}
         schema_contracts = {}
+        loop = asyncio.get_running_loop()
         
         for filename, content in raw_batch.raw_content.items():
-            if filename.endswith('.zip'):
-                with zipfile.ZipFile(io.BytesIO(content)) as zf:
-                    # Process PPRRVU files
-                    if 'pprrvu' in filename.lower():
-                        pprrvu_files = [name for name in zf.namelist() 
-                                       if name.endswith(('.txt', '.csv'))]
-                        
-                        for pprrvu_file in pprrvu_files:
-                            with zf.open(pprrvu_file) as f:
-                                df = self._parse_pprrvu_file(f, pprrvu_file)
-                                if not df.empty:
-                                    adapted_dataframes[f'pprrvu_{pprrvu_file}'] = df
-                                    schema_contracts[f'pprrvu_{pprrvu_file}'] = schema_registry.get_schema("cms_pprrvu")
-                    
-                    # Process GPCI files
-                    elif 'gpci' in filename.lower():
-                        gpci_files = [name for name in zf.namelist() 
-                                     if name.endswith(('.txt', '.csv'))]
-                        
-                        for gpci_file in gpci_files:
-                            with zf.open(gpci_file) as f:
-                                df = self._parse_gpci_file(f, gpci_file)
-                                if not df.empty:
-                                    adapted_dataframes[f'gpci_{gpci_file}'] = df
-                                    schema_contracts[f'gpci_{gpci_file}'] = schema_registry.get_schema("cms_gpci")
-                    
-                    # Process OPPSCap files
-                    elif 'oppscap' in filename.lower():
-                        oppscap_files = [name for name in zf.namelist() 
-                                        if name.endswith(('.txt', '.csv'))]
-                        
-                        for oppscap_file in oppscap_files:
-                            with zf.open(oppscap_file) as f:
-                                df = self._parse_oppscap_file(f, oppscap_file)
-                                if not df.empty:
-                                    adapted_dataframes[f'oppscap_{oppscap_file}'] = df
-                                    schema_contracts[f'oppscap_{oppscap_file}'] = schema_registry.get_schema("cms_oppscap")
-                    
-                    # Process Anesthesia CF files
-                    elif 'anescf' in filename.lower():
-                        anescf_files = [name for name in zf.namelist() 
-                                       if name.endswith(('.txt', '.csv'))]
-                        
-                        for anescf_file in anescf_files:
-                            with zf.open(anescf_file) as f:
-                                df = self._parse_anescf_file(f, anescf_file)
-                                if not df.empty:
-                                    adapted_dataframes[f'anescf_{anescf_file}'] = df
-                                    schema_contracts[f'anescf_{anescf_file}'] = schema_registry.get_schema("cms_anescf")
-                    
-                    # Process Locality-County files
-                    elif 'locality' in filename.lower():
-                        locality_files = [name for name in zf.namelist() 
-                                         if name.endswith(('.txt', '.csv'))]
-                        
-                        for locality_file in locality_files:
-                            with zf.open(locality_file) as f:
-                                df = self._parse_locality_file(f, locality_file)
-                                if not df.empty:
-                                    adapted_dataframes[f'locality_{locality_file}'] = df
-                                    schema_contracts[f'locality_{locality_file}'] = schema_registry.get_schema("cms_localitycounty")
+            if CONVERSION_FACTOR_FILE.search(filename):
+                adapted_dataframes["conversion_factor"] = self._parse_conversion_factor_file(
+                    content,
+                    filename,
+                    release_id=raw_batch.metadata.get("release_id", "unknown"),
+                    vintage_date=raw_batch.metadata.get("vintage_date")
+                )
+                schema_contracts["conversion_factor"] = schema_registry.get_schema(CONVERSION_FACTOR_SCHEMA)
+            elif filename.endswith('.zip'):
+                # Parsing runs in worker processes; keep the event loop free
+                results = await loop.run_in_executor(
+                    None, self._parse_bundle, content, filename
+                )
+                
+                for result in results:
+                    df = result.frame
+                    if df.empty:
+                        continue
+                    if result.cached:
+                        df['ingest_run_id'] = str(uuid.uuid4())
+                    prefix, _, schema_name = RVU_BUNDLE_DATASETS[result.member.dataset]
+                    key = f'{prefix}_{result.member.name}'
+                    adapted_dataframes[key] = df
+                    schema_contracts[key] = schema_registry.get_schema(schema_name)
         
         return AdaptedBatch(
             dataframes=adapted_dataframes,
@@ -1260,16 +1308,91 @@ class RVUIngestor(BaseDISIngestor):
             metadata=raw_batch.metadata
         )
     
-    def _parse_pprrvu_file(self, file_obj, filename: str) -> pd.DataFrame:
+    @staticmethod
+    def _parse_conversion_factor_file(
+        content: bytes,
+        filename: str,
+        release_id: str,
+        vintage_date: Optional[str] = None
+    ) -> pd.DataFrame:
+        """Canonical CF rows (cf_type, cf_value, ...) from a conversion factor file"""
+        year_match = re.search(r"(?:19|20)\d{2}", str(vintage_date or filename))
+        product_year = year_match.group(0) if year_match else str(date.today().year)
+        result = parse_conversion_factor(io.BytesIO(content), filename, {
+            "release_id": release_id,
+            "schema_id": CONVERSION_FACTOR_SCHEMA,
+            "product_year": product_year,
+            "quarter_vintage": f"{product_year}_annual",
+            "vintage_date": vintage_date or f"{product_year}-01-01",
+            "file_sha256": hashlib.sha256(content).hexdigest(),
+            "source_uri": filename,
+        })
+        return result.data
+    
+    @staticmethod
+    def _conversion_factor_frame(data: Dict[str, Any]) -> Optional[pd.DataFrame]:
+        """
+        CF rows for MPFS fee materialization: the parsed conversion factor
+        file when the release carries one, else the CF stamped on PPRRVU rows.
+        """
+        cf = data.get("conversion_factor")
+        if isinstance(cf, pd.DataFrame) and not cf.empty:
+            return cf
+        
+        pprrvu = data.get("pprrvu")
+        if not isinstance(pprrvu, pd.DataFrame) or "conversion_factor" not in pprrvu.columns:
+            return None
+        values = pd.to_numeric(pprrvu["conversion_factor"], errors="coerce")
+        values = values[values > 0]
+        if values.empty:
+            return None
+        return pd.DataFrame({"cf_type": ["physician"], "cf_value": [float(values.mode().iloc[0])]})
+    
+    def _parser_versions(self) -> Dict[str, str]:
+        """Parser and schema contract version of each bundle dataset"""
+        versions = {}
+        for dataset, (_, _, schema_name) in RVU_BUNDLE_DATASETS.items():
+            contract = schema_registry.get_schema(schema_name)
+            versions[dataset] = f"{PARSER_VERSION}+{contract.version if contract else ''}"
+        return versions
+    
+    def _parse_bundle(self, content: bytes, filename: str) -> List[MemberResult]:
+        """Route, stream and parse the wanted members of one RVU bundle"""
+        # Members the router does not recognise fall back to the dataset
+        # named by the bundle itself (e.g. gpci.zip)
+        lowered = filename.lower()
+        fallback = next((dataset for keyword, dataset in RVU_BUNDLE_KEYWORDS if keyword in lowered), None)
+        
+        with ZipBundle(content, fallback_dataset=fallback) as bundle:
+            members = bundle.members(
+                datasets=self.bundle_datasets or RVU_BUNDLE_DATASETS.keys(),
+                suffixes=('.txt', '.csv')
+            )
+            parsers = {
+                dataset: getattr(type(self), parser_name)
+                for dataset, (_, parser_name, _) in RVU_BUNDLE_DATASETS.items()
+            }
+            results = bundle.parse(
+                members, parsers, cache=self.member_cache, versions=self._parser_versions()
+            )
+        
+        logger.info("Parsed RVU bundle",
+                   filename=filename,
+                   members=len(members),
+                   cached=sum(1 for r in results if r.cached))
+        return results
+    
+    @classmethod
+    def _parse_pprrvu_file(cls, file_obj, filename: str) -> pd.DataFrame:
         """Parse PPRRVU file (TXT or CSV)"""
         try:
             if filename.endswith('.txt'):
                 # Fixed-width parsing for TXT files
-                df = self._parse_fixed_width_pprrvu(file_obj)
+                df = cls._parse_fixed_width_pprrvu(file_obj)
             else:
                 # CSV parsing
                 df = pd.read_csv(file_obj, dtype=str)
-                df = self._normalize_pprrvu_columns(df)
+                df = cls._normalize_pprrvu_columns(df)
             
             # Add metadata
             df['effective_from'] = date(2025, 1, 1)
@@ -1284,11 +1407,12 @@ class RVUIngestor(BaseDISIngestor):
             logger.error(f"Failed to parse PPRRVU file {filename}: {e}")
             return pd.DataFrame()
     
-    def _parse_gpci_file(self, file_obj, filename: str) -> pd.DataFrame:
+    @classmethod
+    def _parse_gpci_file(cls, file_obj, filename: str) -> pd.DataFrame:
         """Parse GPCI file"""
         try:
             df = pd.read_csv(file_obj, dtype=str)
-            df = self._normalize_gpci_columns(df)
+            df = cls._normalize_gpci_columns(df)
             
             # Add metadata
             df['effective_from'] = date(2025, 1, 1)
@@ -1303,11 +1427,12 @@ class RVUIngestor(BaseDISIngestor):
             logger.error(f"Failed to parse GPCI file {filename}: {e}")
             return pd.DataFrame()
     
-    def _parse_oppscap_file(self, file_obj, filename: str) -> pd.DataFrame:
+    @classmethod
+    def _parse_oppscap_file(cls, file_obj, filename: str) -> pd.DataFrame:
         """Parse OPPSCap file"""
         try:
             df = pd.read_csv(file_obj, dtype=str)
-            df = self._normalize_oppscap_columns(df)
+            df = cls._normalize_oppscap_columns(df)
             
             # Add metadata
             df['effective_from'] = date(2025, 1, 1)
@@ -1322,11 +1447,12 @@ class RVUIngestor(BaseDISIngestor):
             logger.error(f"Failed to parse OPPSCap file {filename}: {e}")
             return pd.DataFrame()
     
-    def _parse_anescf_file(self, file_obj, filename: str) -> pd.DataFrame:
+    @classmethod
+    def _parse_anescf_file(cls, file_obj, filename: str) -> pd.DataFrame:
         """Parse Anesthesia CF file"""
         try:
             df = pd.read_csv(file_obj, dtype=str)
-            df = self._normalize_anescf_columns(df)
+            df = cls._normalize_anescf_columns(df)
             
             # Add metadata
             df['effective_from'] = date(2025, 1, 1)
@@ -1341,11 +1467,12 @@ class RVUIngestor(BaseDISIngestor):
             logger.error(f"Failed to parse Anesthesia CF file {filename}: {e}")
             return pd.DataFrame()
     
-    def _parse_locality_file(self, file_obj, filename: str) -> pd.DataFrame:
+    @classmethod
+    def _parse_locality_file(cls, file_obj, filename: str) -> pd.DataFrame:
         """Parse Locality-County file"""
         try:
             df = pd.read_csv(file_obj, dtype=str)
-            df = self._normalize_locality_columns(df)
+            df = cls._normalize_locality_columns(df)
             
             # Add metadata
             df['effective_from'] = date(2025, 1, 1)
@@ -1360,7 +1487,8 @@ class RVUIngestor(BaseDISIngestor):
             logger.error(f"Failed to parse Locality file {filename}: {e}")
             return pd.DataFrame()
     
-    def _parse_fixed_width_pprrvu(self, file_obj) -> pd.DataFrame:
+    @classmethod
+    def _parse_fixed_width_pprrvu(cls, file_obj) -> pd.DataFrame:
         """Parse fixed-width PPRRVU TXT file"""
         # This would use the existing layout registry
         from tests.fixtures.rvu.layout_registry import get_layout, parse_fixed_width_record
@@ -1379,9 +1507,10 @@ class RVUIngestor(BaseDISIngestor):
                     continue
         
         df = pd.DataFrame(records)
-        return self._normalize_pprrvu_columns(df)
+        return cls._normalize_pprrvu_columns(df)
     
-    def _normalize_pprrvu_columns(self, df: pd.DataFrame) -> pd.DataFrame:
+    @classmethod
+    def _normalize_pprrvu_columns(cls, df: pd.DataFrame) -> pd.DataFrame:
         """Normalize PPRRVU column names and types"""
         # Column mapping
         column_mapping = {
@@ -1413,7 +1542,8 @@ class RVUIngestor(BaseDISIngestor):
         
         return df
     
-    def _normalize_gpci_columns(self, df: pd.DataFrame) -> pd.DataFrame:
+    @classmethod
+    def _normalize_gpci_columns(cls, df: pd.DataFrame) -> pd.DataFrame:
         """Normalize GPCI column names and types"""
         column_mapping = {
             'LOCALITY': 'locality_code',
@@ -1432,7 +1562,8 @@ class RVUIngestor(BaseDISIngestor):
         
         return df
     
-    def _normalize_oppscap_columns(self, df: pd.DataFrame) -> pd.DataFrame:
+    @classmethod
+    def _normalize_oppscap_columns(cls, df: pd.DataFrame) -> pd.DataFrame:
         """Normalize OPPSCap column names and types"""
         column_mapping = {
             'HCPCS': 'hcpcs',
@@ -1452,7 +1583,8 @@ class RVUIngestor(BaseDISIngestor):
         
         return df
     
-    def _normalize_anescf_columns(self, df: pd.DataFrame) -> pd.DataFrame:
+    @classmethod
+    def _normalize_anescf_columns(cls, df: pd.DataFrame) -> pd.DataFrame:
         """Normalize Anesthesia CF column names and types"""
         column_mapping = {
             'LOCALITY': 'locality_code',
@@ -1468,7 +1600,8 @@ class RVUIngestor(BaseDISIngestor):
         
         return df
     
-    def _normalize_locality_columns(self, df: pd.DataFrame) -> pd.DataFrame:
+    @classmethod
+    def _normalize_locality_columns(cls, df: pd.DataFrame) -> pd.DataFrame:
         """Normalize Locality-County column names and types"""
         column_mapping = {
             'LOCALITY': 'locality_code',
@@ -1651,34 +1784,28 @@ class RVUIngestor(BaseDISIngestor):
                     try:
                         logger.info("Downloading file", url=source_file.url, filename=source_file.filename)
                         
-                        response = await client.get(source_file.url)
-                        content = response.content
-                        
-                        # Calculate file hash
-                        file_hash = hashlib.sha256(content).hexdigest()
-                        
-                        # Store file
+                        # Store once by content; the release layout links to the object
                         file_path = raw_dir / source_file.filename
-                        with open(file_path, 'wb') as f:
-                            f.write(content)
+                        stored = await self.raw_store.download(client, source_file.url, file_path)
                         
                         # Add to manifest
                         file_info = {
                             "path": str(file_path.relative_to(raw_dir.parent)),
-                            "sha256": file_hash,
-                            "size_bytes": len(content),
+                            "sha256": stored.sha256,
+                            "size_bytes": stored.size_bytes,
                             "content_type": source_file.content_type,
                             "url": source_file.url,
-                            "last_modified": response.headers.get('last-modified'),
-                            "etag": response.headers.get('etag')
+                            "last_modified": stored.last_modified,
+                            "etag": stored.etag
                         }
                         manifest_data["files"].append(file_info)
                         downloaded_files.append(file_info)
                         
                         logger.info("File downloaded successfully", 
                                   filename=source_file.filename, 
-                                  size=len(content),
-                                  hash=file_hash)
+                                  size=stored.size_bytes,
+                                  hash=stored.sha256,
+                                  reused=not stored.new)
                         
                     except Exception as e:
                         logger.error("Failed to download file", 
@@ -1926,7 +2053,7 @@ class RVUIngestor(BaseDISIngestor):
                     # Continue with warning - could be configured to fail here
             
             # Create curated directory structure per DIS §4
-            curated_dir = Path(self.output_dir) / "curated" / "cms_rvu" / enriched_batch["vintage_date"]
+            curated_dir = self.curated_root / "curated" / "cms_rvu" / enriched_batch["vintage_date"]
             curated_dir.mkdir(parents=True, exist_ok=True)
             
             # Create data directory
@@ -1964,8 +2091,37 @@ class RVUIngestor(BaseDISIngestor):
                 json.dump(data_docs, f, indent=2)
             
             # Save data with idempotent upserts per DIS §3.6
+            fee_table_path = None
+            history_path = None
+            statistical_drift = {}
             if "data" in enriched_batch:
                 self._save_data_with_upserts(enriched_batch["data"], data_dir, enriched_batch["vintage_date"])
+                statistical_drift = self._detect_statistical_drift(
+                    enriched_batch["data"], enriched_batch["vintage_date"]
+                )
+                
+                # Materialize fully adjusted MPFS fees when the release carries a CF
+                release_id = enriched_batch["release_id"]
+                fee_table_path = materialize_and_publish(
+                    enriched_batch["data"].get("pprrvu"),
+                    enriched_batch["data"].get("gpci"),
+                    self._conversion_factor_frame(enriched_batch["data"]),
+                    year=int(str(enriched_batch["vintage_date"])[:4]),
+                    output_dir=self.curated_root,
+                    vintage=enriched_batch["vintage_date"],
+                    lineage=build_lineage(
+                        pprrvu_release_id=release_id,
+                        gpci_release_id=release_id,
+                        cf_release_id=enriched_batch.get("cf_release_id", release_id)
+                    )
+                )
+                
+                # Add this vintage to the multi-year per-code history
+                history_path = publish_rvu_history(
+                    enriched_batch["data"].get("pprrvu"),
+                    self.curated_root,
+                    vintage=enriched_batch["vintage_date"]
+                )
             
             # Create latest-effective view definition per DIS §3.6
             view_sql = f"""
@@ -2000,6 +2156,9 @@ class RVUIngestor(BaseDISIngestor):
                 "data_directory": str(data_dir),
                 "docs_directory": str(docs_dir),
                 "latest_effective_view": str(view_path),
+                "mpfs_fee_table": str(fee_table_path) if fee_table_path else None,
+                "rvu_history": str(history_path) if history_path else None,
+                "statistical_drift": statistical_drift,
                 "record_count": enriched_batch.get("record_count", 0)
             }
             
@@ -23,8 +23,13 @@ Created: 2025-10-17
 """
 
 import hashlib
+import os
+import pickle
 import re
+import shutil
+import threading
 import unicodedata
+import uuid
 from pathlib import Path
 from typing import Any, Dict, List, NamedTuple, Optional, Tuple
 
@@ -32,6 +37,8 @@ import pandas as pd
 import structlog
 import yaml
 
+from cms_pricing.config import settings
+
 # Optional: RapidFuzz for fuzzy matching (install via requirements-dev.txt)
 try:
     from rapidfuzz import fuzz
@@ -174,12 +181,231 @@ def _compute_authority_fingerprint(counties_df: pd.DataFrame) -> Dict[str, Any]:
     }
 
 
-def load_fips_crosswalk(ref_dir: Optional[Path] = None) -> Tuple[pd.DataFrame, pd.DataFrame, Dict]:
+class FipsCrosswalk(NamedTuple):
+    """
+    Normalized FIPS reference data, as persisted in the crosswalk artifact.
+    
+    Frames are shared between callers and must be treated as read-only.
+    
+    Fields:
+        states: States DataFrame (see load_fips_crosswalk)
+        counties: Counties DataFrame with county_name_key
+        aliases: Aliases dict
+        county_index: (state_fips, county_name_key) → counties row positions
+        fingerprint: Authority fingerprint (_compute_authority_fingerprint)
+        source_digest: SHA-256 over the source reference files
+    """
+    states: pd.DataFrame
+    counties: pd.DataFrame
+    aliases: Dict
+    county_index: Dict[Tuple[str, str], Tuple[int, ...]]
+    fingerprint: Dict[str, Any]
+    source_digest: str
+
+
+# Bump when the artifact layout or key normalization changes
+CROSSWALK_ARTIFACT_VERSION = 1
+
+# Crosswalks loaded in this process, by source digest
+_crosswalks: Dict[str, FipsCrosswalk] = {}
+# Source file stats → digest, so unchanged files are not rehashed
+_source_digests: Dict[Tuple, str] = {}
+_crosswalks_lock = threading.Lock()
+
+
+def normalize_keys(names: pd.Series, state_fips: pd.Series) -> pd.Series:
+    """Vectorized normalize_key over a column of names (same rules)"""
+    keys = (
+        names.str.normalize('NFKD')
+        .str.encode('ascii', 'ignore')
+        .str.decode('ascii')
+        .str.upper()
+        .str.replace(r'[()]', '', regex=True)
+        .str.split()
+        .str.join(' ')
+    )
+    louisiana = state_fips == '22'
+    keys[louisiana] = keys[louisiana].str.replace(r'\s+PARISH$', '', regex=True)
+    return keys
+
+
+def _resolve_ref_dir(ref_dir: Optional[Path]) -> Path:
+    if ref_dir is not None:
+        return Path(ref_dir)
+    
+    # Try Docker path first, fall back to relative from project root
+    docker_ref = Path('/app/data/reference')
+    local_ref = Path(__file__).parent.parent.parent.parent / 'data' / 'reference'
+    
+    if docker_ref.exists():
+        return docker_ref
+    if local_ref.exists():
+        return local_ref
+    raise FileNotFoundError(f"Reference data not found at {docker_ref} or {local_ref}")
+
+
+def _crosswalk_sources(ref_dir: Path) -> Dict[str, Path]:
+    return {
+        'states': ref_dir / 'census/fips_states/2025/us_states.csv',
+        'counties': ref_dir / 'census/fips_counties/2025/us_counties.csv',
+        'aliases': ref_dir / 'cms/county_aliases/2025/county_aliases.yml',
+    }
+
+
+def _source_digest(sources: Dict[str, Path]) -> str:
+    """SHA-256 over the source files, memoized by (path, size, mtime)"""
+    stats = tuple(
+        (str(path), stat.st_size, stat.st_mtime_ns)
+        for path, stat in ((path, path.stat()) for path in sources.values())
+    )
+    with _crosswalks_lock:
+        digest = _source_digests.get(stats)
+    if digest is not None:
+        return digest
+    
+    hasher = hashlib.sha256(f"v{CROSSWALK_ARTIFACT_VERSION}".encode())
+    for name, path in sources.items():
+        hasher.update(name.encode())
+        hasher.update(path.read_bytes())
+    digest = hasher.hexdigest()
+    with _crosswalks_lock:
+        _source_digests[stats] = digest
+    return digest
+
+
+def _build_crosswalk(sources: Dict[str, Path], digest: str) -> FipsCrosswalk:
+    """Read and normalize the source files"""
+    states_df = pd.read_csv(sources['states'], dtype=str)
+    states_df['state_name'] = states_df['state_name'].str.upper()
+    
+    counties_df = pd.read_csv(sources['counties'], dtype=str)
+    # Add normalized key column for matching
+    counties_df['county_name_key'] = normalize_keys(counties_df['county_name'], counties_df['state_fips'])
+    
+    with open(sources['aliases'], 'r', encoding='utf-8') as f:
+        aliases_yaml = yaml.safe_load(f)
+    
+    aliases = {
+        'default': aliases_yaml.get('aliases', {}).get('default', {}),
+        'by_state': aliases_yaml.get('aliases', {}).get('by_state', {}),
+        'special_cases': aliases_yaml.get('special_cases', []),
+    }
+    
+    county_index = {
+        key: tuple(int(i) for i in positions)
+        for key, positions in counties_df.groupby(['state_fips', 'county_name_key'], sort=False).indices.items()
+    }
+    
+    return FipsCrosswalk(
+        states=states_df,
+        counties=counties_df,
+        aliases=aliases,
+        county_index=county_index,
+        fingerprint=_compute_authority_fingerprint(counties_df),
+        source_digest=digest,
+    )
+
+
+def _write_artifact(artifact_dir: Path, crosswalk: FipsCrosswalk):
+    """Write the artifact to a temp directory and rename it into place"""
+    tmp_dir = artifact_dir.parent / f".{artifact_dir.name}.{uuid.uuid4().hex}.tmp"
+    tmp_dir.mkdir(parents=True)
+    try:
+        crosswalk.states.to_parquet(tmp_dir / 'states.parquet', index=False)
+        crosswalk.counties.to_parquet(tmp_dir / 'counties.parquet', index=False)
+        with open(tmp_dir / 'index.pkl', 'wb') as f:
+            pickle.dump({
+                'aliases': crosswalk.aliases,
+                'county_index': crosswalk.county_index,
+                'fingerprint': crosswalk.fingerprint,
+                'source_digest': crosswalk.source_digest,
+            }, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_dir, artifact_dir)
+    except OSError:
+        # Another process published the same artifact first
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        if not (artifact_dir / 'index.pkl').exists():
+            raise
+
+
+def _read_artifact(artifact_dir: Path) -> FipsCrosswalk:
+    with open(artifact_dir / 'index.pkl', 'rb') as f:
+        index = pickle.load(f)
+    return FipsCrosswalk(
+        states=pd.read_parquet(artifact_dir / 'states.parquet', memory_map=True),
+        counties=pd.read_parquet(artifact_dir / 'counties.parquet', memory_map=True),
+        **index,
+    )
+
+
+def load_crosswalk_artifact(
+    ref_dir: Optional[Path] = None,
+    cache_dir: Optional[Path] = None,
+) -> FipsCrosswalk:
+    """
+    Load the normalized FIPS crosswalk, building its artifact on first use.
+    
+    The artifact (Parquet frames plus a pickled index) is stored under
+    <cache_dir>/<source digest>/, so every process in an ingest pool reuses
+    one build and any change to the source files produces a new artifact.
+    Within a process the loaded crosswalk is shared by digest.
+    
+    Args:
+        ref_dir: Root reference data directory
+        cache_dir: Artifact directory (default: <DATA_CACHE_DIR>/fips_crosswalk)
+        
+    Returns:
+        FipsCrosswalk (frames are shared; treat them as read-only)
+    """
+    sources = _crosswalk_sources(_resolve_ref_dir(ref_dir))
+    digest = _source_digest(sources)
+    
+    with _crosswalks_lock:
+        crosswalk = _crosswalks.get(digest)
+    if crosswalk is not None:
+        return crosswalk
+    
+    artifact_dir = Path(cache_dir or Path(settings.data_cache_dir) / 'fips_crosswalk') / digest
+    crosswalk = None
+    if (artifact_dir / 'index.pkl').exists():
+        try:
+            crosswalk = _read_artifact(artifact_dir)
+        except Exception as e:
+            logger.warning("Ignoring unreadable FIPS crosswalk artifact", path=str(artifact_dir), error=str(e))
+    
+    if crosswalk is None:
+        crosswalk = _build_crosswalk(sources, digest)
+        try:
+            _write_artifact(artifact_dir, crosswalk)
+        except Exception as e:
+            logger.warning("Failed to persist FIPS crosswalk artifact", path=str(artifact_dir), error=str(e))
+        
+        logger.info(
+            "Built FIPS crosswalk",
+            states=len(crosswalk.states),
+            counties=len(crosswalk.counties),
+            aliases_default=len(crosswalk.aliases['default']),
+            aliases_by_state=len(crosswalk.aliases['by_state']),
+            source_digest=digest[:16],
+        )
+    
+    with _crosswalks_lock:
+        return _crosswalks.setdefault(digest, crosswalk)
+
+
+def load_fips_crosswalk(
+    ref_dir: Optional[Path] = None,
+    cache_dir: Optional[Path] = None,
+) -> Tuple[pd.DataFrame, pd.DataFrame, Dict]:
     """
     Load FIPS reference data: states, counties, aliases.
     
+    Served from the cached crosswalk artifact (see load_crosswalk_artifact);
+    the returned frames are shared and must be treated as read-only.
+    
     Args:
         ref_dir: Root reference data directory
+        cache_dir: Crosswalk artifact directory
         
     Returns:
         (states_df, counties_df, aliases_dict)
@@ -202,54 +428,8 @@ def load_fips_crosswalk(ref_dir: Optional[Path] = None) -> Tuple[pd.DataFrame, p
         - 'default': Dict[str, str] - global aliases
         - 'by_state': Dict[str, Dict[str, str]] - state-specific
     """
-    # Detect reference data directory
-    if ref_dir is None:
-        # Try Docker path first, fall back to relative from project root
-        docker_ref = Path('/app/data/reference')
-        local_ref = Path(__file__).parent.parent.parent.parent / 'data' / 'reference'
-        
-        if docker_ref.exists():
-            ref_dir = docker_ref
-        elif local_ref.exists():
-            ref_dir = local_ref
-        else:
-            raise FileNotFoundError(f"Reference data not found at {docker_ref} or {local_ref}")
-    
-    # Load states
-    states_path = ref_dir / 'census/fips_states/2025/us_states.csv'
-    states_df = pd.read_csv(states_path, dtype=str)
-    states_df['state_name'] = states_df['state_name'].str.upper()
-    
-    # Load counties
-    counties_path = ref_dir / 'census/fips_counties/2025/us_counties.csv'
-    counties_df = pd.read_csv(counties_path, dtype=str)
-    
-    # Add normalized key column for matching
-    counties_df['county_name_key'] = counties_df.apply(
-        lambda row: normalize_key(row['county_name'], row['state_fips']),
-        axis=1
-    )
-    
-    # Load aliases
-    aliases_path = ref_dir / 'cms/county_aliases/2025/county_aliases.yml'
-    with open(aliases_path, 'r', encoding='utf-8') as f:
-        aliases_yaml = yaml.safe_load(f)
-    
-    aliases = {
-        'default': aliases_yaml.get('aliases', {}).get('default', {}),
-        'by_state': aliases_yaml.get('aliases', {}).get('by_state', {}),
-        'special_cases': aliases_yaml.get('special_cases', []),
-    }
-    
-    logger.info(
-        "Loaded FIPS crosswalk",
-        states=len(states_df),
-        counties=len(counties_df),
-        aliases_default=len(aliases['default']),
-        aliases_by_state=len(aliases['by_state']),
-    )
-    
-    return states_df, counties_df, aliases
+    crosswalk = load_crosswalk_artifact(ref_dir, cache_dir)
+    return crosswalk.states, crosswalk.counties, crosswalk.aliases
 
 
 # =============================================================================
@@ -481,7 +661,7 @@ def explode_county_list(county_names: str) -> List[str]:
 # Matching Pipeline (Exact → Alias → Fuzzy)
 # =============================================================================
 
-def match_exact(county_key: str, state_fips: str, counties_df: pd.DataFrame, fee_area_hint: Optional[str] = None) -> Optional[Tuple[str, str, str, str]]:
+def match_exact(county_key: str, state_fips: str, counties_df: pd.DataFrame, fee_area_hint: Optional[str] = None, county_index: Optional[Dict[Tuple[str, str], Tuple[int, ...]]] = None) -> Optional[Tuple[str, str, str, str]]:
     """
     Exact match on (state_fips, county_name_key) with LSAD tie-breaking.
     
@@ -490,6 +670,8 @@ def match_exact(county_key: str, state_fips: str, counties_df: pd.DataFrame, fee
         state_fips: 2-digit state FIPS
         counties_df: Full counties reference DataFrame
         fee_area_hint: Optional fee_area text for disambiguation hints
+        county_index: Optional FipsCrosswalk.county_index for counties_df
+            (avoids scanning the frame)
         
     Returns:
         (county_fips, county_geoid, county_name_canonical, county_type) or None
@@ -501,10 +683,13 @@ def match_exact(county_key: str, state_fips: str, counties_df: pd.DataFrame, fee
         2. Otherwise → prefer County (most common)
         3. Then Parish, Borough, Census Area, etc.
     """
-    matches = counties_df[
-        (counties_df['state_fips'] == state_fips) &
-        (counties_df['county_name_key'] == county_key)
-    ]
+    if county_index is not None:
+        matches = counties_df.iloc[list(county_index.get((state_fips, county_key), ()))]
+    else:
+        matches = counties_df[
+            (counties_df['state_fips'] == state_fips) &
+            (counties_df['county_name_key'] == county_key)
+        ]
     
     if len(matches) == 0:
         return None
@@ -614,7 +799,7 @@ def apply_aliases(county_key: str, state_fips: str, aliases: Dict) -> str:
     return transformed
 
 
-def match_alias(county_key: str, state_fips: str, counties_df: pd.DataFrame, aliases: Dict, fee_area_hint: Optional[str] = None) -> Optional[Tuple[str, str, str, str]]:
+def match_alias(county_key: str, state_fips: str, counties_df: pd.DataFrame, aliases: Dict, fee_area_hint: Optional[str] = None, county_index: Optional[Dict[Tuple[str, str], Tuple[int, ...]]] = None) -> Optional[Tuple[str, str, str, str]]:
     """
     Match after applying aliases.
     
@@ -624,6 +809,7 @@ def match_alias(county_key: str, state_fips: str, counties_df: pd.DataFrame, ali
         counties_df: Full counties reference DataFrame
         aliases: Aliases dict
         fee_area_hint: Optional fee_area text for disambiguation
+        county_index: Optional FipsCrosswalk.county_index for counties_df
         
     Returns:
         (county_fips, county_geoid, county_name_canonical, county_type) or None
@@ -633,7 +819,7 @@ def match_alias(county_key: str, state_fips: str, counties_df: pd.DataFrame, ali
     
     # Try exact match on transformed key
     if transformed_key != county_key:
-        return match_exact(transformed_key, state_fips, counties_df, fee_area_hint)
+        return match_exact(transformed_key, state_fips, counties_df, fee_area_hint, county_index)
     
     return None
 
@@ -751,7 +937,9 @@ def normalize_locality_fips(
     logger.info("Starting FIPS normalization", raw_rows=len(raw_df))
     
     # Load reference data
-    states_df, counties_df, aliases = load_fips_crosswalk(ref_dir)
+    crosswalk = load_crosswalk_artifact(ref_dir)
+    states_df, counties_df, aliases = crosswalk.states, crosswalk.counties, crosswalk.aliases
+    county_index = crosswalk.county_index
     authority_version = "Census TIGER/Line 2025"
     
     # Create state name → state_fips mapping
@@ -763,8 +951,8 @@ def normalize_locality_fips(
     state_map['GUAM'] = '66'
     state_map['HAWAII/GUAM'] = '15'  # CMS combines Hawaii + Guam
     
-    # Compute authority fingerprint for drift detection
-    authority_fingerprint = _compute_authority_fingerprint(counties_df)
+    # Authority fingerprint for drift detection (computed when the artifact was built)
+    authority_fingerprint = dict(crosswalk.fingerprint)
     
     # Initialize outputs
     normalized_rows = []
@@ -852,7 +1040,7 @@ def normalize_locality_fips(
         # This handles cases where Stage 1 forward-filled wrong state (e.g., CA rows after AR header)
         if len(county_list) > 0 and not state_inference_attempted:
             first_county_key = normalize_key(county_list[0], state_fips)
-            test_match = match_exact(first_county_key, state_fips, counties_df, fee_area)
+            test_match = match_exact(first_county_key, state_fips, counties_df, fee_area, county_index)
             
             if not test_match:
                 # First county doesn't match current state - attempt inference
@@ -907,7 +1095,7 @@ def normalize_locality_fips(
             county_key = normalize_key(county_name_raw, state_fips)
             
             # Try exact match (with fee_area hint for disambiguation)
-            match_result = match_exact(county_key, state_fips, counties_df, fee_area)
+            match_result = match_exact(county_key, state_fips, counties_df, fee_area, county_index)
             if match_result:
                 county_fips, county_geoid, county_name_canonical, county_type = match_result
                 match_method = 'exact'
@@ -915,7 +1103,7 @@ def normalize_locality_fips(
                 metrics['match_methods']['exact'] += 1
             else:
                 # Try alias match (with fee_area hint)
-                match_result = match_alias(county_key, state_fips, counties_df, aliases, fee_area)
+                match_result = match_alias(county_key, state_fips, counties_df, aliases, fee_area, county_index)
                 if match_result:
                     county_fips, county_geoid, county_name_canonical, county_type = match_result
                     match_method = 'alias'
@@ -0,0 +1,371 @@
+"""
+Compact per-column profiles for statistical drift detection
+
+Each publish records one profile per dataset: row count plus, per column,
+null rate, a HyperLogLog distinct-count sketch, min/max, a percentile
+summary (numeric columns) and top-k category frequencies (other columns).
+Profiles are a few KB of JSON, so drift checks compare a new release
+against stored history without re-reading prior vintages.
+"""
+
+import base64
+import json
+import math
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+import structlog
+
+logger = structlog.get_logger()
+
+# 2^12 registers: ~1.6% standard error on distinct counts, 4 KB per column
+HLL_PRECISION = 12
+QUANTILE_POINTS = np.linspace(0.0, 1.0, 101)
+TOP_K = 20
+
+# Provenance and pipeline metadata: new values every release by construction,
+# so they are never profiled (plus anything prefixed vintage_ or _)
+PROVENANCE_COLUMNS = frozenset({
+    "release_id", "source_file_sha256", "source_filename", "source_uri",
+    "parsed_at", "row_content_hash", "batch_id",
+})
+PROVENANCE_PREFIXES = ("vintage_", "_")
+
+
+def is_provenance_column(name: str) -> bool:
+    return name in PROVENANCE_COLUMNS or name.startswith(PROVENANCE_PREFIXES)
+
+
+class HyperLogLog:
+    """HyperLogLog distinct-count sketch over 64-bit pandas hashes"""
+
+    def __init__(self, precision: int = HLL_PRECISION, registers: Optional[np.ndarray] = None):
+        self.precision = precision
+        self.m = 1 << precision
+        self.registers = registers if registers is not None else np.zeros(self.m, dtype=np.uint8)
+
+    def add_hashes(self, hashes: np.ndarray) -> "HyperLogLog":
+        if len(hashes) == 0:
+            return self
+        hashes = hashes.astype(np.uint64, copy=False)
+        suffix_bits = 64 - self.precision
+        index = (hashes >> np.uint64(suffix_bits)).astype(np.int64)
+        suffix = hashes & np.uint64((1 << suffix_bits) - 1)
+        # Rank = position of the leftmost 1-bit in the suffix (suffix_bits + 1 for zero)
+        bit_length = np.zeros(len(suffix), dtype=np.int64)
+        nonzero = suffix > 0
+        bit_length[nonzero] = np.frexp(suffix[nonzero].astype(np.float64))[1]
+        rank = (suffix_bits - bit_length + 1).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+        return self
+
+    def add_series(self, values: pd.Series) -> "HyperLogLog":
+        return self.add_hashes(pd.util.hash_pandas_object(values, index=False).to_numpy())
+
+    def merge(self, other: "HyperLogLog") -> "HyperLogLog":
+        return HyperLogLog(self.precision, np.maximum(self.registers, other.registers))
+
+    def estimate(self) -> float:
+        alpha = 0.7213 / (1 + 1.079 / self.m)
+        raw = alpha * self.m * self.m / np.sum(np.ldexp(1.0, -self.registers.astype(np.int64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if raw <= 2.5 * self.m and zeros:
+            # Small-range correction (linear counting)
+            return self.m * math.log(self.m / zeros)
+        return float(raw)
+
+    def to_string(self) -> str:
+        return base64.b64encode(self.registers.tobytes()).decode("ascii")
+
+    @classmethod
+    def from_string(cls, encoded: str, precision: int = HLL_PRECISION) -> "HyperLogLog":
+        registers = np.frombuffer(base64.b64decode(encoded), dtype=np.uint8).copy()
+        return cls(precision, registers)
+
+
+@dataclass
+class ColumnProfile:
+    """Summary statistics for one column"""
+    name: str
+    dtype: str
+    count: int
+    null_count: int
+    distinct_estimate: float
+    hll: str
+    min: Optional[Any] = None
+    max: Optional[Any] = None
+    quantiles: Optional[List[float]] = None
+    top_k: Optional[Dict[str, float]] = None
+
+    @property
+    def null_rate(self) -> float:
+        return self.null_count / self.count if self.count else 0.0
+
+
+@dataclass
+class DatasetProfile:
+    """Per-column profiles for one dataset release"""
+    dataset: str
+    vintage: str
+    row_count: int
+    columns: Dict[str, ColumnProfile]
+    created_at: str = field(default_factory=lambda: datetime.utcnow().isoformat())
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "DatasetProfile":
+        columns = {name: ColumnProfile(**column) for name, column in data["columns"].items()}
+        return cls(
+            dataset=data["dataset"],
+            vintage=data["vintage"],
+            row_count=data["row_count"],
+            columns=columns,
+            created_at=data.get("created_at", "")
+        )
+
+
+def _scalar(value: Any) -> Any:
+    """JSON-safe form of a min/max value"""
+    if value is None or (isinstance(value, float) and math.isnan(value)) or value is pd.NaT:
+        return None
+    if isinstance(value, (pd.Timestamp, datetime)):
+        return value.isoformat()
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def profile_column(name: str, values: pd.Series, top_k: int = TOP_K) -> ColumnProfile:
+    present = values.dropna()
+    hll = HyperLogLog().add_series(present)
+    profile = ColumnProfile(
+        name=name,
+        dtype=str(values.dtype),
+        count=len(values),
+        null_count=len(values) - len(present),
+        distinct_estimate=round(hll.estimate(), 1),
+        hll=hll.to_string()
+    )
+    if present.empty:
+        return profile
+
+    if pd.api.types.is_numeric_dtype(present) and not pd.api.types.is_bool_dtype(present):
+        numbers = present.to_numpy(dtype=np.float64)
+        profile.min = _scalar(numbers.min())
+        profile.max = _scalar(numbers.max())
+        profile.quantiles = np.quantile(numbers, QUANTILE_POINTS).tolist()
+    else:
+        if pd.api.types.is_datetime64_any_dtype(present):
+            profile.min = _scalar(present.min())
+            profile.max = _scalar(present.max())
+        frequencies = present.astype(str).value_counts(normalize=True, sort=True).head(top_k)
+        profile.top_k = {str(value): float(share) for value, share in frequencies.items()}
+    return profile
+
+
+def profile_frame(
+    df: pd.DataFrame,
+    dataset: str,
+    vintage: str,
+    top_k: int = TOP_K,
+    exclude: Optional[Iterable[str]] = None
+) -> DatasetProfile:
+    """Profile every business column of a frame (provenance and `exclude` skipped), one pass per column"""
+    excluded = set(exclude or ())
+    return DatasetProfile(
+        dataset=dataset,
+        vintage=str(vintage),
+        row_count=len(df),
+        columns={
+            str(name): profile_column(str(name), df[name], top_k)
+            for name in df.columns
+            if str(name) not in excluded and not is_provenance_column(str(name))
+        }
+    )
+
+
+@dataclass
+class DriftThresholds:
+    row_count_change: float = 0.15
+    null_rate_change: float = 0.05
+    distinct_change: float = 0.2
+    # Max CDF distance (Kolmogorov-Smirnov statistic) between percentile summaries
+    distribution_distance: float = 0.1
+    # Total variation distance between top-k category frequencies
+    category_distance: float = 0.1
+
+
+@dataclass
+class DriftFinding:
+    column: Optional[str]
+    metric: str
+    value: float
+    threshold: float
+    message: str
+
+
+@dataclass
+class DriftReport:
+    dataset: str
+    vintage: str
+    reference_vintage: Optional[str]
+    findings: List[DriftFinding] = field(default_factory=list)
+    row_count_change: float = 0.0
+
+    @property
+    def drift_detected(self) -> bool:
+        return bool(self.findings)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {**asdict(self), "drift_detected": self.drift_detected}
+
+
+def _cdf_distance(current: List[float], reference: List[float]) -> float:
+    """Max |F_current(x) - F_reference(x)| over both summaries' points"""
+    current_q, reference_q = np.asarray(current), np.asarray(reference)
+    grid = np.union1d(current_q, reference_q)
+    current_cdf = np.interp(grid, current_q, QUANTILE_POINTS, left=0.0, right=1.0)
+    reference_cdf = np.interp(grid, reference_q, QUANTILE_POINTS, left=0.0, right=1.0)
+    return float(np.max(np.abs(current_cdf - reference_cdf)))
+
+
+def _category_distance(current: Dict[str, float], reference: Dict[str, float]) -> float:
+    """Total variation distance, with mass outside the top-k pooled as 'other'"""
+    keys = set(current) | set(reference)
+    distance = sum(abs(current.get(key, 0.0) - reference.get(key, 0.0)) for key in keys)
+    distance += abs((1.0 - sum(current.values())) - (1.0 - sum(reference.values())))
+    return distance / 2
+
+
+def compare_profiles(
+    current: DatasetProfile,
+    reference: DatasetProfile,
+    thresholds: Optional[DriftThresholds] = None
+) -> DriftReport:
+    """Statistical drift of current relative to reference"""
+    thresholds = thresholds or DriftThresholds()
+    report = DriftReport(current.dataset, current.vintage, reference.vintage)
+    findings = report.findings
+
+    if reference.row_count:
+        report.row_count_change = abs(current.row_count - reference.row_count) / reference.row_count
+        if report.row_count_change > thresholds.row_count_change:
+            findings.append(DriftFinding(
+                None, "row_count", report.row_count_change, thresholds.row_count_change,
+                f"Row count changed {report.row_count_change:.1%} ({reference.row_count} -> {current.row_count})"
+            ))
+
+    # Profiles stored before provenance columns were excluded may still carry them
+    for name in sorted(set(reference.columns) - set(current.columns)):
+        if is_provenance_column(name):
+            continue
+        findings.append(DriftFinding(name, "column_removed", 1.0, 0.0, f"Column '{name}' removed"))
+    for name in sorted(set(current.columns) - set(reference.columns)):
+        findings.append(DriftFinding(name, "column_added", 1.0, 0.0, f"Column '{name}' added"))
+
+    for name, column in current.columns.items():
+        previous = reference.columns.get(name)
+        if previous is None:
+            continue
+
+        null_change = abs(column.null_rate - previous.null_rate)
+        if null_change > thresholds.null_rate_change:
+            findings.append(DriftFinding(
+                name, "null_rate", null_change, thresholds.null_rate_change,
+                f"Null rate of '{name}' changed {previous.null_rate:.1%} -> {column.null_rate:.1%}"
+            ))
+
+        if previous.distinct_estimate:
+            distinct_change = abs(column.distinct_estimate / previous.distinct_estimate - 1.0)
+            if distinct_change > thresholds.distinct_change:
+                findings.append(DriftFinding(
+                    name, "distinct_count", distinct_change, thresholds.distinct_change,
+                    f"Distinct count of '{name}' changed "
+                    f"{previous.distinct_estimate:.0f} -> {column.distinct_estimate:.0f}"
+                ))
+
+        if column.quantiles and previous.quantiles:
+            distance = _cdf_distance(column.quantiles, previous.quantiles)
+            if distance > thresholds.distribution_distance:
+                findings.append(DriftFinding(
+                    name, "distribution", distance, thresholds.distribution_distance,
+                    f"Distribution of '{name}' shifted (KS distance {distance:.3f})"
+                ))
+        elif column.top_k is not None and previous.top_k is not None:
+            distance = _category_distance(column.top_k, previous.top_k)
+            if distance > thresholds.category_distance:
+                findings.append(DriftFinding(
+                    name, "categories", distance, thresholds.category_distance,
+                    f"Category mix of '{name}' shifted (TV distance {distance:.3f})"
+                ))
+
+    return report
+
+
+class ProfileStore:
+    """Profiles persisted as <root>/<dataset>/<vintage>.json"""
+
+    def __init__(self, root: str):
+        self.root = Path(root)
+
+    def _path(self, dataset: str, vintage: str) -> Path:
+        return self.root / dataset / f"{vintage}.json"
+
+    def save(self, profile: DatasetProfile) -> Path:
+        path = self._path(profile.dataset, profile.vintage)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".json.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(profile.to_dict(), f)
+        tmp_path.replace(path)
+        return path
+
+    def load(self, dataset: str, vintage: str) -> Optional[DatasetProfile]:
+        path = self._path(dataset, vintage)
+        if not path.exists():
+            return None
+        with open(path) as f:
+            return DatasetProfile.from_dict(json.load(f))
+
+    def vintages(self, dataset: str) -> List[str]:
+        dataset_dir = self.root / dataset
+        if not dataset_dir.exists():
+            return []
+        return sorted(path.stem for path in dataset_dir.glob("*.json"))
+
+    def history(self, dataset: str, before: Optional[str] = None, limit: Optional[int] = None) -> List[DatasetProfile]:
+        """Stored profiles in vintage order, optionally only those before a vintage"""
+        vintages = [v for v in self.vintages(dataset) if before is None or v < str(before)]
+        if limit is not None:
+            vintages = vintages[-limit:] if limit else []
+        profiles = []
+        for vintage in vintages:
+            try:
+                profiles.append(self.load(dataset, vintage))
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                logger.warning("Skipping unreadable profile", dataset=dataset, vintage=vintage, error=str(e))
+        return profiles
+
+    def latest(self, dataset: str, before: Optional[str] = None) -> Optional[DatasetProfile]:
+        history = self.history(dataset, before=before, limit=1)
+        return history[-1] if history else None
+
+    def record(
+        self,
+        profile: DatasetProfile,
+        thresholds: Optional[DriftThresholds] = None
+    ) -> DriftReport:
+        """Compare against the latest earlier vintage, then store the profile"""
+        reference = self.latest(profile.dataset, before=profile.vintage)
+        if reference is None:
+            report = DriftReport(profile.dataset, profile.vintage, None)
+        else:
+            report = compare_profiles(profile, reference, thresholds)
+        self.save(profile)
+        return report
@@ -14,10 +14,11 @@ Per STD-parser-contracts v1.7 §6.2 and §7.1.
 
 import re
 import json
-from pathlib import Path
-from typing import Tuple, Optional, Dict, Any, List, NamedTuple, Literal, Callable, IO
+from typing import Tuple, Optional, Dict, Any, List, Mapping, NamedTuple, Literal, Callable, IO
 import structlog
 
+from cms_pricing.ingestion.contracts.schema_registry import load_schema_plan
+
 logger = structlog.get_logger()
 
 # Import available parsers
@@ -185,18 +186,14 @@ def route_to_parser(
             
             # Fetch natural_keys from schema contract (single source of truth)
             try:
-                contracts_dir = Path(__file__).parent.parent / "contracts"
-                schema_path = contracts_dir / f"{schema_id}.json"
+                natural_keys = load_schema_plan(schema_id).natural_keys
                 
-                with open(schema_path, 'r') as f:
-                    schema_contract = json.load(f)
-                    natural_keys = schema_contract.get("natural_keys", [])
-                    
-                    # Handle nested schemas (OPPS has multiple tables)
-                    if isinstance(natural_keys, dict):
-                        # For nested schemas, use first table's keys as default
-                        # Parsers will handle table-specific routing
-                        natural_keys = list(natural_keys.values())[0] if natural_keys else []
+                # Handle nested schemas (OPPS has multiple tables)
+                if isinstance(natural_keys, Mapping):
+                    # For nested schemas, use first table's keys as default
+                    # Parsers will handle table-specific routing
+                    natural_keys = list(natural_keys.values())[0] if natural_keys else []
+                natural_keys = list(natural_keys)
                     
             except (FileNotFoundError, json.JSONDecodeError, KeyError) as e:
                 logger.error(
@@ -15,15 +15,32 @@ All parsers (PPRRVU, GPCI, Locality, ANES, OPPSCAP, CF) use these utilities for:
 
 import hashlib
 import codecs
+import numpy as np
 import pandas as pd
-from typing import List, Dict, Any, Tuple, NamedTuple, Optional
+from functools import lru_cache
+from typing import List, Dict, Any, FrozenSet, Tuple, NamedTuple, Optional, Union
 from datetime import datetime, date
 from decimal import Decimal, ROUND_HALF_UP, ROUND_HALF_EVEN, InvalidOperation
 from enum import Enum
 import structlog
 
+from cms_pricing.ingestion.contracts.schema_registry import SchemaPlan, compile_schema_plan
+
 logger = structlog.get_logger()
 
+# Arrow-backed string dtype for parsed text columns (one buffer per column, not per row)
+ARROW_STRING = pd.StringDtype("pyarrow")
+
+# Schema contract as loaded JSON or as a compiled plan (load_schema_plan)
+SchemaLike = Union[Dict[str, Any], SchemaPlan]
+
+
+def as_schema_plan(schema: SchemaLike) -> SchemaPlan:
+    """Return the compiled plan for a schema; raw dicts are compiled on the fly"""
+    if isinstance(schema, SchemaPlan):
+        return schema
+    return compile_schema_plan(schema)
+
 
 # ============================================================================
 # Custom Exceptions (Phase 1 Enhancement)
@@ -153,7 +170,7 @@ class ParseResult(NamedTuple):
     metrics: Dict[str, Any]
 
 
-def build_precision_map(schema: Dict[str, Any]) -> Dict[str, Tuple[int, str]]:
+def build_precision_map(schema: SchemaLike) -> Dict[str, Tuple[int, str]]:
     """
     Extract precision and rounding mode from schema contract.
     
@@ -161,7 +178,7 @@ def build_precision_map(schema: Dict[str, Any]) -> Dict[str, Tuple[int, str]]:
     rounding_mode fields for deterministic hash computation.
     
     Args:
-        schema: Loaded schema contract (JSON dict)
+        schema: Loaded schema contract (JSON dict or SchemaPlan)
         
     Returns:
         Dict mapping column name to (precision, rounding_mode)
@@ -172,15 +189,7 @@ def build_precision_map(schema: Dict[str, Any]) -> Dict[str, Tuple[int, str]]:
         >>> precision_map['work_rvu']
         (2, 'HALF_UP')
     """
-    precision_map = {}
-    
-    for col_name, col_def in schema.get('columns', {}).items():
-        if col_def.get('type') in ['float64', 'number']:
-            precision = col_def.get('precision', 6)  # Default 6dp if not specified
-            rounding = col_def.get('rounding_mode', 'HALF_UP')  # Default HALF_UP
-            precision_map[col_name] = (precision, rounding)
-    
-    return precision_map
+    return dict(as_schema_plan(schema).precision)
 
 
 def canonicalize_numeric_col(
@@ -235,7 +244,7 @@ def canonicalize_numeric_col(
 def compute_row_hashes_vectorized(
     df: pd.DataFrame,
     column_order: List[str],
-    schema: Dict[str, Any]
+    schema: SchemaLike
 ) -> pd.Series:
     """
     Compute row hashes vectorized (10-100x faster than row-wise apply).
@@ -249,7 +258,7 @@ def compute_row_hashes_vectorized(
     Args:
         df: DataFrame to hash
         column_order: Columns to include in hash (from schema, excludes metadata)
-        schema: Schema contract dict (for precision/rounding)
+        schema: Schema contract dict or SchemaPlan (for precision/rounding)
         
     Returns:
         Series of 64-character SHA-256 hex hashes
@@ -261,8 +270,8 @@ def compute_row_hashes_vectorized(
         >>> hashes = compute_row_hashes_vectorized(df, schema['column_order'], schema)
         >>> assert all(len(h) == 64 for h in hashes)
     """
-    # Build precision map from schema
-    precision_map = build_precision_map(schema)
+    plan = as_schema_plan(schema)
+    precision_map = plan.precision
     
     # Pre-normalize each column to canonical strings (vectorized)
     normalized = []
@@ -274,8 +283,7 @@ def compute_row_hashes_vectorized(
             continue
         
         series = df[col]
-        col_def = schema.get('columns', {}).get(col, {})
-        col_type = col_def.get('type', 'str')
+        col_type = plan.dtypes.get(col, 'str')
         
         # Vectorized normalization by type
         if col_type in ['float64', 'number'] or col in precision_map:
@@ -399,31 +407,70 @@ def inject_metadata(
     Returns:
         DataFrame with metadata columns added
     """
-    df = df.copy()
+    df = add_constant_columns(df, {
+        # Three vintage fields (REQUIRED per DIS standards)
+        'vintage_date': metadata['vintage_date'],
+        'product_year': metadata['product_year'],
+        'quarter_vintage': metadata['quarter_vintage'],
+        # Core identity
+        'release_id': metadata['release_id'],
+        # Provenance
+        'source_filename': filename,
+        'source_file_sha256': metadata.get('file_sha256', 'unknown'),
+        'source_uri': metadata.get('source_uri', ''),
+    })
     
-    # Three vintage fields (REQUIRED per DIS standards)
-    df['vintage_date'] = metadata['vintage_date']
-    df['product_year'] = metadata['product_year']
-    df['quarter_vintage'] = metadata['quarter_vintage']
+    # Timestamp
+    df['parsed_at'] = datetime.utcnow()
     
-    # Core identity
-    df['release_id'] = metadata['release_id']
+    return df
+
+
+def constant_column(value: Any, index: pd.Index) -> pd.Series:
+    """
+    Build a column holding one value for every row, dictionary-encoded.
     
-    # Provenance
-    df['source_filename'] = filename
-    df['source_file_sha256'] = metadata.get('file_sha256', 'unknown')
-    df['source_uri'] = metadata.get('source_uri', '')
+    The value is stored once as the single category; rows carry int8 codes.
+    None yields an all-missing column.
+    """
+    if value is None:
+        codes = np.full(len(index), -1, dtype=np.int8)
+        return pd.Series(pd.Categorical.from_codes(codes, categories=pd.Index([], dtype=object)), index=index)
+    codes = np.zeros(len(index), dtype=np.int8)
+    return pd.Series(pd.Categorical.from_codes(codes, categories=[value]), index=index)
+
+
+def add_constant_columns(df: pd.DataFrame, values: Dict[str, Any]) -> pd.DataFrame:
+    """
+    Attach per-file metadata as constant, dictionary-encoded columns.
     
-    # Timestamp
-    df['parsed_at'] = datetime.utcnow()
+    Returns a shallow copy: existing column buffers are shared with the input,
+    which itself is left unchanged.
+    """
+    df = df.copy(deep=False)
+    for col, value in values.items():
+        df[col] = constant_column(value, df.index)
+    return df
+
+
+def to_arrow_strings(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Convert object columns holding only strings/nulls to string[pyarrow].
     
+    Columns with mixed Python objects (dates, Decimals, dicts) are left as-is.
+    Returns a shallow copy.
+    """
+    df = df.copy(deep=False)
+    for col in df.columns[df.dtypes == object]:
+        if pd.api.types.infer_dtype(df[col], skipna=True) in ('string', 'empty'):
+            df[col] = df[col].astype(ARROW_STRING)
     return df
 
 
 def finalize_parser_output(
     df: pd.DataFrame,
     natural_key_cols: List[str],
-    schema: Dict[str, Any]
+    schema: SchemaLike
 ) -> pd.DataFrame:
     """
     Finalize parser output per STD-parser-contracts v1.1 §5.2.
@@ -432,11 +479,12 @@ def finalize_parser_output(
     1. Sort by natural key (deterministic)
     2. Reset index to 0, 1, 2, ...
     3. Compute 64-char row_content_hash (vectorized, schema-driven precision)
+    4. Store string columns as string[pyarrow]
     
     Args:
         df: Parsed DataFrame with metadata
         natural_key_cols: Columns for sorting (natural key from schema)
-        schema: Schema contract dict (for column_order, precision, rounding)
+        schema: Schema contract dict or SchemaPlan (for column_order, precision, rounding)
         
     Returns:
         Finalized DataFrame with 64-char row_content_hash column
@@ -450,10 +498,10 @@ def finalize_parser_output(
     ).reset_index(drop=True)
     
     # Compute row content hash (VECTORIZED for performance)
-    column_order = schema.get('column_order', [])
-    df['row_content_hash'] = compute_row_hashes_vectorized(df, column_order, schema)
+    plan = as_schema_plan(schema)
+    df['row_content_hash'] = compute_row_hashes_vectorized(df, list(plan.column_order), plan)
     
-    return df
+    return to_arrow_strings(df)
 
 
 def detect_encoding(content: bytes) -> Tuple[str, bytes]:
@@ -699,24 +747,35 @@ def compute_row_id(row: pd.Series, natural_keys: List[str]) -> str:
         >>> len(row_id)
         64
     """
-    from datetime import datetime, date
-    
-    parts = []
-    for col in natural_keys:
-        val = row[col]
-        if pd.isna(val):
-            parts.append("")
-        elif isinstance(val, datetime):
-            parts.append(val.strftime('%Y-%m-%d'))
-        elif isinstance(val, date):
-            parts.append(val.isoformat())
-        else:
-            parts.append(str(val).strip())
-    
-    content = '\x1f'.join(parts)
+    content = '\x1f'.join(_row_id_part(row[col]) for col in natural_keys)
     return hashlib.sha256(content.encode('utf-8')).hexdigest()
 
 
+def _row_id_part(val: Any) -> str:
+    if pd.isna(val):
+        return ""
+    if isinstance(val, datetime):
+        return val.strftime('%Y-%m-%d')
+    if isinstance(val, date):
+        return val.isoformat()
+    return str(val).strip()
+
+
+def compute_row_ids(df: pd.DataFrame, natural_keys: List[str]) -> pd.Series:
+    """
+    Columnar compute_row_id for a whole frame.
+    
+    Walks the key columns as plain lists instead of materializing a Series per
+    row; produces exactly the same digests as compute_row_id.
+    """
+    columns = [[_row_id_part(v) for v in df[col].tolist()] for col in natural_keys]
+    row_ids = [
+        hashlib.sha256('\x1f'.join(parts).encode('utf-8')).hexdigest()
+        for parts in (zip(*columns) if columns else [()] * len(df))
+    ]
+    return pd.Series(row_ids, index=df.index, dtype=object)
+
+
 def check_natural_key_uniqueness(
     df: pd.DataFrame,
     natural_keys: List[str],
@@ -761,8 +820,8 @@ def check_natural_key_uniqueness(
         DuplicateKeyError: Duplicate natural keys detected: 5 duplicates
     """
     # Compute row_id for all rows
-    df = df.copy()
-    df['row_id'] = df.apply(lambda r: compute_row_id(r, natural_keys), axis=1)
+    df = df.copy(deep=False)
+    df['row_id'] = compute_row_ids(df, natural_keys)
     
     # Find duplicates
     duplicate_mask = df.duplicated(subset='row_id', keep=False)
@@ -804,14 +863,14 @@ def check_natural_key_uniqueness(
     return df, pd.DataFrame()
 
 
-def get_categorical_columns(schema_contract: Dict) -> Dict[str, Dict[str, Any]]:
+def get_categorical_columns(schema_contract: SchemaLike) -> Dict[str, Dict[str, Any]]:
     """
     Extract categorical column specifications from schema contract.
     
     Per Phase 0 Commit 4: Schema-driven categorical validation.
     
     Args:
-        schema_contract: Loaded JSON schema contract
+        schema_contract: Loaded JSON schema contract or SchemaPlan
         
     Returns:
         {column_name: {enum: [...], nullable: bool}}
@@ -822,19 +881,15 @@ def get_categorical_columns(schema_contract: Dict) -> Dict[str, Dict[str, Any]]:
         >>> print(cats['modifier']['enum'])
         ['', '26', 'TC', '53', ...]
     """
-    categorical = {}
-    for col_name, col_spec in schema_contract.get("columns", {}).items():
-        if col_spec.get("type") == "categorical":
-            categorical[col_name] = {
-                "enum": col_spec.get("enum", []),
-                "nullable": col_spec.get("nullable", True)
-            }
-    return categorical
+    return {
+        col_name: {"enum": list(spec.enum), "nullable": spec.nullable}
+        for col_name, spec in as_schema_plan(schema_contract).categorical.items()
+    }
 
 
 def enforce_categorical_dtypes(
     df: pd.DataFrame,
-    schema_contract: Dict,
+    schema_contract: SchemaLike,
     natural_keys: List[str],
     schema_id: Optional[str] = None,
     release_id: Optional[str] = None,
@@ -854,7 +909,7 @@ def enforce_categorical_dtypes(
     
     Args:
         df: Input DataFrame
-        schema_contract: Loaded schema contract (contains enum values, nullable)
+        schema_contract: Loaded schema contract or SchemaPlan (contains enum values, nullable)
         natural_keys: Natural key columns (for row_id computation)
         schema_id: Schema contract ID (for provenance)
         release_id: Release ID (for provenance)
@@ -891,46 +946,51 @@ def enforce_categorical_dtypes(
         >>> print(result.rejects_df[['validation_rule_id', 'validation_context']])
     """
     rejects_list = []
-    valid_df = df.copy()
     reject_counts_by_column = {}
     
-    # Extract categorical columns from schema contract
-    categorical_cols = get_categorical_columns(schema_contract)
+    # Categorical columns from the compiled schema plan
+    categorical_cols = as_schema_plan(schema_contract).categorical
+    
+    # Rows still valid; rejected rows are sliced out once per check and the
+    # survivors are materialized in a single filter at the end
+    keep = pd.Series(True, index=df.index)
+    dtype_updates = {}
     
     for col_name, col_spec in categorical_cols.items():
-        if col_name not in valid_df.columns:
+        if col_name not in df.columns:
             continue
         
-        allowed_values = col_spec["enum"]
-        nullable = col_spec["nullable"]
+        allowed_values = list(col_spec.enum)
+        nullable = col_spec.nullable
+        column = df[col_name]
         
         # Check 1: Null constraint
         if not nullable:
-            null_mask = valid_df[col_name].isna()
+            null_mask = keep & column.isna()
             if null_mask.any():
-                rejects = valid_df[null_mask].copy()
+                rejects = df[null_mask].copy()
                 rejects['validation_error'] = f"{col_name}: null not allowed"
                 rejects['validation_severity'] = severity.value
                 rejects['validation_rule_id'] = CategoricalRejectReason.NULL_NOT_ALLOWED.value
                 rejects['validation_column'] = col_name
                 rejects['validation_context'] = None  # No value to show
                 rejects_list.append(rejects)
-                valid_df = valid_df[~null_mask].copy()
+                keep &= ~null_mask
                 
                 reject_counts_by_column[col_name] = reject_counts_by_column.get(col_name, 0) + null_mask.sum()
         
         # Check 2: Domain constraint
-        invalid_mask = ~valid_df[col_name].isin(allowed_values + [None, pd.NA, ''])
+        invalid_mask = keep & ~column.isin(col_spec.accepted)
         
         if invalid_mask.any():
-            rejects = valid_df[invalid_mask].copy()
+            rejects = df[invalid_mask].copy()
             rejects['validation_error'] = f"{col_name}: not in allowed values"
             rejects['validation_severity'] = severity.value
             rejects['validation_rule_id'] = CategoricalRejectReason.UNKNOWN_VALUE.value
             rejects['validation_column'] = col_name
             rejects['validation_context'] = rejects[col_name].astype(str)  # Capture invalid value
             rejects_list.append(rejects)
-            valid_df = valid_df[~invalid_mask].copy()
+            keep &= ~invalid_mask
             
             reject_counts_by_column[col_name] = reject_counts_by_column.get(col_name, 0) + invalid_mask.sum()
             
@@ -942,11 +1002,13 @@ def enforce_categorical_dtypes(
                     f"Expected domain: {allowed_values[:10]}..."
                 )
         
-        # NOW safe to convert to categorical (after removing invalid rows)
+        # Safe to convert to categorical once invalid rows are filtered out
         if len(allowed_values) > 0:  # Only if enum defined
-            valid_df[col_name] = valid_df[col_name].astype(
-                pd.CategoricalDtype(categories=allowed_values)
-            )
+            dtype_updates[col_name] = pd.CategoricalDtype(categories=allowed_values)
+    
+    valid_df = (df if keep.all() else df[keep]).copy(deep=False)
+    if dtype_updates:
+        valid_df = valid_df.astype(dtype_updates)
     
     # Combine rejects
     if rejects_list:
@@ -954,7 +1016,7 @@ def enforce_categorical_dtypes(
         
         # Add provenance columns
         if natural_keys:
-            rejects_df['row_id'] = rejects_df.apply(lambda r: compute_row_id(r, natural_keys), axis=1)
+            rejects_df['row_id'] = compute_row_ids(rejects_df, natural_keys)
         if schema_id:
             rejects_df['schema_id'] = schema_id
         if release_id:
@@ -1047,7 +1109,7 @@ def normalize_string_columns(
         - STD-parser-contracts v1.7 Anti-Pattern 9: "Whitespace & NBSP in Codes"
         - STD-data-architecture §3.4 Normalize Stage
     """
-    df = df.copy()
+    df = df.copy(deep=False)
     
     # Determine which columns to normalize
     if columns is None:
@@ -1128,7 +1190,7 @@ def validate_required_metadata(
 
 def validate_layout_schema_alignment(
     layout: Dict[str, Any],
-    schema: Dict[str, Any]
+    schema: SchemaLike
 ) -> None:
     """
     Validate fixed-width layout column names match schema contract exactly.
@@ -1137,8 +1199,8 @@ def validate_layout_schema_alignment(
     Prevents 2-hour debugging sessions from layout-schema mismatches (PPRRVU lesson).
     
     Args:
-        layout: Layout dict from layout_registry.get_layout()
-        schema: Schema contract dict from SchemaRegistry
+        layout: Layout dict from layout_registry.get_layout() (or a LayoutPlan)
+        schema: Schema contract dict or SchemaPlan
         
     Raises:
         LayoutMismatchError: If columns don't align or API naming detected
@@ -1148,16 +1210,22 @@ def validate_layout_schema_alignment(
         >>> schema = registry.get_schema("cms_pprrvu_v1.1")
         >>> validate_layout_schema_alignment(layout, schema)  # Raises if mismatch
     """
-    schema_cols = set(schema['columns'].keys())
-    layout_cols = set(layout['columns'].keys())
-    
+    layout_cols = frozenset(layout['columns'].keys() if isinstance(layout, dict) else layout.names)
+    error = _layout_alignment_error(layout_cols, as_schema_plan(schema).columns)
+    if error:
+        raise LayoutMismatchError(error)
+
+
+@lru_cache(maxsize=256)
+def _layout_alignment_error(layout_cols: FrozenSet[str], schema_cols: FrozenSet[str]) -> Optional[str]:
+    """Alignment diagnosis for a (layout, schema) column pair; memoized across parses"""
     # Anti-pattern check FIRST: API names in layout (work_rvu vs rvu_work)
     # Check before missing columns because API naming is more specific diagnosis
     # Per §6.6, layouts MUST use schema-canonical names, not API presentation names
     api_patterns = ['work_rvu', 'mp_rvu', 'pe_rvu']
     found_api = [p for p in api_patterns if p in layout_cols]
     if found_api:
-        raise LayoutMismatchError(
+        return (
             f"Layout uses API naming: {found_api}. "
             f"Must use schema-canonical names (e.g., rvu_work not work_rvu, rvu_malp not mp_rvu). "
             f"See STD-parser-contracts §6.6 Schema vs API Naming Convention."
@@ -1166,12 +1234,14 @@ def validate_layout_schema_alignment(
     # Check for missing columns (after API naming check)
     missing = schema_cols - layout_cols
     if missing:
-        raise LayoutMismatchError(
+        return (
             f"Layout missing required schema columns: {sorted(missing)}. "
             f"Layout has: {sorted(layout_cols)}, "
             f"Schema expects: {sorted(schema_cols)}. "
             f"See STD-parser-contracts §7.3 for alignment requirements."
         )
+    
+    return None
 
 
 # ============================================================================
@@ -21,6 +21,7 @@ import zipfile
 import time
 import re
 
+from cms_pricing.ingestion.contracts.schema_registry import SchemaPlan, load_schema_plan
 from cms_pricing.ingestion.parsers._parser_kit import (
     ParseResult,
     ValidationResult,
@@ -35,7 +36,8 @@ from cms_pricing.ingestion.parsers._parser_kit import (
     canonicalize_numeric_col,
     validate_required_metadata,
     build_parser_metrics,
-    normalize_string_columns
+    normalize_string_columns,
+    add_constant_columns
 )
 
 logger = structlog.get_logger()
@@ -276,12 +278,12 @@ def parse_conversion_factor(
     # ========================================================================
     # Step 8: Inject Metadata Columns
     # ========================================================================
-    for col in ['release_id', 'vintage_date', 'product_year', 'quarter_vintage']:
-        unique_df[col] = metadata[col]
-    
-    unique_df['source_filename'] = filename
-    unique_df['source_file_sha256'] = metadata['file_sha256']
-    unique_df['source_uri'] = metadata.get('source_uri', '')
+    unique_df = add_constant_columns(unique_df, {
+        **{col: metadata[col] for col in ['release_id', 'vintage_date', 'product_year', 'quarter_vintage']},
+        'source_filename': filename,
+        'source_file_sha256': metadata['file_sha256'],
+        'source_uri': metadata.get('source_uri', ''),
+    })
     unique_df['parsed_at'] = pd.Timestamp.utcnow()
     
     # ========================================================================
@@ -711,44 +713,18 @@ def _apply_cf_guardrails(df: pd.DataFrame, metadata: Dict) -> Dict[str, Any]:
     return warnings
 
 
-def _load_schema(schema_id: str) -> Dict[str, Any]:
+def _load_schema(schema_id: str) -> SchemaPlan:
     """
-    Load schema contract with version stripping.
-    
-    Per STD-parser-contracts v1.6 §14.6.
-    Uses package-safe importlib.resources pattern.
-    
-    Pattern: cms_conversion_factor_v2.0 or cms_conversion_factor_v2.1
-    → looks for cms_conversion_factor_v2.0.json (filename uses MAJOR version)
+    Load the compiled schema plan with version stripping.
     
-    But CF schema file is actually cms_conversion_factor_v1.0.json (contains internal v2.0).
-    This is the transitional case - use filename v1.0 for now.
+    Per STD-parser-contracts v1.6 §14.6, schema filenames carry the MAJOR
+    version only: cms_conversion_factor_v2.1 resolves to
+    cms_conversion_factor_v2.0.json. Plans are compiled once per schema_id.
     
     Args:
         schema_id: Schema ID (e.g., 'cms_conversion_factor_v2.0')
         
     Returns:
-        Schema contract dict
+        Compiled SchemaPlan
     """
-    from importlib.resources import files
-    import json
-    from pathlib import Path
-    
-    # Standard pattern: schema filename uses MAJOR version only
-    # cms_conversion_factor_v2.1 → cms_conversion_factor_v2.0 (filename)
-    # cms_pprrvu_v1.1 → cms_pprrvu_v1.0 (filename)
-    # 
-    # For vX.0 IDs, this is a no-op (v2.0 → v2.0)
-    file_id = schema_id.rsplit('.', 1)[0] + '.0'
-    
-    # Package-safe load
-    try:
-        schema_path = files('cms_pricing.ingestion.contracts').joinpath(f'{file_id}.json')
-        with schema_path.open('r', encoding='utf-8') as f:
-            return json.load(f)
-    except Exception:
-        # Fallback for dev environment
-        schema_path = Path(__file__).parent.parent / 'contracts' / f'{file_id}.json'
-        with open(schema_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
-
+    return load_schema_plan(schema_id)
@@ -39,8 +39,10 @@ from cms_pricing.ingestion.parsers._parser_kit import (
     build_parser_metrics,
     ValidationSeverity,
     ParseError,
+    add_constant_columns,
 )
-from cms_pricing.ingestion.parsers.layout_registry import get_layout
+from cms_pricing.ingestion.contracts.schema_registry import SchemaPlan, load_schema_plan
+from cms_pricing.ingestion.parsers.layout_registry import LayoutPlan, get_layout_plan
 
 
 logger = structlog.get_logger(__name__)
@@ -53,6 +55,7 @@ logger = structlog.get_logger(__name__)
 PARSER_VERSION = "v1.0.0"
 SCHEMA_ID = "cms_gpci_v1.2"
 NATURAL_KEYS = ["locality_code", "effective_from"]
+DEFAULT_DATA_START = re.compile(r"^\d{5}")  # MAC code at line start
 
 # CSV/XLSX header aliases (CMS variations)
 ALIAS_MAP = {
@@ -153,13 +156,13 @@ def parse_gpci(
         df, inner_name = _parse_csv(content, encoding), filename
     elif filename.lower().endswith('.txt'):
         # TXT files: try fixed-width if layout exists, else CSV
-        layout = get_layout(
+        layout = get_layout_plan(
             product_year=metadata['product_year'],
             quarter_vintage=metadata['quarter_vintage'],
             dataset='gpci'
         )
         if layout:
-            logger.debug("Found layout for TXT file", dataset='gpci', version=layout.get('version'))
+            logger.debug("Found layout for TXT file", dataset='gpci', version=layout.version)
             df, inner_name = _parse_fixed_width(content, encoding, layout), filename
         else:
             df, inner_name = _parse_csv(content, encoding), filename
@@ -178,7 +181,7 @@ def parse_gpci(
     
     # Step 3.7: Log unmapped columns (catch future CMS header changes)
     unmapped = [c for c in df.columns 
-                if c not in schema['columns'] 
+                if c not in schema.columns 
                 and not c.startswith('_')
                 and c not in ['mac', 'state', 'locality_name']]
     if unmapped:
@@ -226,13 +229,14 @@ def parse_gpci(
         logger.warning(f"GPCI duplicates quarantined: {len(dupes_df)} rows")
 
     # Step 8: Inject metadata + provenance
-    for col in ['release_id', 'vintage_date', 'product_year', 'quarter_vintage']:
-        unique_df[col] = metadata[col]
-    unique_df['source_filename'] = filename
-    unique_df['source_file_sha256'] = metadata['file_sha256']
-    unique_df['source_uri'] = metadata.get('source_uri', '')
-    unique_df['source_release'] = metadata['source_release']
-    unique_df['source_inner_file'] = inner_name
+    unique_df = add_constant_columns(unique_df, {
+        **{col: metadata[col] for col in ['release_id', 'vintage_date', 'product_year', 'quarter_vintage']},
+        'source_filename': filename,
+        'source_file_sha256': metadata['file_sha256'],
+        'source_uri': metadata.get('source_uri', ''),
+        'source_release': metadata['source_release'],
+        'source_inner_file': inner_name,
+    })
     unique_df['parsed_at'] = pd.Timestamp.utcnow()
 
     # Step 9: Finalize (Core-only hash + sort)
@@ -310,7 +314,7 @@ def _parse_zip(content: bytes, encoding: str, metadata: Dict[str, Any]) -> Tuple
             if re.search(r'^\d{5}', sample, re.MULTILINE):
                 logger.debug(f"Detected fixed-width format in {inner}")
                 # It's fixed-width - get the layout using metadata
-                layout = get_layout(
+                layout = get_layout_plan(
                     product_year=metadata['product_year'],
                     quarter_vintage=metadata.get('quarter_vintage'),
                     dataset='gpci'
@@ -323,7 +327,7 @@ def _parse_zip(content: bytes, encoding: str, metadata: Dict[str, Any]) -> Tuple
             return _parse_csv(raw, encoding), inner
 
 
-def _parse_fixed_width(content: bytes, encoding: str, layout: Dict) -> pd.DataFrame:
+def _parse_fixed_width(content: bytes, encoding: str, layout: LayoutPlan) -> pd.DataFrame:
     """
     Read fixed-width using layout registry colspecs.
     
@@ -334,24 +338,20 @@ def _parse_fixed_width(content: bytes, encoding: str, layout: Dict) -> pd.DataFr
     # Detect data start (skip headers)
     lines = text.splitlines()
     data_start_idx = 0
-    pattern = layout.get('data_start_pattern', r'^\d{5}')
+    pattern = layout.data_start_pattern or DEFAULT_DATA_START
     
     for i, line in enumerate(lines):
-        if len(line) >= layout['min_line_length']:
-            if re.match(pattern, line.strip()):
+        if len(line) >= layout.min_line_length:
+            if pattern.match(line.strip()):
                 data_start_idx = i
                 break
     
     logger.debug("Fixed-width data start detected", line_index=data_start_idx)
     
-    # Build colspecs from layout
-    colspecs = [(c['start'], c['end']) for c in layout['columns'].values()]
-    names = list(layout['columns'].keys())
-    
     df = pd.read_fwf(
         StringIO('\n'.join(lines[data_start_idx:])),
-        colspecs=colspecs,
-        names=names,
+        colspecs=list(layout.colspecs),
+        names=list(layout.names),
         dtype=str
     )
     return df
@@ -523,24 +523,10 @@ def _validate_row_count(df: pd.DataFrame) -> Optional[str]:
     return None  # Within expected range [100, 120]
 
 
-def _load_schema(schema_id: str) -> Dict[str, Any]:
+def _load_schema(schema_id: str) -> SchemaPlan:
     """
-    Load schema contract (package-safe with fallback).
+    Load the compiled schema plan (cached per schema_id).
     
-    For cms_gpci_v1.2, loads cms_gpci_v1.2.json directly.
+    For cms_gpci_v1.2, compiles cms_gpci_v1.2.json once per process.
     """
-    from importlib.resources import files
-    import json
-    from pathlib import Path
-    
-    try:
-        # Package-safe load
-        schema_path = files('cms_pricing.ingestion.contracts').joinpath(f'{schema_id}.json')
-        with schema_path.open('r', encoding='utf-8') as f:
-            return json.load(f)
-    except Exception:
-        # Fallback for dev environment
-        schema_path = Path(__file__).parent.parent / 'contracts' / f'{schema_id}.json'
-        with open(schema_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
-
+    return load_schema_plan(schema_id)
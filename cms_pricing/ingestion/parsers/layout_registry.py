@@ -21,7 +21,10 @@ Compatible changes (patch version):
   - Description updates
 """
 
-from typing import Dict, Any, Optional
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Any, Optional, Pattern, Tuple
 from decimal import Decimal
 import structlog
 
@@ -242,6 +245,42 @@ def get_layout(
     return None
 
 
+@dataclass(frozen=True)
+class LayoutPlan:
+    """Immutable column spans of a fixed-width layout, in layout order"""
+    version: str
+    names: Tuple[str, ...]
+    colspecs: Tuple[Tuple[int, Optional[int]], ...]
+    nullable: Tuple[bool, ...]
+    min_line_length: int
+    data_start_pattern: Optional[Pattern[str]]
+    
+    @property
+    def spans(self) -> Tuple[Tuple[str, int, Optional[int]], ...]:
+        return tuple((name, start, end) for name, (start, end) in zip(self.names, self.colspecs))
+
+
+def compile_layout_plan(layout: Dict[str, Any]) -> LayoutPlan:
+    """Compile a layout dict into a LayoutPlan"""
+    columns = layout['columns']
+    pattern = layout.get('data_start_pattern')
+    return LayoutPlan(
+        version=layout['version'],
+        names=tuple(columns),
+        colspecs=tuple((spec['start'], spec['end']) for spec in columns.values()),
+        nullable=tuple(spec.get('nullable', True) for spec in columns.values()),
+        min_line_length=layout.get('min_line_length', 0),
+        data_start_pattern=re.compile(pattern) if pattern else None,
+    )
+
+
+@lru_cache(maxsize=64)
+def get_layout_plan(product_year: str, quarter_vintage: str, dataset: str) -> Optional[LayoutPlan]:
+    """Compiled layout for dataset and vintage, built once per (year, vintage, dataset)"""
+    layout = get_layout(product_year, quarter_vintage, dataset)
+    return compile_layout_plan(layout) if layout else None
+
+
 def parse_fixed_width_record(line: str, layout: Dict[str, Any]) -> Dict[str, Any]:
     """
     Parse a fixed-width line using layout specification.
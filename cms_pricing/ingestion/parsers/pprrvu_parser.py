@@ -24,11 +24,11 @@ from cms_pricing.ingestion.parsers._parser_kit import (
     finalize_parser_output,
     check_natural_key_uniqueness,
     canonicalize_numeric_col,
-    compute_row_id
+    compute_row_id,
+    add_constant_columns
 )
-from cms_pricing.ingestion.parsers.layout_registry import get_layout
-import json
-from pathlib import Path
+from cms_pricing.ingestion.contracts.schema_registry import load_schema_plan
+from cms_pricing.ingestion.parsers.layout_registry import get_layout_plan
 
 logger = structlog.get_logger()
 
@@ -131,15 +131,9 @@ def parse_pprrvu(
     # Step 4: Cast dtypes (explicit, no coercion)
     df = _cast_dtypes(df, metadata)
     
-    # Step 5: Load schema contract (JSON file)
+    # Step 5: Load compiled schema plan (cached per schema_id)
     # Schema files are named without minor version: cms_pprrvu_v1.0.json contains v1.1 spec
-    schema_id = metadata.get('schema_id', SCHEMA_ID)
-    # Strip minor version: cms_pprrvu_v1.1 → cms_pprrvu_v1.0
-    schema_base = schema_id.rsplit('.', 1)[0] if '.' in schema_id else schema_id
-    schema_file = Path(__file__).parent.parent / "contracts" / f"{schema_base}.0.json"
-    
-    with open(schema_file) as f:
-        schema = json.load(f)
+    schema = load_schema_plan(metadata.get('schema_id', SCHEMA_ID))
     
     # Step 6: Categorical validation (BEFORE casting to categorical)
     cat_result = enforce_categorical_dtypes(
@@ -161,13 +155,15 @@ def parse_pprrvu(
     )
     
     # Step 8: Inject metadata columns
-    unique_df['release_id'] = metadata['release_id']
-    unique_df['vintage_date'] = metadata.get('vintage_date')
-    unique_df['product_year'] = metadata['product_year']
-    unique_df['quarter_vintage'] = metadata['quarter_vintage']
-    unique_df['source_filename'] = filename
-    unique_df['source_file_sha256'] = metadata['file_sha256']
-    unique_df['source_uri'] = metadata.get('source_uri', '')
+    unique_df = add_constant_columns(unique_df, {
+        'release_id': metadata['release_id'],
+        'vintage_date': metadata.get('vintage_date'),
+        'product_year': metadata['product_year'],
+        'quarter_vintage': metadata['quarter_vintage'],
+        'source_filename': filename,
+        'source_file_sha256': metadata['file_sha256'],
+        'source_uri': metadata.get('source_uri', ''),
+    })
     unique_df['parsed_at'] = pd.Timestamp.utcnow()
     unique_df['schema_id'] = metadata['schema_id']
     
@@ -236,8 +232,8 @@ def _parse_fixed_width(content: bytes, encoding: str, metadata: Dict) -> pd.Data
     year = metadata.get('product_year', '2025')
     quarter_vintage = metadata.get('quarter_vintage', '2025Q4')
     
-    # layout_registry.get_layout(product_year, quarter_vintage, dataset)
-    layout = get_layout(year, quarter_vintage, 'pprrvu')
+    # layout_registry.get_layout_plan(product_year, quarter_vintage, dataset)
+    layout = get_layout_plan(year, quarter_vintage, 'pprrvu')
     
     if layout is None:
         raise LayoutMismatchError(
@@ -248,7 +244,8 @@ def _parse_fixed_width(content: bytes, encoding: str, metadata: Dict) -> pd.Data
     # Skip header rows (lines starting with 'HDR')
     data_lines = [line for line in lines if not line.startswith('HDR')]
     
-    min_length = layout.get('min_line_length', 165)
+    min_length = layout.min_line_length or 165
+    spans = layout.spans
     
     records = []
     for line_num, line in enumerate(data_lines, start=1):
@@ -258,9 +255,7 @@ def _parse_fixed_width(content: bytes, encoding: str, metadata: Dict) -> pd.Data
         
         try:
             record = {}
-            for col_name, col_spec in layout['columns'].items():
-                start = col_spec['start']
-                end = col_spec['end']
+            for col_name, start, end in spans:
                 value = line[start:end].strip()
                 record[col_name] = value if value else None
             
@@ -0,0 +1,300 @@
+"""
+Lazy ZIP bundle reader
+
+Quarterly RVU bundles carry several large members (PPRRVU, GPCI, OPPSCAP,
+ANES, LOCCO) and most jobs need only some of them. ZipBundle lists and
+routes members from the central directory alone (route_to_parser on the
+member name), streams just the selected members straight out of the
+archive, and parses independent members concurrently in a process pool.
+Parsed frames can be cached by member CRC so an unchanged member in a
+re-landed or re-issued bundle is never parsed twice.
+"""
+
+import hashlib
+import io
+import os
+import re
+import tempfile
+import zipfile
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import IO, Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Union
+
+import pandas as pd
+import structlog
+
+from cms_pricing.config import settings
+from cms_pricing.ingestion.parsers import PARSER_ROUTING, route_to_parser
+
+logger = structlog.get_logger()
+
+MemberParser = Callable[[IO[bytes], str], Any]
+
+# Bump when a change here alters the frames parsers produce, so persisted
+# member cache entries from older code are no longer matched
+PARSER_VERSION = "1"
+
+
+@dataclass(frozen=True)
+class BundleMember:
+    """A ZIP member as described by the central directory (nothing read)"""
+    name: str
+    dataset: Optional[str]
+    crc: int
+    file_size: int
+    compress_size: int
+
+    @property
+    def basename(self) -> str:
+        return self.name.rsplit("/", 1)[-1]
+
+
+@dataclass
+class MemberResult:
+    member: BundleMember
+    frame: Any
+    cached: bool = False
+
+
+@lru_cache(maxsize=1024)
+def route_member(name: str) -> Optional[str]:
+    """Dataset for a member name, or None if no routing pattern matches"""
+    basename = name.rsplit("/", 1)[-1]
+    # Pre-check the patterns so unrouted members (readmes, PDFs) skip the
+    # schema lookup and the router's error log
+    if not any(re.match(pattern, basename, re.IGNORECASE) for pattern in PARSER_ROUTING):
+        return None
+    try:
+        return route_to_parser(basename).dataset
+    except ValueError:
+        return None
+
+
+def parser_key(parser: Callable) -> str:
+    """Stable identity of a parser for cache keys"""
+    module = getattr(parser, "__module__", None) or type(parser).__module__
+    qualname = getattr(parser, "__qualname__", None) or type(parser).__qualname__
+    return f"{module}.{qualname}"
+
+
+def _parse_member(archive_path: str, member_name: str, parser: MemberParser) -> Any:
+    """Process pool task: open the archive in the worker and stream one member"""
+    with zipfile.ZipFile(archive_path) as zf, zf.open(member_name) as f:
+        return parser(f, member_name)
+
+
+class MemberCache:
+    """
+    Parsed member frames keyed by parser version, parser, member name and CRC.
+
+    Frames are held in a bounded in-memory LRU and, when cache_dir is set,
+    as parquet files so results survive across runs. Copies are returned so
+    callers may modify them freely. Only DataFrames are cached.
+    """
+
+    def __init__(self, cache_dir: Optional[Union[str, Path]] = None, max_items: int = 32):
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.max_items = max_items
+        self._memory: "OrderedDict[str, pd.DataFrame]" = OrderedDict()
+
+    @staticmethod
+    def key(parser: Callable, member: BundleMember, version: str = "") -> str:
+        """Cache key; version is the caller's parser/schema version for the member's dataset"""
+        return (
+            f"{PARSER_VERSION}:{version}:{parser_key(parser)}:"
+            f"{member.basename}:{member.crc:08x}:{member.file_size}"
+        )
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{hashlib.sha256(key.encode()).hexdigest()}.parquet"
+
+    def get(self, key: str) -> Optional[pd.DataFrame]:
+        frame = self._memory.get(key)
+        if frame is not None:
+            self._memory.move_to_end(key)
+            return frame.copy()
+        if self.cache_dir is None:
+            return None
+
+        path = self._path(key)
+        if not path.exists():
+            return None
+        try:
+            frame = pd.read_parquet(path)
+        except Exception as e:
+            logger.warning("Ignoring unreadable member cache entry", path=str(path), error=str(e))
+            return None
+        self._remember(key, frame)
+        return frame.copy()
+
+    def put(self, key: str, frame: Any):
+        if not isinstance(frame, pd.DataFrame):
+            return
+        self._remember(key, frame.copy())
+        if self.cache_dir is None or frame.empty:
+            return
+
+        path = self._path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(".parquet.tmp")
+            frame.to_parquet(tmp_path, index=False)
+            tmp_path.replace(path)
+        except Exception as e:
+            logger.warning("Failed to persist member cache entry", path=str(path), error=str(e))
+
+    def _remember(self, key: str, frame: pd.DataFrame):
+        self._memory[key] = frame
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_items:
+            self._memory.popitem(last=False)
+
+
+class ZipBundle:
+    """
+    A ZIP archive whose members are routed by name and read on demand.
+
+    source is a path or the archive bytes. fallback_dataset is assigned to
+    members the router does not recognise (e.g. every member of a bundle
+    named gpci.zip). Use as a context manager or call close().
+    """
+
+    def __init__(self, source: Union[str, Path, bytes], fallback_dataset: Optional[str] = None):
+        self.fallback_dataset = fallback_dataset
+        self._bytes: Optional[bytes] = None
+        self._path: Optional[str] = None
+        self._spooled: Optional[str] = None
+        if isinstance(source, (bytes, bytearray)):
+            self._bytes = bytes(source)
+            self._zf = zipfile.ZipFile(io.BytesIO(self._bytes))
+        else:
+            self._path = str(source)
+            self._zf = zipfile.ZipFile(self._path)
+
+    def __enter__(self) -> "ZipBundle":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._zf.close()
+        if self._spooled is not None:
+            try:
+                os.unlink(self._spooled)
+            except OSError:
+                pass
+            self._spooled = None
+
+    def members(
+        self,
+        datasets: Optional[Iterable[str]] = None,
+        suffixes: Optional[Sequence[str]] = None
+    ) -> List[BundleMember]:
+        """Members in archive order, optionally limited by dataset and suffix"""
+        wanted = set(datasets) if datasets is not None else None
+        suffixes = tuple(s.lower() for s in suffixes) if suffixes else None
+
+        members = []
+        for info in self._zf.infolist():
+            if info.is_dir():
+                continue
+            if suffixes and not info.filename.lower().endswith(suffixes):
+                continue
+            member = BundleMember(
+                name=info.filename,
+                dataset=route_member(info.filename) or self.fallback_dataset,
+                crc=info.CRC,
+                file_size=info.file_size,
+                compress_size=info.compress_size,
+            )
+            if wanted is not None and member.dataset not in wanted:
+                continue
+            members.append(member)
+        return members
+
+    def open(self, member: Union[BundleMember, str]) -> IO[bytes]:
+        """Stream a member's decompressed bytes"""
+        name = member.name if isinstance(member, BundleMember) else member
+        return self._zf.open(name)
+
+    def _archive_path(self) -> str:
+        """Path worker processes can open; byte sources are spooled once"""
+        if self._path is not None:
+            return self._path
+        if self._spooled is None:
+            fd, self._spooled = tempfile.mkstemp(suffix=".zip")
+            with os.fdopen(fd, "wb") as f:
+                f.write(self._bytes)
+        return self._spooled
+
+    def parse(
+        self,
+        members: Sequence[BundleMember],
+        parser: Union[MemberParser, Mapping[str, MemberParser]],
+        max_workers: Optional[int] = None,
+        cache: Optional[MemberCache] = None,
+        executor: Optional[Executor] = None,
+        versions: Optional[Mapping[str, str]] = None
+    ) -> List[MemberResult]:
+        """
+        Parse members, concurrently when more than one needs parsing.
+
+        parser is called as parser(stream, member_name); pass a mapping of
+        dataset -> parser to parse each dataset differently (members with no
+        entry are skipped). Parsers run in worker processes, so they must be
+        picklable: module-level functions or classmethods. versions maps
+        dataset -> parser/schema version and becomes part of the cache key,
+        so parser fixes invalidate cached frames. Results come back in member
+        order.
+        """
+        if max_workers is None:
+            max_workers = settings.bundle_parse_max_workers
+
+        versions = versions or {}
+        results: Dict[str, MemberResult] = {}
+        pending = []
+        for member in members:
+            member_parser = parser.get(member.dataset) if isinstance(parser, Mapping) else parser
+            if member_parser is None:
+                continue
+            key = MemberCache.key(member_parser, member, versions.get(member.dataset, ""))
+            if cache is not None:
+                frame = cache.get(key)
+                if frame is not None:
+                    results[member.name] = MemberResult(member, frame, cached=True)
+                    continue
+            pending.append((member, member_parser, key))
+
+        if len(pending) <= 1 or (max_workers <= 1 and executor is None):
+            for member, member_parser, _ in pending:
+                with self.open(member) as f:
+                    results[member.name] = MemberResult(member, member_parser(f, member.name))
+        else:
+            archive_path = self._archive_path()
+            pool = executor or ProcessPoolExecutor(max_workers=min(max_workers, len(pending)))
+            try:
+                futures = [
+                    (member, pool.submit(_parse_member, archive_path, member.name, member_parser))
+                    for member, member_parser, _ in pending
+                ]
+                for member, future in futures:
+                    results[member.name] = MemberResult(member, future.result())
+            finally:
+                if executor is None:
+                    pool.shutdown()
+
+        if cache is not None:
+            for member, _, key in pending:
+                cache.put(key, results[member.name].frame)
+
+        logger.debug(
+            "Parsed bundle members",
+            members=len(results),
+            parsed=len(pending),
+            cached=len(results) - len(pending)
+        )
+        return [results[member.name] for member in members if member.name in results]
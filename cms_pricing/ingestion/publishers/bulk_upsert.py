@@ -0,0 +1,160 @@
+"""
+Set-based bulk upserts for curated database tables
+
+Rows are streamed into a temporary staging table in batches, classified
+against the target in SQL (inserted / updated / unchanged) and merged with
+one statement: INSERT ... ON CONFLICT DO UPDATE on PostgreSQL and SQLite,
+or an UPDATE + INSERT ... WHERE NOT EXISTS pair on other dialects. Rows
+whose compared columns are unchanged are left untouched, so reruns of the
+same release are no-ops.
+"""
+
+import uuid
+from dataclasses import dataclass, asdict
+from itertools import chain, islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+import structlog
+from sqlalchemy import Column, MetaData, Table, and_, exists, func, literal, or_, select, true
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+logger = structlog.get_logger()
+
+DEFAULT_BATCH_SIZE = 5000
+
+_ON_CONFLICT_INSERTS = {
+    "postgresql": postgresql_insert,
+    "sqlite": sqlite_insert,
+}
+
+
+@dataclass
+class UpsertResult:
+    """Row counts from a bulk upsert"""
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+
+    @property
+    def total(self) -> int:
+        return self.inserted + self.updated + self.unchanged
+
+    def to_dict(self) -> Dict[str, int]:
+        return {**asdict(self), "total": self.total}
+
+
+def _batches(records: Iterable[Dict[str, Any]], batch_size: int) -> Iterator[List[Dict[str, Any]]]:
+    iterator = iter(records)
+    while True:
+        batch = list(islice(iterator, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+def _staging_table(table: Table) -> Table:
+    """Temporary, constraint-free copy of the target's columns"""
+    return Table(
+        f"{table.name}_stage_{uuid.uuid4().hex[:8]}",
+        MetaData(),
+        *[Column(column.name, column.type) for column in table.columns],
+        prefixes=["TEMPORARY"],
+    )
+
+
+def bulk_upsert(
+    db: Session,
+    table: Table,
+    records: Iterable[Dict[str, Any]],
+    key_columns: Sequence[str],
+    compare_columns: Optional[Sequence[str]] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> UpsertResult:
+    """
+    Merge records into table on key_columns within the session's transaction.
+
+    Keys must be unique within records and backed by a primary key or
+    unique constraint on the table. A matched row is updated only when one
+    of compare_columns (default: every non-key column written) differs,
+    and then every written column is replaced. Compare columns absent from
+    the records are ignored. The caller commits.
+    """
+    records = iter(records)
+    first_batch = next(_batches(records, batch_size), None)
+    if not first_batch:
+        return UpsertResult()
+
+    columns = list(first_batch[0].keys())
+    key_columns = list(key_columns)
+    update_columns = [name for name in columns if name not in key_columns]
+    if compare_columns is None:
+        compare_columns = update_columns
+    else:
+        compare_columns = [name for name in compare_columns if name in columns]
+
+    # The staging table lives in the session's transaction; on failure the
+    # caller's rollback discards it along with the partial merge
+    connection = db.connection()
+    stage = _staging_table(table)
+    stage.create(connection)
+
+    staged = 0
+    for batch in chain([first_batch], _batches(records, batch_size)):
+        connection.execute(stage.insert(), batch)
+        staged += len(batch)
+
+    result = _classify(connection, table, stage, key_columns, compare_columns, staged)
+    _merge(connection, table, stage, columns, key_columns, update_columns, compare_columns)
+    stage.drop(connection)
+
+    logger.info("Bulk upsert complete", table=table.name, **result.to_dict())
+    return result
+
+
+def _classify(connection, table: Table, stage: Table, key_columns, compare_columns, staged: int) -> UpsertResult:
+    """Count staged rows that are new, changed and unchanged relative to the target"""
+    joined = stage.join(table, and_(*[table.c[name] == stage.c[name] for name in key_columns]))
+    matched = connection.execute(select(func.count()).select_from(joined)).scalar_one()
+    unchanged = connection.execute(
+        select(func.count()).select_from(joined).where(
+            and_(true(), *[table.c[name].is_not_distinct_from(stage.c[name]) for name in compare_columns])
+        )
+    ).scalar_one()
+    return UpsertResult(inserted=staged - matched, updated=matched - unchanged, unchanged=unchanged)
+
+
+def _merge(connection, table: Table, stage: Table, columns, key_columns, update_columns, compare_columns):
+    staged_rows = select(*[stage.c[name] for name in columns])
+    dialect_insert = _ON_CONFLICT_INSERTS.get(connection.dialect.name)
+
+    if dialect_insert is not None:
+        # WHERE true keeps SQLite from parsing ON CONFLICT as a join constraint
+        stmt = dialect_insert(table).from_select(columns, staged_rows.where(true()))
+        if update_columns and compare_columns:
+            stmt = stmt.on_conflict_do_update(
+                index_elements=key_columns,
+                set_={name: stmt.excluded[name] for name in update_columns},
+                where=or_(*[table.c[name].is_distinct_from(stmt.excluded[name]) for name in compare_columns]),
+            )
+        else:
+            stmt = stmt.on_conflict_do_nothing(index_elements=key_columns)
+        connection.execute(stmt)
+        return
+
+    # Portable fallback: update changed rows, then insert new ones
+    key_match = and_(*[table.c[name] == stage.c[name] for name in key_columns])
+    if update_columns and compare_columns:
+        changed = or_(*[table.c[name].is_distinct_from(stage.c[name]) for name in compare_columns])
+        connection.execute(
+            table.update()
+            .where(exists(select(literal(1)).select_from(stage).where(and_(key_match, changed))))
+            .values({name: select(stage.c[name]).where(key_match).scalar_subquery() for name in update_columns})
+        )
+    connection.execute(
+        table.insert().from_select(
+            columns,
+            staged_rows.where(~exists(select(literal(1)).select_from(table).where(key_match)))
+        )
+    )
@@ -6,7 +6,10 @@ This module provides snapshot and latest-effective view publishing capabilities
 for curated datasets following DIS standards.
 """
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from datetime import datetime, date
@@ -17,6 +20,38 @@ import structlog
 logger = structlog.get_logger()
 
 
+def constant_arrow_column(value: Any, length: int) -> pa.Array:
+    """
+    Arrow column repeating one value.
+    
+    Dates become date32 and datetimes timestamps; anything else is
+    dictionary-encoded so the value is stored once with int8 indices.
+    """
+    if isinstance(value, datetime):
+        return pa.array(np.full(length, np.datetime64(value, 'us')))
+    if isinstance(value, date):
+        return pa.array(np.full(length, np.datetime64(value, 'D')))
+    indices = pa.array(np.zeros(length, dtype=np.int8))
+    return pa.DictionaryArray.from_arrays(indices, pa.array([value]))
+
+
+def to_arrow_table(df: pd.DataFrame, constants: Optional[Dict[str, Any]] = None) -> pa.Table:
+    """
+    Convert a frame to an Arrow table and attach constant metadata columns.
+    
+    The frame itself is neither copied nor modified; constant columns replace
+    same-named columns from the frame.
+    """
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    for name, value in (constants or {}).items():
+        column = constant_arrow_column(value, table.num_rows)
+        if name in table.column_names:
+            table = table.set_column(table.column_names.index(name), name, column)
+        else:
+            table = table.append_column(name, column)
+    return table
+
+
 @dataclass
 class PublishSpec:
     """Specification for data publishing"""
@@ -87,17 +122,20 @@ class ParquetPublisher(DataPublisher):
         output_dir = self.output_dir / "curated" / "payments" / spec.table_name / str(vintage_date)
         output_dir.mkdir(parents=True, exist_ok=True)
         
-        # Add metadata columns
-        df = df.copy()
-        df['vintage_date'] = vintage_date
-        df['release_id'] = release_id
-        df['published_at'] = datetime.utcnow()
+        # Build the Arrow table once; metadata columns are constants
+        table = to_arrow_table(df, {
+            'vintage_date': vintage_date,
+            'release_id': release_id,
+            'published_at': datetime.utcnow()
+        })
         
         file_paths = []
         
         if spec.partition_columns:
-            # Partitioned output
-            for partition_values, partition_df in df.groupby(spec.partition_columns):
+            # Partitioned output: group on the partition keys only, then slice the table
+            keys = table.select(spec.partition_columns).to_pandas()
+            groups = keys.groupby(spec.partition_columns, observed=True).indices
+            for partition_values, row_indices in groups.items():
                 if isinstance(partition_values, tuple):
                     partition_path = "/".join(f"{col}={val}" for col, val in zip(spec.partition_columns, partition_values))
                 else:
@@ -107,12 +145,12 @@ class ParquetPublisher(DataPublisher):
                 partition_dir.mkdir(parents=True, exist_ok=True)
                 
                 file_path = partition_dir / f"{spec.table_name}.parquet"
-                partition_df.to_parquet(file_path, compression=spec.compression, index=False)
+                pq.write_table(table.take(pa.array(row_indices)), file_path, compression=spec.compression)
                 file_paths.append(str(file_path))
         else:
             # Single file output
             file_path = output_dir / f"{spec.table_name}.parquet"
-            df.to_parquet(file_path, compression=spec.compression, index=False)
+            pq.write_table(table, file_path, compression=spec.compression)
             file_paths.append(str(file_path))
         
         # Create latest-effective view if requested
@@ -211,8 +249,8 @@ class CSVPublisher(DataPublisher):
         output_dir = self.output_dir / "curated" / "payments" / spec.table_name / str(vintage_date)
         output_dir.mkdir(parents=True, exist_ok=True)
         
-        # Add metadata columns
-        df = df.copy()
+        # Add metadata columns (shallow copy; the caller's frame is untouched)
+        df = df.copy(deep=False)
         df['vintage_date'] = vintage_date
         df['release_id'] = release_id
         df['published_at'] = datetime.utcnow()
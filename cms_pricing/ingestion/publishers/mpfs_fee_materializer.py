@@ -0,0 +1,144 @@
+"""
+Materialized MPFS Fee Table
+
+Precomputes the fully adjusted MPFS allowed amount for every HCPCS/modifier
+x locality x facility/non-facility combination of a release:
+
+    [(work RVU x GPCI work) + (PE RVU x GPCI PE) + (MP RVU x GPCI MP)] x CF
+
+The result is published as a curated snapshot under
+curated/payments/mpfs_fee_schedule/<vintage>/ with lineage back to the
+PPRRVU, GPCI and conversion factor releases.
+"""
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import structlog
+
+from cms_pricing.services.mpfs_fee_table import DATASET, LINEAGE_KEY
+
+logger = structlog.get_logger()
+
+
+def _numeric(df: pd.DataFrame, *names: str) -> np.ndarray:
+    """First of `names` present in df as float64 (missing column -> all NaN)"""
+    for name in names:
+        if name in df.columns:
+            return pd.to_numeric(df[name], errors="coerce").to_numpy(dtype=np.float64)
+    return np.full(len(df), np.nan)
+
+
+def _cents(amounts: np.ndarray) -> pa.Array:
+    """Round half-up to whole cents; NaN amounts become nulls"""
+    missing = np.isnan(amounts)
+    cents = np.floor(np.where(missing, 0.0, amounts) * 100 + 0.5).astype(np.int32)
+    return pa.array(cents, mask=missing)
+
+
+def build_lineage(pprrvu_release_id: str, gpci_release_id: str, cf_release_id: str) -> Dict[str, str]:
+    """Source release IDs plus a digest identifying the combination"""
+    lineage = {
+        "pprrvu_release_id": pprrvu_release_id,
+        "gpci_release_id": gpci_release_id,
+        "cf_release_id": cf_release_id,
+    }
+    content = "|".join(f"{key}={value}" for key, value in sorted(lineage.items()))
+    lineage["digest"] = hashlib.sha256(content.encode("utf-8")).hexdigest()
+    return lineage
+
+
+def physician_conversion_factor(cf_df: pd.DataFrame) -> float:
+    """The physician CF from conversion factor parser output"""
+    physician = cf_df[cf_df["cf_type"].astype(str) == "physician"]
+    if physician.empty:
+        raise ValueError("No physician conversion factor in CF data")
+    return float(physician["cf_value"].iloc[0])
+
+
+def materialize_mpfs_fees(
+    pprrvu: pd.DataFrame,
+    gpci: pd.DataFrame,
+    conversion_factor: float,
+    year: int,
+    lineage: Dict[str, str]
+) -> pa.Table:
+    """
+    Cross every PPRRVU row with every GPCI locality.
+    
+    Args:
+        pprrvu: PPRRVU rows (hcpcs, modifier, rvu_work, rvu_pe_fac, rvu_pe_nonfac, rvu_malp)
+        gpci: GPCI rows (locality_code or locality_id, gpci_work, gpci_pe, gpci_mp)
+        conversion_factor: Physician conversion factor for the release
+        year: Product year of the release
+        lineage: Output of build_lineage, stored in the Parquet schema metadata
+    
+    Returns:
+        Arrow table, one row per code x locality, amounts in int32 cents
+    """
+    rvus = pprrvu.assign(modifier=pprrvu["modifier"].fillna("").astype(str).str.strip())
+    rvus = rvus.drop_duplicates(subset=["hcpcs", "modifier"], keep="first")
+    locality_col = "locality_id" if "locality_id" in gpci.columns else "locality_code"
+    gpcis = gpci.drop_duplicates(subset=[locality_col], keep="first")
+    
+    # Work and MP are setting-independent; only the PE RVU differs
+    work = np.nan_to_num(_numeric(rvus, "rvu_work", "work_rvu"))[:, None] * _numeric(gpcis, "gpci_work")[None, :]
+    mp = np.nan_to_num(_numeric(rvus, "rvu_malp", "mp_rvu"))[:, None] * _numeric(gpcis, "gpci_mp", "gpci_malp")[None, :]
+    gpci_pe = _numeric(gpcis, "gpci_pe")[None, :]
+    pe_fac = np.nan_to_num(_numeric(rvus, "rvu_pe_fac", "pe_fac_rvu"))[:, None] * gpci_pe
+    # A missing non-facility PE RVU (NA indicator) leaves the non-facility amount unpriced
+    pe_nonfac = _numeric(rvus, "rvu_pe_nonfac", "pe_nf_rvu")[:, None] * gpci_pe
+    
+    facility = (work + pe_fac + mp) * conversion_factor
+    non_facility = (work + pe_nonfac + mp) * conversion_factor
+    
+    n_codes, n_localities = facility.shape
+    code_idx = np.repeat(np.arange(n_codes, dtype=np.int32), n_localities)
+    locality_idx = np.tile(np.arange(n_localities, dtype=np.int32), n_codes)
+    
+    table = pa.table({
+        "year": pa.array(np.full(n_codes * n_localities, year, dtype=np.int16)),
+        "hcpcs": pa.DictionaryArray.from_arrays(code_idx, pa.array(rvus["hcpcs"].astype(str).tolist())),
+        "modifier": pa.DictionaryArray.from_arrays(code_idx, pa.array(rvus["modifier"].tolist())),
+        "locality_id": pa.DictionaryArray.from_arrays(
+            locality_idx, pa.array(gpcis[locality_col].astype(str).str.strip().tolist())
+        ),
+        "facility_cents": _cents(facility.ravel()),
+        "non_facility_cents": _cents(non_facility.ravel()),
+    })
+    return table.replace_schema_metadata({LINEAGE_KEY: json.dumps(lineage).encode("utf-8")})
+
+
+def publish_mpfs_fee_table(table: pa.Table, output_dir: Path, vintage: str) -> Path:
+    """Write the materialized table where the snapshot store picks it up"""
+    target_dir = Path(output_dir) / "curated" / "payments" / DATASET / str(vintage)
+    target_dir.mkdir(parents=True, exist_ok=True)
+    path = target_dir / f"{DATASET}.parquet"
+    pq.write_table(table, path, compression="snappy")
+    
+    logger.info("Published materialized MPFS fee table", path=str(path), rows=table.num_rows)
+    return path
+
+
+def materialize_and_publish(
+    pprrvu: pd.DataFrame,
+    gpci: pd.DataFrame,
+    cf_df: pd.DataFrame,
+    year: int,
+    output_dir: Path,
+    vintage: str,
+    lineage: Dict[str, str]
+) -> Optional[Path]:
+    """Publish-stage entry point; returns None when the release lacks an input"""
+    if pprrvu is None or pprrvu.empty or gpci is None or gpci.empty or cf_df is None or cf_df.empty:
+        logger.info("Skipping MPFS fee materialization; PPRRVU, GPCI and CF are all required",
+                   vintage=vintage)
+        return None
+    table = materialize_mpfs_fees(pprrvu, gpci, physician_conversion_factor(cf_df), year, lineage)
+    return publish_mpfs_fee_table(table, output_dir, vintage)
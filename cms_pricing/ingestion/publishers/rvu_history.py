@@ -0,0 +1,131 @@
+"""
+Multi-year RVU History Store
+
+Every published PPRRVU vintage is also written as a slice under
+curated/history/rvu_items/slices/<vintage>.parquet, and all slices are
+compacted into one file sorted by hcpcs, modifier, effective_from and
+vintage. Each code's rows across all vintages therefore form one
+contiguous run, and the small row groups carry min/max statistics, so a
+per-code or code-list history read only touches the row groups that can
+hold those codes instead of scanning every vintage.
+"""
+
+import fcntl
+import os
+import uuid
+from pathlib import Path
+from typing import Optional
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+import structlog
+
+from cms_pricing.services.rvu_history import HISTORY_DIR, HISTORY_FILE, HISTORY_SCHEMA, SORT_KEYS
+
+logger = structlog.get_logger()
+
+# Small row groups keep per-code reads selective; ~20k codes x 4 quarters a year
+ROW_GROUP_SIZE = 8192
+
+# Ingestor column -> history column, first present wins
+COLUMN_SOURCES = {
+    "hcpcs": ("hcpcs", "hcpcs_code"),
+    "modifier": ("modifier",),
+    "description": ("description",),
+    "status_code": ("status_code",),
+    "global_days": ("global_days",),
+    "rvu_work": ("rvu_work", "work_rvu"),
+    "rvu_pe_nonfac": ("rvu_pe_nonfac", "pe_rvu_nonfac"),
+    "rvu_pe_fac": ("rvu_pe_fac", "pe_rvu_fac"),
+    "rvu_malp": ("rvu_malp", "mp_rvu"),
+    "na_indicator": ("na_indicator",),
+    "effective_from": ("effective_from", "effective_start"),
+    "effective_to": ("effective_to", "effective_end"),
+    "source_filename": ("source_filename", "source_file"),
+}
+
+
+def history_slice(pprrvu: pd.DataFrame, vintage: str) -> pa.Table:
+    """PPRRVU rows of one vintage in the history schema, sorted"""
+    columns = {}
+    for name, sources in COLUMN_SOURCES.items():
+        source = next((s for s in sources if s in pprrvu.columns), None)
+        columns[name] = pprrvu[source] if source is not None else pd.Series([None] * len(pprrvu), index=pprrvu.index)
+
+    frame = pd.DataFrame(columns)
+    for name in ("hcpcs", "modifier"):
+        frame[name] = frame[name].fillna("").astype(str).str.strip()
+    for name in ("rvu_work", "rvu_pe_nonfac", "rvu_pe_fac", "rvu_malp"):
+        frame[name] = pd.to_numeric(frame[name], errors="coerce")
+    for name in ("effective_from", "effective_to"):
+        dates = pd.to_datetime(frame[name], errors="coerce")
+        frame[name] = dates.dt.date.astype(object).where(dates.notna(), None)
+    for name in ("description", "status_code", "global_days", "na_indicator", "source_filename"):
+        frame[name] = frame[name].map(lambda value: None if pd.isna(value) else str(value))
+    frame["vintage"] = str(vintage)
+
+    frame = frame[frame["hcpcs"] != ""]
+    frame = frame.sort_values(SORT_KEYS, kind="stable", na_position="last")
+    return pa.Table.from_pandas(frame, schema=HISTORY_SCHEMA, preserve_index=False)
+
+
+def _write_atomic(table: pa.Table, path: Path, row_group_size: Optional[int] = None):
+    tmp_path = path.parent / f".{path.name}.{uuid.uuid4().hex}.tmp"
+    pq.write_table(
+        table,
+        tmp_path,
+        compression="snappy",
+        row_group_size=row_group_size,
+        write_statistics=True,
+    )
+    os.replace(tmp_path, path)
+
+
+def compact_rvu_history(output_dir: Path) -> Optional[Path]:
+    """Rebuild the sorted history file from every vintage slice"""
+    history_dir = Path(output_dir) / HISTORY_DIR
+    slices = sorted((history_dir / "slices").glob("*.parquet"))
+    if not slices:
+        return None
+
+    table = pa.concat_tables([pq.read_table(path, schema=HISTORY_SCHEMA) for path in slices])
+    # One whole-table sort lines up every code's vintages into a single run
+    order = pc.sort_indices(
+        table, sort_keys=[(key, "ascending") for key in SORT_KEYS], null_placement="at_end"
+    )
+    table = table.take(order)
+
+    path = history_dir / HISTORY_FILE
+    _write_atomic(table, path, row_group_size=ROW_GROUP_SIZE)
+
+    logger.info(
+        "Compacted RVU history",
+        path=str(path),
+        vintages=len(slices),
+        rows=table.num_rows,
+        codes=len(pc.unique(table.column("hcpcs"))),
+    )
+    return path
+
+
+def publish_rvu_history(pprrvu: Optional[pd.DataFrame], output_dir: Path, vintage: str) -> Optional[Path]:
+    """
+    Add (or replace) a vintage's PPRRVU rows in the history store.
+
+    Returns the compacted history path, or None when there are no rows.
+    Compaction is serialized with a lock file so concurrent backfill
+    workers never drop each other's slices.
+    """
+    if pprrvu is None or pprrvu.empty:
+        return None
+
+    history_dir = Path(output_dir) / HISTORY_DIR
+    slices_dir = history_dir / "slices"
+    slices_dir.mkdir(parents=True, exist_ok=True)
+
+    with open(history_dir / ".lock", "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        _write_atomic(history_slice(pprrvu, vintage), slices_dir / f"{vintage}.parquet")
+        return compact_rvu_history(output_dir)
@@ -12,7 +12,8 @@ from dataclasses import dataclass, asdict
 from datetime import datetime, timedelta
 from enum import Enum
 from pathlib import Path
-from typing import Dict, Any, List, Optional, Union
+from typing import Dict, Any, List, Optional, Tuple, Union
+import numpy as np
 import pandas as pd
 import structlog
 
@@ -104,6 +105,18 @@ class QuarantineMetrics:
     oldest_unresolved_days: float
 
 
+CRITICAL_FIELDS = ("hcpcs", "locality_code", "state_fips", "effective_from")
+
+# Columns of the in-memory index; raw payloads stay in the Parquet segments
+INDEX_COLUMNS = [
+    "record_id", "dataset_name", "batch_id", "release_id", "quarantine_timestamp",
+    "status", "severity", "category", "rule_id", "rule_name"
+]
+
+# Remediation updates are keyed by (dataset_name, release_id, batch_id, record_id)
+RecordKey = Tuple[str, str, str, str]
+
+
 class QuarantineTriage:
     """Triage system for quarantined records"""
     
@@ -203,6 +216,51 @@ class QuarantineTriage:
             "remediation_suggestions": self._get_remediation_suggestions(category, error_code, raw_data)
         }
     
+    def triage_rule(
+        self,
+        error_code: str,
+        error_message: str,
+        payload_sizes: np.ndarray,
+        field_counts: np.ndarray,
+        has_critical_fields: np.ndarray
+    ) -> Dict[str, Any]:
+        """
+        Triage every reject of one validation rule at once.
+        
+        Category, priority and suggestions depend only on the rule, so they are
+        resolved once; severity and auto-remediation are evaluated as array
+        operations over per-record features (serialized size, field count and
+        presence of critical fields).
+        """
+        category = self._categorize_error(error_code, error_message)
+        rules = self.triage_rules.get(category.value, self.triage_rules["validation_failure"])
+        base_severity = rules["severity"]
+        count = len(payload_sizes)
+        
+        if base_severity == QuarantineSeverity.MEDIUM:
+            severity = np.where(has_critical_fields, QuarantineSeverity.HIGH.value, base_severity.value)
+        elif base_severity == QuarantineSeverity.LOW:
+            severity = np.where(payload_sizes > 1000, QuarantineSeverity.MEDIUM.value, base_severity.value)
+        else:
+            severity = np.full(count, base_severity.value, dtype=object)
+        
+        if not rules["auto_remediation"] or category in [
+            QuarantineCategory.BUSINESS_RULE, QuarantineCategory.SCHEMA_VIOLATION
+        ]:
+            auto_remediation = np.zeros(count, dtype=bool)
+        else:
+            auto_remediation = field_counts >= 3
+        
+        return {
+            "category": category,
+            "severity": severity,
+            "priority": rules["priority"],
+            "auto_remediation": auto_remediation,
+            "requires_review": rules["requires_review"],
+            "estimated_time": rules["estimated_time"],
+            "remediation_suggestions": self._get_remediation_suggestions(category, error_code, {})
+        }
+    
     def _categorize_error(self, error_code: str, error_message: str) -> QuarantineCategory:
         """Categorize error based on code and message"""
         error_lower = error_message.lower()
@@ -230,8 +288,7 @@ class QuarantineTriage:
         """Calculate severity based on data impact"""
         
         # Check for critical fields
-        critical_fields = ["hcpcs", "locality_code", "state_fips", "effective_from"]
-        has_critical_fields = any(field in raw_data for field in critical_fields)
+        has_critical_fields = any(field in raw_data for field in CRITICAL_FIELDS)
         
         # Check data volume impact
         data_size = len(str(raw_data))
@@ -288,15 +345,25 @@ class QuarantineTriage:
 
 class QuarantineManager:
     """
-    Manages quarantine workflow for DIS-compliant ingestors
+    Manages quarantine workflow for DIS-compliant ingestors.
+    
+    Quarantined records are persisted as one Parquet segment per batch under
+    ``<output_dir>/<dataset>/<release_id>/records/``. Only a slim index of
+    the triage columns is kept in memory for metrics; remediation and
+    escalation updates are appended to ``remediation_index.ndjson`` rather
+    than rewriting record files. Record ids are content hashes, so updates
+    are keyed by ``(dataset, release, batch, record_id)``.
     """
     
+    REMEDIATION_INDEX = "remediation_index.ndjson"
+    
     def __init__(self, output_dir: str = "data/quarantine"):
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
         self.triage = QuarantineTriage()
         self.quarantine_batches: List[QuarantineBatch] = []
-        self.quarantine_records: List[QuarantineRecord] = []
+        self._index = pd.DataFrame(columns=INDEX_COLUMNS)
+        self._remediation_updates: Dict[RecordKey, Dict[str, Any]] = self._load_remediation_index()
     
     def quarantine_records(
         self,
@@ -309,161 +376,258 @@ class QuarantineManager:
         """Quarantine records that failed validation"""
         
         quarantine_timestamp = datetime.utcnow()
-        quarantined_records = []
+        frames = []
         
-        # Process each validation rule result
+        # Triage each failing rule's rejects as one vectorized block
         for rule_result in validation_results.get("validation_rules", []):
             if rule_result.get("violations", 0) > 0:
-                # Get reject data for this rule
                 reject_data = self._get_reject_data(rule_result, raw_data)
-                
-                for reject_record in reject_data:
-                    # Triage the record
-                    triage_result = self.triage.triage_record(
-                        error_code=rule_result.get("rule_id", "unknown"),
-                        error_message=rule_result.get("message", "Validation failed"),
-                        raw_data=reject_record
-                    )
-                    
-                    # Create quarantine record
-                    quarantine_record = QuarantineRecord(
-                        record_id=self._generate_record_id(reject_record),
-                        dataset_name=dataset_name,
-                        batch_id=batch_id,
-                        release_id=release_id,
-                        quarantine_timestamp=quarantine_timestamp,
-                        status=QuarantineStatus.NEW,
-                        severity=triage_result["severity"],
-                        category=triage_result["category"],
-                        rule_id=rule_result.get("rule_id", "unknown"),
-                        rule_name=rule_result.get("name", "Unknown Rule"),
-                        error_message=rule_result.get("message", "Validation failed"),
-                        error_code=rule_result.get("rule_id", "unknown"),
-                        raw_data=reject_record,
-                        remediation_actions=triage_result["remediation_suggestions"]
-                    )
-                    
-                    quarantined_records.append(quarantine_record)
-        
-        # Create quarantine batch
+                if reject_data:
+                    frames.append(self._triage_rejects(rule_result, reject_data))
+        
+        records = pd.concat(frames, ignore_index=True) if frames else self._empty_records_frame()
+        records["dataset_name"] = dataset_name
+        records["batch_id"] = batch_id
+        records["release_id"] = release_id
+        records["quarantine_timestamp"] = pd.Timestamp(quarantine_timestamp)
+        records["status"] = QuarantineStatus.NEW.value
+        
+        # Create quarantine batch (records live in the Parquet segment)
         quarantine_batch = QuarantineBatch(
             batch_id=batch_id,
             dataset_name=dataset_name,
             release_id=release_id,
             quarantine_timestamp=quarantine_timestamp,
-            total_records=len(quarantined_records),
-            records=quarantined_records,
-            summary=self._generate_batch_summary(quarantined_records),
-            triage_priority=self._calculate_batch_priority(quarantined_records)
+            total_records=len(records),
+            records=[],
+            summary=self._generate_batch_summary(records),
+            triage_priority=self._calculate_batch_priority(records),
+            estimated_remediation_time=(
+                records["estimated_time"].max() if len(records) else None
+            )
         )
         
-        # Store quarantine batch
+        # Save to disk, then keep only the slim index in memory
+        self._save_quarantine_batch(quarantine_batch, records)
         self.quarantine_batches.append(quarantine_batch)
-        self.quarantine_records.extend(quarantined_records)
-        
-        # Save to disk
-        self._save_quarantine_batch(quarantine_batch)
+        if len(records):
+            frames = [frame for frame in (self._index, records[INDEX_COLUMNS]) if len(frame)]
+            self._index = pd.concat(frames, ignore_index=True)
         
         logger.info("Records quarantined",
                    dataset=dataset_name,
                    batch_id=batch_id,
-                   total_records=len(quarantined_records),
+                   total_records=len(records),
                    priority=quarantine_batch.triage_priority)
         
         return quarantine_batch
     
+    def _triage_rejects(self, rule_result: Dict[str, Any], reject_data: List[Dict[str, Any]]) -> pd.DataFrame:
+        """Build the quarantine columns for one rule's rejects"""
+        rule_id = rule_result.get("rule_id", "unknown")
+        error_message = rule_result.get("message", "Validation failed")
+        
+        # One serialization pass feeds the record id, the size heuristic and storage
+        payloads = [json.dumps(record, sort_keys=True, default=str) for record in reject_data]
+        triage_result = self.triage.triage_rule(
+            error_code=rule_id,
+            error_message=error_message,
+            payload_sizes=np.fromiter((len(p) for p in payloads), dtype=np.int64, count=len(payloads)),
+            field_counts=np.fromiter((len(r) for r in reject_data), dtype=np.int64, count=len(reject_data)),
+            has_critical_fields=np.fromiter(
+                (any(field in r for field in CRITICAL_FIELDS) for r in reject_data),
+                dtype=bool, count=len(reject_data)
+            )
+        )
+        
+        return pd.DataFrame({
+            "record_id": [hashlib.md5(p.encode()).hexdigest()[:16] for p in payloads],
+            "severity": triage_result["severity"],
+            "category": triage_result["category"].value,
+            "rule_id": rule_id,
+            "rule_name": rule_result.get("name", "Unknown Rule"),
+            "error_message": error_message,
+            "error_code": rule_id,
+            "auto_remediation": triage_result["auto_remediation"],
+            "estimated_time": triage_result["estimated_time"],
+            "remediation_actions": json.dumps(triage_result["remediation_suggestions"]),
+            "raw_data": payloads,
+        })
+    
+    def _empty_records_frame(self) -> pd.DataFrame:
+        return pd.DataFrame(columns=[
+            "record_id", "severity", "category", "rule_id", "rule_name", "error_message",
+            "error_code", "auto_remediation", "estimated_time", "remediation_actions", "raw_data"
+        ])
+    
     def _get_reject_data(self, rule_result: Dict[str, Any], raw_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Get reject data for a specific rule"""
-        # This would typically come from the validation engine
-        # For now, return a sample of raw data as reject data
+        # Validators that know the offending rows pass them as "rejects"
+        if rule_result.get("rejects") is not None:
+            return rule_result["rejects"]
+        
+        # Otherwise fall back to a sample of raw data as reject data
         return raw_data[:rule_result.get("violations", 0)]
     
-    def _generate_record_id(self, raw_data: Dict[str, Any]) -> str:
-        """Generate unique record ID for quarantine"""
-        data_str = json.dumps(raw_data, sort_keys=True)
-        return hashlib.md5(data_str.encode()).hexdigest()[:16]
-    
-    def _generate_batch_summary(self, records: List[QuarantineRecord]) -> Dict[str, Any]:
-        """Generate summary for quarantine batch"""
-        summary = {
+    def _generate_batch_summary(self, records: pd.DataFrame) -> Dict[str, Any]:
+        """Generate summary for quarantine batch from column counts"""
+        return {
             "total_records": len(records),
-            "by_status": {},
-            "by_severity": {},
-            "by_category": {},
-            "by_rule": {}
+            "by_status": self._value_counts(records, "status"),
+            "by_severity": self._value_counts(records, "severity"),
+            "by_category": self._value_counts(records, "category"),
+            "by_rule": self._value_counts(records, "rule_name")
         }
-        
-        for record in records:
-            # Count by status
-            status = record.status.value
-            summary["by_status"][status] = summary["by_status"].get(status, 0) + 1
-            
-            # Count by severity
-            severity = record.severity.value
-            summary["by_severity"][severity] = summary["by_severity"].get(severity, 0) + 1
-            
-            # Count by category
-            category = record.category.value
-            summary["by_category"][category] = summary["by_category"].get(category, 0) + 1
-            
-            # Count by rule
-            rule = record.rule_name
-            summary["by_rule"][rule] = summary["by_rule"].get(rule, 0) + 1
-        
-        return summary
     
-    def _calculate_batch_priority(self, records: List[QuarantineRecord]) -> str:
+    @staticmethod
+    def _value_counts(frame: pd.DataFrame, column: str) -> Dict[str, int]:
+        if not len(frame):
+            return {}
+        return {str(k): int(v) for k, v in frame[column].value_counts(sort=False).items()}
+    
+    def _calculate_batch_priority(self, records: pd.DataFrame) -> str:
         """Calculate batch priority based on record severity"""
-        if not records:
+        if not len(records):
             return "low"
         
-        severities = [record.severity for record in records]
+        severities = set(records["severity"].unique())
         
-        if QuarantineSeverity.CRITICAL in severities:
+        if QuarantineSeverity.CRITICAL.value in severities:
             return "critical"
-        elif QuarantineSeverity.HIGH in severities:
+        elif QuarantineSeverity.HIGH.value in severities:
             return "high"
-        elif QuarantineSeverity.MEDIUM in severities:
+        elif QuarantineSeverity.MEDIUM.value in severities:
             return "medium"
         else:
             return "low"
     
-    def _save_quarantine_batch(self, batch: QuarantineBatch):
-        """Save quarantine batch to disk"""
-        batch_dir = self.output_dir / batch.dataset_name / batch.release_id
-        batch_dir.mkdir(parents=True, exist_ok=True)
+    def _batch_dir(self, dataset_name: str, release_id: str) -> Path:
+        return self.output_dir / dataset_name / release_id
+    
+    def _save_quarantine_batch(self, batch: QuarantineBatch, records: pd.DataFrame):
+        """Save batch metadata as JSON and its records as a single Parquet segment"""
+        batch_dir = self._batch_dir(batch.dataset_name, batch.release_id)
+        records_dir = batch_dir / "records"
+        records_dir.mkdir(parents=True, exist_ok=True)
         
-        # Save batch metadata
+        # Save batch metadata (summary only; records are in the segment)
         batch_file = batch_dir / f"quarantine_batch_{batch.batch_id}.json"
         with open(batch_file, 'w') as f:
             json.dump(asdict(batch), f, indent=2, default=str)
         
-        # Save individual records
-        records_dir = batch_dir / "records"
-        records_dir.mkdir(exist_ok=True)
+        if len(records):
+            segment = records.drop(columns=["estimated_time"]).astype({"auto_remediation": bool})
+            segment.to_parquet(records_dir / f"part-{batch.batch_id}.parquet", index=False)
+    
+    def load_records(
+        self,
+        dataset_name: str,
+        release_id: str,
+        batch_id: Optional[str] = None
+    ) -> List[QuarantineRecord]:
+        """Load quarantined records from Parquet segments with remediation updates applied"""
+        records_dir = self._batch_dir(dataset_name, release_id) / "records"
+        pattern = f"part-{batch_id}.parquet" if batch_id else "part-*.parquet"
+        segments = sorted(records_dir.glob(pattern))
+        if not segments:
+            return []
+        
+        frame = pd.concat([pd.read_parquet(path) for path in segments], ignore_index=True)
+        return [self._record_from_row(row) for row in frame.to_dict("records")]
+    
+    def _record_from_row(self, row: Dict[str, Any]) -> QuarantineRecord:
+        key = (row["dataset_name"], row["release_id"], row["batch_id"], row["record_id"])
+        update = self._remediation_updates.get(key, {})
+        reviewed_at = update.get("reviewed_at")
+        return QuarantineRecord(
+            record_id=row["record_id"],
+            dataset_name=row["dataset_name"],
+            batch_id=row["batch_id"],
+            release_id=row["release_id"],
+            quarantine_timestamp=pd.Timestamp(row["quarantine_timestamp"]).to_pydatetime(),
+            status=QuarantineStatus(update.get("status", row["status"])),
+            severity=QuarantineSeverity(row["severity"]),
+            category=QuarantineCategory(row["category"]),
+            rule_id=row["rule_id"],
+            rule_name=row["rule_name"],
+            error_message=row["error_message"],
+            error_code=row["error_code"],
+            raw_data=json.loads(row["raw_data"]),
+            remediation_notes=update.get("remediation_notes"),
+            reviewed_by=update.get("reviewed_by"),
+            reviewed_at=datetime.fromisoformat(reviewed_at) if reviewed_at else None,
+            remediation_actions=json.loads(row["remediation_actions"])
+        )
+    
+    def _load_remediation_index(self) -> Dict[RecordKey, Dict[str, Any]]:
+        """Replay the append-only remediation index; later entries win"""
+        updates: Dict[RecordKey, Dict[str, Any]] = {}
+        index_file = self.output_dir / self.REMEDIATION_INDEX
+        if index_file.exists():
+            with open(index_file) as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        updates[self._entry_key(entry)] = entry
+        return updates
+    
+    @staticmethod
+    def _entry_key(entry: Dict[str, Any]) -> RecordKey:
+        return (entry.get("dataset_name"), entry.get("release_id"), entry.get("batch_id"), entry["record_id"])
+    
+    def _segment_contains(self, dataset_name: str, release_id: str, batch_id: str, record_id: str) -> bool:
+        """Check a persisted batch segment for a record not in the in-memory index"""
+        segment = self._batch_dir(dataset_name, release_id) / "records" / f"part-{batch_id}.parquet"
+        if not segment.exists():
+            return False
+        return bool((pd.read_parquet(segment, columns=["record_id"])["record_id"] == record_id).any())
+    
+    def _record_status_update(
+        self,
+        dataset_name: str,
+        release_id: str,
+        batch_id: str,
+        record_id: str,
+        status: QuarantineStatus,
+        notes: str,
+        reviewed_by: str
+    ) -> bool:
+        """Apply a status change to the index and append it to the remediation log"""
+        index = self._index
+        mask = (
+            (index["dataset_name"] == dataset_name)
+            & (index["release_id"] == release_id)
+            & (index["batch_id"] == batch_id)
+            & (index["record_id"] == record_id)
+        )
+        if mask.any():
+            index.loc[mask, "status"] = status.value
+        elif not self._segment_contains(dataset_name, release_id, batch_id, record_id):
+            return False
         
-        for record in batch.records:
-            record_file = records_dir / f"record_{record.record_id}.json"
-            with open(record_file, 'w') as f:
-                json.dump(asdict(record), f, indent=2, default=str)
+        entry = {
+            "dataset_name": dataset_name,
+            "release_id": release_id,
+            "batch_id": batch_id,
+            "record_id": record_id,
+            "status": status.value,
+            "remediation_notes": notes,
+            "reviewed_by": reviewed_by,
+            "reviewed_at": datetime.utcnow().isoformat()
+        }
+        self._remediation_updates[self._entry_key(entry)] = entry
+        with open(self.output_dir / self.REMEDIATION_INDEX, 'a') as f:
+            f.write(json.dumps(entry) + "\n")
+        return True
     
     def get_quarantine_metrics(self) -> QuarantineMetrics:
         """Get quarantine system metrics"""
-        total_quarantined = len(self.quarantine_records)
-        
-        # Calculate metrics by status
-        by_status = {}
-        by_severity = {}
-        by_category = {}
-        
-        for record in self.quarantine_records:
-            status = record.status.value
-            severity = record.severity.value
-            category = record.category.value
-            
-            by_status[status] = by_status.get(status, 0) + 1
-            by_severity[severity] = by_severity.get(severity, 0) + 1
-            by_category[category] = by_category.get(category, 0) + 1
+        index = self._index
+        total_quarantined = len(index)
+        
+        by_status = self._value_counts(index, "status")
+        by_severity = self._value_counts(index, "severity")
+        by_category = self._value_counts(index, "category")
         
         # Calculate remediation metrics
         remediated_count = by_status.get("remediated", 0)
@@ -475,10 +639,10 @@ class QuarantineManager:
         escalation_rate = escalated_count / total_quarantined if total_quarantined > 0 else 0.0
         
         # Calculate oldest unresolved
-        unresolved_records = [r for r in self.quarantine_records if r.status in [QuarantineStatus.NEW, QuarantineStatus.UNDER_REVIEW]]
-        if unresolved_records:
-            oldest_timestamp = min(r.quarantine_timestamp for r in unresolved_records)
-            oldest_unresolved_days = (datetime.utcnow() - oldest_timestamp).total_seconds() / 86400
+        unresolved = index["status"].isin([QuarantineStatus.NEW.value, QuarantineStatus.UNDER_REVIEW.value])
+        if unresolved.any():
+            oldest_timestamp = index.loc[unresolved, "quarantine_timestamp"].min()
+            oldest_unresolved_days = (pd.Timestamp(datetime.utcnow()) - oldest_timestamp).total_seconds() / 86400
         else:
             oldest_unresolved_days = 0.0
         
@@ -501,37 +665,47 @@ class QuarantineManager:
         recent_batches = sorted(self.quarantine_batches, key=lambda b: b.quarantine_timestamp, reverse=True)[:10]
         
         # Get high priority items
-        high_priority = [r for r in self.quarantine_records if r.severity in [QuarantineSeverity.HIGH, QuarantineSeverity.CRITICAL]]
+        high_priority = self._index["severity"].isin([
+            QuarantineSeverity.HIGH.value, QuarantineSeverity.CRITICAL.value
+        ])
         
         return {
             "metrics": asdict(metrics),
             "recent_batches": [asdict(batch) for batch in recent_batches],
-            "high_priority_items": len(high_priority),
-            "requires_attention": len([r for r in self.quarantine_records if r.status == QuarantineStatus.NEW]),
+            "high_priority_items": int(high_priority.sum()),
+            "requires_attention": int((self._index["status"] == QuarantineStatus.NEW.value).sum()),
             "last_updated": datetime.utcnow().isoformat()
         }
     
-    def remediate_record(self, record_id: str, remediation_notes: str, remediated_by: str) -> bool:
+    def remediate_record(
+        self,
+        dataset_name: str,
+        release_id: str,
+        batch_id: str,
+        record_id: str,
+        remediation_notes: str,
+        remediated_by: str
+    ) -> bool:
         """Mark a record as remediated"""
-        for record in self.quarantine_records:
-            if record.record_id == record_id:
-                record.status = QuarantineStatus.REMEDIATED
-                record.remediation_notes = remediation_notes
-                record.reviewed_by = remediated_by
-                record.reviewed_at = datetime.utcnow()
-                return True
-        return False
+        return self._record_status_update(
+            dataset_name, release_id, batch_id, record_id,
+            QuarantineStatus.REMEDIATED, remediation_notes, remediated_by
+        )
     
-    def escalate_record(self, record_id: str, escalation_reason: str, escalated_by: str) -> bool:
+    def escalate_record(
+        self,
+        dataset_name: str,
+        release_id: str,
+        batch_id: str,
+        record_id: str,
+        escalation_reason: str,
+        escalated_by: str
+    ) -> bool:
         """Escalate a record for higher-level review"""
-        for record in self.quarantine_records:
-            if record.record_id == record_id:
-                record.status = QuarantineStatus.ESCALATED
-                record.remediation_notes = f"ESCALATED: {escalation_reason}"
-                record.reviewed_by = escalated_by
-                record.reviewed_at = datetime.utcnow()
-                return True
-        return False
+        return self._record_status_update(
+            dataset_name, release_id, batch_id, record_id,
+            QuarantineStatus.ESCALATED, f"ESCALATED: {escalation_reason}", escalated_by
+        )
 
 
 # Global quarantine manager instance
@@ -0,0 +1,292 @@
+"""
+Content-addressed store for raw source files
+
+Every downloaded file is stored once under objects/<sha[:2]>/<sha256> and
+exposed in each dataset's landing layout as a hard link (symlink or copy
+where links are unavailable). A SQLite index records objects, the URL
+each was fetched from (with ETag/Last-Modified for conditional
+re-downloads) and every landing path that references them, so a bundle
+landed by several scrapers and ingestors occupies disk once and is only
+transferred again when the server reports a change.
+"""
+
+import hashlib
+import os
+import shutil
+import sqlite3
+import threading
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Union
+
+import httpx
+import structlog
+
+from cms_pricing.config import settings
+
+logger = structlog.get_logger()
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS objects (
+    sha256 TEXT PRIMARY KEY,
+    size_bytes INTEGER NOT NULL,
+    stored_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sources (
+    url TEXT PRIMARY KEY,
+    sha256 TEXT NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    content_type TEXT,
+    fetched_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS links (
+    path TEXT PRIMARY KEY,
+    sha256 TEXT NOT NULL,
+    linked_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS links_sha256 ON links (sha256);
+"""
+
+
+@dataclass
+class StoredObject:
+    """A raw file in the store"""
+    sha256: str
+    size_bytes: int
+    path: Path
+    url: Optional[str] = None
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    content_type: Optional[str] = None
+    # False when identical content was already stored
+    new: bool = True
+    # True when the server answered 304 and nothing was transferred
+    not_modified: bool = False
+
+    def read_bytes(self) -> bytes:
+        return self.path.read_bytes()
+
+
+class RawStore:
+    """
+    Deduplicating raw file store.
+
+    Objects are read-only; landing paths are replaced (never written
+    through) when relinked, so a stored object never changes. Nothing is
+    created on disk until the store is first used.
+    """
+
+    def __init__(self, root: Union[str, Path]):
+        self.root = Path(root)
+        self.objects_dir = self.root / "objects"
+        self.index_path = self.root / "index.sqlite"
+        self._opened = False
+        self._open_lock = threading.Lock()
+
+    def _open(self):
+        """Create the objects directory and index on first use"""
+        if self._opened:
+            return
+        with self._open_lock:
+            if self._opened:
+                return
+            self.objects_dir.mkdir(parents=True, exist_ok=True)
+            db = sqlite3.connect(self.index_path, timeout=30.0)
+            try:
+                with db:
+                    db.executescript(_SCHEMA)
+            finally:
+                db.close()
+            self._opened = True
+
+    @contextmanager
+    def _index(self) -> Iterator[sqlite3.Connection]:
+        self._open()
+        db = sqlite3.connect(self.index_path, timeout=30.0)
+        try:
+            with db:
+                yield db
+        finally:
+            db.close()
+
+    def object_path(self, sha256: str) -> Path:
+        return self.objects_dir / sha256[:2] / sha256
+
+    def has(self, sha256: str) -> bool:
+        return self.object_path(sha256).exists()
+
+    def _stored(self, sha256: str, size_bytes: int, new: bool, **source) -> StoredObject:
+        now = datetime.utcnow().isoformat()
+        with self._index() as db:
+            db.execute(
+                "INSERT OR IGNORE INTO objects (sha256, size_bytes, stored_at) VALUES (?, ?, ?)",
+                (sha256, size_bytes, now)
+            )
+            if source.get("url"):
+                db.execute(
+                    "INSERT OR REPLACE INTO sources (url, sha256, etag, last_modified, content_type, fetched_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (source["url"], sha256, source.get("etag"), source.get("last_modified"),
+                     source.get("content_type"), now)
+                )
+        return StoredObject(sha256, size_bytes, self.object_path(sha256), new=new, **source)
+
+    def _commit_object(self, tmp_path: Path, sha256: str) -> bool:
+        """Move a fully written temp file into place; False if already stored"""
+        target = self.object_path(sha256)
+        if target.exists():
+            tmp_path.unlink()
+            return False
+        target.parent.mkdir(parents=True, exist_ok=True)
+        os.chmod(tmp_path, 0o444)
+        os.replace(tmp_path, target)
+        return True
+
+    def put_bytes(self, content: bytes, **source) -> StoredObject:
+        """Store content (no-op if already present) and record its source URL"""
+        sha256 = hashlib.sha256(content).hexdigest()
+        new = False
+        self._open()
+        if not self.has(sha256):
+            tmp_path = self.objects_dir / f".{uuid.uuid4().hex}.tmp"
+            tmp_path.write_bytes(content)
+            new = self._commit_object(tmp_path, sha256)
+        return self._stored(sha256, len(content), new, **source)
+
+    def put_file(self, path: Union[str, Path], **source) -> StoredObject:
+        """Store a local file, hashing it in chunks"""
+        path = Path(path)
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+        sha256 = digest.hexdigest()
+        new = False
+        self._open()
+        if not self.has(sha256):
+            tmp_path = self.objects_dir / f".{uuid.uuid4().hex}.tmp"
+            shutil.copyfile(path, tmp_path)
+            new = self._commit_object(tmp_path, sha256)
+        return self._stored(sha256, path.stat().st_size, new, **source)
+
+    def lookup_url(self, url: str) -> Optional[StoredObject]:
+        """Last object fetched from url, if it is still stored"""
+        with self._index() as db:
+            row = db.execute(
+                "SELECT s.sha256, o.size_bytes, s.etag, s.last_modified, s.content_type "
+                "FROM sources s JOIN objects o ON o.sha256 = s.sha256 WHERE s.url = ?",
+                (url,)
+            ).fetchone()
+        if row is None or not self.has(row[0]):
+            return None
+        sha256, size_bytes, etag, last_modified, content_type = row
+        return StoredObject(
+            sha256, size_bytes, self.object_path(sha256), url=url, etag=etag,
+            last_modified=last_modified, content_type=content_type, new=False
+        )
+
+    def link(self, sha256: str, dest: Union[str, Path]) -> Path:
+        """Expose an object at dest (hard link, else symlink, else copy)"""
+        source = self.object_path(sha256)
+        dest = Path(dest)
+        dest.parent.mkdir(parents=True, exist_ok=True)
+
+        if dest.exists() and not dest.is_symlink():
+            if os.path.samefile(source, dest):
+                self._record_link(sha256, dest)
+                return dest
+        if dest.exists() or dest.is_symlink():
+            dest.unlink()
+
+        try:
+            os.link(source, dest)
+        except OSError:
+            try:
+                dest.symlink_to(source.resolve())
+            except OSError:
+                shutil.copyfile(source, dest)
+        self._record_link(sha256, dest)
+        return dest
+
+    def _record_link(self, sha256: str, dest: Path):
+        with self._index() as db:
+            db.execute(
+                "INSERT OR REPLACE INTO links (path, sha256, linked_at) VALUES (?, ?, ?)",
+                (os.path.abspath(dest), sha256, datetime.utcnow().isoformat())
+            )
+
+    def references(self, sha256: str) -> List[str]:
+        """Landing paths that reference an object"""
+        with self._index() as db:
+            rows = db.execute("SELECT path FROM links WHERE sha256 = ? ORDER BY path", (sha256,)).fetchall()
+        return [row[0] for row in rows]
+
+    async def download(
+        self,
+        client: httpx.AsyncClient,
+        url: str,
+        dest: Optional[Union[str, Path]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional[float] = None
+    ) -> StoredObject:
+        """
+        Fetch url into the store and optionally link it at dest.
+
+        A URL fetched before is revalidated with If-None-Match /
+        If-Modified-Since; on 304 the stored object is reused without a
+        transfer. Raises httpx.HTTPStatusError on error responses.
+        """
+        known = self.lookup_url(url)
+        request_headers = dict(headers or {})
+        if known is not None:
+            if known.etag:
+                request_headers["If-None-Match"] = known.etag
+            if known.last_modified:
+                request_headers["If-Modified-Since"] = known.last_modified
+
+        kwargs = {"timeout": timeout} if timeout is not None else {}
+        response = await client.get(url, headers=request_headers, follow_redirects=True, **kwargs)
+
+        if response.status_code == 304 and known is not None:
+            stored = known
+            stored.not_modified = True
+        else:
+            response.raise_for_status()
+            stored = self.put_bytes(
+                response.content,
+                url=url,
+                etag=response.headers.get("etag"),
+                last_modified=response.headers.get("last-modified"),
+                content_type=response.headers.get("content-type")
+            )
+
+        if dest is not None:
+            self.link(stored.sha256, dest)
+
+        logger.info(
+            "Raw file stored",
+            url=url,
+            sha256=stored.sha256[:16],
+            size_bytes=stored.size_bytes,
+            new=stored.new,
+            not_modified=stored.not_modified
+        )
+        return stored
+
+
+_stores: Dict[str, RawStore] = {}
+_stores_lock = threading.Lock()
+
+
+def raw_store_for(root: Optional[Union[str, Path]] = None) -> RawStore:
+    """Shared store for a root directory (settings.raw_store_dir by default), opened on first use"""
+    key = str(Path(root or settings.raw_store_dir).resolve())
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = _stores[key] = RawStore(key)
+        return store
@@ -0,0 +1,224 @@
+"""
+OPPS Backfill Executor
+
+Runs multi-quarter OPPS backfills across a process pool. Reference tables
+(wage index, SI lookup) are loaded once per year in the coordinating process
+and shipped to the workers with each quarter's task; every finished batch is
+checkpointed so an interrupted backfill resumes where it stopped.
+"""
+
+import asyncio
+import json
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import pandas as pd
+import structlog
+
+logger = structlog.get_logger()
+
+# One ingestor per worker process, created by _init_worker
+_worker_ingestor = None
+
+
+def plan_batch_ids(start_year: int, end_year: int, quarters: int = 4) -> List[str]:
+    """Batch IDs for a backfill window; the last year stops after `quarters`"""
+    batch_ids = []
+    for year in range(start_year, end_year + 1):
+        for quarter in range(1, 5):
+            if year == end_year and quarter > quarters:
+                break
+            batch_ids.append(f"opps_{year}q{quarter}_r01")
+    return batch_ids
+
+
+def _batch_year(batch_id: str) -> int:
+    return int(batch_id.split("_")[1][:4])
+
+
+def _init_worker(output_dir: str, database_url: Optional[str], cpt_masking: bool):
+    """Process pool initializer: build the worker's ingestor once"""
+    global _worker_ingestor
+    from cms_pricing.ingestion.ingestors.opps_ingestor import OPPSIngestor
+    
+    _worker_ingestor = OPPSIngestor(
+        output_dir=Path(output_dir),
+        database_url=database_url,
+        cpt_masking_enabled=cpt_masking
+    )
+
+
+def _ingest_batch_worker(batch_id: str, reference_data: Dict[str, pd.DataFrame]) -> Dict[str, Any]:
+    """Ingest one batch inside a worker process, reusing the shipped reference data"""
+    started = time.perf_counter()
+    _worker_ingestor.set_reference_data(_batch_year(batch_id), reference_data)
+    result = asyncio.run(_worker_ingestor.ingest_batch(batch_id))
+    
+    publish_results = result.get("publish_results") or {}
+    return {
+        "batch_id": batch_id,
+        "status": result.get("status", "failed"),
+        "stage": result.get("stage"),
+        "error": result.get("error"),
+        "records_published": publish_results.get("records_published", 0),
+        "seconds": round(time.perf_counter() - started, 3),
+    }
+
+
+class BackfillCheckpoint:
+    """Per-batch checkpoint file; rewritten atomically after each batch"""
+    
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.batches: Dict[str, Dict[str, Any]] = {}
+        if self.path.exists():
+            with open(self.path) as f:
+                self.batches = json.load(f).get("batches", {})
+    
+    def is_complete(self, batch_id: str) -> bool:
+        return self.batches.get(batch_id, {}).get("status") == "success"
+    
+    def record(self, outcome: Dict[str, Any]):
+        self.batches[outcome["batch_id"]] = {
+            **outcome,
+            "completed_at": datetime.utcnow().isoformat()
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump({"batches": self.batches}, f, indent=2)
+        os.replace(tmp_path, self.path)
+    
+    def reset(self):
+        self.batches = {}
+        if self.path.exists():
+            self.path.unlink()
+
+
+@dataclass
+class BackfillReport:
+    """Aggregate outcome and throughput of a backfill run"""
+    planned: int
+    skipped: int
+    succeeded: List[str] = field(default_factory=list)
+    failed: List[str] = field(default_factory=list)
+    records_published: int = 0
+    elapsed_seconds: float = 0.0
+    
+    @property
+    def batches_per_minute(self) -> float:
+        processed = len(self.succeeded) + len(self.failed)
+        return processed * 60 / self.elapsed_seconds if self.elapsed_seconds else 0.0
+    
+    @property
+    def records_per_second(self) -> float:
+        return self.records_published / self.elapsed_seconds if self.elapsed_seconds else 0.0
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "planned": self.planned,
+            "skipped": self.skipped,
+            "succeeded": len(self.succeeded),
+            "failed": len(self.failed),
+            "failed_batches": self.failed,
+            "records_published": self.records_published,
+            "elapsed_seconds": round(self.elapsed_seconds, 3),
+            "batches_per_minute": round(self.batches_per_minute, 3),
+            "records_per_second": round(self.records_per_second, 3),
+        }
+
+
+class OPPSBackfillExecutor:
+    """
+    Fan a backfill window out over a pool of worker processes.
+    
+    `reference_loader` is an async callable returning the reference tables
+    for a year (normally `OPPSIngestor.load_reference_data`); it is awaited
+    once per year. `executor_factory` exists so callers can substitute a
+    different pool; by default a ProcessPoolExecutor of `max_workers` is used
+    with one ingestor per worker process.
+    """
+    
+    def __init__(
+        self,
+        output_dir: Path,
+        reference_loader: Callable[[int], Any],
+        database_url: Optional[str] = None,
+        cpt_masking: bool = True,
+        max_workers: int = 4,
+        checkpoint_path: Optional[Path] = None,
+        executor_factory: Optional[Callable[[], Executor]] = None,
+        batch_worker: Callable[[str, Dict[str, pd.DataFrame]], Dict[str, Any]] = _ingest_batch_worker
+    ):
+        self.output_dir = Path(output_dir)
+        self.reference_loader = reference_loader
+        self.database_url = database_url
+        self.cpt_masking = cpt_masking
+        self.max_workers = max(1, max_workers)
+        self.checkpoint = BackfillCheckpoint(
+            checkpoint_path or self.output_dir / "backfill" / "opps_checkpoint.json"
+        )
+        self.executor_factory = executor_factory or self._process_pool
+        self.batch_worker = batch_worker
+    
+    def _process_pool(self) -> Executor:
+        return ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            initializer=_init_worker,
+            initargs=(str(self.output_dir), self.database_url, self.cpt_masking)
+        )
+    
+    async def run(self, batch_ids: List[str], resume: bool = True) -> BackfillReport:
+        """Ingest every pending batch and return the aggregate report"""
+        if not resume:
+            self.checkpoint.reset()
+        
+        pending = [b for b in batch_ids if not self.checkpoint.is_complete(b)]
+        report = BackfillReport(planned=len(batch_ids), skipped=len(batch_ids) - len(pending))
+        logger.info("Starting OPPS backfill run",
+                   planned=report.planned,
+                   skipped=report.skipped,
+                   workers=self.max_workers)
+        
+        started = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        reference_by_year: Dict[int, Dict[str, pd.DataFrame]] = {}
+        
+        with self.executor_factory() as executor:
+            futures = []
+            for batch_id in pending:
+                year = _batch_year(batch_id)
+                if year not in reference_by_year:
+                    reference_by_year[year] = await self.reference_loader(year)
+                futures.append(self._settle(batch_id, loop.run_in_executor(
+                    executor, self.batch_worker, batch_id, reference_by_year[year]
+                )))
+            
+            for future in asyncio.as_completed(futures):
+                outcome = await future
+                self.checkpoint.record(outcome)
+                if outcome["status"] == "success":
+                    report.succeeded.append(outcome["batch_id"])
+                    report.records_published += outcome.get("records_published", 0)
+                    logger.info("Batch backfilled successfully", batch_id=outcome["batch_id"],
+                               seconds=outcome.get("seconds"))
+                else:
+                    report.failed.append(outcome["batch_id"])
+                    logger.error("Batch backfill failed", batch_id=outcome["batch_id"],
+                                error=outcome.get("error"), stage=outcome.get("stage"))
+        
+        report.elapsed_seconds = time.perf_counter() - started
+        logger.info("OPPS backfill run completed", **report.to_dict())
+        return report
+    
+    async def _settle(self, batch_id: str, future) -> Dict[str, Any]:
+        """Turn a worker crash into a failed outcome so other batches continue"""
+        try:
+            return await future
+        except Exception as e:
+            return {"batch_id": batch_id, "status": "failed", "error": str(e), "records_published": 0}
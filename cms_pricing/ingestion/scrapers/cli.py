@@ -18,6 +18,7 @@ from typing import Dict, Any, List, Optional
 import structlog
 
 from .cms_rvu_scraper import CMSRVUScraper
+from .crawler import close_shared_client
 from ..ingestors.rvu_ingestor import RVUIngestor
 from ..quarantine.dis_quarantine import QuarantineManager
 from ..metadata.discovery_manifest import DiscoveryManifest, DiscoveryManifestStore
@@ -411,6 +412,8 @@ async def main():
         logger.error("CLI operation failed", error=str(e))
         print(json.dumps({"status": "failed", "error": str(e)}, indent=2))
         sys.exit(1)
+    finally:
+        await close_shared_client()
 
 if __name__ == "__main__":
     asyncio.run(main())
@@ -18,6 +18,7 @@ import structlog
 from bs4 import BeautifulSoup
 
 from .cms_rvu_scraper import CMSRVUScraper, RVUFileInfo
+from .crawler import close_shared_client
 from ..metadata.discovery_manifest import DiscoveryManifest, DiscoveryManifestStore
 
 logger = structlog.get_logger()
@@ -367,12 +368,15 @@ async def main():
     """Example usage of MPFS scraper"""
     scraper = CMSMPFSScraper()
     
-    # Discover MPFS files for 2025
-    files = await scraper.scrape_mpfs_files(2025, 2025, latest_only=True)
-    
-    print(f"Discovered {len(files)} MPFS files:")
-    for file_info in files:
-        print(f"  - {file_info.filename} ({file_info.file_type}) - {file_info.size_bytes} bytes")
+    try:
+        # Discover MPFS files for 2025
+        files = await scraper.scrape_mpfs_files(2025, 2025, latest_only=True)
+        
+        print(f"Discovered {len(files)} MPFS files:")
+        for file_info in files:
+            print(f"  - {file_info.filename} ({file_info.file_type}) - {file_info.size_bytes} bytes")
+    finally:
+        await close_shared_client()
 
 
 if __name__ == "__main__":
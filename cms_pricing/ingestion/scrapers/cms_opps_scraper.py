@@ -18,14 +18,15 @@ import re
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Optional, Set, Tuple, Any
-from urllib.parse import urljoin, urlparse
+from urllib.parse import urlparse
 from dataclasses import dataclass
 
 import httpx
-from bs4 import BeautifulSoup
 from structlog import get_logger
 
 from ..metadata.discovery_manifest import DiscoveryManifest, DiscoveryManifestStore
+from ..raw_store import RawStore, StoredObject, raw_store_for
+from .crawler import Crawler, close_shared_client
 
 logger = get_logger()
 
@@ -47,6 +48,9 @@ class ScrapedFileInfo:
 
 SCRAPER_VERSION = "1.0.0"
 
+# How long resolved download URLs of an unchanged quarter page are reused
+RESOLUTION_TTL = timedelta(days=7)
+
 
 class CMSOPPSScraper:
     """
@@ -57,11 +61,13 @@ class CMSOPPSScraper:
     checksum validation and manifest generation.
     """
     
-    def __init__(self, base_url: str = "https://www.cms.gov", output_dir: Path = None):
+    def __init__(self, base_url: str = "https://www.cms.gov", output_dir: Path = None, raw_store: Optional[RawStore] = None):
         self.base_url = base_url
         self.output_dir = output_dir or Path("data/scraped/opps")
         self.output_dir.mkdir(parents=True, exist_ok=True)
         self.manifest_store = DiscoveryManifestStore(self.output_dir / "manifests", prefix="cms_opps_manifest")
+        self.crawler = Crawler(self.output_dir / "page_cache")
+        self.raw_store = raw_store or raw_store_for()
         self.opps_base_url = "https://www.cms.gov/medicare/payment/prospective-payment-systems/hospital-outpatient"
         self.quarterly_addenda_url = "https://www.cms.gov/medicare/payment/prospective-payment-systems/hospital-outpatient-pps/quarterly-addenda-updates"
         
@@ -171,35 +177,27 @@ class CMSOPPSScraper:
         """Get links to quarterly addenda pages."""
         logger.info("Fetching quarterly addenda page", url=self.quarterly_addenda_url)
         
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.get(self.quarterly_addenda_url)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Find links to quarterly releases
-            addenda_links = []
-            
-            # Look for links containing quarter/year patterns
-            for link in soup.find_all('a', href=True):
-                href = link.get('href', '')
-                text = link.get_text(strip=True)
-                
-                # Debug logging
-                logger.debug("Checking link", href=href, text=text)
-                
-                # Check if this looks like a quarterly addenda link
-                if self._is_quarterly_addenda_link(href, text):
-                    full_url = urljoin(self.quarterly_addenda_url, href)
-                    addenda_links.append({
-                        'url': full_url,
-                        'text': text,
-                        'href': href
-                    })
-                    logger.debug("Added quarterly link", url=full_url, text=text)
+        page = await self.crawler.fetch(self.quarterly_addenda_url)
+        
+        # Find links to quarterly releases
+        addenda_links = []
+        
+        # Look for links containing quarter/year patterns
+        for link in self.crawler.links(page):
+            href = link.href
+            text = link.text
             
-            logger.info("Found quarterly addenda links", count=len(addenda_links))
-            return addenda_links
+            # Check if this looks like a quarterly addenda link
+            if self._is_quarterly_addenda_link(href, text):
+                addenda_links.append({
+                    'url': link.url,
+                    'text': text,
+                    'href': href
+                })
+                logger.debug("Added quarterly link", url=link.url, text=text)
+        
+        logger.info("Found quarterly addenda links", count=len(addenda_links), page_changed=page.changed)
+        return addenda_links
     
     def _is_quarterly_addenda_link(self, href: str, text: str) -> bool:
         """Check if a link points to quarterly addenda."""
@@ -298,58 +296,73 @@ class CMSOPPSScraper:
             quarter=quarter_info['quarter']
         )
         
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.get(quarter_url)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            files = []
-            year = quarter_info['year']
-            quarter = quarter_info['quarter']
+        page = await self.crawler.fetch(quarter_url)
+        year = quarter_info['year']
+        quarter = quarter_info['quarter']
+        batch_id = f"opps_{year}q{quarter}_r01"
+        
+        # Disclaimer resolution issues a request per file; reuse the last
+        # results while the quarter page is unchanged (re-resolved after
+        # RESOLUTION_TTL so transient failures do not stick)
+        cached = page.annotations.get("resolved_files")
+        if cached and datetime.utcnow() - datetime.fromisoformat(cached['resolved_at']) < RESOLUTION_TTL:
+            resolved = cached['files']
+        else:
+            resolved = []
             
             # Look for file links
-            for link in soup.find_all('a', href=True):
-                href = link.get('href', '')
-                text = link.get_text(strip=True)
+            for link in self.crawler.links(page):
+                href = link.href
+                text = link.text
                 
                 # Check if this is a relevant file
                 file_type = self._classify_file(href, text)
                 if file_type:
-                    initial_url = urljoin(quarter_url, href)
-                    
-                    # Generate batch ID
-                    batch_id = f"opps_{year}q{quarter}_r01"
+                    initial_url = link.url
                     
                     # Handle disclaimer interstitials using tiered strategy
-                    final_url = await self._resolve_disclaimer_url(client, initial_url, text)
-                    
-                    file_info = ScrapedFileInfo(
-                        url=final_url,
-                        filename=self._extract_filename(href, text),
-                        file_type=file_type,
-                        batch_id=batch_id,
-                        discovered_at=datetime.utcnow(),
-                        source_page=quarter_url,
-                        metadata={
-                            'year': year,
-                            'quarter': quarter,
-                            'addendum_type': file_type,
-                            'original_text': text,
-                            'initial_url': initial_url,
-                            'disclaimer_resolved': final_url != initial_url
-                        }
-                    )
-                    
-                    files.append(file_info)
+                    final_url = await self._resolve_disclaimer_url(self.crawler.client, initial_url, text)
+                    resolved.append({
+                        'url': final_url,
+                        'filename': self._extract_filename(href, text),
+                        'file_type': file_type,
+                        'original_text': text,
+                        'initial_url': initial_url
+                    })
             
-            logger.info(
-                "Discovered quarter files",
-                quarter=f"{year}Q{quarter}",
-                file_count=len(files)
+            self.crawler.annotate(page, "resolved_files", {
+                'resolved_at': datetime.utcnow().isoformat(),
+                'files': resolved
+            })
+        
+        files = [
+            ScrapedFileInfo(
+                url=entry['url'],
+                filename=entry['filename'],
+                file_type=entry['file_type'],
+                batch_id=batch_id,
+                discovered_at=datetime.utcnow(),
+                source_page=quarter_url,
+                metadata={
+                    'year': year,
+                    'quarter': quarter,
+                    'addendum_type': entry['file_type'],
+                    'original_text': entry['original_text'],
+                    'initial_url': entry['initial_url'],
+                    'disclaimer_resolved': entry['url'] != entry['initial_url']
+                }
             )
-            
-            return files
+            for entry in resolved
+        ]
+        
+        logger.info(
+            "Discovered quarter files",
+            quarter=f"{year}Q{quarter}",
+            file_count=len(files),
+            page_changed=page.changed
+        )
+        
+        return files
     
     async def _resolve_disclaimer_url(self, client: httpx.AsyncClient, initial_url: str, text: str) -> str:
         """
@@ -652,11 +665,10 @@ class CMSOPPSScraper:
             batch_dir = self.output_dir / "scraped" / file_info.batch_id
             batch_dir.mkdir(parents=True, exist_ok=True)
             
-            # Download file
-            file_path = await self._download_with_retry(file_info.url, batch_dir / file_info.filename)
-            
-            # Calculate checksum
-            checksum = self._calculate_checksum(file_path)
+            # Download into the raw store; the batch path links to the object
+            file_path = batch_dir / file_info.filename
+            stored = await self._download_with_retry(file_info.url, file_path)
+            checksum = stored.sha256
             
             # Update file info
             file_info.local_path = file_path
@@ -717,18 +729,11 @@ class CMSOPPSScraper:
                 sha256_hash.update(byte_block)
         return sha256_hash.hexdigest()
     
-    async def _download_with_retry(self, url: str, file_path: Path, max_retries: int = 3) -> Path:
-        """Download file with retry logic."""
+    async def _download_with_retry(self, url: str, file_path: Path, max_retries: int = 3) -> StoredObject:
+        """Download file into the raw store (linked at file_path) with retry logic."""
         for attempt in range(max_retries):
             try:
-                async with httpx.AsyncClient(timeout=30.0) as client:
-                    response = await client.get(url)
-                    response.raise_for_status()
-                    
-                    with open(file_path, 'wb') as f:
-                        f.write(response.content)
-                    
-                    return file_path
+                return await self.raw_store.download(self.crawler.client, url, file_path)
                     
             except Exception as e:
                 if attempt == max_retries - 1:
@@ -813,23 +818,26 @@ async def main():
     
     scraper = CMSOPPSScraper(output_dir=args.output_dir)
     
-    if args.discover:
-        files = await scraper.discover_files(max_quarters=args.max_quarters)
-        print(f"Discovered {len(files)} OPPS files")
-        
-        for file_info in files:
-            print(f"  {file_info.batch_id}: {file_info.filename} ({file_info.file_type})")
-    
-    if args.download:
-        files = await scraper.discover_latest(quarters=args.latest)
-        print(f"Downloading {len(files)} latest OPPS files")
+    try:
+        if args.discover:
+            files = await scraper.discover_files(max_quarters=args.max_quarters)
+            print(f"Discovered {len(files)} OPPS files")
+            
+            for file_info in files:
+                print(f"  {file_info.batch_id}: {file_info.filename} ({file_info.file_type})")
         
-        for file_info in files:
-            try:
-                await scraper.download_file(file_info)
-                print(f"  Downloaded: {file_info.filename}")
-            except Exception as e:
-                print(f"  Failed to download {file_info.filename}: {e}")
+        if args.download:
+            files = await scraper.discover_latest(quarters=args.latest)
+            print(f"Downloading {len(files)} latest OPPS files")
+            
+            for file_info in files:
+                try:
+                    await scraper.download_file(file_info)
+                    print(f"  Downloaded: {file_info.filename}")
+                except Exception as e:
+                    print(f"  Failed to download {file_info.filename}: {e}")
+    finally:
+        await close_shared_client()
 
 
 if __name__ == "__main__":
@@ -5,14 +5,15 @@ Scrapes the official CMS RVU files page and downloads historical data
 
 import asyncio
 import re
-import hashlib
 from datetime import datetime, date
 from pathlib import Path
 from typing import List, Dict, Any, Optional
 from dataclasses import dataclass
 import httpx
 import structlog
-from bs4 import BeautifulSoup
+
+from ..raw_store import RawStore, raw_store_for
+from .crawler import Crawler, Link, close_shared_client
 
 logger = structlog.get_logger()
 
@@ -34,11 +35,13 @@ class RVUFileInfo:
 class CMSRVUScraper:
     """Scraper for CMS RVU files page"""
     
-    def __init__(self, output_dir: str = "./data/cms_rvu"):
+    def __init__(self, output_dir: str = "./data/cms_rvu", raw_store: Optional[RawStore] = None):
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
         self.base_url = "https://www.cms.gov"
         self.rvu_page_url = "https://www.cms.gov/medicare/payment/fee-schedules/physician/pfs-relative-value-files"
+        self.crawler = Crawler(self.output_dir / "page_cache")
+        self.raw_store = raw_store or raw_store_for()
         
     async def scrape_rvu_files(self, start_year: int = 2003, end_year: int = 2025) -> List[RVUFileInfo]:
         """
@@ -55,21 +58,18 @@ class CMSRVUScraper:
                    start_year=start_year, end_year=end_year)
         
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                # Fetch the main RVU page
-                response = await client.get(self.rvu_page_url)
-                response.raise_for_status()
-                
-                # Parse HTML
-                soup = BeautifulSoup(response.content, 'html.parser')
-                
-                # Extract file links from the page
-                rvu_files = self._extract_file_links(soup, start_year, end_year)
-                
-                logger.info("RVU files scraped successfully", 
-                           files_found=len(rvu_files))
-                
-                return rvu_files
+            # Conditional fetch; an unchanged page reuses its extracted links
+            page = await self.crawler.fetch(self.rvu_page_url)
+            links = self.crawler.links(page)
+            
+            # Extract file links from the page
+            rvu_files = self._extract_file_links(links, start_year, end_year)
+            
+            logger.info("RVU files scraped successfully", 
+                       files_found=len(rvu_files),
+                       page_changed=page.changed)
+            
+            return rvu_files
                 
         except Exception as e:
             logger.error("Failed to scrape RVU files", error=str(e))
@@ -142,34 +142,23 @@ class CMSRVUScraper:
             
             logger.info("Downloading file", url=url, filename=filename)
             
-            # Download file
-            response = await client.get(url)
-            response.raise_for_status()
-            
-            # Save file
+            # Download into the raw store; file_path links to the object
             file_path = self.output_dir / filename
-            with open(file_path, 'wb') as f:
-                f.write(response.content)
-            
-            # Calculate checksum
-            import hashlib
-            with open(file_path, 'rb') as f:
-                file_content = f.read()
-                checksum = hashlib.sha256(file_content).hexdigest()
+            stored = await self.raw_store.download(client, url, file_path)
             
             result = {
                 "success": True,
                 "filename": filename,
                 "url": url,
                 "file_path": str(file_path),
-                "size_bytes": len(file_content),
-                "checksum": checksum,
+                "size_bytes": stored.size_bytes,
+                "checksum": stored.sha256,
                 "downloaded_at": datetime.now().isoformat()
             }
             
             logger.info("File downloaded successfully", 
                        filename=filename, 
-                       size_bytes=len(file_content))
+                       size_bytes=stored.size_bytes)
             
             return result
             
@@ -183,42 +172,16 @@ class CMSRVUScraper:
                 "error": str(e)
             }
     
-    def _extract_file_links(self, soup: BeautifulSoup, start_year: int, end_year: int) -> List[RVUFileInfo]:
-        """Extract file links from the parsed HTML"""
+    def _extract_file_links(self, links: List[Link], start_year: int, end_year: int) -> List[RVUFileInfo]:
+        """Extract RVU files from the page's links"""
         rvu_files = []
         
-        # Look for links that match RVU file patterns
-        # Pattern: RVU{YY}{Letter} or similar
-        rvu_pattern = re.compile(r'RVU(\d{2,4})([A-Z]*)', re.IGNORECASE)
-        
-        # Find all links on the page
-        links = soup.find_all('a', href=True)
-        
+        # Every link (including those in tables) whose text names an RVU
+        # file, e.g. RVU{YY}{Letter}; anything else fails to parse
         for link in links:
-            href = link.get('href', '')
-            text = link.get_text(strip=True)
-            
-            # Check if this looks like an RVU file
-            if 'rvu' in text.lower() or 'rvu' in href.lower():
-                # Extract file information
-                file_info = self._parse_rvu_link(href, text, start_year, end_year)
-                if file_info:
-                    rvu_files.append(file_info)
-        
-        # Also look for direct file links in tables
-        tables = soup.find_all('table')
-        for table in tables:
-            rows = table.find_all('tr')
-            for row in rows:
-                cells = row.find_all(['td', 'th'])
-                for cell in cells:
-                    links_in_cell = cell.find_all('a', href=True)
-                    for link in links_in_cell:
-                        href = link.get('href', '')
-                        text = link.get_text(strip=True)
-                        file_info = self._parse_rvu_link(href, text, start_year, end_year)
-                        if file_info:
-                            rvu_files.append(file_info)
+            file_info = self._parse_rvu_link(link.href, link.text, start_year, end_year)
+            if file_info:
+                rvu_files.append(file_info)
         
         # Remove duplicates and sort by year
         unique_files = self._deduplicate_files(rvu_files)
@@ -292,36 +255,26 @@ class CMSRVUScraper:
             logger.info("Downloading RVU file", 
                        filename=file_info.filename, url=file_info.url)
             
-            response = await client.get(file_info.url)
-            response.raise_for_status()
-            
-            content = response.content
-            
-            # Calculate checksum
-            checksum = hashlib.sha256(content).hexdigest()
-            
-            # Save file
+            # Download into the raw store; file_path links to the object
             file_path = self.output_dir / f"{file_info.year}" / file_info.filename
-            file_path.parent.mkdir(parents=True, exist_ok=True)
-            
-            with open(file_path, 'wb') as f:
-                f.write(content)
+            stored = await self.raw_store.download(client, file_info.url, file_path)
+            checksum = stored.sha256
             
             # Update file info
-            file_info.size_bytes = len(content)
+            file_info.size_bytes = stored.size_bytes
             file_info.checksum = checksum
             file_info.last_modified = datetime.now()
             
             logger.info("File downloaded successfully", 
                        filename=file_info.filename, 
-                       size_bytes=len(content),
+                       size_bytes=stored.size_bytes,
                        checksum=checksum[:16])
             
             return {
                 "status": "success",
                 "file_info": file_info,
                 "file_path": str(file_path),
-                "size_bytes": len(content),
+                "size_bytes": stored.size_bytes,
                 "checksum": checksum
             }
             
@@ -417,21 +370,24 @@ async def main():
     """Main function to demonstrate the scraper"""
     scraper = CMSRVUScraper()
     
-    # Scrape files from 2020 to 2025 (recent data)
-    files = await scraper.scrape_rvu_files(start_year=2020, end_year=2025)
-    
-    print(f"Found {len(files)} RVU files:")
-    for file_info in files:
-        print(f"  {file_info.year} {file_info.quarter}: {file_info.filename}")
-    
-    # Download files (limit to 3 for demo)
-    if files:
-        demo_files = files[:3]  # Just download first 3 files for demo
-        results = await scraper.download_all_files(demo_files, max_concurrent=2)
+    try:
+        # Scrape files from 2020 to 2025 (recent data)
+        files = await scraper.scrape_rvu_files(start_year=2020, end_year=2025)
+        
+        print(f"Found {len(files)} RVU files:")
+        for file_info in files:
+            print(f"  {file_info.year} {file_info.quarter}: {file_info.filename}")
         
-        # Generate manifest
-        manifest = scraper.generate_manifest(files, results)
-        print(f"\nManifest generated with {len(manifest['files'])} files")
+        # Download files (limit to 3 for demo)
+        if files:
+            demo_files = files[:3]  # Just download first 3 files for demo
+            results = await scraper.download_all_files(demo_files, max_concurrent=2)
+            
+            # Generate manifest
+            manifest = scraper.generate_manifest(files, results)
+            print(f"\nManifest generated with {len(manifest['files'])} files")
+    finally:
+        await close_shared_client()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,234 @@
+"""
+Shared crawler layer for CMS discovery pages
+
+All page fetches go through one pooled httpx client per event loop
+(HTTP/2 when the h2 package is installed) instead of a fresh client per
+request. Fetched pages are cached on disk by URL with their ETag and
+Last-Modified headers and revalidated with conditional requests, so an
+unchanged listing page costs a 304 and is never re-parsed: link
+extraction (lxml XPath, BeautifulSoup fallback) and any other per-page
+results are stored as annotations that stay valid until the content
+changes.
+"""
+
+import asyncio
+import hashlib
+import importlib.util
+import json
+import weakref
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+from urllib.parse import urljoin
+
+import httpx
+import structlog
+
+logger = structlog.get_logger()
+
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+DEFAULT_TIMEOUT = 30.0
+DEFAULT_LIMITS = httpx.Limits(max_connections=20, max_keepalive_connections=10, keepalive_expiry=30.0)
+DEFAULT_HEADERS = {"User-Agent": "DIS-CMS-Scraper/1.0 (+ops@yourco.com)"}
+
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+
+
+def shared_client() -> httpx.AsyncClient:
+    """Pooled client for the running event loop"""
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            timeout=DEFAULT_TIMEOUT,
+            limits=DEFAULT_LIMITS,
+            headers=DEFAULT_HEADERS,
+            http2=HTTP2_AVAILABLE,
+        )
+        _clients[loop] = client
+    return client
+
+
+async def close_shared_client():
+    """Close the running loop's pooled client (e.g. at the end of a CLI run)"""
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+@dataclass
+class Link:
+    href: str
+    text: str
+    url: str
+
+
+def extract_links(content: Union[bytes, str], base_url: str) -> List[Link]:
+    """Every <a href> in document order, with text stripped like get_text(strip=True)"""
+    try:
+        import lxml.html
+    except ImportError:
+        lxml = None
+
+    links = []
+    if lxml is not None:
+        if not content:
+            return links
+        document = lxml.html.fromstring(content)
+        for anchor in document.xpath("//a[@href]"):
+            href = anchor.get("href", "")
+            text = "".join(piece.strip() for piece in anchor.xpath(".//text()"))
+            links.append(Link(href, text, urljoin(base_url, href)))
+        return links
+
+    from bs4 import BeautifulSoup
+    for anchor in BeautifulSoup(content, "html.parser").find_all("a", href=True):
+        href = anchor.get("href", "")
+        links.append(Link(href, anchor.get_text(strip=True), urljoin(base_url, href)))
+    return links
+
+
+@dataclass
+class Page:
+    """A fetched page; changed is False when the cached copy was still current"""
+    url: str
+    content: bytes
+    content_sha256: str
+    changed: bool = True
+    status_code: int = 200
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    content_type: Optional[str] = None
+    fetched_at: str = field(default_factory=lambda: datetime.utcnow().isoformat())
+    # Results derived from this exact content (dropped when it changes)
+    annotations: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8", errors="replace")
+
+
+class PageCache:
+    """Pages on disk as <sha256(url)>.json (metadata) plus .body"""
+
+    def __init__(self, cache_dir: Optional[Union[str, Path]] = None):
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self._memory: Dict[str, Page] = {}
+
+    def _paths(self, url: str):
+        key = hashlib.sha256(url.encode()).hexdigest()
+        directory = self.cache_dir / key[:2]
+        return directory / f"{key}.json", directory / f"{key}.body"
+
+    def load(self, url: str) -> Optional[Page]:
+        if url in self._memory:
+            return self._memory[url]
+        if self.cache_dir is None:
+            return None
+
+        meta_path, body_path = self._paths(url)
+        if not meta_path.exists() or not body_path.exists():
+            return None
+        try:
+            with open(meta_path) as f:
+                meta = json.load(f)
+            page = Page(content=body_path.read_bytes(), **meta)
+        except (OSError, ValueError, TypeError) as e:
+            logger.warning("Ignoring unreadable page cache entry", url=url, error=str(e))
+            return None
+        if hashlib.sha256(page.content).hexdigest() != page.content_sha256:
+            return None
+        self._memory[url] = page
+        return page
+
+    def save(self, page: Page):
+        self._memory[page.url] = page
+        if self.cache_dir is None:
+            return
+
+        meta_path, body_path = self._paths(page.url)
+        meta_path.parent.mkdir(parents=True, exist_ok=True)
+        meta = {name: value for name, value in page.__dict__.items() if name not in ("content", "changed")}
+        try:
+            tmp_body = body_path.with_suffix(".body.tmp")
+            tmp_body.write_bytes(page.content)
+            tmp_body.replace(body_path)
+            tmp_meta = meta_path.with_suffix(".json.tmp")
+            with open(tmp_meta, "w") as f:
+                json.dump(meta, f)
+            tmp_meta.replace(meta_path)
+        except (OSError, TypeError) as e:
+            logger.warning("Failed to persist page cache entry", url=page.url, error=str(e))
+
+
+class Crawler:
+    """
+    Conditional, cached page fetches over the shared client.
+
+    Pass client to use a specific httpx.AsyncClient (e.g. one with a mock
+    transport); otherwise the running loop's pooled client is used.
+    """
+
+    def __init__(self, cache_dir: Optional[Union[str, Path]] = None, client: Optional[httpx.AsyncClient] = None):
+        self.cache = PageCache(cache_dir)
+        self._client = client
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        return self._client or shared_client()
+
+    async def fetch(self, url: str, headers: Optional[Dict[str, str]] = None) -> Page:
+        """Fetch a page, revalidating any cached copy with If-None-Match/If-Modified-Since"""
+        cached = self.cache.load(url)
+        request_headers = dict(headers or {})
+        if cached is not None:
+            if cached.etag:
+                request_headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                request_headers["If-Modified-Since"] = cached.last_modified
+
+        response = await self.client.get(url, headers=request_headers, follow_redirects=True)
+
+        if response.status_code == 304 and cached is not None:
+            cached.changed = False
+            cached.status_code = 304
+            logger.debug("Page not modified", url=url)
+            return cached
+
+        response.raise_for_status()
+        content = response.content
+        digest = hashlib.sha256(content).hexdigest()
+        # Servers without validators still avoid a re-parse if the bytes match
+        changed = cached is None or cached.content_sha256 != digest
+
+        page = Page(
+            url=url,
+            content=content,
+            content_sha256=digest,
+            changed=changed,
+            status_code=response.status_code,
+            etag=response.headers.get("etag"),
+            last_modified=response.headers.get("last-modified"),
+            content_type=response.headers.get("content-type"),
+            annotations={} if changed else cached.annotations,
+        )
+        self.cache.save(page)
+        logger.debug("Page fetched", url=url, changed=changed)
+        return page
+
+    def annotate(self, page: Page, key: str, value: Any):
+        """Store a JSON-serializable result derived from the page's content"""
+        page.annotations[key] = value
+        self.cache.save(page)
+
+    def links(self, page: Page) -> List[Link]:
+        """Links on the page, extracted once per distinct content"""
+        cached = page.annotations.get("links")
+        if cached is not None:
+            return [Link(**link) for link in cached]
+
+        links = extract_links(page.content, page.url)
+        self.annotate(page, "links", [link.__dict__ for link in links])
+        return links
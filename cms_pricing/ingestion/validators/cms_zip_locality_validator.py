@@ -4,14 +4,19 @@ Implements DIS-compliant validation rules for CMS ZIP locality data
 """
 
 import json
-import re
 from datetime import datetime, date
 from typing import Dict, List, Any, Tuple, Optional
+import numpy as np
 import pandas as pd
 from dataclasses import dataclass
 from enum import Enum
 
 from ..contracts.ingestor_spec import ValidationSeverity
+from .rule_planner import PlannedRule, RulePlan, ValidationContext
+
+
+REQUIRED_FIELDS = ("zip5", "state", "locality", "effective_from", "vintage")
+DATE_FIELDS = ("effective_from", "effective_to", "vintage")
 
 
 class ValidationResult(Enum):
@@ -29,6 +34,10 @@ class ValidationRule:
     severity: ValidationSeverity
     validator_func: callable
     threshold: float = 1.0
+    # Columns the rule reads; rules sharing none run concurrently
+    columns: Tuple[str, ...] = ()
+    # A failed blocking rule skips all remaining rules
+    blocking: bool = False
 
 
 @dataclass
@@ -61,6 +70,10 @@ class CMSZipLocalityValidator:
         """Initialize validator with schema contract"""
         self.schema_contract = self._load_schema_contract(schema_contract_path)
         self.validation_rules = self._create_validation_rules()
+        self.plan = RulePlan(
+            PlannedRule(rule.name, rule.validator_func, frozenset(rule.columns), rule.blocking)
+            for rule in self.validation_rules
+        )
         self.valid_states = {
             "AL", "AK", "AZ", "AR", "CA", "CO", "CT", "DE", "FL", "GA",
             "HI", "ID", "IL", "IN", "IA", "KS", "KY", "LA", "ME", "MD",
@@ -107,14 +120,16 @@ class CMSZipLocalityValidator:
                 description="All required fields must be present",
                 severity=ValidationSeverity.CRITICAL,
                 validator_func=self._validate_required_fields,
-                threshold=1.0
+                threshold=1.0,
+                blocking=True
             ),
             ValidationRule(
                 name="data_types",
                 description="Data types must match schema",
                 severity=ValidationSeverity.CRITICAL,
                 validator_func=self._validate_data_types,
-                threshold=1.0
+                threshold=1.0,
+                columns=("zip5", "state", "locality")
             ),
             
             # Domain validation
@@ -123,28 +138,32 @@ class CMSZipLocalityValidator:
                 description="ZIP5 codes must be exactly 5 digits",
                 severity=ValidationSeverity.CRITICAL,
                 validator_func=self._validate_zip5_format,
-                threshold=1.0
+                threshold=1.0,
+                columns=("zip5",)
             ),
             ValidationRule(
                 name="state_codes",
                 description="State codes must be valid US state/territory codes",
                 severity=ValidationSeverity.CRITICAL,
                 validator_func=self._validate_state_codes,
-                threshold=1.0
+                threshold=1.0,
+                columns=("state",)
             ),
             ValidationRule(
                 name="locality_format",
                 description="Locality codes must be non-empty numeric strings",
                 severity=ValidationSeverity.CRITICAL,
                 validator_func=self._validate_locality_format,
-                threshold=1.0
+                threshold=1.0,
+                columns=("locality",)
             ),
             ValidationRule(
                 name="date_formats",
                 description="Date fields must be valid ISO dates",
                 severity=ValidationSeverity.CRITICAL,
                 validator_func=self._validate_date_formats,
-                threshold=1.0
+                threshold=1.0,
+                columns=DATE_FIELDS
             ),
             
             # Business rule validation
@@ -153,21 +172,24 @@ class CMSZipLocalityValidator:
                 description="ZIP5 codes must be unique per vintage",
                 severity=ValidationSeverity.CRITICAL,
                 validator_func=self._validate_uniqueness,
-                threshold=1.0
+                threshold=1.0,
+                columns=("zip5",)
             ),
             ValidationRule(
                 name="effective_date_range",
                 description="Effective end date must be after start date",
                 severity=ValidationSeverity.CRITICAL,
                 validator_func=self._validate_effective_date_range,
-                threshold=1.0
+                threshold=1.0,
+                columns=("effective_from", "effective_to")
             ),
             ValidationRule(
                 name="future_dates",
                 description="Dates must not be in the future",
                 severity=ValidationSeverity.WARNING,
                 validator_func=self._validate_future_dates,
-                threshold=0.95
+                threshold=0.95,
+                columns=DATE_FIELDS
             ),
             
             # Quality validation
@@ -176,7 +198,8 @@ class CMSZipLocalityValidator:
                 description="Critical fields must have high completeness",
                 severity=ValidationSeverity.CRITICAL,
                 validator_func=self._validate_completeness,
-                threshold=0.99
+                threshold=0.99,
+                columns=REQUIRED_FIELDS
             )
         ]
     
@@ -211,10 +234,30 @@ class CMSZipLocalityValidator:
         failed_records = 0
         warning_records = 0
         
-        # Run all validation rules
-        for rule in self.validation_rules:
-            try:
-                result = rule.validator_func(df, vintage)
+        # Run the rule plan: required_fields gates the rest, then
+        # independent rule groups run concurrently over shared intermediates
+        outcomes = self.plan.run(df, lambda result: not result["passed"], vintage)
+        
+        for rule, outcome in zip(self.validation_rules, outcomes):
+            if outcome.skipped:
+                validation_results.append({
+                    "rule_name": rule.name,
+                    "description": rule.description,
+                    "severity": rule.severity.value,
+                    "passed": False,
+                    "skipped": True,
+                    "passed_count": 0,
+                    "failed_count": 0,
+                    "warning_count": 0,
+                    "quality_score": 0.0,
+                    "threshold": rule.threshold,
+                    "details": {"skipped": "blocked by a failed structural rule"},
+                    "sample_failures": []
+                })
+                continue
+            
+            if outcome.error is None:
+                result = outcome.result
                 validation_results.append({
                     "rule_name": rule.name,
                     "description": rule.description,
@@ -236,8 +279,7 @@ class CMSZipLocalityValidator:
                         failed_records += result["failed_count"]
                     else:
                         warning_records += result.get("warning_count", 0)
-                        
-            except Exception as e:
+            else:
                 validation_results.append({
                     "rule_name": rule.name,
                     "description": rule.description,
@@ -248,7 +290,7 @@ class CMSZipLocalityValidator:
                     "warning_count": 0,
                     "quality_score": 0.0,
                     "threshold": rule.threshold,
-                    "details": {"error": str(e)},
+                    "details": {"error": str(outcome.error)},
                     "sample_failures": []
                 })
                 failed_records += total_records
@@ -261,7 +303,9 @@ class CMSZipLocalityValidator:
             overall_quality_score = 0.0
         
         # Get business rules applied
-        business_rules_applied = [rule.name for rule in self.validation_rules]
+        business_rules_applied = [
+            rule.name for rule, outcome in zip(self.validation_rules, outcomes) if not outcome.skipped
+        ]
         
         return ValidationReport(
             dataset_name="cms_zip_locality",
@@ -278,43 +322,36 @@ class CMSZipLocalityValidator:
     
     # Validation rule implementations
     
-    def _validate_required_fields(self, df: pd.DataFrame, vintage: str = None) -> Dict[str, Any]:
+    def _validate_required_fields(self, ctx: ValidationContext, vintage: str = None) -> Dict[str, Any]:
         """Validate all required fields are present"""
-        required_fields = ["zip5", "state", "locality", "effective_from", "vintage"]
-        missing_fields = [field for field in required_fields if field not in df.columns]
+        missing_fields = [field for field in REQUIRED_FIELDS if not ctx.has(field)]
         
         if missing_fields:
             return {
                 "passed": False,
                 "passed_count": 0,
-                "failed_count": len(df),
+                "failed_count": len(ctx),
                 "quality_score": 0.0,
                 "details": {"missing_fields": missing_fields}
             }
         
         return {
             "passed": True,
-            "passed_count": len(df),
+            "passed_count": len(ctx),
             "failed_count": 0,
             "quality_score": 1.0,
             "details": {"all_required_fields_present": True}
         }
     
-    def _validate_data_types(self, df: pd.DataFrame, vintage: str = None) -> Dict[str, Any]:
+    def _validate_data_types(self, ctx: ValidationContext, vintage: str = None) -> Dict[str, Any]:
         """Validate data types match expected schema"""
+        df = ctx.df
         type_issues = []
         
-        # Check ZIP5 is string
-        if "zip5" in df.columns and not df["zip5"].dtype == "object":
-            type_issues.append("zip5 should be string")
-        
-        # Check state is string
-        if "state" in df.columns and not df["state"].dtype == "object":
-            type_issues.append("state should be string")
-        
-        # Check locality is string
-        if "locality" in df.columns and not df["locality"].dtype == "object":
-            type_issues.append("locality should be string")
+        # ZIP5, state and locality must be strings
+        for field in ("zip5", "state", "locality"):
+            if field in df.columns and not df[field].dtype == "object":
+                type_issues.append(f"{field} should be string")
         
         if type_issues:
             return {
@@ -333,115 +370,80 @@ class CMSZipLocalityValidator:
             "details": {"all_types_correct": True}
         }
     
-    def _validate_zip5_format(self, df: pd.DataFrame, vintage: str = None) -> Dict[str, Any]:
-        """Validate ZIP5 format (exactly 5 digits)"""
-        if "zip5" not in df.columns:
-            return {"passed": False, "passed_count": 0, "failed_count": len(df), "quality_score": 0.0}
-        
-        zip5_pattern = re.compile(r'^\d{5}$')
-        valid_zips = df["zip5"].astype(str).str.match(zip5_pattern, na=False)
-        valid_count = valid_zips.sum()
-        invalid_count = len(df) - valid_count
-        
-        quality_score = valid_count / len(df) if len(df) > 0 else 0.0
+    def _pattern_result(
+        self,
+        ctx: ValidationContext,
+        field: str,
+        valid: np.ndarray,
+        details: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Rule result from a per-row validity mask"""
+        valid_count = int(valid.sum())
+        invalid_count = len(ctx) - valid_count
         
         sample_failures = []
         if invalid_count > 0:
-            invalid_samples = df[~valid_zips]["zip5"].head(5).tolist()
-            sample_failures = [{"zip5": str(zip_val)} for zip_val in invalid_samples]
+            invalid_samples = ctx.df[field][~valid].head(5).tolist()
+            sample_failures = [{field: str(value)} for value in invalid_samples]
         
         return {
             "passed": invalid_count == 0,
             "passed_count": valid_count,
             "failed_count": invalid_count,
-            "quality_score": quality_score,
-            "details": {"zip5_pattern": "^\\d{5}$"},
+            "quality_score": valid_count / len(ctx) if len(ctx) > 0 else 0.0,
+            "details": details,
             "sample_failures": sample_failures
         }
     
-    def _validate_state_codes(self, df: pd.DataFrame, vintage: str = None) -> Dict[str, Any]:
-        """Validate state codes are valid US state/territory codes"""
-        if "state" not in df.columns:
-            return {"passed": False, "passed_count": 0, "failed_count": len(df), "quality_score": 0.0}
-        
-        valid_states = df["state"].astype(str).str.upper().isin(self.valid_states)
-        valid_count = valid_states.sum()
-        invalid_count = len(df) - valid_count
-        
-        quality_score = valid_count / len(df) if len(df) > 0 else 0.0
+    def _validate_zip5_format(self, ctx: ValidationContext, vintage: str = None) -> Dict[str, Any]:
+        """Validate ZIP5 format (exactly 5 digits)"""
+        if not ctx.has("zip5"):
+            return {"passed": False, "passed_count": 0, "failed_count": len(ctx), "quality_score": 0.0}
         
-        sample_failures = []
-        if invalid_count > 0:
-            invalid_samples = df[~valid_states]["state"].head(5).tolist()
-            sample_failures = [{"state": str(state_val)} for state_val in invalid_samples]
+        valid_zips = ctx.matches("zip5", r'^\d{5}$')
+        return self._pattern_result(ctx, "zip5", valid_zips, {"zip5_pattern": "^\\d{5}$"})
+    
+    def _validate_state_codes(self, ctx: ValidationContext, vintage: str = None) -> Dict[str, Any]:
+        """Validate state codes are valid US state/territory codes"""
+        if not ctx.has("state"):
+            return {"passed": False, "passed_count": 0, "failed_count": len(ctx), "quality_score": 0.0}
         
-        return {
-            "passed": invalid_count == 0,
-            "passed_count": valid_count,
-            "failed_count": invalid_count,
-            "quality_score": quality_score,
-            "details": {"valid_states": list(self.valid_states)},
-            "sample_failures": sample_failures
-        }
+        valid_states = ctx.upper("state").isin(self.valid_states).to_numpy()
+        return self._pattern_result(ctx, "state", valid_states, {"valid_states": list(self.valid_states)})
     
-    def _validate_locality_format(self, df: pd.DataFrame, vintage: str = None) -> Dict[str, Any]:
+    def _validate_locality_format(self, ctx: ValidationContext, vintage: str = None) -> Dict[str, Any]:
         """Validate locality codes are non-empty numeric strings"""
-        if "locality" not in df.columns:
-            return {"passed": False, "passed_count": 0, "failed_count": len(df), "quality_score": 0.0}
-        
-        # Check non-empty and numeric
-        locality_str = df["locality"].astype(str)
-        non_empty = locality_str != ""
-        numeric = locality_str.str.match(r'^\d+$', na=False)
-        valid_localities = non_empty & numeric
-        
-        valid_count = valid_localities.sum()
-        invalid_count = len(df) - valid_count
-        
-        quality_score = valid_count / len(df) if len(df) > 0 else 0.0
-        
-        sample_failures = []
-        if invalid_count > 0:
-            invalid_samples = df[~valid_localities]["locality"].head(5).tolist()
-            sample_failures = [{"locality": str(loc_val)} for loc_val in invalid_samples]
+        if not ctx.has("locality"):
+            return {"passed": False, "passed_count": 0, "failed_count": len(ctx), "quality_score": 0.0}
         
-        return {
-            "passed": invalid_count == 0,
-            "passed_count": valid_count,
-            "failed_count": invalid_count,
-            "quality_score": quality_score,
-            "details": {"locality_pattern": "^\\d+$"},
-            "sample_failures": sample_failures
-        }
+        # One or more digits (so also non-empty)
+        valid_localities = ctx.matches("locality", r'^\d+$')
+        return self._pattern_result(ctx, "locality", valid_localities, {"locality_pattern": "^\\d+$"})
     
-    def _validate_date_formats(self, df: pd.DataFrame, vintage: str = None) -> Dict[str, Any]:
+    def _validate_date_formats(self, ctx: ValidationContext, vintage: str = None) -> Dict[str, Any]:
         """Validate date fields are valid ISO dates"""
-        date_fields = ["effective_from", "effective_to", "vintage"]
         all_valid = True
         total_valid = 0
         total_invalid = 0
         
-        for field in date_fields:
-            if field not in df.columns:
+        for field in DATE_FIELDS:
+            if not ctx.has(field):
                 continue
                 
             # Skip fields that are all null (like effective_to)
-            if df[field].isnull().all():
+            if ctx.null_mask(field).all():
                 continue
                 
-            # Try to parse dates
+            # Parse the string form; unparseable values become NaT
             try:
-                # Convert to string first if needed
-                field_data = df[field].astype(str)
-                parsed_dates = pd.to_datetime(field_data, format="%Y-%m-%d", errors="coerce")
-                valid_dates = parsed_dates.notna()
-                total_valid += valid_dates.sum()
-                total_invalid += (~valid_dates).sum()
+                valid_dates = ctx.dates(field, format="%Y-%m-%d").notna().to_numpy()
+                total_valid += int(valid_dates.sum())
+                total_invalid += int((~valid_dates).sum())
                 if not valid_dates.all():
                     all_valid = False
-            except Exception as e:
+            except Exception:
                 all_valid = False
-                total_invalid += len(df)
+                total_invalid += len(ctx)
         
         quality_score = total_valid / (total_valid + total_invalid) if (total_valid + total_invalid) > 0 else 0.0
         
@@ -453,14 +455,14 @@ class CMSZipLocalityValidator:
             "details": {"date_format": "YYYY-MM-DD"}
         }
     
-    def _validate_uniqueness(self, df: pd.DataFrame, vintage: str = None) -> Dict[str, Any]:
+    def _validate_uniqueness(self, ctx: ValidationContext, vintage: str = None) -> Dict[str, Any]:
         """Validate ZIP5 codes are unique per vintage"""
-        if "zip5" not in df.columns:
-            return {"passed": False, "passed_count": 0, "failed_count": len(df), "quality_score": 0.0}
+        if not ctx.has("zip5"):
+            return {"passed": False, "passed_count": 0, "failed_count": len(ctx), "quality_score": 0.0}
         
         # Check uniqueness within the dataset
-        unique_zips = df["zip5"].nunique()
-        total_records = len(df)
+        unique_zips = ctx.df["zip5"].nunique()
+        total_records = len(ctx)
         duplicates = total_records - unique_zips
         
         quality_score = unique_zips / total_records if total_records > 0 else 0.0
@@ -473,22 +475,21 @@ class CMSZipLocalityValidator:
             "details": {"unique_zip5_count": unique_zips, "duplicate_count": duplicates}
         }
     
-    def _validate_effective_date_range(self, df: pd.DataFrame, vintage: str = None) -> Dict[str, Any]:
+    def _validate_effective_date_range(self, ctx: ValidationContext, vintage: str = None) -> Dict[str, Any]:
         """Validate effective end date is after start date"""
-        if "effective_from" not in df.columns or "effective_to" not in df.columns:
-            return {"passed": True, "passed_count": len(df), "failed_count": 0, "quality_score": 1.0}
+        if not ctx.has("effective_from") or not ctx.has("effective_to"):
+            return {"passed": True, "passed_count": len(ctx), "failed_count": 0, "quality_score": 1.0}
         
-        # Convert to datetime for comparison
         try:
-            from_dates = pd.to_datetime(df["effective_from"], errors="coerce")
-            to_dates = pd.to_datetime(df["effective_to"], errors="coerce")
+            from_dates = ctx.dates("effective_from")
+            to_dates = ctx.dates("effective_to")
             
             # Check where effective_to is not null and is before effective_from
             invalid_ranges = (to_dates.notna()) & (to_dates < from_dates)
-            invalid_count = invalid_ranges.sum()
-            valid_count = len(df) - invalid_count
+            invalid_count = int(invalid_ranges.sum())
+            valid_count = len(ctx) - invalid_count
             
-            quality_score = valid_count / len(df) if len(df) > 0 else 0.0
+            quality_score = valid_count / len(ctx) if len(ctx) > 0 else 0.0
             
             return {
                 "passed": invalid_count == 0,
@@ -497,39 +498,31 @@ class CMSZipLocalityValidator:
                 "quality_score": quality_score,
                 "details": {"invalid_date_ranges": invalid_count}
             }
-        except:
-            return {"passed": False, "passed_count": 0, "failed_count": len(df), "quality_score": 0.0}
+        except Exception:
+            return {"passed": False, "passed_count": 0, "failed_count": len(ctx), "quality_score": 0.0}
     
-    def _validate_future_dates(self, df: pd.DataFrame, vintage: str = None) -> Dict[str, Any]:
+    def _validate_future_dates(self, ctx: ValidationContext, vintage: str = None) -> Dict[str, Any]:
         """Validate dates are not in the future"""
-        date_fields = ["effective_from", "effective_to", "vintage"]
-        today = date.today()
+        today = pd.Timestamp(date.today())
         total_valid = 0
         total_future = 0
         
-        for field in date_fields:
-            if field not in df.columns:
+        for field in DATE_FIELDS:
+            if not ctx.has(field):
                 continue
                 
             # Skip fields that are all null (like effective_to)
-            if df[field].isnull().all():
+            if ctx.null_mask(field).all():
                 continue
                 
             try:
-                # Convert to datetime, handling different input types
-                if field == "effective_from" and hasattr(df[field].iloc[0], 'date'):
-                    # Already datetime.date objects
-                    field_dates = pd.to_datetime(df[field]).dt.date
-                else:
-                    # String dates
-                    field_dates = pd.to_datetime(df[field], errors="coerce").dt.date
-                
-                future_dates = field_dates > today
-                total_valid += (~future_dates).sum()
-                total_future += future_dates.sum()
-            except Exception as e:
+                # Compare calendar days; unparseable dates are not future
+                future_dates = (ctx.dates(field).dt.normalize() > today).to_numpy()
+                total_valid += int((~future_dates).sum())
+                total_future += int(future_dates.sum())
+            except Exception:
                 # If there's an error, count as future dates
-                total_future += len(df)
+                total_future += len(ctx)
         
         quality_score = total_valid / (total_valid + total_future) if (total_valid + total_future) > 0 else 0.0
         
@@ -542,22 +535,21 @@ class CMSZipLocalityValidator:
             "details": {"future_dates": total_future}
         }
     
-    def _validate_completeness(self, df: pd.DataFrame, vintage: str = None) -> Dict[str, Any]:
+    def _validate_completeness(self, ctx: ValidationContext, vintage: str = None) -> Dict[str, Any]:
         """Validate critical fields have high completeness"""
-        critical_fields = ["zip5", "state", "locality", "effective_from", "vintage"]
-        total_records = len(df)
+        total_records = len(ctx)
         
         if total_records == 0:
             return {"passed": False, "passed_count": 0, "failed_count": 0, "quality_score": 0.0}
         
-        completeness_scores = []
-        for field in critical_fields:
-            if field in df.columns:
-                non_null_count = df[field].notna().sum()
-                completeness = non_null_count / total_records
-                completeness_scores.append(completeness)
+        completeness_scores = {
+            field: float((~ctx.null_mask(field)).sum()) / total_records
+            for field in REQUIRED_FIELDS if ctx.has(field)
+        }
         
-        avg_completeness = sum(completeness_scores) / len(completeness_scores) if completeness_scores else 0.0
+        avg_completeness = (
+            sum(completeness_scores.values()) / len(completeness_scores) if completeness_scores else 0.0
+        )
         threshold = 0.99  # 99% completeness threshold
         
         return {
@@ -565,5 +557,5 @@ class CMSZipLocalityValidator:
             "passed_count": int(avg_completeness * total_records),
             "failed_count": int((1 - avg_completeness) * total_records),
             "quality_score": avg_completeness,
-            "details": {"completeness_scores": dict(zip(critical_fields, completeness_scores))}
+            "details": {"completeness_scores": completeness_scores}
         }
@@ -0,0 +1,173 @@
+"""
+Rule execution planning for DIS validators
+
+Validators describe each rule with the columns it reads. The planner runs
+blocking rules (structural gates) first and stops as soon as one fails;
+the remaining rules are grouped by the columns they read (frame-level
+rules each get their own group), and the groups run on a thread pool. Column-level
+intermediates (null masks, string forms, parsed dates) are computed once
+per frame in a ValidationContext and shared by every rule.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, FrozenSet, Hashable, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from cms_pricing.config import settings
+
+
+class ValidationContext:
+    """
+    One frame plus memoized per-column intermediates.
+
+    Safe to share between threads: each intermediate is built once, under a
+    per-key lock, and never mutated afterwards.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+        self._values: Dict[Hashable, Any] = {}
+        self._locks: Dict[Hashable, threading.Lock] = {}
+        self._guard = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.df)
+
+    def memo(self, key: Hashable, build: Callable[[], Any]) -> Any:
+        """Value for key, built on first use"""
+        if key in self._values:
+            return self._values[key]
+        with self._guard:
+            lock = self._locks.setdefault(key, threading.Lock())
+        with lock:
+            if key not in self._values:
+                self._values[key] = build()
+            return self._values[key]
+
+    def has(self, column: str) -> bool:
+        return column in self.df.columns
+
+    def null_mask(self, column: str) -> np.ndarray:
+        """Boolean mask of missing values"""
+        return self.memo(("null", column), lambda: self.df[column].isna().to_numpy())
+
+    def strings(self, column: str) -> pd.Series:
+        """Column as str (missing values become 'nan'/'None', like astype(str))"""
+        return self.memo(("str", column), lambda: self.df[column].astype(str))
+
+    def upper(self, column: str) -> pd.Series:
+        return self.memo(("upper", column), lambda: self.strings(column).str.upper())
+
+    def matches(self, column: str, pattern: str) -> np.ndarray:
+        """Boolean mask of string values matching a regex (str.match semantics)"""
+        return self.memo(
+            ("match", column, pattern),
+            lambda: self.strings(column).str.match(pattern, na=False).to_numpy()
+        )
+
+    def dates(self, column: str, format: Optional[str] = None) -> pd.Series:
+        """Column parsed to datetimes (unparseable values become NaT)"""
+        return self.memo(
+            ("dates", column, format),
+            lambda: pd.to_datetime(
+                self.strings(column) if format else self.df[column], format=format, errors="coerce"
+            )
+        )
+
+
+@dataclass
+class PlannedRule:
+    """A rule plus the columns it reads (empty for frame-level rules)"""
+    name: str
+    func: Callable[..., Any]
+    columns: FrozenSet[str] = field(default_factory=frozenset)
+    # Blocking rules run first; a failed one skips everything after it
+    blocking: bool = False
+
+
+@dataclass
+class RuleOutcome:
+    rule: PlannedRule
+    result: Any = None
+    error: Optional[Exception] = None
+    skipped: bool = False
+
+
+class RulePlan:
+    """
+    Execution plan for a fixed list of rules.
+
+    Outcomes are always returned in rule order, independent of which thread
+    finished first.
+    """
+
+    def __init__(self, rules: Iterable[PlannedRule], max_workers: Optional[int] = None):
+        self.rules: List[PlannedRule] = list(rules)
+        self.max_workers = max_workers if max_workers is not None else settings.validation_max_workers
+        self.blocking = [i for i, rule in enumerate(self.rules) if rule.blocking]
+        self.groups = self._group([i for i, rule in enumerate(self.rules) if not rule.blocking])
+
+    def _group(self, indices: List[int]) -> List[List[int]]:
+        """
+        Rules reading the same column set, in rule order.
+
+        Grouping by exact column set (rather than any overlap) keeps wide
+        rules such as completeness from serializing everything; overlapping
+        groups still compute each shared intermediate once via the context.
+        Rules that declare no columns share no intermediates, so each runs
+        in a group of its own.
+        """
+        groups: Dict[Hashable, List[int]] = {}
+        for i in indices:
+            columns = self.rules[i].columns
+            groups.setdefault(columns if columns else ("frame", i), []).append(i)
+        return list(groups.values())
+
+    def run(
+        self,
+        df: pd.DataFrame,
+        is_blocked: Callable[[Any], bool],
+        *args: Any,
+        context: Optional[ValidationContext] = None
+    ) -> List[RuleOutcome]:
+        """
+        Execute the plan against a frame.
+
+        Each rule is called as func(context, *args). is_blocked receives a
+        blocking rule's result and returns True when validation must stop;
+        rules that did not run are marked skipped.
+        """
+        context = context or ValidationContext(df)
+        outcomes: List[Optional[RuleOutcome]] = [None] * len(self.rules)
+
+        for i in self.blocking:
+            outcome = self._execute(self.rules[i], context, args)
+            outcomes[i] = outcome
+            if outcome.error is not None or is_blocked(outcome.result):
+                return [o or RuleOutcome(rule, skipped=True) for rule, o in zip(self.rules, outcomes)]
+
+        def run_group(group: List[int]) -> List[Tuple[int, RuleOutcome]]:
+            return [(i, self._execute(self.rules[i], context, args)) for i in group]
+
+        workers = min(self.max_workers, len(self.groups))
+        if workers <= 1:
+            finished = [run_group(group) for group in self.groups]
+        else:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="validation") as pool:
+                finished = list(pool.map(run_group, self.groups))
+
+        for group in finished:
+            for i, outcome in group:
+                outcomes[i] = outcome
+        return outcomes
+
+    @staticmethod
+    def _execute(rule: PlannedRule, context: ValidationContext, args: Tuple[Any, ...]) -> RuleOutcome:
+        try:
+            return RuleOutcome(rule, result=rule.func(context, *args))
+        except Exception as e:
+            return RuleOutcome(rule, error=e)
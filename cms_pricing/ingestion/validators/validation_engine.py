@@ -6,9 +6,8 @@ This module provides comprehensive validation capabilities including
 structural, domain, statistical, and business rule validation.
 """
 
-import re
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
 from enum import Enum
 from typing import Dict, Any, List, Optional, Callable, Union
 import pandas as pd
@@ -16,6 +15,9 @@ import numpy as np
 from scipy import stats
 import structlog
 
+from ..observability.column_profiles import DatasetProfile, DriftThresholds, compare_profiles, profile_frame
+from .rule_planner import PlannedRule, RulePlan
+
 logger = structlog.get_logger()
 
 
@@ -36,6 +38,8 @@ class ValidationResult:
     details: Optional[Dict[str, Any]] = None
     threshold: Optional[float] = None
     actual_value: Optional[float] = None
+    # Not run because a structural check failed; neither passed nor failed
+    skipped: bool = False
 
 
 @dataclass
@@ -49,6 +53,7 @@ class ValidationReport:
     results: List[ValidationResult]
     overall_valid: bool
     quality_score: float
+    skipped_checks: int = 0
 
 
 class ValidationRule(ABC):
@@ -206,12 +211,9 @@ class DomainValidator:
                 message=f"ZIP column '{zip_column}' not found"
             )
         
-        zip_pattern = re.compile(r'^\d{5}$')
-        invalid_zips = []
-        
-        for idx, zip_code in df[zip_column].dropna().items():
-            if not zip_pattern.match(str(zip_code)):
-                invalid_zips.append((idx, zip_code))
+        zips = df[zip_column].dropna()
+        invalid = zips[~zips.astype(str).str.match(r'^\d{5}$')]
+        invalid_zips = list(invalid.items())
         
         if invalid_zips:
             return ValidationResult(
@@ -240,12 +242,9 @@ class DomainValidator:
                 message=f"Locality column '{locality_column}' not found"
             )
         
-        locality_pattern = re.compile(r'^\d{2}$')
-        invalid_localities = []
-        
-        for idx, locality in df[locality_column].dropna().items():
-            if not locality_pattern.match(str(locality)):
-                invalid_localities.append((idx, locality))
+        localities = df[locality_column].dropna()
+        invalid = localities[~localities.astype(str).str.match(r'^\d{2}$')]
+        invalid_localities = list(invalid.items())
         
         if invalid_localities:
             return ValidationResult(
@@ -342,9 +341,22 @@ class StatisticalValidator:
         )
     
     @staticmethod
-    def validate_drift(df: pd.DataFrame, reference_df: pd.DataFrame, max_drift: float = 0.15) -> ValidationResult:
-        """Check for significant drift from reference data"""
-        if len(df) == 0 or len(reference_df) == 0:
+    def validate_drift(
+        df: pd.DataFrame,
+        reference: Union[pd.DataFrame, DatasetProfile],
+        max_drift: float = 0.15,
+        thresholds: Optional[DriftThresholds] = None
+    ) -> ValidationResult:
+        """
+        Check for significant drift from reference data.
+        
+        The reference may be a stored DatasetProfile (preferred: prior
+        vintages never need to be loaded) or a frame, which is profiled.
+        """
+        reference_profile = reference if isinstance(reference, DatasetProfile) else None
+        reference_rows = reference_profile.row_count if reference_profile else len(reference)
+        
+        if len(df) == 0 or reference_rows == 0:
             return ValidationResult(
                 rule_name="drift",
                 severity=ValidationSeverity.WARNING,
@@ -352,8 +364,14 @@ class StatisticalValidator:
                 message="Cannot calculate drift: empty datasets"
             )
         
+        if reference_profile is None:
+            reference_profile = profile_frame(reference, "reference", "reference")
+        thresholds = thresholds or DriftThresholds(row_count_change=max_drift)
+        report = compare_profiles(profile_frame(df, reference_profile.dataset, "current"), reference_profile, thresholds)
+        
         # Calculate row count drift
-        row_count_drift = abs(len(df) - len(reference_df)) / len(reference_df)
+        row_count_drift = report.row_count_change
+        column_findings = [asdict(finding) for finding in report.findings if finding.column is not None]
         
         if row_count_drift > max_drift:
             return ValidationResult(
@@ -361,6 +379,18 @@ class StatisticalValidator:
                 severity=ValidationSeverity.WARNING,
                 passed=False,
                 message=f"Significant row count drift detected: {row_count_drift:.2%}",
+                details={"column_drift": column_findings},
+                actual_value=row_count_drift,
+                threshold=max_drift
+            )
+        
+        if column_findings:
+            return ValidationResult(
+                rule_name="drift",
+                severity=ValidationSeverity.WARNING,
+                passed=False,
+                message=f"Column drift detected in {len({f['column'] for f in column_findings})} columns",
+                details={"column_drift": column_findings},
                 actual_value=row_count_drift,
                 threshold=max_drift
             )
@@ -391,7 +421,7 @@ class ValidationEngine:
         df: pd.DataFrame, 
         dataset_name: str,
         schema: Dict[str, Any] = None,
-        reference_df: pd.DataFrame = None
+        reference_df: Union[pd.DataFrame, DatasetProfile] = None
     ) -> ValidationReport:
         """
         Comprehensive dataset validation following DIS standards.
@@ -400,75 +430,98 @@ class ValidationEngine:
             df: DataFrame to validate
             dataset_name: Name of the dataset
             schema: Optional schema contract
-            reference_df: Optional reference data for drift detection
+            reference_df: Optional reference data or stored profile for drift detection
             
         Returns:
             Complete validation report
         """
-        results = []
+        # Structural gates run first; a failed one skips the remaining checks
+        rules = []
         
-        # Structural validation
         if schema and "required_columns" in schema:
-            results.append(
-                self.structural_validator.validate_required_columns(
-                    df, schema["required_columns"]
-                )
-            )
-        
-        if schema and "expected_types" in schema:
-            results.append(
-                self.structural_validator.validate_data_types(
-                    df, schema["expected_types"]
-                )
-            )
+            rules.append(PlannedRule(
+                "required_columns",
+                lambda ctx: self.structural_validator.validate_required_columns(ctx.df, schema["required_columns"]),
+                blocking=True
+            ))
         
         # Always check minimum row count
-        results.append(
-            self.structural_validator.validate_row_count(df, min_rows=1)
-        )
+        rules.append(PlannedRule(
+            "row_count",
+            lambda ctx: self.structural_validator.validate_row_count(ctx.df, min_rows=1),
+            blocking=True
+        ))
+        
+        if schema and "expected_types" in schema:
+            rules.append(PlannedRule(
+                "data_types",
+                lambda ctx: self.structural_validator.validate_data_types(ctx.df, schema["expected_types"]),
+                frozenset(schema["expected_types"])
+            ))
         
         # Domain validation for common fields
         if "state" in df.columns:
-            results.append(
-                self.domain_validator.validate_state_codes(df)
-            )
+            rules.append(PlannedRule(
+                "state_codes", lambda ctx: self.domain_validator.validate_state_codes(ctx.df), frozenset({"state"})
+            ))
         
         if "zip5" in df.columns:
-            results.append(
-                self.domain_validator.validate_zip_codes(df)
-            )
+            rules.append(PlannedRule(
+                "zip_codes", lambda ctx: self.domain_validator.validate_zip_codes(ctx.df), frozenset({"zip5"})
+            ))
         
         if "locality" in df.columns:
-            results.append(
-                self.domain_validator.validate_locality_codes(df)
-            )
+            rules.append(PlannedRule(
+                "locality_codes",
+                lambda ctx: self.domain_validator.validate_locality_codes(ctx.df),
+                frozenset({"locality"})
+            ))
         
         # Statistical validation
-        results.append(
-            self.statistical_validator.validate_null_rates(df)
-        )
+        rules.append(PlannedRule(
+            "null_rates",
+            lambda ctx: self.statistical_validator.validate_null_rates(ctx.df),
+            frozenset(df.columns)
+        ))
         
         if schema and "primary_keys" in schema:
-            results.append(
-                self.statistical_validator.validate_uniqueness(
-                    df, schema["primary_keys"]
-                )
-            )
+            rules.append(PlannedRule(
+                "uniqueness",
+                lambda ctx: self.statistical_validator.validate_uniqueness(ctx.df, schema["primary_keys"]),
+                frozenset(schema["primary_keys"])
+            ))
         
         # Drift detection if reference data provided
         if reference_df is not None:
-            results.append(
-                self.statistical_validator.validate_drift(df, reference_df)
-            )
+            rules.append(PlannedRule(
+                "drift", lambda ctx: self.statistical_validator.validate_drift(ctx.df, reference_df)
+            ))
+        
+        results = []
+        for outcome in RulePlan(rules).run(df, lambda result: not result.passed):
+            if outcome.error is not None:
+                raise outcome.error
+            if outcome.skipped:
+                results.append(ValidationResult(
+                    rule_name=outcome.rule.name,
+                    severity=ValidationSeverity.INFO,
+                    passed=False,
+                    message="Skipped: a structural check failed",
+                    skipped=True
+                ))
+            else:
+                results.append(outcome.result)
         
         # Calculate summary statistics
         total_checks = len(results)
+        skipped_checks = sum(1 for r in results if r.skipped)
         passed_checks = sum(1 for r in results if r.passed)
         failed_checks = sum(1 for r in results if not r.passed and r.severity == ValidationSeverity.ERROR)
         warning_checks = sum(1 for r in results if not r.passed and r.severity == ValidationSeverity.WARNING)
         
         overall_valid = failed_checks == 0
-        quality_score = passed_checks / total_checks if total_checks > 0 else 0.0
+        executed_checks = total_checks - skipped_checks
+        quality_score = passed_checks / executed_checks if executed_checks > 0 else 0.0
         
         return ValidationReport(
             dataset_name=dataset_name,
@@ -478,32 +531,45 @@ class ValidationEngine:
             warning_checks=warning_checks,
             results=results,
             overall_valid=overall_valid,
-            quality_score=quality_score
+            quality_score=quality_score,
+            skipped_checks=skipped_checks
         )
     
     def validate_business_rules(self, df: pd.DataFrame, rules: List[Callable]) -> List[ValidationResult]:
-        """Validate custom business rules"""
+        """
+        Validate custom business rules (run concurrently, reported in order).
+        
+        A rule may declare the columns it reads as a `columns` attribute;
+        rules without one run independently of each other.
+        """
+        plan = RulePlan(
+            PlannedRule(
+                getattr(rule, "__name__", repr(rule)),
+                lambda ctx, rule=rule: rule(ctx.df),
+                frozenset(getattr(rule, "columns", ()))
+            )
+            for rule in rules
+        )
         results = []
         
-        for rule in rules:
-            try:
-                result = rule(df)
-                if isinstance(result, ValidationResult):
-                    results.append(result)
-                else:
-                    # Convert boolean result to ValidationResult
-                    results.append(ValidationResult(
-                        rule_name=rule.__name__,
-                        severity=ValidationSeverity.ERROR,
-                        passed=bool(result),
-                        message="Business rule validation"
-                    ))
-            except Exception as e:
+        for outcome in plan.run(df, lambda result: False):
+            rule_name = outcome.rule.name
+            if outcome.error is not None:
                 results.append(ValidationResult(
-                    rule_name=rule.__name__,
+                    rule_name=rule_name,
                     severity=ValidationSeverity.ERROR,
                     passed=False,
-                    message=f"Business rule validation failed: {str(e)}"
+                    message=f"Business rule validation failed: {str(outcome.error)}"
+                ))
+            elif isinstance(outcome.result, ValidationResult):
+                results.append(outcome.result)
+            else:
+                # Convert boolean result to ValidationResult
+                results.append(ValidationResult(
+                    rule_name=rule_name,
+                    severity=ValidationSeverity.ERROR,
+                    passed=bool(outcome.result),
+                    message="Business rule validation"
                 ))
         
         return results
@@ -4,7 +4,10 @@ ZIP9 Overrides Validator following Data Ingestion Standard (DIS)
 Validates ZIP9 override data according to business rules and quality gates.
 """
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
 import re
 from datetime import datetime, date
 from typing import Dict, List, Any, Tuple
@@ -15,6 +18,17 @@ from cms_pricing.ingestion.validators.validation_engine import ValidationEngine,
 
 logger = structlog.get_logger()
 
+ZIP9_PATTERN = r'\d{9}'
+
+# Larger than any 9-digit ZIP9; separates ZIP5 groups in the overlap sweep
+ZIP9_GROUP_STRIDE = 10 ** 10
+
+VALID_STATES = {
+    'AL', 'AK', 'AZ', 'AR', 'CA', 'CO', 'CT', 'DE', 'FL', 'GA', 'HI', 'ID', 'IL', 'IN', 'IA', 'KS', 'KY', 'LA', 'ME', 'MD', 'MA', 'MI', 'MN', 'MS', 'MO', 'MT', 'NE', 'NV', 'NH', 'NJ', 'NM', 'NY', 'NC', 'ND', 'OH', 'OK', 'OR', 'PA', 'RI', 'SC', 'SD', 'TN', 'TX', 'UT', 'VT', 'VA', 'WA', 'WV', 'WI', 'WY', 'DC', 'PR', 'VI', 'GU', 'AS', 'MP'
+}
+
+VIOLATION_COLUMNS = ["row", "field", "value", "error"]
+
 
 class SimpleValidationRule:
     """Simple validation rule for ZIP9 data"""
@@ -28,9 +42,12 @@ class SimpleValidationRule:
 class ZIP9OverridesValidator:
     """Validator for ZIP9 overrides data following DIS standards"""
     
-    def __init__(self):
+    def __init__(self, max_error_samples: int = 100):
         self.validation_engine = ValidationEngine()
         self.validation_rules = []
+        self.max_error_samples = max_error_samples
+        # Full violation frames from the last validate() call, keyed by rule name
+        self.violations: Dict[str, pd.DataFrame] = {}
         self._setup_validation_rules()
     
     def _setup_validation_rules(self):
@@ -52,6 +69,14 @@ class ZIP9OverridesValidator:
             severity="critical"
         ))
         
+        # Overlapping ZIP9 ranges within a ZIP5
+        self.validation_rules.append(SimpleValidationRule(
+            name="zip9_range_overlap",
+            description="ZIP9 ranges within a ZIP5 must not overlap",
+            validator_func=self._validate_zip9_range_overlaps,
+            severity="critical"
+        ))
+        
         # State code validation
         self.validation_rules.append(SimpleValidationRule(
             name="state_code_validation",
@@ -111,9 +136,12 @@ class ZIP9OverridesValidator:
             "details": []
         }
         
+        self.violations = {}
+        
         for rule in self.validation_rules:
             try:
-                passed, errors = rule.validator_func(df)
+                passed, violations = rule.validator_func(df)
+                self.violations[rule.name] = violations
                 if passed:
                     validation_results["rules_passed"] += 1
                     validation_results["details"].append({
@@ -127,7 +155,8 @@ class ZIP9OverridesValidator:
                         "rule": rule.name,
                         "status": "failed",
                         "message": rule.description,
-                        "errors": errors
+                        "violation_count": len(violations),
+                        "errors": violations.head(self.max_error_samples).to_dict("records")
                     })
             except Exception as e:
                 validation_results["rules_failed"] += 1
@@ -156,159 +185,244 @@ class ZIP9OverridesValidator:
         
         return validation_results
     
-    def _validate_zip9_format(self, df: pd.DataFrame) -> Tuple[bool, List[Dict[str, Any]]]:
+    def _violations(
+        self,
+        df: pd.DataFrame,
+        mask: pd.Series,
+        field: str,
+        values: pd.Series,
+        error: Any
+    ) -> pd.DataFrame:
+        """Violation rows for a boolean mask; `error` may be a string or a per-row Series"""
+        mask = mask.fillna(False).astype(bool)
+        return pd.DataFrame({
+            "row": df.index[mask.to_numpy()],
+            "field": field,
+            "value": values[mask].to_numpy(),
+            "error": error[mask].to_numpy() if isinstance(error, pd.Series) else error
+        })
+    
+    def _no_violations(self) -> pd.DataFrame:
+        return pd.DataFrame(columns=VIOLATION_COLUMNS)
+    
+    def _result(self, frames: List[pd.DataFrame]) -> Tuple[bool, pd.DataFrame]:
+        frames = [frame for frame in frames if len(frame)]
+        violations = pd.concat(frames, ignore_index=True) if frames else self._no_violations()
+        return violations.empty, violations
+    
+    def _parse_zip9(self, values: pd.Series) -> Tuple[np.ndarray, np.ndarray]:
+        """Well-formed mask and int64 values for a ZIP9 column, using Arrow string kernels"""
+        text = values.astype(str).astype("string[pyarrow]")
+        well_formed = text.str.fullmatch(ZIP9_PATTERN).fillna(False).to_numpy(dtype=bool)
+        numbers = np.zeros(len(values), dtype=np.int64)
+        if well_formed.any():
+            digits = pa.array(text[well_formed].to_numpy(dtype=object), type=pa.string())
+            numbers[well_formed] = pc.cast(digits, pa.int64()).to_numpy()
+        return well_formed, numbers
+    
+    def _validate_zip9_format(self, df: pd.DataFrame) -> Tuple[bool, pd.DataFrame]:
         """Validate ZIP9 format (9 digits)"""
-        errors = []
-        
-        # Check zip9_low format
-        if 'zip9_low' in df.columns:
-            invalid_low = df[~df['zip9_low'].astype(str).str.match(r'^\d{9}$')]
-            for idx, row in invalid_low.iterrows():
-                errors.append({
-                    "row": idx,
-                    "field": "zip9_low",
-                    "value": row['zip9_low'],
-                    "error": "ZIP9 low must be exactly 9 digits"
-                })
+        frames = []
         
-        # Check zip9_high format
-        if 'zip9_high' in df.columns:
-            invalid_high = df[~df['zip9_high'].astype(str).str.match(r'^\d{9}$')]
-            for idx, row in invalid_high.iterrows():
-                errors.append({
-                    "row": idx,
-                    "field": "zip9_high",
-                    "value": row['zip9_high'],
-                    "error": "ZIP9 high must be exactly 9 digits"
-                })
+        for field, label in (("zip9_low", "low"), ("zip9_high", "high")):
+            if field in df.columns:
+                well_formed, _ = self._parse_zip9(df[field])
+                frames.append(self._violations(
+                    df, pd.Series(~well_formed, index=df.index), field, df[field],
+                    f"ZIP9 {label} must be exactly 9 digits"
+                ))
         
-        return len(errors) == 0, errors
+        return self._result(frames)
     
-    def _validate_zip9_range(self, df: pd.DataFrame) -> Tuple[bool, List[Dict[str, Any]]]:
+    def _validate_zip9_range(self, df: pd.DataFrame) -> Tuple[bool, pd.DataFrame]:
         """Validate ZIP9 range (low <= high)"""
-        errors = []
+        frames = []
         
         if 'zip9_low' in df.columns and 'zip9_high' in df.columns:
-            invalid_ranges = df[df['zip9_low'] > df['zip9_high']]
-            for idx, row in invalid_ranges.iterrows():
-                errors.append({
-                    "row": idx,
-                    "field": "zip9_range",
-                    "value": f"{row['zip9_low']}-{row['zip9_high']}",
-                    "error": "ZIP9 low must be less than or equal to ZIP9 high"
-                })
-        
-        return len(errors) == 0, errors
+            invalid = df['zip9_low'] > df['zip9_high']
+            frames.append(self._violations(
+                df, invalid, "zip9_range",
+                df['zip9_low'].astype(str) + "-" + df['zip9_high'].astype(str),
+                "ZIP9 low must be less than or equal to ZIP9 high"
+            ))
+        
+        return self._result(frames)
     
-    def _validate_state_codes(self, df: pd.DataFrame) -> Tuple[bool, List[Dict[str, Any]]]:
+    def _validate_zip9_range_overlaps(self, df: pd.DataFrame) -> Tuple[bool, pd.DataFrame]:
+        """
+        Detect overlapping ZIP9 ranges within each ZIP5 with a sort-based sweep.
+        
+        Ranges are sorted by (zip5, low, high); a range overlaps an earlier one
+        when its low is at or below the running maximum of the previous highs
+        in the same ZIP5. The earlier range holding that maximum is reported as
+        the partner; differing state/locality makes the overlap a conflict,
+        identical mappings make it a redundant overlap. The sort dominates, so
+        the check is O(n log n).
+        """
+        if 'zip9_low' not in df.columns or 'zip9_high' not in df.columns:
+            return self._result([])
+        
+        low_ok, low = self._parse_zip9(df['zip9_low'])
+        high_ok, high = self._parse_zip9(df['zip9_high'])
+        
+        # Malformed and inverted ranges are reported by their own rules
+        positions = np.flatnonzero(low_ok & high_ok & (low <= high))
+        if len(positions) < 2:
+            return self._result([])
+        low = low[positions]
+        high = high[positions]
+        zip5 = low // 10_000
+        
+        order = np.lexsort((high, low, zip5))
+        positions, low, high, zip5 = positions[order], low[order], high[order], zip5[order]
+        
+        # Offsetting by group keeps one global cummax from leaking across ZIP5s
+        group = np.concatenate(([0], np.cumsum(zip5[1:] != zip5[:-1])))
+        offset = group * ZIP9_GROUP_STRIDE
+        running_high = np.maximum.accumulate(high + offset)
+        index = np.arange(len(high))
+        owner = np.maximum.accumulate(np.where(high + offset == running_high, index, -1))
+        
+        same_group = np.concatenate(([False], group[1:] == group[:-1]))
+        previous_high = np.concatenate(([0], running_high[:-1])) - offset
+        overlap = same_group & (low <= previous_high)
+        if not overlap.any():
+            return self._result([])
+        
+        rows = positions[overlap]
+        partners = positions[np.concatenate(([0], owner[:-1]))[overlap]]
+        conflict = np.zeros(len(rows), dtype=bool)
+        for column in ('state', 'locality'):
+            if column in df.columns:
+                values = df[column].to_numpy(dtype=object)
+                conflict |= values[rows] != values[partners]
+        
+        partner_labels = pd.Series(df.index[partners]).astype(str)
+        violations = pd.DataFrame({
+            "row": df.index[rows],
+            "field": "zip9_range_overlap",
+            "value": (df['zip9_low'].iloc[rows].astype(str) + "-" +
+                      df['zip9_high'].iloc[rows].astype(str)).to_numpy(),
+            "error": (pd.Series(np.where(
+                conflict,
+                "ZIP9 range conflicts with overlapping range at row ",
+                "ZIP9 range duplicates overlapping range at row "
+            ), dtype=object) + partner_labels).to_numpy(),
+            "overlaps_row": df.index[partners],
+            "conflict": conflict
+        })
+        return self._result([violations])
+    
+    def _validate_state_codes(self, df: pd.DataFrame) -> Tuple[bool, pd.DataFrame]:
         """Validate state codes"""
-        errors = []
-        
-        valid_states = {
-            'AL', 'AK', 'AZ', 'AR', 'CA', 'CO', 'CT', 'DE', 'FL', 'GA', 'HI', 'ID', 'IL', 'IN', 'IA', 'KS', 'KY', 'LA', 'ME', 'MD', 'MA', 'MI', 'MN', 'MS', 'MO', 'MT', 'NE', 'NV', 'NH', 'NJ', 'NM', 'NY', 'NC', 'ND', 'OH', 'OK', 'OR', 'PA', 'RI', 'SC', 'SD', 'TN', 'TX', 'UT', 'VT', 'VA', 'WA', 'WV', 'WI', 'WY', 'DC', 'PR', 'VI', 'GU', 'AS', 'MP'
-        }
+        frames = []
         
         if 'state' in df.columns:
-            invalid_states = df[~df['state'].isin(valid_states)]
-            for idx, row in invalid_states.iterrows():
-                errors.append({
-                    "row": idx,
-                    "field": "state",
-                    "value": row['state'],
-                    "error": f"Invalid state code: {row['state']}"
-                })
+            invalid = ~df['state'].isin(VALID_STATES)
+            frames.append(self._violations(
+                df, invalid, "state", df['state'],
+                "Invalid state code: " + df['state'].astype(str)
+            ))
         
-        return len(errors) == 0, errors
+        return self._result(frames)
     
-    def _validate_locality_codes(self, df: pd.DataFrame) -> Tuple[bool, List[Dict[str, Any]]]:
+    def _validate_locality_codes(self, df: pd.DataFrame) -> Tuple[bool, pd.DataFrame]:
         """Validate locality codes (2 digits)"""
-        errors = []
+        frames = []
         
         if 'locality' in df.columns:
-            invalid_locality = df[~df['locality'].astype(str).str.match(r'^\d{2}$')]
-            for idx, row in invalid_locality.iterrows():
-                errors.append({
-                    "row": idx,
-                    "field": "locality",
-                    "value": row['locality'],
-                    "error": "Locality code must be 2 digits"
-                })
+            invalid = ~df['locality'].astype(str).str.fullmatch(r'\d{2}')
+            frames.append(self._violations(
+                df, invalid, "locality", df['locality'], "Locality code must be 2 digits"
+            ))
         
-        return len(errors) == 0, errors
+        return self._result(frames)
     
-    def _validate_rural_flags(self, df: pd.DataFrame) -> Tuple[bool, List[Dict[str, Any]]]:
+    def _validate_rural_flags(self, df: pd.DataFrame) -> Tuple[bool, pd.DataFrame]:
         """Validate rural flags (A, B, or null)"""
-        errors = []
+        frames = []
         
         if 'rural_flag' in df.columns:
-            invalid_flags = df[df['rural_flag'].notna() & ~df['rural_flag'].isin(['A', 'B'])]
-            for idx, row in invalid_flags.iterrows():
-                errors.append({
-                    "row": idx,
-                    "field": "rural_flag",
-                    "value": row['rural_flag'],
-                    "error": "Rural flag must be A, B, or null"
-                })
+            invalid = df['rural_flag'].notna() & ~df['rural_flag'].isin(['A', 'B'])
+            frames.append(self._violations(
+                df, invalid, "rural_flag", df['rural_flag'], "Rural flag must be A, B, or null"
+            ))
         
-        return len(errors) == 0, errors
+        return self._result(frames)
     
-    def _validate_effective_dates(self, df: pd.DataFrame) -> Tuple[bool, List[Dict[str, Any]]]:
+    def _validate_effective_dates(self, df: pd.DataFrame) -> Tuple[bool, pd.DataFrame]:
         """Validate effective dates"""
-        errors = []
+        frames = []
         
         if 'effective_from' in df.columns and 'effective_to' in df.columns:
             # Check for invalid date ranges
-            invalid_ranges = df[
-                df['effective_from'].notna() & 
-                df['effective_to'].notna() & 
+            invalid = (
+                df['effective_from'].notna() &
+                df['effective_to'].notna() &
                 (df['effective_from'] > df['effective_to'])
-            ]
-            for idx, row in invalid_ranges.iterrows():
-                errors.append({
-                    "row": idx,
-                    "field": "effective_dates",
-                    "value": f"{row['effective_from']} to {row['effective_to']}",
-                    "error": "Effective from must be less than or equal to effective to"
-                })
-        
-        return len(errors) == 0, errors
+            )
+            frames.append(self._violations(
+                df, invalid, "effective_dates",
+                df['effective_from'].astype(str) + " to " + df['effective_to'].astype(str),
+                "Effective from must be less than or equal to effective to"
+            ))
+        
+        return self._result(frames)
     
-    def _validate_zip5_prefix_consistency(self, df: pd.DataFrame) -> Tuple[bool, List[Dict[str, Any]]]:
+    def _validate_zip5_prefix_consistency(self, df: pd.DataFrame) -> Tuple[bool, pd.DataFrame]:
         """Validate ZIP5 prefix consistency"""
-        errors = []
+        frames = []
         
         if 'zip9_low' in df.columns and 'zip9_high' in df.columns:
             # Check that ZIP5 prefixes match
-            df['zip5_low'] = df['zip9_low'].astype(str).str[:5]
-            df['zip5_high'] = df['zip9_high'].astype(str).str[:5]
-            
-            inconsistent_prefixes = df[df['zip5_low'] != df['zip5_high']]
-            for idx, row in inconsistent_prefixes.iterrows():
-                errors.append({
-                    "row": idx,
-                    "field": "zip5_prefix",
-                    "value": f"{row['zip5_low']} vs {row['zip5_high']}",
-                    "error": "ZIP9 codes must have consistent ZIP5 prefix"
-                })
-        
-        return len(errors) == 0, errors
+            zip5_low = df['zip9_low'].astype(str).str[:5]
+            zip5_high = df['zip9_high'].astype(str).str[:5]
+            frames.append(self._violations(
+                df, zip5_low != zip5_high, "zip5_prefix",
+                zip5_low + " vs " + zip5_high,
+                "ZIP9 codes must have consistent ZIP5 prefix"
+            ))
+        
+        return self._result(frames)
     
-    def _validate_data_completeness(self, df: pd.DataFrame) -> Tuple[bool, List[Dict[str, Any]]]:
+    def _validate_data_completeness(self, df: pd.DataFrame) -> Tuple[bool, pd.DataFrame]:
         """Validate data completeness"""
-        errors = []
+        frames = []
         
         required_fields = ['zip9_low', 'zip9_high', 'state', 'locality', 'effective_from', 'vintage']
         
         for field in required_fields:
             if field in df.columns:
-                null_count = df[field].isnull().sum()
-                if null_count > 0:
-                    errors.append({
-                        "field": field,
-                        "error": f"Required field {field} has {null_count} null values"
-                    })
+                frames.append(self._violations(
+                    df, df[field].isnull(), field, df[field], f"Required field {field} is null"
+                ))
         
-        return len(errors) == 0, errors
+        return self._result(frames)
+    
+    def build_quarantine_results(self, df: pd.DataFrame) -> Dict[str, Any]:
+        """
+        Shape the last validate() run for QuarantineManager.quarantine_records.
+        
+        Each failed rule carries its rejected source rows under "rejects", so
+        the quarantine store receives the actual offending records.
+        """
+        rules = []
+        for rule in self.validation_rules:
+            violations = self.violations.get(rule.name)
+            if violations is None or violations.empty:
+                continue
+            
+            rejected_rows = df.index.intersection(pd.Index(violations["row"].unique()))
+            rules.append({
+                "rule_id": rule.name,
+                "name": rule.name,
+                "message": rule.description,
+                "severity": rule.severity,
+                "violations": len(rejected_rows),
+                "rejects": df.loc[rejected_rows].to_dict("records")
+            })
+        
+        return {"validation_rules": rules}
     
     def _calculate_quality_score(self, validation_results: Dict[str, Any]) -> float:
         """Calculate quality score based on validation results"""
@@ -327,7 +441,7 @@ class ZIP9OverridesValidator:
             "consistent_count": 0,
             "inconsistent_count": 0,
             "missing_zip5_count": 0,
-            "conflicting_mappings": []
+            "conflicting_mappings": []  # capped sample; inconsistent_count is the total
         }
         
         # Extract ZIP5 prefixes from ZIP9 data
@@ -340,22 +454,20 @@ class ZIP9OverridesValidator:
         
         # Check for conflicting mappings
         merged_df = zip9_df.merge(zip5_df, left_on='zip5_prefix', right_on='zip5', how='inner')
-        conflicting = merged_df[
-            (merged_df['state_x'] != merged_df['state_y']) |
-            (merged_df['locality_x'] != merged_df['locality_y'])
-        ]
-        
-        for _, row in conflicting.iterrows():
-            consistency_results["conflicting_mappings"].append({
-                "zip9_low": row['zip9_low'],
-                "zip9_high": row['zip9_high'],
-                "zip5_prefix": row['zip5_prefix'],
-                "zip9_state": row['state_x'],
-                "zip5_state": row['state_y'],
-                "zip9_locality": row['locality_x'],
-                "zip5_locality": row['locality_y'],
-                "conflict_type": "state_mismatch" if row['state_x'] != row['state_y'] else "locality_mismatch"
-            })
+        state_mismatch = merged_df['state_x'] != merged_df['state_y']
+        conflicting = merged_df[state_mismatch | (merged_df['locality_x'] != merged_df['locality_y'])]
+        
+        conflicts = pd.DataFrame({
+            "zip9_low": conflicting['zip9_low'],
+            "zip9_high": conflicting['zip9_high'],
+            "zip5_prefix": conflicting['zip5_prefix'],
+            "zip9_state": conflicting['state_x'],
+            "zip5_state": conflicting['state_y'],
+            "zip9_locality": conflicting['locality_x'],
+            "zip5_locality": conflicting['locality_y'],
+            "conflict_type": np.where(state_mismatch[conflicting.index], "state_mismatch", "locality_mismatch")
+        })
+        consistency_results["conflicting_mappings"] = conflicts.head(self.max_error_samples).to_dict("records")
         
         consistency_results["inconsistent_count"] = len(conflicting)
         consistency_results["consistent_count"] = len(merged_df) - len(conflicting)
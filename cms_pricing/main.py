@@ -17,7 +17,8 @@ from prometheus_client import Counter, Histogram, generate_latest, CONTENT_TYPE_
 from starlette.responses import Response as StarletteResponse
 
 from cms_pricing.config import settings
-from cms_pricing.database import engine, Base
+from cms_pricing.database import engine, Base, dispose_engines
+from cms_pricing.engines.registry import engine_registry
 from cms_pricing.middleware import LoggingMiddleware, SecurityMiddleware
 from cms_pricing.routers import plans, pricing, geography, trace, health, rvu, nearest_zip, mpfs, opps
 from cms_pricing.services.geography_health import router as geography_health_router
@@ -101,6 +102,9 @@ async def lifespan(app: FastAPI):
     # Initialize cache
     await cache_manager.initialize()
     
+    # Build the shared pricing engines once per process
+    engine_registry.initialize()
+    
     # Warm caches if configured
     warm_slices = settings.get_warm_slices()
     if warm_slices:
@@ -114,6 +118,8 @@ async def lifespan(app: FastAPI):
     # Shutdown
     logger.info("Shutting down CMS Pricing API")
     await cache_manager.close()
+    engine_registry.close()
+    await dispose_engines()
 
 
 # Create FastAPI app
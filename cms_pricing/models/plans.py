@@ -19,6 +19,8 @@ class Plan(Base):
     created_by = Column(String(100), nullable=True)
     created_at = Column(Date, nullable=False)
     updated_at = Column(Date, nullable=True)
+    # Bumped on every update; cached plans are checked against it
+    version = Column(Integer, nullable=False, default=1, server_default="1")
     
     # Relationships
     components = relationship("PlanComponent", back_populates="plan", cascade="all, delete-orphan")
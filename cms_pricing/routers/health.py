@@ -3,8 +3,10 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from sqlalchemy import text
-from cms_pricing.database import get_db
+from cms_pricing.config import settings
+from cms_pricing.database import get_db, get_pool_status
 from cms_pricing.cache import CacheManager
+from cms_pricing.services.snapshot_store import snapshot_store
 
 router = APIRouter()
 
@@ -28,20 +30,32 @@ async def readiness_check(
 ):
     """Readiness check with dependencies"""
     try:
-        # Check database connection
+        # Check database connection (geography and plans are always served from SQL)
         db.execute(text("SELECT 1"))
         
         # Check cache directory
         cache_manager.disk_cache.cache_dir
         
-        return {
+        dependencies = {
+            "database": "healthy",
+            "cache": "healthy"
+        }
+        response = {
             "status": "ready",
             "service": "cms-pricing-api",
-            "dependencies": {
-                "database": "healthy",
-                "cache": "healthy"
-            }
+            "dependencies": dependencies,
+            "database_pool": get_pool_status()
         }
+        
+        if settings.pricing_data_backend == "snapshot":
+            # Fee lookups read curated snapshots: ready once a release is published
+            snapshots = snapshot_store.describe()
+            if not any(snapshots.values()):
+                raise RuntimeError(f"no curated snapshots under {snapshot_store.root}")
+            dependencies["snapshots"] = "healthy"
+            response["snapshots"] = snapshots
+        
+        return response
     except Exception as e:
         raise HTTPException(
             status_code=503,
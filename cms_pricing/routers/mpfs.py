@@ -6,6 +6,7 @@ Following Global API Program PRDs v1.0 and QTS standards
 
 from fastapi import APIRouter, HTTPException, Query, Depends, status
 from fastapi.responses import JSONResponse
+from sqlalchemy import case, distinct, func
 from sqlalchemy.orm import Session
 from typing import List, Optional, Dict, Any
 from datetime import date, datetime
@@ -20,6 +21,7 @@ from cms_pricing.schemas.mpfs import (
     MPFSAbstractResponse, MPFSHealthResponse
 )
 from cms_pricing.auth import verify_api_key
+from cms_pricing.cache import stats_cache
 import uuid
 from fastapi import Request
 
@@ -394,6 +396,59 @@ async def get_abstracts(
         )
 
 
+def _compute_mpfs_stats(db: Session, effective_date: Optional[date]):
+    """
+    Compute MPFS statistics in one grouped pass per table
+    
+    Flag counts use conditional aggregates so the RVU table is scanned once
+    instead of once per flag, and conversion factor types are grouped in SQL.
+    
+    Returns:
+        Tuple of (rvu_stats, cf_stats) dictionaries
+    """
+    rvu_query = db.query(
+        func.count(MPFSRVU.id),
+        func.sum(case((MPFSRVU.is_payable == True, 1), else_=0)),
+        func.sum(case((MPFSRVU.is_surgery == True, 1), else_=0)),
+        func.sum(case((MPFSRVU.is_evaluation == True, 1), else_=0)),
+        func.count(distinct(MPFSRVU.hcpcs))
+    )
+    cf_query = db.query(
+        MPFSConversionFactor.cf_type,
+        func.count(MPFSConversionFactor.id)
+    )
+    
+    if effective_date:
+        rvu_query = rvu_query.filter(
+            MPFSRVU.effective_from <= effective_date,
+            (MPFSRVU.effective_to.is_(None)) | (MPFSRVU.effective_to >= effective_date)
+        )
+        cf_query = cf_query.filter(
+            MPFSConversionFactor.effective_from <= effective_date,
+            (MPFSConversionFactor.effective_to.is_(None)) | (MPFSConversionFactor.effective_to >= effective_date)
+        )
+    
+    total, payable, surgery, evaluation, unique_hcpcs = rvu_query.one()
+    rvu_stats = {
+        "total": total or 0,
+        "payable": int(payable or 0),
+        "surgery": int(surgery or 0),
+        "evaluation": int(evaluation or 0),
+        "unique_hcpcs": unique_hcpcs or 0
+    }
+    
+    by_type = {
+        cf_type: count
+        for cf_type, count in cf_query.group_by(MPFSConversionFactor.cf_type).all()
+    }
+    cf_stats = {
+        "total": sum(by_type.values()),
+        "by_type": by_type
+    }
+    
+    return rvu_stats, cf_stats
+
+
 @router.get("/stats")
 async def get_mpfs_stats(
     request: Request,
@@ -419,53 +474,23 @@ async def get_mpfs_stats(
                    effective_date=effective_date,
                    correlation_id=correlation_id)
         
-        # Build base query
-        rvu_query = db.query(MPFSRVU)
-        cf_query = db.query(MPFSConversionFactor)
-        
-        # Apply effective date filter if provided
-        if effective_date:
-            rvu_query = rvu_query.filter(
-                MPFSRVU.effective_from <= effective_date,
-                (MPFSRVU.effective_to.is_(None)) | (MPFSRVU.effective_to >= effective_date)
-            )
-            cf_query = cf_query.filter(
-                MPFSConversionFactor.effective_from <= effective_date,
-                (MPFSConversionFactor.effective_to.is_(None)) | (MPFSConversionFactor.effective_to >= effective_date)
-            )
-        
-        # Calculate statistics
-        total_rvu_items = rvu_query.count()
-        payable_items = rvu_query.filter(MPFSRVU.is_payable == True).count()
-        surgery_items = rvu_query.filter(MPFSRVU.is_surgery == True).count()
-        evaluation_items = rvu_query.filter(MPFSRVU.is_evaluation == True).count()
-        
-        # Get unique HCPCS codes
-        unique_hcpcs = rvu_query.with_entities(MPFSRVU.hcpcs).distinct().count()
-        
-        # Get conversion factors
-        conversion_factors = cf_query.all()
-        cf_stats = {
-            "total": len(conversion_factors),
-            "by_type": {}
-        }
-        for cf in conversion_factors:
-            cf_type = cf.cf_type
-            if cf_type not in cf_stats["by_type"]:
-                cf_stats["by_type"][cf_type] = 0
-            cf_stats["by_type"][cf_type] += 1
+        filters = {"effective_date": effective_date}
+        cached = stats_cache.get("mpfs", filters)
+        if cached is None:
+            cached = _compute_mpfs_stats(db, effective_date)
+            stats_cache.put("mpfs", filters, cached)
+        rvu_stats, cf_stats = cached
+        total_rvu_items = rvu_stats["total"]
         
         stats = {
-            "rvu_items": {
-                "total": total_rvu_items,
-                "payable": payable_items,
-                "surgery": surgery_items,
-                "evaluation": evaluation_items,
-                "unique_hcpcs": unique_hcpcs
+            "rvu_items": dict(rvu_stats),
+            "conversion_factors": {
+                "total": cf_stats["total"],
+                "by_type": dict(cf_stats["by_type"])
             },
-            "conversion_factors": cf_stats,
             "metadata": {
                 "effective_date": effective_date.isoformat() if effective_date else None,
+                "dataset_digest": stats_cache.get_digest("mpfs"),
                 "correlation_id": correlation_id,
                 "timestamp": datetime.now().isoformat()
             }
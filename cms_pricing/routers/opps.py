@@ -17,11 +17,13 @@ from decimal import Decimal
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from fastapi.responses import JSONResponse
+from sqlalchemy import distinct, func, select, true
 from sqlalchemy.orm import Session
 from pydantic import BaseModel, Field
 
 from cms_pricing.database import get_db
 from cms_pricing.auth import verify_api_key
+from cms_pricing.cache import stats_cache
 from cms_pricing.models.opps import (
     OPPSAPCPayment, 
     OPPSHCPCSCrosswalk, 
@@ -443,6 +445,65 @@ async def get_si_lookup(
         )
 
 
+def _compute_opps_counts(db: Session, year: Optional[int], quarter: Optional[int]) -> Dict[str, int]:
+    """Compute OPPS record and distinct-code counts in a single statement.
+    
+    Each table is aggregated once (total plus distinct count) in a one-row
+    subquery, and the subqueries are cross-joined so the database answers
+    every count in one round trip.
+    """
+    apc_filters = []
+    hcpcs_filters = []
+    rates_filters = []
+    
+    if year:
+        apc_filters.append(OPPSAPCPayment.year == year)
+        hcpcs_filters.append(OPPSHCPCSCrosswalk.year == year)
+        rates_filters.append(OPPSRatesEnriched.year == year)
+    
+    if quarter:
+        apc_filters.append(OPPSAPCPayment.quarter == quarter)
+        hcpcs_filters.append(OPPSHCPCSCrosswalk.quarter == quarter)
+        rates_filters.append(OPPSRatesEnriched.quarter == quarter)
+    
+    apc = select(
+        func.count().label("total"),
+        func.count(distinct(OPPSAPCPayment.apc_code)).label("unique")
+    ).where(*apc_filters).subquery()
+    hcpcs = select(
+        func.count().label("total"),
+        func.count(distinct(OPPSHCPCSCrosswalk.hcpcs_code)).label("unique")
+    ).where(*hcpcs_filters).subquery()
+    rates = select(
+        func.count().label("total"),
+        func.count(distinct(OPPSRatesEnriched.ccn)).label("unique")
+    ).where(*rates_filters).subquery()
+    si = select(func.count().label("total")).select_from(RefSILookup).subquery()
+    
+    # Each subquery is one aggregate row; joining them explicitly on true
+    # avoids SQLAlchemy's cartesian-product warning for an implicit FROM list
+    row = db.execute(
+        select(
+            apc.c.total, apc.c.unique,
+            hcpcs.c.total, hcpcs.c.unique,
+            rates.c.total, rates.c.unique,
+            si.c.total
+        ).select_from(
+            apc.join(hcpcs, true()).join(rates, true()).join(si, true())
+        )
+    ).one()
+    
+    return {
+        "apc_count": row[0],
+        "unique_apc_codes": row[1],
+        "hcpcs_count": row[2],
+        "unique_hcpcs_codes": row[3],
+        "rates_count": row[4],
+        "unique_ccns": row[5],
+        "si_count": row[6]
+    }
+
+
 @router.get("/stats", response_model=Dict[str, Any])
 async def get_stats(
     request: Request,
@@ -455,48 +516,29 @@ async def get_stats(
     correlation_id = get_correlation_id(request)
     
     try:
-        # Build base filters
-        apc_filters = []
-        hcpcs_filters = []
-        rates_filters = []
-        
-        if year:
-            apc_filters.append(OPPSAPCPayment.year == year)
-            hcpcs_filters.append(OPPSHCPCSCrosswalk.year == year)
-            rates_filters.append(OPPSRatesEnriched.year == year)
-        
-        if quarter:
-            apc_filters.append(OPPSAPCPayment.quarter == quarter)
-            hcpcs_filters.append(OPPSHCPCSCrosswalk.quarter == quarter)
-            rates_filters.append(OPPSRatesEnriched.quarter == quarter)
-        
-        # Get counts
-        apc_count = db.query(OPPSAPCPayment).filter(*apc_filters).count()
-        hcpcs_count = db.query(OPPSHCPCSCrosswalk).filter(*hcpcs_filters).count()
-        rates_count = db.query(OPPSRatesEnriched).filter(*rates_filters).count()
-        si_count = db.query(RefSILookup).count()
-        
-        # Get unique counts
-        unique_apc_codes = db.query(OPPSAPCPayment.apc_code).filter(*apc_filters).distinct().count()
-        unique_hcpcs_codes = db.query(OPPSHCPCSCrosswalk.hcpcs_code).filter(*hcpcs_filters).distinct().count()
-        unique_ccns = db.query(OPPSRatesEnriched.ccn).filter(*rates_filters).distinct().count()
+        filters = {"year": year, "quarter": quarter}
+        counts = stats_cache.get("opps", filters)
+        if counts is None:
+            counts = _compute_opps_counts(db, year, quarter)
+            stats_cache.put("opps", filters, counts)
         
         stats = {
             "total_records": {
-                "apc_payments": apc_count,
-                "hcpcs_crosswalk": hcpcs_count,
-                "rates_enriched": rates_count,
-                "si_lookup": si_count
+                "apc_payments": counts["apc_count"],
+                "hcpcs_crosswalk": counts["hcpcs_count"],
+                "rates_enriched": counts["rates_count"],
+                "si_lookup": counts["si_count"]
             },
             "unique_codes": {
-                "apc_codes": unique_apc_codes,
-                "hcpcs_codes": unique_hcpcs_codes,
-                "ccns": unique_ccns
+                "apc_codes": counts["unique_apc_codes"],
+                "hcpcs_codes": counts["unique_hcpcs_codes"],
+                "ccns": counts["unique_ccns"]
             },
             "filters_applied": {
                 "year": year,
                 "quarter": quarter
             },
+            "dataset_digest": stats_cache.get_digest("opps"),
             "generated_at": datetime.utcnow().isoformat(),
             "correlation_id": correlation_id
         }
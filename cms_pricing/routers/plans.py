@@ -16,6 +16,7 @@ from cms_pricing.schemas.plans import (
     PlanCreate, PlanUpdate, PlanResponse, PlanSummary, PlanComponentCreate, PlanComponentResponse
 )
 from cms_pricing.auth import verify_api_key
+from cms_pricing.cache import plan_cache
 
 router = APIRouter()
 limiter = Limiter(key_func=get_remote_address)
@@ -201,6 +202,7 @@ async def update_plan(
         plan.metadata_json = plan_data.metadata
     
     plan.updated_at = date.today()
+    plan.version = (plan.version or 0) + 1
     
     # Update components if provided
     if plan_data.components is not None:
@@ -227,6 +229,7 @@ async def update_plan(
             db.add(component)
     
     db.commit()
+    plan_cache.invalidate(plan_id)
     db.refresh(plan)
 
     # Build response mapping metadata_json -> metadata for API compatibility
@@ -273,5 +276,6 @@ async def delete_plan(
     
     db.delete(plan)
     db.commit()
+    plan_cache.invalidate(plan_id)
     
     return {"message": "Plan deleted successfully"}
@@ -12,7 +12,7 @@ from cms_pricing.schemas.pricing import (
 )
 from cms_pricing.auth import verify_api_key
 from cms_pricing.services.pricing import PricingService
-from cms_pricing.database import get_db
+from cms_pricing.database import get_db, SessionLocal
 
 router = APIRouter()
 limiter = Limiter(key_func=get_remote_address)
@@ -83,7 +83,7 @@ async def price_plan(
     """Price a complete treatment plan"""
     
     try:
-        pricing_service = PricingService(db)
+        pricing_service = PricingService(db, session_factory=SessionLocal)
         result = await pricing_service.price_plan(pricing_request)
         return result
     except Exception as e:
@@ -103,7 +103,7 @@ async def compare_locations(
     """Compare pricing between two locations"""
     
     try:
-        pricing_service = PricingService(db)
+        pricing_service = PricingService(db, session_factory=SessionLocal)
         result = await pricing_service.compare_locations(comparison_request)
         return result
     except Exception as e:
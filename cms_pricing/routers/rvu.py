@@ -17,6 +17,7 @@ from cms_pricing.schemas.rvu import (
     RVUSearchRequest, RVUSearchResponse
 )
 from cms_pricing.ingestion.ingestors.rvu_ingestor import RVUIngestor
+from cms_pricing.services.rvu_history import rvu_history_store
 import logging
 import uuid
 import time
@@ -467,6 +468,56 @@ async def search_rvu_items(
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
+@router.get("/rvu-items/{hcpcs}/history")
+async def get_rvu_item_history(
+    request: Request,
+    hcpcs: str,
+    modifier: Optional[str] = Query(None, description="Modifier filter (empty string for unmodified rows)"),
+    start_date: Optional[date] = Query(None, description="Only rows effective on or after this date"),
+    end_date: Optional[date] = Query(None, description="Only rows effective on or before this date")
+):
+    """RVU values for one HCPCS code across every published vintage"""
+    
+    start_time = time.time()
+    correlation_id = get_correlation_id(request)
+    
+    if start_date and end_date and start_date > end_date:
+        return create_error_response(
+            "INVALID_DATE_RANGE",
+            "start_date must not be after end_date",
+            [{"field": "start_date", "issue": "after end_date"}],
+            correlation_id
+        )
+    
+    try:
+        # Sorted multi-vintage Parquet; only row groups holding this code are read
+        data = rvu_history_store.history(hcpcs, modifier=modifier, start=start_date, end=end_date)
+    except Exception as e:
+        logger.error("Failed to read RVU history", hcpcs=hcpcs, error=str(e), correlation_id=correlation_id)
+        raise HTTPException(status_code=500, detail="Internal server error")
+    
+    if not data:
+        raise HTTPException(status_code=404, detail="No RVU history for code")
+    
+    meta = {
+        "hcpcs": hcpcs,
+        "vintages": sorted({row["vintage"] for row in data}),
+        "filters": {
+            "modifier": modifier,
+            "start_date": start_date,
+            "end_date": end_date
+        },
+        "total": len(data)
+    }
+    
+    trace = {
+        "correlation_id": correlation_id,
+        "latency_ms": round((time.time() - start_time) * 1000, 2)
+    }
+    
+    return create_api_response(data, meta, trace)
+
+
 @router.get("/rvu-items/{item_id}", response_model=RVUItemResponse)
 async def get_rvu_item(
     item_id: str,
@@ -60,7 +60,7 @@ async def replay_run(
         )
     
     try:
-        trace_service = TraceService()
+        trace_service = TraceService(db)
         result = await trace_service.replay_run(run_id)
         
         if not result:
@@ -1,14 +1,50 @@
 """Effective date handling for CMS data selection"""
 
-from typing import List, Optional, TypeVar, Generic, Dict, Any
-from datetime import date, datetime
+import hashlib
+import heapq
+import threading
+import time
+from bisect import bisect_right
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Callable, Iterable, List, Optional, Tuple, TypeVar, Generic, Dict, Any
+from datetime import date, datetime, timedelta
 from dataclasses import dataclass
 import structlog
 
+from cms_pricing.config import settings
+
 logger = structlog.get_logger(__name__)
 
 T = TypeVar('T')
 
+_QUARTER_BOUNDS = {
+    1: ((1, 1), (3, 31)),     # Jan 1 - Mar 31
+    2: ((4, 1), (6, 30)),     # Apr 1 - Jun 30
+    3: ((7, 1), (9, 30)),     # Jul 1 - Sep 30
+    4: ((10, 1), (12, 31)),   # Oct 1 - Dec 31
+}
+
+
+@lru_cache(maxsize=256)
+def year_window(year: int) -> Tuple[date, date]:
+    """Return the (Jan 1, Dec 31) effective window for a calendar year"""
+    return date(year, 1, 1), date(year, 12, 31)
+
+
+@lru_cache(maxsize=1024)
+def quarter_window(year: int, quarter: int) -> Tuple[date, date]:
+    """Return the (first day, last day) effective window for a calendar quarter"""
+    if quarter not in _QUARTER_BOUNDS:
+        raise ValueError(f"Invalid quarter {quarter}")
+    (start_month, start_day), (end_month, end_day) = _QUARTER_BOUNDS[quarter]
+    return date(year, start_month, start_day), date(year, end_month, end_day)
+
+
+def quarter_for_date(target_date: date) -> int:
+    """Get quarter number (1-4) for a given date"""
+    return (target_date.month - 1) // 3 + 1
+
 
 @dataclass
 class EffectiveDateRecord(Generic[T]):
@@ -19,6 +55,174 @@ class EffectiveDateRecord(Generic[T]):
     dataset_digest: Optional[str] = None
 
 
+class EffectiveDateIntervalIndex(Generic[T]):
+    """
+    Precomputed lookup over a set of effective-dated records.
+    
+    The effective windows are swept once into disjoint segments, each
+    remembering the record selected for any date inside it (latest
+    effective_from among the covering records) and the fallback record
+    (latest effective_from on or before the segment start). Lookups are a
+    single bisect instead of a scan over every record.
+    """
+    
+    def __init__(self, records: Iterable[EffectiveDateRecord[T]]):
+        self.records: List[EffectiveDateRecord[T]] = list(records)
+        self._starts: List[date] = []
+        self._covering: List[Optional[EffectiveDateRecord[T]]] = []
+        self._fallback: List[Optional[EffectiveDateRecord[T]]] = []
+        self._by_start = sorted(self.records, key=lambda r: r.effective_from)
+        self._from_dates = [r.effective_from for r in self._by_start]
+        self._build()
+    
+    def _build(self):
+        """Sweep window boundaries, keeping a max-heap of active records"""
+        boundaries = {r.effective_from for r in self.records}
+        boundaries.update(
+            r.effective_to + timedelta(days=1)
+            for r in self.records
+            if r.effective_to is not None and r.effective_to < date.max
+        )
+        
+        # Stable sort keeps input order among equal effective_from, which
+        # matches the tie-breaking of max() over the original list
+        order = sorted(range(len(self.records)), key=lambda i: self.records[i].effective_from)
+        active: List[Tuple[int, int]] = []
+        latest: Optional[int] = None
+        pos = 0
+        
+        for boundary in sorted(boundaries):
+            while pos < len(order) and self.records[order[pos]].effective_from <= boundary:
+                idx = order[pos]
+                record = self.records[idx]
+                heapq.heappush(active, (-record.effective_from.toordinal(), idx))
+                if latest is None or record.effective_from > self.records[latest].effective_from:
+                    latest = idx
+                pos += 1
+            
+            while active:
+                effective_to = self.records[active[0][1]].effective_to
+                if effective_to is None or effective_to >= boundary:
+                    break
+                heapq.heappop(active)
+            
+            self._starts.append(boundary)
+            self._covering.append(self.records[active[0][1]] if active else None)
+            self._fallback.append(self.records[latest] if latest is not None else None)
+    
+    def __len__(self) -> int:
+        return len(self.records)
+    
+    def _segment(self, valuation_date: date) -> int:
+        return bisect_right(self._starts, valuation_date) - 1
+    
+    def covering(self, valuation_date: date) -> Optional[EffectiveDateRecord[T]]:
+        """Latest record whose window covers the valuation date"""
+        segment = self._segment(valuation_date)
+        return self._covering[segment] if segment >= 0 else None
+    
+    def latest_on_or_before(self, valuation_date: date) -> Optional[EffectiveDateRecord[T]]:
+        """Latest record with effective_from on or before the valuation date"""
+        segment = self._segment(valuation_date)
+        return self._fallback[segment] if segment >= 0 else None
+    
+    def for_quarter(self, year: int, quarter: int) -> Optional[EffectiveDateRecord[T]]:
+        """Record active at the start of a quarter"""
+        return self.covering(quarter_window(year, quarter)[0])
+    
+    def overlapping(self, start: date, end: date) -> List[EffectiveDateRecord[T]]:
+        """All records whose window overlaps [start, end], ordered by effective_from"""
+        candidates = self._by_start[:bisect_right(self._from_dates, end)]
+        return [
+            r for r in candidates
+            if r.effective_to is None or r.effective_to >= start
+        ]
+
+
+class IntervalIndexCache:
+    """
+    Process-wide cache of interval indexes keyed by (dataset, digest).
+    
+    Keys that carry a dataset digest never go stale, so the TTL only bounds
+    entries built for datasets whose current digest is discovered lazily.
+    Digests probed from the database are re-checked at most every
+    `refresh_seconds`.
+    """
+    
+    def __init__(self, ttl_seconds: int = 300, max_items: int = 128, refresh_seconds: int = 60):
+        self.ttl_seconds = ttl_seconds
+        self.max_items = max_items
+        self.refresh_seconds = refresh_seconds
+        self._entries: "OrderedDict[Tuple[str, Optional[str]], Tuple[EffectiveDateIntervalIndex, float]]" = OrderedDict()
+        self._digests: Dict[str, Tuple[str, float]] = {}
+        self._lock = threading.Lock()
+        self.builds = 0
+        self.probes = 0
+    
+    def current_digest(self, dataset: str, probe: Callable[[], str]) -> str:
+        """The dataset's digest from `probe`, re-run at most every refresh_seconds"""
+        now = time.time()
+        with self._lock:
+            cached = self._digests.get(dataset)
+            if cached is not None and now < cached[1]:
+                return cached[0]
+        
+        digest = probe()
+        with self._lock:
+            self._digests[dataset] = (digest, now + self.refresh_seconds)
+            self.probes += 1
+        return digest
+    
+    def get_or_build(
+        self,
+        dataset: str,
+        digest: Optional[str],
+        loader: Callable[[], Iterable[EffectiveDateRecord]]
+    ) -> EffectiveDateIntervalIndex:
+        """Return the cached index for (dataset, digest), building it from loader on a miss"""
+        key = (dataset, digest)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (digest is not None or entry[1] > now):
+                self._entries.move_to_end(key)
+                return entry[0]
+        
+        index = EffectiveDateIntervalIndex(loader())
+        with self._lock:
+            self._entries[key] = (index, now + self.ttl_seconds)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_items:
+                self._entries.popitem(last=False)
+            self.builds += 1
+        return index
+    
+    def invalidate(self, dataset: Optional[str] = None):
+        """Drop cached indexes and probed digests for one dataset, or all of them"""
+        with self._lock:
+            if dataset is None:
+                self._entries.clear()
+                self._digests.clear()
+                return
+            for key in [k for k in self._entries if k[0] == dataset]:
+                del self._entries[key]
+            self._digests.pop(dataset, None)
+
+
+interval_index_cache = IntervalIndexCache(
+    ttl_seconds=settings.effective_index_ttl_seconds,
+    refresh_seconds=settings.effective_index_refresh_seconds
+)
+
+
+def records_digest(records: Iterable[EffectiveDateRecord]) -> str:
+    """Combined digest of a record set's windows and dataset digests"""
+    hasher = hashlib.sha256()
+    for r in records:
+        hasher.update(f"{r.effective_from}:{r.effective_to}:{r.dataset_digest}|".encode())
+    return hasher.hexdigest()
+
+
 class EffectiveDateSelector:
     """Selects records based on effective date ranges and valuation date"""
     
@@ -29,7 +233,9 @@ class EffectiveDateSelector:
         self, 
         records: List[EffectiveDateRecord[T]], 
         valuation_date: date,
-        strict_mode: bool = False
+        strict_mode: bool = False,
+        dataset: Optional[str] = None,
+        digest: Optional[str] = None
     ) -> Optional[EffectiveDateRecord[T]]:
         """
         Select the most recent record whose effective window covers the valuation date.
@@ -38,6 +244,8 @@ class EffectiveDateSelector:
             records: List of records with effective date ranges
             valuation_date: Date for which to select data
             strict_mode: If True, error when no record covers the date
+            dataset: Optional dataset name; caches the index for this record set
+            digest: Optional precomputed records_digest of records
             
         Returns:
             Selected record or None if no suitable record found
@@ -46,23 +254,16 @@ class EffectiveDateSelector:
             self.logger.warning("No records provided for selection")
             return None
         
-        # Filter records that cover the valuation date
-        covering_records = []
-        for record in records:
-            if self._covers_date(record, valuation_date):
-                covering_records.append(record)
+        index = self.build_index(records, dataset, digest)
+        selected = index.covering(valuation_date)
         
-        if not covering_records:
+        if selected is None:
             if strict_mode:
                 raise ValueError(f"No records cover valuation date {valuation_date}")
             
             # Fallback: use latest record with effective_from <= valuation_date
-            fallback_records = [
-                r for r in records 
-                if r.effective_from <= valuation_date
-            ]
-            if fallback_records:
-                selected = max(fallback_records, key=lambda r: r.effective_from)
+            selected = index.latest_on_or_before(valuation_date)
+            if selected is not None:
                 self.logger.warning(
                     "Using fallback record for valuation date",
                     valuation_date=valuation_date,
@@ -77,19 +278,36 @@ class EffectiveDateSelector:
                 )
                 return None
         
-        # Select the most recent record (latest effective_from)
-        selected = max(covering_records, key=lambda r: r.effective_from)
-        
         self.logger.info(
             "Selected record for valuation date",
             valuation_date=valuation_date,
             selected_effective_from=selected.effective_from,
-            selected_effective_to=selected.effective_to,
-            total_candidates=len(covering_records)
+            selected_effective_to=selected.effective_to
         )
         
         return selected
     
+    def build_index(
+        self,
+        records: List[EffectiveDateRecord[T]],
+        dataset: Optional[str] = None,
+        digest: Optional[str] = None
+    ) -> EffectiveDateIntervalIndex[T]:
+        """
+        Build (or reuse) the interval index for a record set.
+        
+        When a dataset name is given the index is cached under the combined
+        digest of the records, so repeated selections against the same
+        vintage set skip the sweep. Callers that select repeatedly from one
+        loaded record set should compute records_digest once and pass it.
+        """
+        if dataset is None:
+            return EffectiveDateIntervalIndex(records)
+        
+        if digest is None:
+            digest = records_digest(records)
+        return interval_index_cache.get_or_build(dataset, digest, lambda: records)
+    
     def _covers_date(self, record: EffectiveDateRecord[T], valuation_date: date) -> bool:
         """Check if a record's effective window covers the valuation date"""
         if record.effective_from > valuation_date:
@@ -170,30 +388,7 @@ class EffectiveDateSelector:
         Returns:
             Tuple of (effective_from, effective_to)
         """
-        quarter_starts = {
-            1: (1, 1),    # Jan 1
-            2: (4, 1),    # Apr 1
-            3: (7, 1),    # Jul 1
-            4: (10, 1)    # Oct 1
-        }
-        
-        quarter_ends = {
-            1: (3, 31),   # Mar 31
-            2: (6, 30),   # Jun 30
-            3: (9, 30),   # Sep 30
-            4: (12, 31)   # Dec 31
-        }
-        
-        if quarter not in quarter_starts:
-            raise ValueError(f"Invalid quarter {quarter}")
-        
-        start_month, start_day = quarter_starts[quarter]
-        end_month, end_day = quarter_ends[quarter]
-        
-        effective_from = date(year, start_month, start_day)
-        effective_to = date(year, end_month, end_day)
-        
-        return effective_from, effective_to
+        return quarter_window(year, quarter)
     
     def determine_effective_date(
         self, 
@@ -215,51 +410,54 @@ class EffectiveDateSelector:
         Raises:
             ValueError: If parameters are invalid or conflicting
         """
-        if valuation_date:
-            # Specific date provided - use it directly
-            return {
-                "date": valuation_date,
-                "year": valuation_date.year,
-                "quarter": self._get_quarter_for_date(valuation_date),
-                "type": "specific_date"
-            }
-        
-        if valuation_year is None:
+        if valuation_date is None and valuation_year is None:
             # Default to current year
             valuation_year = date.today().year
         
-        if quarter is None:
-            # Annual selection - covers all quarters
-            return {
-                "date": date(valuation_year, 1, 1),  # Start of year
-                "year": valuation_year,
-                "quarter": None,
-                "type": "annual"
-            }
-        
-        # Quarterly selection
-        if quarter < 1 or quarter > 4:
-            raise ValueError(f"Invalid quarter {quarter}. Must be 1-4.")
-        
-        effective_from, effective_to = self.get_quarter_effective_dates(valuation_year, quarter)
-        
+        # Callers may annotate the returned dict, so hand out a copy
+        return dict(_effective_date_params(valuation_year, quarter, valuation_date))
+    
+    def _get_quarter_for_date(self, target_date: date) -> int:
+        """Get quarter number for a given date"""
+        return quarter_for_date(target_date)
+
+
+@lru_cache(maxsize=4096)
+def _effective_date_params(
+    valuation_year: Optional[int],
+    quarter: Optional[int],
+    valuation_date: Optional[date]
+) -> Dict[str, Any]:
+    """Memoized core of EffectiveDateSelector.determine_effective_date"""
+    if valuation_date:
+        # Specific date provided - use it directly
+        return {
+            "date": valuation_date,
+            "year": valuation_date.year,
+            "quarter": quarter_for_date(valuation_date),
+            "type": "specific_date"
+        }
+    
+    if quarter is None:
+        # Annual selection - covers all quarters
         return {
-            "date": effective_from,  # Start of quarter
+            "date": year_window(valuation_year)[0],  # Start of year
             "year": valuation_year,
-            "quarter": quarter,
-            "type": "quarterly",
-            "effective_from": effective_from,
-            "effective_to": effective_to
+            "quarter": None,
+            "type": "annual"
         }
     
-    def _get_quarter_for_date(self, target_date: date) -> int:
-        """Get quarter number for a given date"""
-        month = target_date.month
-        if month <= 3:
-            return 1
-        elif month <= 6:
-            return 2
-        elif month <= 9:
-            return 3
-        else:
-            return 4
\ No newline at end of file
+    # Quarterly selection
+    if quarter < 1 or quarter > 4:
+        raise ValueError(f"Invalid quarter {quarter}. Must be 1-4.")
+    
+    effective_from, effective_to = quarter_window(valuation_year, quarter)
+    
+    return {
+        "date": effective_from,  # Start of quarter
+        "year": valuation_year,
+        "quarter": quarter,
+        "type": "quarterly",
+        "effective_from": effective_from,
+        "effective_to": effective_to
+    }
@@ -3,29 +3,34 @@
 from typing import List, Optional, Dict, Any
 from datetime import date
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, func
+from sqlalchemy import and_, or_, func, false
 import math
 import time
 
-from cms_pricing.database import SessionLocal
 from cms_pricing.models.geography import Geography
 from cms_pricing.models.zip_geometry import ZipGeometry
 from cms_pricing.schemas.geography import (
     GeographyResolveResponse, GeographyCandidate
 )
-from cms_pricing.services.effective_dates import EffectiveDateSelector, EffectiveDateRecord
+from cms_pricing.services.effective_dates import (
+    EffectiveDateSelector, EffectiveDateRecord, EffectiveDateIntervalIndex,
+    interval_index_cache, year_window
+)
 from cms_pricing.services.geography_trace import GeographyTraceService
+from cms_pricing.services.zip9_index import zip9_index_cache
 from cms_pricing.config import settings
 import structlog
 
 logger = structlog.get_logger()
 
+GEOGRAPHY_DATASET = "ZIP_LOCALITY"
+
 
 class GeographyService:
     """Service for resolving ZIP codes to localities and CBSAs"""
     
-    def __init__(self, db: Session = None):
-        self.db = db or SessionLocal()
+    def __init__(self, db: Session):
+        self.db = db
         self.effective_date_selector = EffectiveDateSelector()
         self.trace_service = GeographyTraceService(self.db)
     
@@ -219,7 +224,7 @@ class GeographyService:
         """Resolve exact ZIP+4 match"""
         
         # Build effective date filter
-        effective_filter = self._build_effective_date_filter_from_params(effective_params)
+        effective_filter = self._vintage_filter(effective_params)
         
         # Query for exact ZIP+4 match
         record = self.db.query(Geography).filter(
@@ -241,6 +246,21 @@ class GeographyService:
                 "nearest_zip": None
             }
         
+        # Fall back to the CMS ZIP9 override ranges, when they are loaded
+        zip9_index = zip9_index_cache.get_or_none(self.db)
+        override = zip9_index.lookup(zip5 + plus4) if zip9_index is not None else None
+        if override:
+            return {
+                "locality_id": override["locality"],
+                "state": override["state"],
+                "rural_flag": "R" if override["rural_flag"] else None,
+                "carrier": None,
+                "match_level": "zip+4",
+                "dataset_digest": f"zip9_overrides:{override['vintage']}",
+                "distance_miles": None,
+                "nearest_zip": None
+            }
+        
         return None
     
     async def _resolve_zip5_exact(
@@ -249,7 +269,7 @@ class GeographyService:
         """Resolve exact ZIP5 match (ZIP5-only records)"""
         
         # Build effective date filter
-        effective_filter = self._build_effective_date_filter_from_params(effective_params)
+        effective_filter = self._vintage_filter(effective_params)
         
         # Query for ZIP5-only records (has_plus4 = 0)
         record = self.db.query(Geography).filter(
@@ -279,7 +299,7 @@ class GeographyService:
         """Resolve using nearest ZIP within same state using geometry-based distance calculation"""
         
         # Build effective date filter
-        effective_filter = self._build_effective_date_filter_from_params(effective_params)
+        effective_filter = self._vintage_filter(effective_params)
         
         # Get the source ZIP's coordinates
         source_geom = self.db.query(ZipGeometry).filter(
@@ -400,43 +420,92 @@ class GeographyService:
         
         return R * c
     
-    def _build_effective_date_filter_from_params(self, effective_params: Dict[str, Any]):
-        """Build SQLAlchemy filter for effective date selection using effective_params"""
-        
+    def _effective_window(self, effective_params: Dict[str, Any]) -> tuple:
+        """Date window (start, end) that records must overlap for the given params"""
         if effective_params["type"] == "specific_date":
-            # For specific dates, find records that cover the exact date
-            effective_date = effective_params["date"]
-            return and_(
-                Geography.effective_from <= effective_date,
-                or_(
-                    Geography.effective_to >= effective_date,
-                    Geography.effective_to.is_(None)
-                )
-            )
+            return effective_params["date"], effective_params["date"]
         elif effective_params["type"] == "quarterly":
-            # For quarterly selection, use the quarter's date range
-            effective_from = effective_params["effective_from"]
-            effective_to = effective_params["effective_to"]
-            return and_(
-                Geography.effective_from <= effective_to,
-                or_(
-                    Geography.effective_to >= effective_from,
-                    Geography.effective_to.is_(None)
-                )
-            )
+            return effective_params["effective_from"], effective_params["effective_to"]
         else:  # annual
-            # For annual selection, use the full year range
-            year = effective_params["year"]
-            effective_from = date(year, 1, 1)
-            effective_to = date(year, 12, 31)
-            return and_(
-                Geography.effective_from <= effective_to,
-                or_(
-                    Geography.effective_to >= effective_from,
-                    Geography.effective_to.is_(None)
-                )
+            return year_window(effective_params["year"])
+    
+    def _build_effective_date_filter_from_params(self, effective_params: Dict[str, Any]):
+        """Build SQLAlchemy range filter for effective date selection using effective_params"""
+        
+        # Specific dates collapse to a single-day window, quarterly and annual
+        # selections to the quarter's or year's date range
+        effective_from, effective_to = self._effective_window(effective_params)
+        return and_(
+            Geography.effective_from <= effective_to,
+            or_(
+                Geography.effective_to >= effective_from,
+                Geography.effective_to.is_(None)
             )
+        )
+    
+    def _vintage_index(self) -> EffectiveDateIntervalIndex:
+        """Interval index over the distinct ZIP locality vintages currently loaded"""
+        
+        def load_vintages():
+            rows = self.db.query(
+                Geography.effective_from,
+                Geography.effective_to,
+                Geography.dataset_digest
+            ).distinct().all()
+            return [
+                EffectiveDateRecord(
+                    data=row.dataset_digest,
+                    effective_from=row.effective_from,
+                    effective_to=row.effective_to,
+                    dataset_digest=row.dataset_digest
+                )
+                for row in rows
+            ]
+        
+        def probe_vintages():
+            # Any newly loaded or removed vintage changes this aggregate
+            latest_from, latest_to, loaded_on, digests = self.db.query(
+                func.max(Geography.effective_from),
+                func.max(Geography.effective_to),
+                func.max(Geography.created_at),
+                func.count(func.distinct(Geography.dataset_digest))
+            ).one()
+            return f"{latest_from}:{latest_to}:{loaded_on}:{digests}"
+        
+        # The aggregate scans the table, so it runs once per refresh window
+        # rather than on every resolve
+        digest = interval_index_cache.current_digest(GEOGRAPHY_DATASET, probe_vintages)
+        return interval_index_cache.get_or_build(GEOGRAPHY_DATASET, digest, load_vintages)
     
+    def _vintage_filter(self, effective_params: Dict[str, Any]):
+        """
+        Build an effective date filter keyed on the resolved vintages.
+        
+        The handful of distinct (effective_from, effective_to) windows is
+        indexed once per loaded vintage set; the overlapping ones are then
+        matched by equality so the planner can use the effective-date indexes
+        instead of evaluating open-ended range predicates row by row.
+        """
+        index = self._vintage_index()
+        if not len(index):
+            return self._build_effective_date_filter_from_params(effective_params)
+        
+        vintages = {
+            (v.effective_from, v.effective_to)
+            for v in index.overlapping(*self._effective_window(effective_params))
+        }
+        if not vintages:
+            return false()
+        
+        return or_(*[
+            and_(
+                Geography.effective_from == effective_from,
+                Geography.effective_to.is_(None) if effective_to is None
+                else Geography.effective_to == effective_to
+            )
+            for effective_from, effective_to in sorted(vintages, key=lambda v: (v[0], v[1] or date.max))
+        ])
+
     def _build_effective_date_filter(self, valuation_year: int, quarter: Optional[int] = None):
         """Build SQLAlchemy filter for effective date selection"""
         
@@ -542,8 +611,3 @@ class GeographyService:
                 resolution_method="error",
                 warnings=[f"ZIP {zip5} resolution failed: {str(e)}"]
         )
-    
-    def __del__(self):
-        """Clean up database session"""
-        if hasattr(self, 'db'):
-            self.db.close()
@@ -0,0 +1,122 @@
+"""In-memory view of the materialized MPFS fee table"""
+
+import json
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import structlog
+
+from cms_pricing.services.snapshot_store import ParquetSnapshotStore, SnapshotTable, snapshot_store
+
+logger = structlog.get_logger()
+
+# Curated dataset name (curated/payments/<DATASET>/<vintage>) and the Parquet
+# schema metadata key holding the PPRRVU/GPCI/CF lineage
+DATASET = "mpfs_fee_schedule"
+LINEAGE_KEY = b"mpfs_fee_lineage"
+
+# Missing non-facility amount (PE RVU not applicable in that setting)
+NOT_PRICED = -1
+
+
+def _encoded(column: pa.ChunkedArray) -> Tuple[np.ndarray, List[Any]]:
+    """Dictionary indices and values of a column, whatever its stored encoding"""
+    if pa.types.is_dictionary(column.type):
+        column = column.cast(column.type.value_type)
+    encoded = pc.dictionary_encode(column).combine_chunks()
+    return encoded.indices.to_numpy(zero_copy_only=False), encoded.dictionary.to_pylist()
+
+
+class MPFSFeeTable:
+    """
+    Fully adjusted MPFS allowed amounts for one release.
+    
+    Amounts live in two int32 matrices (code x locality), facility and
+    non-facility; a lookup is two dict hits and an array read.
+    """
+    
+    def __init__(self, table: pa.Table, vintage: Optional[str] = None):
+        self.vintage = vintage
+        metadata = table.schema.metadata or {}
+        self.lineage: Dict[str, str] = json.loads(metadata.get(LINEAGE_KEY, b"{}"))
+        
+        year_idx, years = _encoded(table.column("year"))
+        hcpcs_idx, codes = _encoded(table.column("hcpcs"))
+        modifier_idx, modifiers = _encoded(table.column("modifier"))
+        locality_idx, localities = _encoded(table.column("locality_id"))
+        
+        keys, rows = np.unique(
+            np.stack([year_idx, hcpcs_idx, modifier_idx], axis=1), axis=0, return_inverse=True
+        )
+        rows = rows.ravel()
+        self._rows = {
+            (int(years[y]), codes[h], modifiers[m] or ""): i
+            for i, (y, h, m) in enumerate(keys.tolist())
+        }
+        self._localities = {loc: i for i, loc in enumerate(localities)}
+        
+        shape = (len(keys), len(localities))
+        self._facility = np.full(shape, NOT_PRICED, dtype=np.int32)
+        self._non_facility = np.full(shape, NOT_PRICED, dtype=np.int32)
+        for matrix, name in ((self._facility, "facility_cents"), (self._non_facility, "non_facility_cents")):
+            cents = table.column(name).combine_chunks()
+            values = cents.fill_null(NOT_PRICED).to_numpy(zero_copy_only=False)
+            matrix[rows, locality_idx] = values
+    
+    def __len__(self) -> int:
+        return len(self._rows) * len(self._localities)
+    
+    @property
+    def digest(self) -> str:
+        return self.lineage.get("digest", "")
+    
+    def lookup(
+        self,
+        year: int,
+        hcpcs: str,
+        locality_id: str,
+        modifier: str = "",
+        facility: bool = True
+    ) -> Optional[int]:
+        """Allowed amount in cents, or None when the table has no price for the key"""
+        row = self._rows.get((int(year), hcpcs, modifier or ""))
+        col = self._localities.get(locality_id)
+        if row is None or col is None:
+            return None
+        cents = int((self._facility if facility else self._non_facility)[row, col])
+        return None if cents == NOT_PRICED else cents
+
+
+class MPFSFeeTableCache:
+    """Builds the fee table from the latest curated snapshot, once per snapshot"""
+    
+    def __init__(self, store: ParquetSnapshotStore):
+        self.store = store
+        self._snapshot: Optional[SnapshotTable] = None
+        self._table: Optional[MPFSFeeTable] = None
+        self._lock = threading.Lock()
+    
+    def get(self) -> Optional[MPFSFeeTable]:
+        """The current fee table, or None if no materialized release is published"""
+        snapshot = self.store.table(DATASET)
+        if snapshot is None:
+            return None
+        
+        with self._lock:
+            if snapshot is self._snapshot:
+                return self._table
+        
+        fee_table = MPFSFeeTable(snapshot.table, vintage=snapshot.vintage)
+        with self._lock:
+            self._snapshot = snapshot
+            self._table = fee_table
+        
+        logger.info("Built MPFS fee table", vintage=snapshot.vintage,
+                   entries=len(fee_table), digest=fee_table.digest)
+        return fee_table
+
+
+mpfs_fee_tables = MPFSFeeTableCache(snapshot_store)
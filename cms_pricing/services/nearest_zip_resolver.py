@@ -7,10 +7,11 @@ from sqlalchemy.orm import Session
 from sqlalchemy import and_, or_, func
 
 from cms_pricing.models.nearest_zip import (
-    ZCTACoords, ZipToZCTA, CMSZipLocality, ZIP9Overrides,
+    ZCTACoords, ZipToZCTA, CMSZipLocality,
     ZipMetadata, NearestZipTrace, NBERCentroids
 )
 from cms_pricing.services.nearest_zip_distance import DistanceEngine
+from cms_pricing.services.zip9_index import zip9_index_cache
 import structlog
 
 logger = structlog.get_logger()
@@ -140,17 +141,15 @@ class NearestZipResolver:
         
         # Check ZIP9 overrides first
         if zip9:
-            zip9_record = self.db.query(ZIP9Overrides).filter(
-                and_(
-                    ZIP9Overrides.zip9_low <= zip9,
-                    ZIP9Overrides.zip9_high >= zip9
-                )
-            ).first()
+            # None while the overrides table is unavailable; re-querying it
+            # here would only fail again
+            zip9_index = zip9_index_cache.get_or_none(self.db)
+            override = zip9_index.lookup(zip9) if zip9_index is not None else None
             
-            if zip9_record:
+            if override:
                 result.update({
-                    'state': zip9_record.state,
-                    'locality': zip9_record.locality,
+                    'state': override['state'],
+                    'locality': override['locality'],
                     'zip9_hit': True
                 })
                 return result
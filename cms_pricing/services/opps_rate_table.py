@@ -0,0 +1,135 @@
+"""In-memory index over the precomputed OPPS wage-adjusted rates"""
+
+import threading
+import time
+from datetime import date
+from typing import Dict, NamedTuple, Optional, Tuple
+
+import pyarrow as pa
+import structlog
+
+from cms_pricing.services.snapshot_store import ParquetSnapshotStore, SnapshotTable, snapshot_store
+
+logger = structlog.get_logger()
+
+# Curated datasets written by the OPPS ingestor, one vintage per quarter
+# (vintage = first day of the quarter)
+RATES_DATASET = "opps_rates_enriched"
+CROSSWALK_DATASET = "opps_hcpcs_crosswalk"
+
+# Labor-related share of the OPPS payment rate; only this portion is
+# adjusted by the wage index (42 CFR 419.43)
+LABOR_SHARE = 0.60
+
+
+def wage_adjust(rate, wage_index):
+    """Split the rate into labor/non-labor shares and wage-adjust the labor share"""
+    return rate * (LABOR_SHARE * wage_index + (1 - LABOR_SHARE))
+
+
+def quarter_vintage(year: int, quarter) -> str:
+    """Vintage directory holding a quarter's rate tables"""
+    return date(int(year), 3 * (int(quarter) - 1) + 1, 1).isoformat()
+
+
+class OPPSRate(NamedTuple):
+    apc: str
+    status_indicator: Optional[str]
+    wage_adjusted_rate: float
+
+
+class OPPSRateTable:
+    """
+    Wage-adjusted OPPS rates for one quarter.
+    
+    A lookup is a HCPCS -> APC hit on the crosswalk followed by an
+    (APC, CBSA) hit on the rate table.
+    """
+    
+    def __init__(self, rates: pa.Table, crosswalk: pa.Table, vintage: Optional[str] = None):
+        self.vintage = vintage
+        
+        self._codes: Dict[str, Tuple[str, Optional[str]]] = {}
+        modifiers = (
+            crosswalk.column("modifier").to_pylist()
+            if "modifier" in crosswalk.column_names else [None] * crosswalk.num_rows
+        )
+        for hcpcs, modifier, apc, status_indicator in zip(
+            crosswalk.column("hcpcs_code").to_pylist(),
+            modifiers,
+            crosswalk.column("apc_code").to_pylist(),
+            crosswalk.column("status_indicator").to_pylist(),
+        ):
+            # Unmodified rows price the code; first one wins like the SQL path
+            if hcpcs is None or apc is None or modifier:
+                continue
+            self._codes.setdefault(str(hcpcs), (str(apc), status_indicator))
+        
+        self._rates: Dict[Tuple[str, str], float] = {}
+        for apc, cbsa, rate in zip(
+            rates.column("apc_code").to_pylist(),
+            rates.column("cbsa_code").to_pylist(),
+            rates.column("wage_adjusted_rate_usd").to_pylist(),
+        ):
+            if apc is None or cbsa is None or rate is None:
+                continue
+            self._rates.setdefault((str(apc), str(cbsa)), float(rate))
+    
+    def __len__(self) -> int:
+        return len(self._rates)
+    
+    def lookup(self, hcpcs: str, cbsa: str) -> Optional[OPPSRate]:
+        """Wage-adjusted rate for a code in a CBSA, or None if not precomputed"""
+        code = self._codes.get(hcpcs)
+        if code is None:
+            return None
+        rate = self._rates.get((code[0], cbsa))
+        if rate is None:
+            return None
+        return OPPSRate(apc=code[0], status_indicator=code[1], wage_adjusted_rate=rate)
+
+
+class OPPSRateTableCache:
+    """
+    Builds each quarter's rate table from its curated snapshots, once per snapshot.
+    
+    Unpublished quarters are remembered for the store's `refresh_seconds`
+    so a run of misses does not rescan the curated tree on every line.
+    """
+    
+    def __init__(self, store: ParquetSnapshotStore):
+        self.store = store
+        self._tables: Dict[str, Tuple[SnapshotTable, SnapshotTable, OPPSRateTable]] = {}
+        self._misses: Dict[str, float] = {}
+        self._lock = threading.Lock()
+    
+    def get(self, year: int, quarter) -> Optional[OPPSRateTable]:
+        """The rate table for a quarter, or None if the quarter was not published"""
+        vintage = quarter_vintage(year, quarter)
+        now = time.time()
+        with self._lock:
+            if now < self._misses.get(vintage, 0.0):
+                return None
+        
+        rates = self.store.table(RATES_DATASET, vintage)
+        crosswalk = self.store.table(CROSSWALK_DATASET, vintage)
+        if rates is None or crosswalk is None:
+            with self._lock:
+                self._misses[vintage] = now + self.store.refresh_seconds
+            return None
+        
+        with self._lock:
+            cached = self._tables.get(vintage)
+            if cached is not None and cached[0] is rates and cached[1] is crosswalk:
+                return cached[2]
+        
+        rate_table = OPPSRateTable(rates.table, crosswalk.table, vintage=vintage)
+        with self._lock:
+            self._tables[vintage] = (rates, crosswalk, rate_table)
+            self._misses.pop(vintage, None)
+        
+        logger.info("Built OPPS rate table", vintage=vintage, entries=len(rate_table))
+        return rate_table
+
+
+opps_rate_tables = OPPSRateTableCache(snapshot_store)
@@ -1,25 +1,23 @@
 """Pricing service for calculating Medicare rates"""
 
+import asyncio
 import uuid
-from typing import Dict, Any, List, Optional
+from typing import Callable, Dict, Any, List, Mapping, Optional, Tuple
 from datetime import date
 
 from cms_pricing.schemas.pricing import (
     PricingRequest, PricingResponse, ComparisonRequest, ComparisonResponse,
     LineItemResponse, GeographyResponse, ComparisonDelta
 )
-from cms_pricing.schemas.geography import GeographyCandidate
+from cms_pricing.schemas.geography import GeographyCandidate, GeographyResolveResponse
 from cms_pricing.services.geography import GeographyService
 from cms_pricing.services.trace import TraceService
 from sqlalchemy.orm import Session
+from cms_pricing.cache import plan_cache
+from cms_pricing.config import settings
 from cms_pricing.models.plans import Plan, PlanComponent
-from cms_pricing.engines.mpfs import MPSFEngine
-from cms_pricing.engines.opps import OPPSEngine
-from cms_pricing.engines.asc import ASCEngine
-from cms_pricing.engines.ipps import IPPSEngine
-from cms_pricing.engines.clfs import CLFSEngine
-from cms_pricing.engines.dmepos import DMEPOSEngine
-from cms_pricing.engines.drugs import DrugEngine
+from cms_pricing.engines.base import BasePricingEngine, PricingContext, use_context
+from cms_pricing.engines.registry import engine_registry
 import structlog
 
 logger = structlog.get_logger()
@@ -28,20 +26,21 @@ logger = structlog.get_logger()
 class PricingService:
     """Main pricing service"""
     
-    def __init__(self, db: Session = None):
+    def __init__(
+        self,
+        db: Session = None,
+        session_factory: Optional[Callable[[], Session]] = None,
+        engines: Optional[Mapping[str, BasePricingEngine]] = None
+    ):
         self.db = db
+        # Optional factory for per-task sessions; enables concurrent engine
+        # fan-out (a single Session cannot be shared across tasks)
+        self.session_factory = session_factory
         self.geography_service = GeographyService(db)
         self.trace_service = TraceService(db)
-        self._plan_name_cache: Dict[Any, str] = {}
-        self.engines = {
-            'MPFS': MPSFEngine(),
-            'OPPS': OPPSEngine(),
-            'ASC': ASCEngine(),
-            'IPPS': IPPSEngine(),
-            'CLFS': CLFSEngine(),
-            'DMEPOS': DMEPOSEngine(),
-            'DRUGS': DrugEngine()
-        }
+        # Engines are process-wide singletons; each call runs them inside a
+        # data context carrying the request-scoped session.
+        self.engines = engines if engines is not None else engine_registry
     
     async def price_single_code(
         self,
@@ -68,16 +67,17 @@ class PricingService:
                 raise ValueError(f"Unknown setting: {setting}")
             
             # Price the code
-            result = await engine.price_code(
-                code=code,
-                zip=zip,
-                year=year,
-                quarter=quarter,
-                geography=geography_result,
-                ccn=ccn,
-                payer=payer,
-                plan=plan
-            )
+            with use_context(PricingContext(db=self.db)):
+                result = await engine.price_code(
+                    code=code,
+                    zip=zip,
+                    year=year,
+                    quarter=quarter,
+                    geography=geography_result,
+                    ccn=ccn,
+                    payer=payer,
+                    plan=plan
+                )
             
             # Add geography info
             result['geography'] = geography_result.dict()
@@ -103,124 +103,11 @@ class PricingService:
         run_id = str(uuid.uuid4())
         
         try:
-            # Resolve geography
+            components, plan_name = await self._resolve_plan(request.plan_id, request.ad_hoc_plan)
             geography_result = await self.geography_service.resolve_zip(request.zip)
             
-            # Get plan components
-            if request.plan_id:
-                # Load from database
-                components = await self._load_plan_components(request.plan_id)
-                plan_name = await self._get_plan_name(request.plan_id)
-            else:
-                # Use ad-hoc plan
-                ad_hoc_plan = request.ad_hoc_plan or {}
-                components = self._normalize_ad_hoc_components(
-                    ad_hoc_plan.get('components', [])
-                )
-                plan_name = ad_hoc_plan.get('name', 'Ad-hoc Plan')
-            
-            # Price each component
-            line_items = []
-            total_allowed_cents = 0
-            total_beneficiary_deductible_cents = 0
-            total_beneficiary_coinsurance_cents = 0
-            total_beneficiary_cents = 0
-            total_program_payment_cents = 0
-            
-            for i, component in enumerate(components):
-                # Get appropriate engine
-                engine = self.engines.get(component['setting'])
-                if not engine:
-                    logger.warning(
-                        "Unknown setting for component",
-                        run_id=run_id,
-                        code=component['code'],
-                        setting=component['setting']
-                    )
-                    continue
-                
-                # Price the component
-                result = await engine.price_code(
-                    code=component['code'],
-                    zip=request.zip,
-                    year=request.year,
-                    quarter=request.quarter,
-                    geography=geography_result,
-                    ccn=request.ccn,
-                    payer=request.payer,
-                    plan=request.plan,
-                    units=component['units'],
-                    utilization_weight=component['utilization_weight'],
-                    professional_component=component['professional_component'],
-                    facility_component=component['facility_component'],
-                    modifiers=component['modifiers'],
-                    pos=component['pos'],
-                    ndc11=component['ndc11']
-                )
-
-                # Create line item response
-                line_item = LineItemResponse(
-                    sequence=i + 1,
-                    code=component['code'],
-                    setting=component['setting'],
-                    units=component['units'],
-                    utilization_weight=component['utilization_weight'],
-                    allowed_cents=result['allowed_cents'],
-                    beneficiary_deductible_cents=result.get('beneficiary_deductible_cents', 0),
-                    beneficiary_coinsurance_cents=result.get('beneficiary_coinsurance_cents', 0),
-                    beneficiary_total_cents=result.get('beneficiary_total_cents', 0),
-                    program_payment_cents=result.get('program_payment_cents', 0),
-                    professional_allowed_cents=result.get('professional_allowed_cents'),
-                    facility_allowed_cents=result.get('facility_allowed_cents'),
-                    source=result.get('source', 'benchmark'),
-                    facility_specific=result.get('facility_specific', False),
-                    packaged=result.get('packaged', False),
-                    reference_price_cents=result.get('reference_price_cents'),
-                    unit_conversion=result.get('unit_conversion'),
-                    trace_refs=result.get('trace_refs', [])
-                )
-                
-                line_items.append(line_item)
-                
-                # Accumulate totals
-                total_allowed_cents += result['allowed_cents']
-                total_beneficiary_deductible_cents += result.get('beneficiary_deductible_cents', 0)
-                total_beneficiary_coinsurance_cents += result.get('beneficiary_coinsurance_cents', 0)
-                total_beneficiary_cents += result.get('beneficiary_total_cents', 0)
-                total_program_payment_cents += result.get('program_payment_cents', 0)
-            
-            # Create geography response
-            geography_response = GeographyResponse(
-                zip5=geography_result.zip5,
-                locality_id=geography_result.selected_candidate.locality_id if geography_result.selected_candidate else None,
-                locality_name=geography_result.selected_candidate.locality_name if geography_result.selected_candidate else None,
-                cbsa=geography_result.selected_candidate.cbsa if geography_result.selected_candidate else None,
-                cbsa_name=geography_result.selected_candidate.cbsa_name if geography_result.selected_candidate else None,
-                county_fips=geography_result.selected_candidate.county_fips if geography_result.selected_candidate else None,
-                state_code=geography_result.selected_candidate.state_code if geography_result.selected_candidate else None,
-                rural_flag=geography_result.selected_candidate.rural_flag if geography_result.selected_candidate else None,
-                resolution_method=geography_result.resolution_method,
-                candidates=geography_result.candidates
-            )
-            
-            # Create response
-            response = PricingResponse(
-                run_id=run_id,
-                plan_id=request.plan_id,
-                plan_name=plan_name,
-                geography=geography_response,
-                line_items=line_items,
-                total_allowed_cents=total_allowed_cents,
-                total_beneficiary_deductible_cents=total_beneficiary_deductible_cents,
-                total_beneficiary_coinsurance_cents=total_beneficiary_coinsurance_cents,
-                total_beneficiary_cents=total_beneficiary_cents,
-                total_program_payment_cents=total_program_payment_cents,
-                remaining_part_b_deductible_cents=0,  # TODO(alex, GH-424): Calculate remaining deductible
-                post_acute_included=request.include_home_health or request.include_snf,
-                sequestration_applied=request.apply_sequestration,
-                facility_specific_used=any(item.facility_specific for item in line_items),
-                datasets_used=[],  # TODO(alex, GH-425): Collect dataset information
-                warnings=geography_result.warnings
+            response = await self._price_location(
+                request, components, plan_name, geography_result, run_id, self._new_semaphore()
             )
             
             # Store trace
@@ -255,49 +142,246 @@ class PricingService:
             
             raise
     
+    async def _resolve_plan(
+        self,
+        plan_id,
+        ad_hoc_plan: Optional[Dict[str, Any]]
+    ) -> Tuple[List[Dict[str, Any]], str]:
+        """Load stored or ad-hoc plan components and the plan name"""
+        if plan_id:
+            # Load from database
+            plan = await self._load_plan(plan_id)
+            components = plan['components']
+            plan_name = plan['name']
+        else:
+            # Use ad-hoc plan
+            ad_hoc_plan = ad_hoc_plan or {}
+            components = self._normalize_ad_hoc_components(
+                ad_hoc_plan.get('components', [])
+            )
+            plan_name = ad_hoc_plan.get('name', 'Ad-hoc Plan')
+        
+        return components, plan_name
+    
+    async def _price_location(
+        self,
+        request: PricingRequest,
+        components: List[Dict[str, Any]],
+        plan_name: str,
+        geography_result: GeographyResolveResponse,
+        run_id: str,
+        semaphore: asyncio.Semaphore
+    ) -> PricingResponse:
+        """Price already-loaded plan components for an already-resolved location"""
+        
+        priced = await self._price_components(
+            request, components, geography_result, run_id, semaphore
+        )
+        
+        line_items = []
+        total_allowed_cents = 0
+        total_beneficiary_deductible_cents = 0
+        total_beneficiary_coinsurance_cents = 0
+        total_beneficiary_cents = 0
+        total_program_payment_cents = 0
+        
+        for i, component, result in priced:
+            # Create line item response
+            line_item = LineItemResponse(
+                sequence=i + 1,
+                code=component['code'],
+                setting=component['setting'],
+                units=component['units'],
+                utilization_weight=component['utilization_weight'],
+                allowed_cents=result['allowed_cents'],
+                beneficiary_deductible_cents=result.get('beneficiary_deductible_cents', 0),
+                beneficiary_coinsurance_cents=result.get('beneficiary_coinsurance_cents', 0),
+                beneficiary_total_cents=result.get('beneficiary_total_cents', 0),
+                program_payment_cents=result.get('program_payment_cents', 0),
+                professional_allowed_cents=result.get('professional_allowed_cents'),
+                facility_allowed_cents=result.get('facility_allowed_cents'),
+                source=result.get('source', 'benchmark'),
+                facility_specific=result.get('facility_specific', False),
+                packaged=result.get('packaged', False),
+                reference_price_cents=result.get('reference_price_cents'),
+                unit_conversion=result.get('unit_conversion'),
+                trace_refs=result.get('trace_refs', [])
+            )
+            
+            line_items.append(line_item)
+            
+            # Accumulate totals
+            total_allowed_cents += result['allowed_cents']
+            total_beneficiary_deductible_cents += result.get('beneficiary_deductible_cents', 0)
+            total_beneficiary_coinsurance_cents += result.get('beneficiary_coinsurance_cents', 0)
+            total_beneficiary_cents += result.get('beneficiary_total_cents', 0)
+            total_program_payment_cents += result.get('program_payment_cents', 0)
+        
+        # Create geography response
+        selected = geography_result.selected_candidate
+        geography_response = GeographyResponse(
+            zip5=geography_result.zip5,
+            locality_id=selected.locality_id if selected else None,
+            locality_name=selected.locality_name if selected else None,
+            cbsa=selected.cbsa if selected else None,
+            cbsa_name=selected.cbsa_name if selected else None,
+            county_fips=selected.county_fips if selected else None,
+            state_code=selected.state_code if selected else None,
+            rural_flag=selected.rural_flag if selected else None,
+            resolution_method=geography_result.resolution_method,
+            candidates=geography_result.candidates
+        )
+        
+        # Create response
+        return PricingResponse(
+            run_id=run_id,
+            plan_id=request.plan_id,
+            plan_name=plan_name,
+            geography=geography_response,
+            line_items=line_items,
+            total_allowed_cents=total_allowed_cents,
+            total_beneficiary_deductible_cents=total_beneficiary_deductible_cents,
+            total_beneficiary_coinsurance_cents=total_beneficiary_coinsurance_cents,
+            total_beneficiary_cents=total_beneficiary_cents,
+            total_program_payment_cents=total_program_payment_cents,
+            remaining_part_b_deductible_cents=0,  # TODO(alex, GH-424): Calculate remaining deductible
+            post_acute_included=request.include_home_health or request.include_snf,
+            sequestration_applied=request.apply_sequestration,
+            facility_specific_used=any(item.facility_specific for item in line_items),
+            datasets_used=[],  # TODO(alex, GH-425): Collect dataset information
+            warnings=geography_result.warnings
+        )
+    
+    async def _price_components(
+        self,
+        request: PricingRequest,
+        components: List[Dict[str, Any]],
+        geography_result,
+        run_id: str,
+        semaphore: asyncio.Semaphore
+    ) -> List[Tuple[int, Dict[str, Any], Dict[str, Any]]]:
+        """
+        Price components with one task per setting.
+        
+        Components are grouped by setting and each group runs on its own
+        engine, bounded by the shared semaphore. Results are returned as
+        (component index, component, result) in original plan order, so line
+        numbering and totals do not depend on task completion order.
+        """
+        groups: Dict[str, List[int]] = {}
+        for i, component in enumerate(components):
+            if component['setting'] not in self.engines:
+                logger.warning(
+                    "Unknown setting for component",
+                    run_id=run_id,
+                    code=component['code'],
+                    setting=component['setting']
+                )
+                continue
+            groups.setdefault(component['setting'], []).append(i)
+        
+        results: Dict[int, Dict[str, Any]] = {}
+        
+        async def price_group(setting: str, indices: List[int]):
+            async with semaphore:
+                engine = self.engines[setting]
+                session = self._group_session()
+                try:
+                    # Each group runs in its own task, so the context set here
+                    # is only seen by this group's engine calls
+                    with use_context(PricingContext(db=session if session is not None else self.db)):
+                        for i in indices:
+                            component = components[i]
+                            results[i] = await engine.price_code(
+                                code=component['code'],
+                                zip=request.zip,
+                                year=request.year,
+                                quarter=request.quarter,
+                                geography=geography_result,
+                                ccn=request.ccn,
+                                payer=request.payer,
+                                plan=request.plan,
+                                units=component['units'],
+                                utilization_weight=component['utilization_weight'],
+                                professional_component=component['professional_component'],
+                                facility_component=component['facility_component'],
+                                modifiers=component['modifiers'],
+                                pos=component['pos'],
+                                ndc11=component['ndc11']
+                            )
+                finally:
+                    if session is not None:
+                        session.close()
+        
+        await self._gather_all(
+            [price_group(setting, indices) for setting, indices in groups.items()]
+        )
+        
+        return [(i, components[i], results[i]) for i in sorted(results)]
+    
+    def _new_semaphore(self) -> asyncio.Semaphore:
+        """Semaphore bounding concurrent engine groups for one pricing call.
+        
+        Without a session factory every group shares one Session, which is
+        not safe for concurrent use, so groups run one at a time.
+        """
+        if self.session_factory is None:
+            return asyncio.Semaphore(1)
+        return asyncio.Semaphore(max(1, settings.pricing_max_concurrency))
+    
+    def _group_session(self) -> Optional[Session]:
+        """Dedicated session for a setting group, or None to use the request's"""
+        if self.session_factory is None:
+            return None
+        return self.session_factory()
+    
+    async def _gather_all(self, coroutines: List[Any]) -> List[Any]:
+        """Run coroutines concurrently, cancelling the rest on first failure"""
+        tasks = [asyncio.ensure_future(coroutine) for coroutine in coroutines]
+        try:
+            return await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+    
     async def compare_locations(self, request: ComparisonRequest) -> ComparisonResponse:
         """Compare pricing between two locations"""
         
         run_id = str(uuid.uuid4())
         
         try:
-            # Price location A
-            request_a = PricingRequest(
-                zip=request.zip_a,
-                plan_id=request.plan_id,
-                year=request.year,
-                quarter=request.quarter,
-                ccn=request.ccn_a,
-                payer=request.payer,
-                plan=request.plan,
-                include_home_health=request.include_home_health,
-                include_snf=request.include_snf,
-                apply_sequestration=request.apply_sequestration,
-                sequestration_rate=request.sequestration_rate,
-                format=request.format,
-                ad_hoc_plan=request.ad_hoc_plan
-            )
+            request_a = self._location_request(request, request.zip_a, request.ccn_a)
+            request_b = self._location_request(request, request.zip_b, request.ccn_b)
             
-            result_a = await self.price_plan(request_a)
+            # Load the plan once for both locations
+            components, plan_name = await self._resolve_plan(request.plan_id, request.ad_hoc_plan)
             
-            # Price location B
-            request_b = PricingRequest(
-                zip=request.zip_b,
-                plan_id=request.plan_id,
-                year=request.year,
-                quarter=request.quarter,
-                ccn=request.ccn_b,
-                payer=request.payer,
-                plan=request.plan,
-                include_home_health=request.include_home_health,
-                include_snf=request.include_snf,
-                apply_sequestration=request.apply_sequestration,
-                sequestration_rate=request.sequestration_rate,
-                format=request.format,
-                ad_hoc_plan=request.ad_hoc_plan
-            )
+            # Geography resolution runs on the request session, so resolve
+            # both locations before fanning out
+            geography_a = await self.geography_service.resolve_zip(request_a.zip)
+            geography_b = await self.geography_service.resolve_zip(request_b.zip)
             
-            result_b = await self.price_plan(request_b)
+            # Price both locations concurrently; the semaphore bounds total
+            # engine fan-out across the pair
+            semaphore = self._new_semaphore()
+            run_id_a = str(uuid.uuid4())
+            run_id_b = str(uuid.uuid4())
+            result_a, result_b = await self._gather_all([
+                self._price_location(request_a, components, plan_name, geography_a, run_id_a, semaphore),
+                self._price_location(request_b, components, plan_name, geography_b, run_id_b, semaphore),
+            ])
+            
+            # Store per-location traces in a fixed order
+            for location_request, result in ((request_a, result_a), (request_b, result_b)):
+                await self.trace_service.store_run(
+                    run_id=result.run_id,
+                    endpoint="/pricing/price",
+                    request_data=location_request.dict(),
+                    response_data=result.dict(),
+                    status="success"
+                )
             
             # Validate parity
             parity_report = self._validate_parity(request_a, request_b, result_a, result_b)
@@ -353,6 +437,29 @@ class PricingService:
             
             raise
     
+    def _location_request(
+        self,
+        request: ComparisonRequest,
+        zip_code: str,
+        ccn: Optional[str]
+    ) -> PricingRequest:
+        """Build the single-location pricing request for one side of a comparison"""
+        return PricingRequest(
+            zip=zip_code,
+            plan_id=request.plan_id,
+            year=request.year,
+            quarter=request.quarter,
+            ccn=ccn,
+            payer=request.payer,
+            plan=request.plan,
+            include_home_health=request.include_home_health,
+            include_snf=request.include_snf,
+            apply_sequestration=request.apply_sequestration,
+            sequestration_rate=request.sequestration_rate,
+            format=request.format,
+            ad_hoc_plan=request.ad_hoc_plan
+        )
+    
     def _validate_parity(
         self,
         request_a: PricingRequest,
@@ -435,18 +542,25 @@ class PricingService:
             return 0.0 if value_b == 0 else float('inf')
         return ((value_b - value_a) / value_a) * 100
     
-    async def _load_plan_components(self, plan_id) -> List[Dict[str, Any]]:
-        """Load plan components from database"""
+    async def _load_plan(self, plan_id) -> Dict[str, Any]:
+        """Load a stored plan as {'name', 'version', 'components'}, from the shared plan cache when current"""
         if not self.db:
             raise ValueError("Database session is required to load stored plans")
 
+        # Primary-key probe of the plan version; any update bumps it
+        version = self.db.query(Plan.version).filter(Plan.id == plan_id).scalar()
+        if version is None:
+            plan_cache.invalidate(plan_id)
+            raise ValueError(f"Plan not found: {plan_id}")
+
+        cached = plan_cache.get(plan_id, version=version)
+        if cached is not None:
+            return cached
+
         plan = self.db.query(Plan).filter(Plan.id == plan_id).first()
         if not plan:
             raise ValueError(f"Plan not found: {plan_id}")
 
-        # Cache plan name for later reuse in the same request
-        self._plan_name_cache[plan_id] = plan.name
-
         components = (
             self.db.query(PlanComponent)
             .filter(PlanComponent.plan_id == plan_id)
@@ -456,7 +570,6 @@ class PricingService:
 
         if not components:
             logger.warning("Stored plan found without components", plan_id=str(plan_id))
-            return []
 
         normalized_components: List[Dict[str, Any]] = []
         for component in components:
@@ -478,22 +591,8 @@ class PricingService:
             )
 
         # Already ordered via query; no additional sort required
-        return normalized_components
-    
-    async def _get_plan_name(self, plan_id) -> str:
-        """Get plan name from database, using cached value when available"""
-        if plan_id in self._plan_name_cache:
-            return self._plan_name_cache[plan_id]
-
-        if not self.db:
-            raise ValueError("Database session is required to resolve plan name")
-
-        plan = self.db.query(Plan).filter(Plan.id == plan_id).first()
-        if not plan:
-            raise ValueError(f"Plan not found: {plan_id}")
-
-        self._plan_name_cache[plan_id] = plan.name
-        return plan.name
+        plan_cache.put(plan_id, plan.version, plan.name, normalized_components)
+        return {"name": plan.name, "version": plan.version, "components": normalized_components}
 
     def _normalize_ad_hoc_components(self, components: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Normalize ad-hoc plan components to match stored plan structure"""
@@ -0,0 +1,127 @@
+"""Per-code RVU history across vintages, read with Parquet predicate pushdown"""
+
+import os
+import threading
+from datetime import date
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+import structlog
+
+from cms_pricing.config import settings
+
+logger = structlog.get_logger()
+
+# History layout under the curated root (written by publishers.rvu_history)
+HISTORY_DIR = Path("curated") / "history" / "rvu_items"
+HISTORY_FILE = "rvu_items.parquet"
+
+SORT_KEYS = ["hcpcs", "modifier", "effective_from", "vintage"]
+
+HISTORY_SCHEMA = pa.schema([
+    ("hcpcs", pa.string()),
+    ("modifier", pa.string()),
+    ("description", pa.string()),
+    ("status_code", pa.string()),
+    ("global_days", pa.string()),
+    ("rvu_work", pa.float64()),
+    ("rvu_pe_nonfac", pa.float64()),
+    ("rvu_pe_fac", pa.float64()),
+    ("rvu_malp", pa.float64()),
+    ("na_indicator", pa.string()),
+    ("effective_from", pa.date32()),
+    ("effective_to", pa.date32()),
+    ("source_filename", pa.string()),
+    ("vintage", pa.string()),
+])
+
+
+def _effective_filter(start: Optional[date], end: Optional[date]) -> Optional[ds.Expression]:
+    """Rows whose effective window overlaps [start, end]"""
+    expression = None
+    if end is not None:
+        expression = ds.field("effective_from") <= pa.scalar(end, pa.date32())
+    if start is not None:
+        overlaps = ds.field("effective_to").is_null() | (ds.field("effective_to") >= pa.scalar(start, pa.date32()))
+        expression = overlaps if expression is None else expression & overlaps
+    return expression
+
+
+class RVUHistoryStore:
+    """
+    Sorted, all-vintage PPRRVU history.
+
+    The Parquet dataset is opened once and re-opened only when the file is
+    replaced; each query filters on hcpcs (and optionally modifier and an
+    effective date range), so only row groups whose statistics admit the
+    requested codes are read.
+    """
+
+    def __init__(self, root: str):
+        self.path = Path(root) / HISTORY_DIR / HISTORY_FILE
+        self._dataset: Optional[ds.Dataset] = None
+        self._signature: Optional[Tuple[int, int]] = None
+        self._lock = threading.Lock()
+
+    def dataset(self) -> Optional[ds.Dataset]:
+        """The history dataset, or None if no vintage has been published"""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        signature = (stat.st_mtime_ns, stat.st_size)
+
+        with self._lock:
+            if signature == self._signature:
+                return self._dataset
+
+        dataset = ds.dataset(self.path, format="parquet", schema=HISTORY_SCHEMA)
+        with self._lock:
+            self._dataset, self._signature = dataset, signature
+        logger.info("Opened RVU history", path=str(self.path), row_groups=sum(
+            fragment.num_row_groups for fragment in dataset.get_fragments()
+        ))
+        return dataset
+
+    def scan(
+        self,
+        codes: Iterable[str],
+        modifier: Optional[str] = None,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        columns: Optional[Sequence[str]] = None
+    ) -> pa.Table:
+        """
+        History rows for a set of codes, in (hcpcs, modifier, effective_from,
+        vintage) order. Intended for bulk longitudinal analytics; call
+        .to_pandas() on the result for a DataFrame.
+        """
+        codes = sorted(set(codes))
+        dataset = self.dataset()
+        if dataset is None or not codes:
+            empty = HISTORY_SCHEMA.empty_table()
+            return empty.select(list(columns)) if columns else empty
+
+        expression = ds.field("hcpcs") == codes[0] if len(codes) == 1 else ds.field("hcpcs").isin(codes)
+        if modifier is not None:
+            expression = expression & (ds.field("modifier") == modifier)
+        effective = _effective_filter(start, end)
+        if effective is not None:
+            expression = expression & effective
+
+        return dataset.to_table(columns=list(columns) if columns else None, filter=expression)
+
+    def history(
+        self,
+        hcpcs: str,
+        modifier: Optional[str] = None,
+        start: Optional[date] = None,
+        end: Optional[date] = None
+    ) -> List[Dict[str, Any]]:
+        """One code's rows across every vintage, oldest effective date first"""
+        return self.scan([hcpcs], modifier=modifier, start=start, end=end).to_pylist()
+
+
+rvu_history_store = RVUHistoryStore(settings.curated_data_dir)
@@ -0,0 +1,231 @@
+"""Read-only pricing reference data served from curated Parquet snapshots"""
+
+import threading
+import time
+from datetime import date, datetime
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import structlog
+
+from cms_pricing.config import settings
+from cms_pricing.services.effective_dates import year_window
+
+logger = structlog.get_logger()
+
+# Datasets prefixed with this are read from the RVU ingestor's layout
+# (curated/cms_rvu/<vintage>/data/<dataset>/); everything else from the
+# ParquetPublisher layout (curated/payments/<dataset>/<vintage>/).
+RVU_PREFIX = "cms_rvu."
+
+
+def _key(values: Iterable[Any]) -> Tuple[Optional[str], ...]:
+    """Index key; values are compared as strings so 2025 matches '2025'"""
+    return tuple(None if v is None else str(v) for v in values)
+
+
+def _as_date(value: Any) -> Optional[date]:
+    if value is None or isinstance(value, date) and not isinstance(value, datetime):
+        return value
+    if isinstance(value, datetime):
+        return value.date()
+    return date.fromisoformat(str(value)[:10])
+
+
+def effective_in_year(records: Iterable[Any], year: int) -> List[Any]:
+    """Snapshot counterpart of engines.base.effective_in_year"""
+    year_start, year_end = year_window(year)
+    selected = []
+    for record in records:
+        effective_from = _as_date(getattr(record, "effective_from", None))
+        effective_to = _as_date(getattr(record, "effective_to", None))
+        if effective_from is not None and effective_from > year_end:
+            continue
+        if effective_to is not None and effective_to < year_start:
+            continue
+        selected.append(record)
+    return selected
+
+
+class SnapshotTable:
+    """
+    One curated snapshot (dataset + vintage), memory-mapped from Parquet.
+    
+    Hash indexes over key columns are built on first use and kept for the
+    life of the snapshot; rows are only materialized when returned.
+    """
+    
+    def __init__(self, dataset: str, vintage: str, table: pa.Table):
+        self.dataset = dataset
+        self.vintage = vintage
+        self.table = table
+        self._indexes: Dict[Tuple[str, ...], Dict[Tuple, List[int]]] = {}
+        self._lock = threading.Lock()
+    
+    @classmethod
+    def read(cls, dataset: str, vintage: str, files: List[Path]) -> "SnapshotTable":
+        tables = [pq.read_table(path, memory_map=True) for path in sorted(files)]
+        table = tables[0] if len(tables) == 1 else pa.concat_tables(tables, promote_options="default")
+        return cls(dataset, vintage, table)
+    
+    def __len__(self) -> int:
+        return self.table.num_rows
+    
+    def index(self, columns: Tuple[str, ...]) -> Dict[Tuple, List[int]]:
+        """Row ids grouped by the values of `columns`"""
+        with self._lock:
+            index = self._indexes.get(columns)
+        if index is not None:
+            return index
+        
+        index = {}
+        values = [self.table.column(col).to_pylist() for col in columns]
+        for row_id, key in enumerate(zip(*values)):
+            index.setdefault(_key(key), []).append(row_id)
+        with self._lock:
+            self._indexes[columns] = index
+        return index
+    
+    def rows(self, row_ids: Iterable[int]) -> List[SimpleNamespace]:
+        return [SimpleNamespace(**self.table.slice(i, 1).to_pylist()[0]) for i in row_ids]
+    
+    def find(self, **criteria) -> List[SimpleNamespace]:
+        """Rows whose columns equal every keyword given, in file order"""
+        columns = tuple(sorted(criteria))
+        return self.rows(self.index(columns).get(_key(criteria[c] for c in columns), []))
+
+
+class ParquetSnapshotStore:
+    """
+    Pricing lookups over the latest curated snapshot of each dataset.
+    
+    The newest vintage directory is re-checked at most every
+    `refresh_seconds`; a snapshot is read once and replaced only when a newer
+    vintage appears. Lookups can also pin an explicit vintage.
+    """
+    
+    def __init__(self, root: str, refresh_seconds: int = 60):
+        self.root = Path(root)
+        self.refresh_seconds = refresh_seconds
+        self._tables: Dict[Tuple[str, str], SnapshotTable] = {}
+        self._latest: Dict[str, Tuple[Optional[str], float]] = {}
+        self._by_year: Dict[Tuple[str, int], Tuple[Optional[str], float]] = {}
+        self._lock = threading.Lock()
+    
+    def _vintage_dirs(self, dataset: str) -> Dict[str, Path]:
+        if dataset.startswith(RVU_PREFIX):
+            name = dataset[len(RVU_PREFIX):]
+            base = self.root / "curated" / "cms_rvu"
+            candidates = {d.name: d / "data" / name for d in base.iterdir()} if base.is_dir() else {}
+        else:
+            base = self.root / "curated" / "payments" / dataset
+            candidates = {d.name: d for d in base.iterdir()} if base.is_dir() else {}
+        return {vintage: path for vintage, path in candidates.items() if path.is_dir()}
+    
+    def vintages(self, dataset: str) -> List[str]:
+        return sorted(self._vintage_dirs(dataset))
+    
+    def latest_vintage(self, dataset: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            cached = self._latest.get(dataset)
+            if cached and now < cached[1]:
+                return cached[0]
+        
+        vintages = self.vintages(dataset)
+        latest = vintages[-1] if vintages else None
+        with self._lock:
+            previous = self._latest.get(dataset, (None, 0.0))[0]
+            self._latest[dataset] = (latest, now + self.refresh_seconds)
+            if previous is not None and previous != latest:
+                # Superseded snapshot; pinned lookups re-read it on demand
+                self._tables.pop((dataset, previous), None)
+        return latest
+    
+    def vintage_for_year(self, dataset: str, year: int) -> Optional[str]:
+        """Latest vintage dated in `year` (vintages are ISO dates), re-checked like latest_vintage"""
+        key = (dataset, int(year))
+        now = time.time()
+        with self._lock:
+            cached = self._by_year.get(key)
+            if cached and now < cached[1]:
+                return cached[0]
+        
+        vintages = [v for v in self.vintages(dataset) if v[:4] == str(year)]
+        vintage = vintages[-1] if vintages else None
+        with self._lock:
+            self._by_year[key] = (vintage, now + self.refresh_seconds)
+        return vintage
+    
+    def table(self, dataset: str, vintage: Optional[str] = None) -> Optional[SnapshotTable]:
+        """The snapshot for a dataset (latest vintage unless pinned), or None if absent"""
+        vintage = vintage or self.latest_vintage(dataset)
+        if vintage is None:
+            return None
+        
+        with self._lock:
+            snapshot = self._tables.get((dataset, vintage))
+        if snapshot is not None:
+            return snapshot
+        
+        path = self._vintage_dirs(dataset).get(vintage)
+        files = [f for f in path.rglob("*.parquet") if f.is_file()] if path else []
+        if not files:
+            return None
+        snapshot = SnapshotTable.read(dataset, vintage, files)
+        with self._lock:
+            self._tables[(dataset, vintage)] = snapshot
+        
+        logger.info("Loaded curated snapshot", dataset=dataset, vintage=vintage,
+                   files=len(files), rows=len(snapshot))
+        return snapshot
+    
+    def find(self, dataset: str, vintage: Optional[str] = None, **criteria) -> List[SimpleNamespace]:
+        snapshot = self.table(dataset, vintage)
+        return snapshot.find(**criteria) if snapshot is not None else []
+    
+    def first(self, dataset: str, vintage: Optional[str] = None, **criteria) -> Optional[SimpleNamespace]:
+        rows = self.find(dataset, vintage, **criteria)
+        return rows[0] if rows else None
+    
+    def first_effective(
+        self,
+        dataset: str,
+        year: int,
+        vintage: Optional[str] = None,
+        **criteria
+    ) -> Optional[SimpleNamespace]:
+        """First row matching `criteria` (and `year`) whose effective window overlaps the year"""
+        rows = effective_in_year(self.find(dataset, vintage, year=year, **criteria), year)
+        return rows[0] if rows else None
+    
+    def describe(self) -> Dict[str, Optional[str]]:
+        """Latest vintage of every dataset present under the root"""
+        datasets = []
+        payments = self.root / "curated" / "payments"
+        if payments.is_dir():
+            datasets.extend(d.name for d in payments.iterdir() if d.is_dir())
+        rvu = self.root / "curated" / "cms_rvu"
+        if rvu.is_dir():
+            datasets.extend({
+                RVU_PREFIX + d.name
+                for vintage_dir in rvu.iterdir() if (vintage_dir / "data").is_dir()
+                for d in (vintage_dir / "data").iterdir() if d.is_dir()
+            })
+        return {dataset: self.latest_vintage(dataset) for dataset in sorted(datasets)}
+    
+    def invalidate(self):
+        """Drop all loaded snapshots and vintage checks"""
+        with self._lock:
+            self._tables.clear()
+            self._latest.clear()
+            self._by_year.clear()
+
+
+snapshot_store = ParquetSnapshotStore(
+    settings.curated_data_dir,
+    refresh_seconds=settings.snapshot_refresh_seconds
+)
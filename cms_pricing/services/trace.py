@@ -8,7 +8,6 @@ from sqlalchemy.orm import Session
 from uuid import UUID
 
 from cms_pricing.schemas.trace import TraceResponse, TraceData
-from cms_pricing.database import SessionLocal
 from cms_pricing.models.runs import Run, RunInput, RunOutput, RunTrace
 import structlog
 
@@ -30,8 +29,8 @@ def convert_uuids_to_strings(obj: Any) -> Any:
 class TraceService:
     """Service for managing run traces and auditability"""
     
-    def __init__(self, db: Session = None):
-        self.db = db or SessionLocal()
+    def __init__(self, db: Session):
+        self.db = db
     
     async def store_run(
         self,
@@ -218,8 +217,3 @@ class TraceService:
                 exc_info=True
             )
             raise
-    
-    def __del__(self):
-        """Clean up database session"""
-        if hasattr(self, 'db'):
-            self.db.close()
@@ -0,0 +1,165 @@
+"""In-memory interval index over CMS ZIP9 override ranges"""
+
+import threading
+import time
+from bisect import bisect_right
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import structlog
+from sqlalchemy import func
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from cms_pricing.config import settings
+from cms_pricing.models.nearest_zip import ZIP9Overrides
+
+logger = structlog.get_logger()
+
+
+class ZIP9IntervalIndex:
+    """
+    Sorted-array index of ZIP9 ranges for one override vintage.
+    
+    Ranges are kept as parallel lists ordered by (low, high) together with a
+    running maximum of `high`, so a lookup is one bisect on the starts plus a
+    short backwards walk that only happens when ranges overlap.
+    """
+    
+    def __init__(self, rows: Iterable[Tuple[str, str, str, str, Optional[bool]]], vintage: Optional[str] = None):
+        self.vintage = vintage
+        ranges = []
+        skipped = 0
+        for low, high, state, locality, rural_flag in rows:
+            try:
+                low, high = int(low), int(high)
+            except (TypeError, ValueError):
+                skipped += 1
+                continue
+            if low > high:
+                skipped += 1
+                continue
+            ranges.append((low, high, state, locality, rural_flag))
+        if skipped:
+            logger.warning("Skipped malformed ZIP9 override rows", vintage=vintage, skipped=skipped)
+        ranges.sort(key=lambda r: (r[0], r[1]))
+        self._lows = [r[0] for r in ranges]
+        self._highs = [r[1] for r in ranges]
+        self._payload = [r[2:] for r in ranges]
+        self._max_highs: List[int] = []
+        running = -1
+        for high in self._highs:
+            running = max(running, high)
+            self._max_highs.append(running)
+    
+    def __len__(self) -> int:
+        return len(self._lows)
+    
+    def lookup(self, zip9: str) -> Optional[Dict[str, Any]]:
+        """Return the override covering a 9-digit ZIP, preferring the latest-starting range"""
+        if not zip9 or not zip9.isdigit():
+            return None
+        
+        value = int(zip9)
+        i = bisect_right(self._lows, value) - 1
+        while i >= 0 and self._max_highs[i] >= value:
+            if self._highs[i] >= value:
+                state, locality, rural_flag = self._payload[i]
+                return {
+                    "state": state,
+                    "locality": locality,
+                    "rural_flag": rural_flag,
+                    "vintage": self.vintage,
+                }
+            i -= 1
+        return None
+
+
+class ZIP9IndexCache:
+    """
+    Process-wide ZIP9 index for the latest override vintage.
+    
+    The (vintage, row count) digest is re-checked at most every
+    `refresh_seconds`; the index is rebuilt only when it changes, and the
+    ZIP9 ingester invalidates it directly after publishing a release. An
+    unavailable overrides table is likewise remembered for `refresh_seconds`.
+    """
+    
+    def __init__(self, refresh_seconds: int = 60):
+        self.refresh_seconds = refresh_seconds
+        self._index: Optional[ZIP9IntervalIndex] = None
+        self._digest: Optional[Tuple[Optional[str], int]] = None
+        self._next_check = 0.0
+        self._unavailable_until = 0.0
+        self._lock = threading.Lock()
+        self.builds = 0
+        self.failures = 0
+    
+    def get(self, db: Session) -> ZIP9IntervalIndex:
+        """Return the index for the current vintage, rebuilding it if a new release landed"""
+        now = time.time()
+        with self._lock:
+            if self._index is not None and now < self._next_check:
+                return self._index
+        
+        vintage, count = db.query(
+            func.max(ZIP9Overrides.vintage), func.count(ZIP9Overrides.id)
+        ).one()
+        digest = (vintage, count)
+        
+        with self._lock:
+            if self._index is not None and digest == self._digest:
+                self._next_check = now + self.refresh_seconds
+                return self._index
+        
+        rows = []
+        if vintage is not None:
+            rows = db.query(
+                ZIP9Overrides.zip9_low,
+                ZIP9Overrides.zip9_high,
+                ZIP9Overrides.state,
+                ZIP9Overrides.locality,
+                ZIP9Overrides.rural_flag
+            ).filter(ZIP9Overrides.vintage == vintage).all()
+        index = ZIP9IntervalIndex(rows, vintage=vintage)
+        
+        with self._lock:
+            self._index = index
+            self._digest = digest
+            self._next_check = now + self.refresh_seconds
+            self.builds += 1
+        
+        logger.info("Built ZIP9 override index", vintage=vintage, ranges=len(index))
+        return index
+    
+    def get_or_none(self, db: Session) -> Optional[ZIP9IntervalIndex]:
+        """Like get(), but None when the index cannot be built (e.g. no overrides table)"""
+        now = time.time()
+        with self._lock:
+            if now < self._unavailable_until:
+                return None
+            if self._index is not None and now < self._next_check:
+                return self._index
+        
+        try:
+            # A savepoint confines a failed query to this lookup; the
+            # caller's transaction on the shared session stays usable
+            with db.begin_nested():
+                return self.get(db)
+        except SQLAlchemyError as e:
+            with self._lock:
+                self._unavailable_until = now + self.refresh_seconds
+                self.failures += 1
+            logger.warning("ZIP9 override index unavailable", error=str(e),
+                           retry_in_seconds=self.refresh_seconds)
+            return None
+    
+    def invalidate(self):
+        """Force the next lookup to rebuild from the database"""
+        with self._lock:
+            self._index = None
+            self._digest = None
+            self._next_check = 0.0
+            self._unavailable_until = 0.0
+
+
+zip9_index_cache = ZIP9IndexCache(refresh_seconds=settings.zip9_index_refresh_seconds)
@@ -0,0 +1,67 @@
+"""Tests for pooled database engines and request-scoped session sharing"""
+
+import asyncio
+from unittest.mock import Mock
+
+from sqlalchemy import create_engine, select, text
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from cms_pricing.database import (
+    InstrumentedQueuePool, engine, execute_async, get_async_database_url, get_pool_status
+)
+from cms_pricing.engines.base import PricingContext, use_context
+from cms_pricing.engines.mpfs import MPSFEngine
+from cms_pricing.engines.registry import engine_registry
+from cms_pricing.services.pricing import PricingService
+
+
+def test_sync_engine_uses_sized_queue_pool():
+    assert isinstance(engine.pool, InstrumentedQueuePool)
+    status = get_pool_status()["sync"]
+    assert status["size"] >= 1
+    assert status["checked_out"] == 0
+
+
+def test_async_database_url_translation():
+    assert get_async_database_url("postgresql://u:p@h/db") == "postgresql+asyncpg://u:p@h/db"
+    assert get_async_database_url("postgresql+psycopg2://u:p@h/db") == "postgresql+asyncpg://u:p@h/db"
+    assert get_async_database_url("postgresql+asyncpg://u:p@h/db") == "postgresql+asyncpg://u:p@h/db"
+
+
+def test_execute_async_runs_sync_session_off_loop():
+    sqlite_engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    session = sessionmaker(bind=sqlite_engine)()
+    try:
+        result = asyncio.run(execute_async(session, select(text("42"))))
+        assert result.scalar() == 42
+    finally:
+        session.close()
+
+
+def test_engine_reads_session_from_context():
+    shared = Mock()
+    engine_instance = MPSFEngine()
+    assert engine_instance.db is None
+
+    with use_context(PricingContext(db=shared)):
+        assert engine_instance.db is shared
+    assert engine_instance.db is None
+    shared.close.assert_not_called()
+
+
+def test_pricing_service_shares_one_session():
+    shared = Mock()
+    service = PricingService(shared)
+
+    assert service.geography_service.db is shared
+    assert service.trace_service.db is shared
+    assert service.engines is engine_registry
+    assert PricingService(Mock()).engines["MPFS"] is service.engines["MPFS"]
+    with use_context(PricingContext(db=shared)):
+        assert all(engine_instance.db is shared for engine_instance in service.engines.values())
+
+    del service
+    shared.close.assert_not_called()
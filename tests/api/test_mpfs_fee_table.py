@@ -0,0 +1,120 @@
+"""Tests for the materialized MPFS fee table"""
+
+import asyncio
+from pathlib import Path
+from unittest.mock import Mock
+
+import pandas as pd
+import pytest
+
+from cms_pricing.engines.base import BasePricingEngine
+from cms_pricing.engines.mpfs import MPSFEngine
+from cms_pricing.ingestion.ingestors.rvu_ingestor import RVUIngestor
+from cms_pricing.ingestion.publishers.mpfs_fee_materializer import (
+    build_lineage,
+    materialize_and_publish,
+    materialize_mpfs_fees,
+)
+from cms_pricing.schemas.geography import GeographyCandidate, GeographyResolveResponse
+from cms_pricing.services.mpfs_fee_table import MPFSFeeTable, MPFSFeeTableCache
+from cms_pricing.services.snapshot_store import ParquetSnapshotStore
+
+PPRRVU = pd.DataFrame({
+    "hcpcs": ["99213", "99213", "71046"],
+    "modifier": [None, "26", "TC"],
+    "rvu_work": [1.30, 1.30, 0.0],
+    "rvu_pe_nonfac": [1.21, 0.5, None],
+    "rvu_pe_fac": [0.55, 0.5, 0.6],
+    "rvu_malp": [0.10, 0.05, 0.01],
+})
+GPCI = pd.DataFrame({
+    "locality_code": ["01", "05"],
+    "gpci_work": [1.0, 1.05],
+    "gpci_pe": [1.0, 1.3],
+    "gpci_mp": [1.0, 0.6],
+})
+CF = pd.DataFrame({"cf_type": ["physician", "anesthesia"], "cf_value": [32.3465, 20.3178]})
+LINEAGE = build_lineage("mpfs_2025_q1", "mpfs_2025_q1", "cf_2025")
+CF_FILE = Path(__file__).parent.parent / "fixtures" / "conversion_factor" / "golden" / "cf_2025_minimal.csv"
+
+
+def _expected_cents(work, pe, mp, gpci, cf=32.3465):
+    amount = (work * gpci[0] + pe * gpci[1] + mp * gpci[2]) * cf
+    return int(amount * 100 + 0.5)
+
+
+def test_fee_table_matches_rvu_formula():
+    table = MPFSFeeTable(materialize_mpfs_fees(PPRRVU, GPCI, 32.3465, 2025, LINEAGE))
+
+    assert len(table) == 3 * 2
+    assert table.lookup(2025, "99213", "05", facility=False) == _expected_cents(1.30, 1.21, 0.10, (1.05, 1.3, 0.6))
+    assert table.lookup(2025, "99213", "01") == _expected_cents(1.30, 0.55, 0.10, (1.0, 1.0, 1.0))
+    assert table.lookup(2025, "99213", "01", modifier="26") == _expected_cents(1.30, 0.5, 0.05, (1.0, 1.0, 1.0))
+    assert table.lookup(2025, "71046", "01", modifier="TC", facility=False) is None
+    assert table.lookup(2024, "99213", "01") is None
+    assert table.lookup(2025, "99213", "99") is None
+    assert table.lineage["cf_release_id"] == "cf_2025"
+    assert table.digest == LINEAGE["digest"]
+
+
+def test_published_table_is_served_from_snapshot(tmp_path):
+    path = materialize_and_publish(PPRRVU, GPCI, CF, 2025, tmp_path, "2025-01-01", LINEAGE)
+    assert path.parent.name == "2025-01-01"
+    assert materialize_and_publish(PPRRVU, GPCI, None, 2025, tmp_path, "2025-01-01", LINEAGE) is None
+
+    cache = MPFSFeeTableCache(ParquetSnapshotStore(str(tmp_path)))
+    first = cache.get()
+
+    assert first is cache.get()
+    assert first.lookup(2025, "99213", "01") == _expected_cents(1.30, 0.55, 0.10, (1.0, 1.0, 1.0))
+
+
+def test_mpfs_engine_uses_fee_table(tmp_path, monkeypatch):
+    materialize_and_publish(PPRRVU, GPCI, CF, 2025, tmp_path, "2025-01-01", LINEAGE)
+    monkeypatch.setattr(
+        "cms_pricing.engines.mpfs.mpfs_fee_tables", MPFSFeeTableCache(ParquetSnapshotStore(str(tmp_path)))
+    )
+    cost_sharing = BasePricingEngine._calculate_beneficiary_cost_sharing
+    monkeypatch.setattr(
+        BasePricingEngine, "_calculate_beneficiary_cost_sharing",
+        lambda self, amount: cost_sharing(self, amount, deductible_remaining=0.0),
+    )
+    db = Mock()
+    candidate = GeographyCandidate(zip5="94103", locality_id="05", cbsa="41860", used=True)
+    geography = GeographyResolveResponse(
+        zip5="94103", candidates=[candidate], requires_resolution=False,
+        selected_candidate=candidate, resolution_method="exact",
+    )
+
+    result = asyncio.run(MPSFEngine(db).price_code("99213", "94103", 2025, geography=geography, pos="11", units=2))
+
+    assert result["allowed_cents"] == pytest.approx(2 * _expected_cents(1.30, 1.21, 0.10, (1.05, 1.3, 0.6)), abs=1)
+    assert result["trace_refs"][1] == f"mpfs_fee_lineage_{LINEAGE['digest'][:16]}"
+    db.execute.assert_not_called()
+
+
+def _publish_release(tmp_path, data):
+    ingestor = RVUIngestor(str(tmp_path / "ingest"), curated_root=str(tmp_path))
+    return asyncio.run(ingestor.publish({
+        "batch_id": "rvu_2025_b", "release_id": "rvu_2025_b", "vintage_date": "2025-01-01", "data": data,
+    }))
+
+
+def test_ingestor_publish_materializes_with_parsed_cf_file(tmp_path):
+    cf = RVUIngestor._parse_conversion_factor_file(CF_FILE.read_bytes(), CF_FILE.name, "cf_2025")
+
+    published = _publish_release(tmp_path, {"pprrvu": PPRRVU, "gpci": GPCI, "conversion_factor": cf})
+
+    assert published["mpfs_fee_table"] is not None
+    table = MPFSFeeTableCache(ParquetSnapshotStore(str(tmp_path))).get()
+    assert table.lookup(2025, "99213", "01") == _expected_cents(1.30, 0.55, 0.10, (1.0, 1.0, 1.0))
+
+
+def test_ingestor_publish_falls_back_to_pprrvu_cf(tmp_path):
+    assert _publish_release(tmp_path, {"pprrvu": PPRRVU, "gpci": GPCI})["mpfs_fee_table"] is None
+
+    published = _publish_release(tmp_path, {"pprrvu": PPRRVU.assign(conversion_factor="33.0"), "gpci": GPCI})
+
+    assert published["mpfs_fee_table"] is not None
+    table = MPFSFeeTableCache(ParquetSnapshotStore(str(tmp_path))).get()
+    assert table.lookup(2025, "99213", "01") == _expected_cents(1.30, 0.55, 0.10, (1.0, 1.0, 1.0), cf=33.0)
@@ -0,0 +1,115 @@
+"""Tests for the precomputed OPPS wage-adjusted rate table"""
+
+import asyncio
+from unittest.mock import Mock
+
+import pandas as pd
+import pytest
+
+from cms_pricing.engines.base import BasePricingEngine
+from cms_pricing.engines.opps import OPPSEngine
+from cms_pricing.ingestion.ingestors.opps_ingestor import OPPSBatchInfo, OPPSIngestor
+from cms_pricing.schemas.geography import GeographyCandidate, GeographyResolveResponse
+from cms_pricing.services.opps_rate_table import OPPSRateTableCache, quarter_vintage, wage_adjust
+from cms_pricing.services.snapshot_store import ParquetSnapshotStore
+
+APC = pd.DataFrame({
+    "apc_code": ["5012", "5021"],
+    "payment_rate_usd": [100.0, 200.0],
+})
+WAGE = pd.DataFrame({
+    "ccn": ["050001", "050002", "330001"],
+    "cbsa_code": ["41860", "41860", "35620"],
+    "wage_index": [1.5, 1.6, 0.8],
+})
+CROSSWALK = pd.DataFrame({
+    "hcpcs_code": ["99213", "99213", "G0463", "J1100"],
+    "modifier": [None, "25", None, None],
+    "status_indicator": ["V", "V", "J2", "N"],
+    "apc_code": ["5012", "5021", "5021", None],
+})
+
+
+def _ingestor(tmp_path):
+    ingestor = OPPSIngestor(output_dir=tmp_path, curated_root=tmp_path)
+    batch_info = OPPSBatchInfo(
+        batch_id="opps_2025q2_r01", year=2025, quarter=2, release_number=1,
+        effective_from=ingestor._calculate_effective_from(2025, 2),
+        effective_to=ingestor._calculate_effective_to(2025, 2),
+        files=[], discovered_at=None,
+    )
+    return ingestor, batch_info
+
+
+def test_enrichment_wage_adjusts_labor_share_only(tmp_path):
+    ingestor, _ = _ingestor(tmp_path)
+
+    enriched = asyncio.run(ingestor._enrich_with_wage_index(APC, WAGE))
+
+    assert len(enriched) == 2 * 2
+    rates = enriched.set_index(["apc_code", "cbsa_code"])["wage_adjusted_rate_usd"]
+    assert rates[("5012", "41860")] == pytest.approx(130.0)
+    assert rates[("5021", "35620")] == pytest.approx(round(200.0 * (0.6 * 0.8 + 0.4), 2))
+    assert wage_adjust(100.0, 1.0) == pytest.approx(100.0)
+
+
+def test_engine_prices_from_published_rate_table(tmp_path, monkeypatch):
+    ingestor, batch_info = _ingestor(tmp_path)
+    enriched = asyncio.run(ingestor._enrich_with_wage_index(APC, WAGE))
+    ingestor._publish_rate_snapshots(
+        {"opps_rates_enriched": enriched, "hcpcs_crosswalk": CROSSWALK}, batch_info
+    )
+    cache = OPPSRateTableCache(ParquetSnapshotStore(str(tmp_path)))
+    monkeypatch.setattr("cms_pricing.engines.opps.opps_rate_tables", cache)
+    cost_sharing = BasePricingEngine._calculate_beneficiary_cost_sharing
+    monkeypatch.setattr(
+        BasePricingEngine, "_calculate_beneficiary_cost_sharing",
+        lambda self, amount: cost_sharing(self, amount, deductible_remaining=0.0),
+    )
+    db = Mock()
+    candidate = GeographyCandidate(zip5="94103", locality_id="05", cbsa="41860", used=True)
+    geography = GeographyResolveResponse(
+        zip5="94103", candidates=[candidate], requires_resolution=False,
+        selected_candidate=candidate, resolution_method="exact",
+    )
+
+    result = asyncio.run(OPPSEngine(db).price_code("99213", "94103", 2025, quarter="2", geography=geography))
+
+    assert quarter_vintage(2025, "2") == "2025-04-01"
+    assert cache.get(2025, "2") is cache.get(2025, 2)
+    assert cache.get(2025, "1") is None
+    assert cache.get(2025, "2").lookup("J1100", "41860") is None
+    assert result["allowed_cents"] == 13000
+    assert result["trace_refs"][1] == "opps_rate_2025_2_5012_41860"
+    db.execute.assert_not_called()
+
+
+def test_empty_wage_index_keeps_unadjusted_rows_and_skips_snapshot(tmp_path):
+    ingestor, batch_info = _ingestor(tmp_path)
+
+    enriched = asyncio.run(ingestor._enrich_with_wage_index(APC, WAGE.iloc[0:0]))
+    ingestor._publish_rate_snapshots(
+        {"opps_rates_enriched": enriched, "hcpcs_crosswalk": CROSSWALK}, batch_info
+    )
+
+    assert enriched["apc_code"].tolist() == ["5012", "5021"]
+    assert enriched["wage_adjusted_rate_usd"].isna().all()
+    assert OPPSRateTableCache(ParquetSnapshotStore(str(tmp_path))).get(2025, "2") is None
+
+
+def test_missing_quarter_is_not_rescanned_within_refresh_window(tmp_path, monkeypatch):
+    ingestor, batch_info = _ingestor(tmp_path)
+    store = ParquetSnapshotStore(str(tmp_path), refresh_seconds=60)
+    cache = OPPSRateTableCache(store)
+    assert cache.get(2025, "2") is None
+
+    enriched = asyncio.run(ingestor._enrich_with_wage_index(APC, WAGE))
+    ingestor._publish_rate_snapshots(
+        {"opps_rates_enriched": enriched, "hcpcs_crosswalk": CROSSWALK}, batch_info
+    )
+    scans = Mock(wraps=store._vintage_dirs)
+    monkeypatch.setattr(store, "_vintage_dirs", scans)
+
+    assert cache.get(2025, "2") is None
+    scans.assert_not_called()
+    assert OPPSRateTableCache(store).get(2025, "2").lookup("99213", "41860").apc == "5012"
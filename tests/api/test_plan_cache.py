@@ -0,0 +1,86 @@
+"""Tests for the shared stored-plan cache"""
+
+import asyncio
+import uuid
+from datetime import date
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+import pytest
+
+from cms_pricing.cache import PlanCache, plan_cache
+from cms_pricing.services.pricing import PricingService
+
+
+def test_plan_cache_lru_and_hit_rate():
+    cache = PlanCache(max_items=2, ttl_seconds=60)
+    cache.put("a", 1, "Plan A", [{"code": "99213", "modifiers": []}])
+    cache.put("b", 1, "Plan B", [])
+
+    assert cache.get("a")["name"] == "Plan A"  # "a" becomes most recent
+    cache.put("c", 1, "Plan C", [])
+
+    assert cache.get("b") is None
+    assert cache.get("c")["name"] == "Plan C"
+    stats = cache.get_stats()
+    assert stats["evictions"] == 1
+    assert stats["hit_rate"] == pytest.approx(2 / 3)
+
+
+def test_plan_cache_versions_expiry_and_copies():
+    cache = PlanCache(ttl_seconds=-1)
+    cache.put("a", 1, "Plan A", [])
+    assert cache.get("a") is None
+
+    cache = PlanCache(ttl_seconds=60)
+    cache.put("a", 1, "Plan A", [{"code": "99213", "modifiers": ["26"]}])
+    assert cache.get("a", version=2) is None
+    cache.put("a", 1, "Plan A", [{"code": "99213", "modifiers": ["26"]}])
+
+    first = cache.get("a", version=1)
+    first["components"][0]["modifiers"].append("TC")
+    assert cache.get("a")["components"][0]["modifiers"] == ["26"]
+
+    cache.invalidate("a")
+    assert cache.get("a") is None
+
+
+def _stored_plan_db(plan_id):
+    plan = SimpleNamespace(id=plan_id, name="Knee scope", updated_at=date(2025, 3, 1), version=1)
+    component = SimpleNamespace(
+        code="29881", setting="mpfs", units=1, utilization_weight=1.0,
+        professional_component=True, facility_component=True, modifiers=["rt"],
+        pos="22", ndc11=None, wastage_units=0.0, sequence=1,
+    )
+    db = Mock()
+    query = db.query.return_value.filter.return_value
+    query.first.return_value = plan
+    query.scalar.side_effect = lambda: plan.version
+    query.order_by.return_value.all.return_value = [component]
+    return db
+
+
+def test_pricing_service_reuses_cached_plan():
+    plan_id = uuid.uuid4()
+    db = _stored_plan_db(plan_id)
+    misses = plan_cache.misses
+    try:
+        components, name = asyncio.run(PricingService(db)._resolve_plan(plan_id, None))
+        queries_after_first_load = db.query.call_count
+        assert plan_cache.misses == misses + 1
+
+        cached_components, cached_name = asyncio.run(PricingService(db)._resolve_plan(plan_id, None))
+
+        assert name == cached_name == "Knee scope"
+        assert components == cached_components
+        assert cached_components[0]["setting"] == "MPFS"
+        assert cached_components[0]["modifiers"] == ["RT"]
+        # Only the version probe runs on a hit
+        assert db.query.call_count == queries_after_first_load + 1
+
+        # An update from any worker bumps the version and forces a reload
+        db.query.return_value.filter.return_value.first.return_value.version = 2
+        asyncio.run(PricingService(db)._resolve_plan(plan_id, None))
+        assert plan_cache.get(plan_id)["version"] == 2
+    finally:
+        plan_cache.invalidate(plan_id)
@@ -0,0 +1,122 @@
+"""Tests for concurrent per-setting pricing fan-out"""
+
+import asyncio
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from cms_pricing.engines.base import BasePricingEngine
+from cms_pricing.schemas.geography import GeographyCandidate, GeographyResolveResponse
+from cms_pricing.schemas.pricing import ComparisonRequest, PricingRequest
+from cms_pricing.services.pricing import PricingService
+
+
+class FakeEngine(BasePricingEngine):
+    """Engine stub whose latency depends on the code, so tasks finish out of order"""
+
+    active = 0
+    peak = 0
+
+    async def price_code(self, code, zip, year, geography=None, **kwargs):
+        FakeEngine.active += 1
+        FakeEngine.peak = max(FakeEngine.peak, FakeEngine.active)
+        try:
+            await asyncio.sleep(0.001 * (int(code) % 5))
+        finally:
+            FakeEngine.active -= 1
+        cents = int(code) + (1000 if zip == "94110" else 0)
+        return {"allowed_cents": cents, "trace_refs": [f"{zip}:{code}"]}
+
+
+def _geography(zip5):
+    candidate = GeographyCandidate(zip5=zip5, locality_id="01", cbsa="41860", used=True)
+    return GeographyResolveResponse(
+        zip5=zip5,
+        candidates=[candidate],
+        requires_resolution=False,
+        selected_candidate=candidate,
+        resolution_method="exact",
+    )
+
+
+def _service(session_factory=None):
+    FakeEngine.active = 0
+    FakeEngine.peak = 0
+    service = PricingService(Mock(), session_factory=session_factory)
+    service.engines = {setting: FakeEngine(Mock()) for setting in ("MPFS", "OPPS", "ASC", "CLFS")}
+    service.geography_service.resolve_zip = AsyncMock(side_effect=_geography)
+    service.trace_service.store_run = AsyncMock()
+    return service
+
+
+AD_HOC_PLAN = {
+    "name": "Mixed plan",
+    "components": [
+        {"code": "00004", "setting": "MPFS"},
+        {"code": "00003", "setting": "OPPS"},
+        {"code": "00002", "setting": "ASC"},
+        {"code": "00001", "setting": "CLFS"},
+        {"code": "00009", "setting": "UNKNOWN"},
+        {"code": "00008", "setting": "MPFS"},
+        {"code": "00007", "setting": "OPPS"},
+    ],
+}
+
+
+def test_price_plan_preserves_line_order():
+    service = _service(session_factory=Mock)
+    request = PricingRequest(zip="94103", year=2025, ad_hoc_plan=AD_HOC_PLAN)
+
+    response = asyncio.run(service.price_plan(request))
+
+    assert [item.code for item in response.line_items] == [
+        "00004", "00003", "00002", "00001", "00008", "00007"
+    ]
+    assert [item.sequence for item in response.line_items] == [1, 2, 3, 4, 6, 7]
+    assert response.total_allowed_cents == 4 + 3 + 2 + 1 + 8 + 7
+    assert FakeEngine.peak > 1
+
+
+def test_price_plan_without_session_factory_is_sequential():
+    service = _service()
+    request = PricingRequest(zip="94103", year=2025, ad_hoc_plan=AD_HOC_PLAN)
+
+    asyncio.run(service.price_plan(request))
+
+    assert FakeEngine.peak == 1
+
+
+def test_compare_prices_locations_once_and_deterministically(monkeypatch):
+    monkeypatch.setattr("cms_pricing.services.pricing.settings.pricing_max_concurrency", 2)
+    service = _service(session_factory=Mock)
+    service._resolve_plan = AsyncMock(wraps=service._resolve_plan)
+    request = ComparisonRequest(zip_a="94103", zip_b="94110", year=2025, ad_hoc_plan=AD_HOC_PLAN)
+
+    response = asyncio.run(service.compare_locations(request))
+
+    service._resolve_plan.assert_awaited_once()
+    resolved = [call.args[0] for call in service.geography_service.resolve_zip.await_args_list]
+    assert resolved == ["94103", "94110"]
+    assert FakeEngine.peak <= 2
+    assert response.location_a.geography.zip5 == "94103"
+    assert response.location_b.geography.zip5 == "94110"
+    assert response.total_delta_cents == 6 * 1000
+    assert response.parity_report["valid"] is True
+    stored_endpoints = [call.kwargs["endpoint"] for call in service.trace_service.store_run.await_args_list]
+    assert stored_endpoints == ["/pricing/price", "/pricing/price", "/pricing/compare"]
+
+
+class FailingEngine(FakeEngine):
+    async def price_code(self, code, zip, year, geography=None, **kwargs):
+        raise ValueError(f"No OPPS data found for code {code}")
+
+
+def test_price_plan_failure_propagates_and_records_error():
+    service = _service(session_factory=Mock)
+    service.engines["OPPS"] = FailingEngine(Mock())
+    request = PricingRequest(zip="94103", year=2025, ad_hoc_plan=AD_HOC_PLAN)
+
+    with pytest.raises(ValueError, match="No OPPS data"):
+        asyncio.run(service.price_plan(request))
+
+    assert service.trace_service.store_run.await_args.kwargs["status"] == "error"
@@ -0,0 +1,110 @@
+"""Tests for the multi-year RVU history store"""
+
+import asyncio
+from datetime import date
+
+import pandas as pd
+import pyarrow.parquet as pq
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from cms_pricing.config import settings
+from cms_pricing.ingestion.ingestors.rvu_ingestor import RVUIngestor
+from cms_pricing.ingestion.publishers import rvu_history as publisher
+from cms_pricing.routers import rvu as rvu_router
+from cms_pricing.services.rvu_history import RVUHistoryStore
+
+
+def _pprrvu(year: int, work_99213: float) -> pd.DataFrame:
+    return pd.DataFrame({
+        "hcpcs": ["99214", "99213", "71046", "99213"],
+        "modifier": [None, None, "TC", "26"],
+        "status_code": ["A", "A", "A", "A"],
+        "rvu_work": [1.92, work_99213, 0.0, 0.5],
+        "rvu_pe_nonfac": [1.5, 1.21, 0.6, None],
+        "rvu_pe_fac": [0.7, 0.55, 0.6, 0.2],
+        "rvu_malp": [0.1, 0.1, 0.01, 0.05],
+        "effective_from": [date(year, 1, 1)] * 4,
+        "effective_to": [date(year, 12, 31)] * 4,
+        "source_filename": [f"PPRRVU{year}.csv"] * 4,
+    })
+
+
+def _publish_years(tmp_path, years=range(2021, 2026)):
+    for year in years:
+        path = publisher.publish_rvu_history(_pprrvu(year, round(0.9 + (year - 2020) / 10, 2)), tmp_path, f"{year}-01-01")
+    return path
+
+
+def test_history_returns_one_code_across_vintages(tmp_path):
+    _publish_years(tmp_path)
+    store = RVUHistoryStore(str(tmp_path))
+
+    rows = store.history("99213", modifier="")
+
+    assert [row["vintage"] for row in rows] == [f"{y}-01-01" for y in range(2021, 2026)]
+    assert [row["rvu_work"] for row in rows] == [1.0, 1.1, 1.2, 1.3, 1.4]
+    assert rows[0]["effective_from"] == date(2021, 1, 1)
+    assert len(store.history("99213")) == 10
+    assert store.history("00000") == []
+
+
+def test_effective_range_and_bulk_scan(tmp_path):
+    _publish_years(tmp_path)
+    store = RVUHistoryStore(str(tmp_path))
+
+    window = store.history("99213", modifier="", start=date(2023, 6, 1), end=date(2024, 6, 1))
+    bulk = store.scan(["71046", "99214"], columns=["hcpcs", "vintage", "rvu_work"]).to_pandas()
+
+    assert [row["vintage"] for row in window] == ["2023-01-01", "2024-01-01"]
+    assert bulk["hcpcs"].tolist() == ["71046"] * 5 + ["99214"] * 5
+    assert list(bulk.columns) == ["hcpcs", "vintage", "rvu_work"]
+
+
+def test_republishing_a_vintage_replaces_its_rows(tmp_path):
+    _publish_years(tmp_path, years=[2024, 2025])
+    publisher.publish_rvu_history(_pprrvu(2025, 2.0), tmp_path, "2025-01-01")
+    store = RVUHistoryStore(str(tmp_path))
+
+    assert [row["rvu_work"] for row in store.history("99213", modifier="")] == [1.3, 2.0]
+
+
+def test_codes_are_contiguous_runs_with_row_group_statistics(tmp_path, monkeypatch):
+    monkeypatch.setattr(publisher, "ROW_GROUP_SIZE", 4)
+    path = _publish_years(tmp_path)
+
+    table = pq.read_table(path)
+    codes = table.column("hcpcs").to_pylist()
+    metadata = pq.ParquetFile(path).metadata
+    hcpcs_col = table.schema.get_field_index("hcpcs")
+    bounds = [
+        (metadata.row_group(i).column(hcpcs_col).statistics.min, metadata.row_group(i).column(hcpcs_col).statistics.max)
+        for i in range(metadata.num_row_groups)
+    ]
+
+    assert codes == sorted(codes)
+    assert metadata.num_row_groups == 5
+    # Only the row groups whose range covers a code need to be read for it
+    assert sum(low <= "71046" <= high for low, high in bounds) == 2
+
+
+def test_endpoint_serves_history_published_by_the_ingestor(tmp_path, monkeypatch):
+    # Ingestor and endpoint both default to the configured curated root
+    monkeypatch.setattr(settings, "curated_data_dir", str(tmp_path / "curated_root"))
+    monkeypatch.setattr(rvu_router, "rvu_history_store", RVUHistoryStore(settings.curated_data_dir))
+    ingestor = RVUIngestor(str(tmp_path / "ingest"))
+    for year in (2024, 2025):
+        published = asyncio.run(ingestor.publish({
+            "batch_id": f"rvu_{year}", "release_id": f"rvu_{year}", "vintage_date": f"{year}-01-01",
+            "data": {"pprrvu": _pprrvu(year, 1.0 + (year - 2024) / 10)},
+        }))
+        assert published["rvu_history"] is not None
+    app = FastAPI()
+    app.include_router(rvu_router.router)
+
+    response = TestClient(app).get("/api/v1/rvu/rvu-items/99213/history", params={"modifier": ""})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["meta"]["vintages"] == ["2024-01-01", "2025-01-01"]
+    assert [row["rvu_work"] for row in body["data"]] == [1.0, 1.1]
@@ -0,0 +1,137 @@
+"""Tests for the curated Parquet snapshot pricing backend"""
+
+import asyncio
+from datetime import date
+from unittest.mock import Mock
+
+import pandas as pd
+import pytest
+
+from cms_pricing.engines.base import BasePricingEngine
+from cms_pricing.engines.mpfs import MPSFEngine
+from cms_pricing.engines.opps import OPPSEngine
+from cms_pricing.ingestion.ingestors.rvu_ingestor import RVUIngestor
+from cms_pricing.ingestion.publishers.data_publishers import ParquetPublisher, PublishSpec
+from cms_pricing.schemas.geography import GeographyCandidate, GeographyResolveResponse
+from cms_pricing.services.mpfs_fee_table import MPFSFeeTableCache
+from cms_pricing.services.opps_rate_table import RATES_DATASET, OPPSRateTableCache
+from cms_pricing.services.snapshot_store import ParquetSnapshotStore
+
+
+def _publish(root, table_name, df, vintage, partition_columns=()):
+    spec = PublishSpec(
+        table_name=table_name, partition_columns=list(partition_columns),
+        output_format="parquet", create_latest_view=False,
+    )
+    ParquetPublisher(str(root)).publish_snapshot(df, spec, vintage, f"{table_name}_{vintage}")
+
+
+def _rates(rate):
+    return pd.DataFrame({
+        "year": [2025, 2025, 2025],
+        "quarter": ["1", "1", "2"],
+        "apc_code": ["5012", "5021", "5012"],
+        "cbsa_code": ["41860", "41860", "41860"],
+        "wage_adjusted_rate_usd": [rate, 150.0, 130.0],
+        "effective_from": [date(2025, 1, 1), date(2025, 1, 1), date(2025, 4, 1)],
+        "effective_to": [None, None, None],
+    })
+
+
+def _geography(locality_id="05", cbsa="41860"):
+    candidate = GeographyCandidate(zip5="94103", locality_id=locality_id, cbsa=cbsa, used=True)
+    return GeographyResolveResponse(
+        zip5="94103", candidates=[candidate], requires_resolution=False,
+        selected_candidate=candidate, resolution_method="exact",
+    )
+
+
+@pytest.fixture
+def no_deductible(monkeypatch):
+    cost_sharing = BasePricingEngine._calculate_beneficiary_cost_sharing
+    monkeypatch.setattr(
+        BasePricingEngine, "_calculate_beneficiary_cost_sharing",
+        lambda self, amount: cost_sharing(self, amount, deductible_remaining=0.0),
+    )
+
+
+def test_lookups_use_latest_vintage_and_partitions(tmp_path):
+    _publish(tmp_path, RATES_DATASET, _rates(100.0), date(2025, 1, 1), ["quarter"])
+    _publish(tmp_path, RATES_DATASET, _rates(110.0), date(2025, 2, 1), ["quarter"])
+    store = ParquetSnapshotStore(str(tmp_path), refresh_seconds=0)
+
+    assert store.vintages(RATES_DATASET) == ["2025-01-01", "2025-02-01"]
+    row = store.first_effective(RATES_DATASET, 2025, quarter="1", apc_code="5012")
+    assert row.wage_adjusted_rate_usd == 110.0
+    assert len(store.find(RATES_DATASET, cbsa_code="41860")) == 3
+
+    pinned = store.first(RATES_DATASET, vintage="2025-01-01", year="2025", quarter=1, apc_code="5012")
+    assert pinned.wage_adjusted_rate_usd == 100.0
+    assert store.first(RATES_DATASET, apc_code="0000") is None
+    assert store.vintage_for_year(RATES_DATASET, 2025) == "2025-02-01"
+    assert store.vintage_for_year(RATES_DATASET, 2024) is None
+    assert store.describe() == {RATES_DATASET: "2025-02-01"}
+
+
+def test_effective_window_filters_rows(tmp_path):
+    df = _rates(100.0).assign(effective_to=[date(2024, 12, 31), None, None])
+    df.loc[0, "effective_from"] = date(2024, 1, 1)
+    _publish(tmp_path, RATES_DATASET, df, date(2025, 1, 1))
+    store = ParquetSnapshotStore(str(tmp_path))
+
+    assert store.first_effective(RATES_DATASET, 2025, quarter="1", apc_code="5012") is None
+    assert store.first_effective(RATES_DATASET, 2025, apc_code="5012").wage_adjusted_rate_usd == 130.0
+
+
+def test_mpfs_engine_prices_from_published_rvu_release(tmp_path, monkeypatch, no_deductible):
+    pprrvu = pd.DataFrame({
+        "hcpcs": ["99213", "99213"],
+        "modifier": ["26", None],
+        "status_code": ["A", "A"],
+        "rvu_work": [1.0, 1.0],
+        "rvu_pe_nonfac": [0.5, 2.0],
+        "rvu_pe_fac": [0.5, 0.8],
+        "rvu_malp": [0.1, 0.1],
+        "conversion_factor": [32.0, 32.0],
+    })
+    gpci = pd.DataFrame({
+        "locality_code": ["01", "05"],
+        "state_fips": ["06", "06"],
+        "gpci_work": [1.0, 1.0],
+        "gpci_pe": [1.0, 1.2],
+        "gpci_malp": [1.0, 1.0],
+    })
+    ingestor = RVUIngestor(str(tmp_path / "ingest"), curated_root=str(tmp_path))
+    published = asyncio.run(ingestor.publish({
+        "batch_id": "rvu_2025_b", "release_id": "rvu_2025_b", "vintage_date": "2025-01-01",
+        "data": {"pprrvu": pprrvu, "gpci": gpci},
+    }))
+    assert published["status"] == "success"
+
+    store = ParquetSnapshotStore(str(tmp_path))
+    monkeypatch.setattr("cms_pricing.engines.mpfs.mpfs_fee_tables", MPFSFeeTableCache(store))
+    db = Mock()
+    engine = MPSFEngine(db, snapshots=store)
+
+    result = asyncio.run(engine.price_code("99213", "94103", 2025, geography=_geography(), pos="11"))
+
+    # Global row, locality 05 GPCI: (1.0 * 1.0 + 2.0 * 1.2 + 0.1 * 1.0) * 32.0
+    assert result["allowed_cents"] == 11200
+    with pytest.raises(ValueError, match="No GPCI data"):
+        asyncio.run(engine.price_code("99213", "94103", 2025, geography=_geography("99"), pos="11"))
+    with pytest.raises(ValueError, match="No MPFS data"):
+        asyncio.run(engine.price_code("99213", "94103", 2024, geography=_geography(), pos="11"))
+    db.execute.assert_not_called()
+
+
+def test_opps_engine_misses_published_rate_table_without_sql(tmp_path, monkeypatch, no_deductible):
+    store = ParquetSnapshotStore(str(tmp_path))
+    monkeypatch.setattr("cms_pricing.engines.opps.opps_rate_tables", OPPSRateTableCache(store))
+    db = Mock()
+
+    with pytest.raises(ValueError, match="No published OPPS rate"):
+        asyncio.run(OPPSEngine(db, snapshots=store).price_code(
+            "99213", "94103", 2025, quarter="1", geography=_geography()
+        ))
+    db.execute.assert_not_called()
+    db.query.assert_not_called()
@@ -0,0 +1,131 @@
+"""Tests for single-pass /mpfs/stats and /opps/stats aggregation and caching"""
+
+import warnings
+from datetime import date
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import SAWarning
+from sqlalchemy.orm import sessionmaker
+
+from cms_pricing.cache import StatsCache
+from cms_pricing.models.mpfs.mpfs_conversion_factor import Base as MPFSCFBase, MPFSConversionFactor
+from cms_pricing.models.mpfs.mpfs_rvu import Base as MPFSRVUBase, MPFSRVU
+from cms_pricing.models.opps.opps_apc_payment import Base as APCBase, OPPSAPCPayment
+from cms_pricing.models.opps.opps_hcpcs_crosswalk import Base as CrosswalkBase
+from cms_pricing.models.opps.opps_rates_enriched import Base as RatesBase
+from cms_pricing.models.opps.ref_si_lookup import Base as SIBase
+from cms_pricing.routers.mpfs import _compute_mpfs_stats
+from cms_pricing.routers.opps import _compute_opps_counts
+
+
+@pytest.fixture
+def sqlite_session():
+    """In-memory SQLite session with the MPFS and OPPS tables"""
+    engine = create_engine("sqlite://")
+    statements = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _count_statements(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    for base in (MPFSRVUBase, MPFSCFBase, APCBase, CrosswalkBase, RatesBase, SIBase):
+        base.metadata.create_all(engine)
+
+    session = sessionmaker(bind=engine)()
+    session.info["statements"] = statements
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+def _rvu(hcpcs, payable, surgery, evaluation, effective_from=date(2025, 1, 1)):
+    return MPFSRVU(
+        hcpcs=hcpcs, status_code="A", is_payable=payable, is_surgery=surgery,
+        is_evaluation=evaluation, effective_from=effective_from,
+        release_id="r1", batch_id="b1",
+    )
+
+
+def _cf(cf_id, cf_type):
+    return MPFSConversionFactor(
+        id=cf_id, cf_type=cf_type, cf_value=32.35, effective_from=date(2025, 1, 1),
+        release_id="r1", vintage_year="2025", batch_id="b1",
+    )
+
+
+def _apc(quarter, apc_code):
+    return OPPSAPCPayment(
+        year=2025, quarter=quarter, apc_code=apc_code, payment_rate_usd=100,
+        relative_weight=1.0, effective_from=date(2025, 1, 1), release_id="r1",
+        batch_id="b1", created_at=date(2025, 1, 1), updated_at=date(2025, 1, 1),
+    )
+
+
+def test_mpfs_stats_single_pass(sqlite_session):
+    sqlite_session.add_all([
+        _rvu("99213", True, False, True),
+        _rvu("99213", True, False, True),
+        _rvu("10060", True, True, False),
+        _rvu("0001U", False, False, False),
+        _rvu("99999", True, True, False, effective_from=date(2026, 1, 1)),
+        _cf("cf1", "physician"),
+        _cf("cf2", "physician"),
+        _cf("cf3", "anesthesia"),
+    ])
+    sqlite_session.commit()
+    sqlite_session.info["statements"].clear()
+
+    rvu_stats, cf_stats = _compute_mpfs_stats(sqlite_session, date(2025, 6, 1))
+
+    assert rvu_stats == {
+        "total": 4, "payable": 3, "surgery": 1, "evaluation": 2, "unique_hcpcs": 3
+    }
+    assert cf_stats == {"total": 3, "by_type": {"physician": 2, "anesthesia": 1}}
+    # One aggregate over RVUs, one grouped pass over conversion factors
+    assert len(sqlite_session.info["statements"]) == 2
+
+
+def test_opps_counts_single_statement(sqlite_session):
+    sqlite_session.add_all([
+        _apc(1, "5012"),
+        _apc(1, "5013"),
+        _apc(2, "5014"),
+    ])
+    sqlite_session.commit()
+    sqlite_session.info["statements"].clear()
+
+    with warnings.catch_warnings():
+        # No cartesian-product warning for the one-row aggregate subqueries
+        warnings.simplefilter("error", SAWarning)
+        counts = _compute_opps_counts(sqlite_session, 2025, 1)
+
+    assert counts["apc_count"] == 2
+    assert counts["unique_apc_codes"] == 2
+    assert counts["hcpcs_count"] == 0
+    assert counts["si_count"] == 0
+    assert len(sqlite_session.info["statements"]) == 1
+
+
+def test_stats_cache_invalidated_on_publish():
+    cache = StatsCache(ttl_seconds=60)
+    filters = {"effective_date": date(2025, 1, 1)}
+
+    assert cache.get("mpfs", filters) is None
+    cache.put("mpfs", filters, {"total": 1})
+    assert cache.get("mpfs", filters) == {"total": 1}
+
+    cache.put("opps", {"year": 2025}, {"total": 2})
+    cache.invalidate("mpfs", "mpfs_2025_q2")
+
+    assert cache.get_digest("mpfs") == "mpfs_2025_q2"
+    assert cache.get("mpfs", filters) is None
+    assert cache.get("opps", {"year": 2025}) == {"total": 2}
+    assert cache.get_stats()["hits"] == 2
+
+
+def test_stats_cache_expires_entries():
+    cache = StatsCache(ttl_seconds=0)
+    cache.put("mpfs", {}, {"total": 1})
+    assert cache.get("mpfs", {}) is None
@@ -7,6 +7,7 @@ the QA Testing Standard (QTS) v1.0 requirements.
 
 import pytest
 import asyncio
+import inspect
 from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
@@ -33,6 +34,15 @@ SCHEDULER_AVAILABLE = importlib.util.find_spec(SCHEDULER_MODULE) is not None
 NEAREST_ZIP_AVAILABLE = importlib.util.find_spec(NEAREST_ZIP_MODULE) is not None
 ZIP9_AVAILABLE = importlib.util.find_spec(ZIP9_MODULE) is not None
 
+# Tests that import one of these inside the test body are skipped when the
+# module is missing; module-level imports use pytest.importorskip instead
+OPTIONAL_MODULES = (
+    (GEOGRAPHY_MODULE, GEOGRAPHY_AVAILABLE, "geography ingestion module unavailable"),
+    (SCHEDULER_MODULE, SCHEDULER_AVAILABLE, "ingestion scheduler unavailable"),
+    (NEAREST_ZIP_MODULE, NEAREST_ZIP_AVAILABLE, "nearest zip ingestion modules unavailable"),
+    (ZIP9_MODULE, ZIP9_AVAILABLE, "zip9 ingester unavailable"),
+)
+
 
 DOMAIN_MARKER_PATTERNS = {
     "prd_docs": ("tests/prd_docs", "doc_catalog", "doc_metadata", "doc_links", "doc_dependencies"),
@@ -171,6 +181,21 @@ def test_data_dir():
     return data_dir
 
 
+def _missing_module_reason(item):
+    """Skip reason if the test body imports an unavailable optional module"""
+    function = getattr(item, "function", None)
+    if function is None:
+        return None
+    try:
+        source = inspect.getsource(function)
+    except (OSError, TypeError):
+        return None
+    for module, available, reason in OPTIONAL_MODULES:
+        if not available and module in source:
+            return reason
+    return None
+
+
 # Pytest configuration
 def pytest_configure(config):
     """Configure pytest with custom markers"""
@@ -199,17 +224,9 @@ def pytest_collection_modifyitems(config, items):
     for item in items:
         fspath = str(item.fspath)
 
-        if not GEOGRAPHY_AVAILABLE and 'geography' in fspath:
-            item.add_marker(pytest.mark.skip(reason='geography ingestion module unavailable'))
-            continue
-        if not SCHEDULER_AVAILABLE and 'scheduler' in fspath:
-            item.add_marker(pytest.mark.skip(reason='ingestion scheduler unavailable'))
-            continue
-        if not NEAREST_ZIP_AVAILABLE and ('nearest_zip' in fspath or 'zip9' in fspath):
-            item.add_marker(pytest.mark.skip(reason='nearest zip ingestion modules unavailable'))
-            continue
-        if not ZIP9_AVAILABLE and 'zip9' in fspath:
-            item.add_marker(pytest.mark.skip(reason='zip9 ingester unavailable'))
+        reason = _missing_module_reason(item)
+        if reason:
+            item.add_marker(pytest.mark.skip(reason=reason))
             continue
 
         if 'integration' in fspath:
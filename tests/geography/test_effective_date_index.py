@@ -0,0 +1,167 @@
+"""Tests for the precomputed effective-date interval index"""
+
+import random
+import uuid
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import MetaData, String, create_engine
+from sqlalchemy.orm import sessionmaker
+
+from cms_pricing.models.geography import Geography
+from cms_pricing.services.effective_dates import (
+    EffectiveDateIntervalIndex, EffectiveDateRecord, EffectiveDateSelector,
+    IntervalIndexCache, interval_index_cache, quarter_window, records_digest, year_window
+)
+from cms_pricing.services.geography import GEOGRAPHY_DATASET, GeographyService
+
+
+def _linear_select(records, valuation_date):
+    """Reference selection: the original linear-scan semantics"""
+    covering = [
+        r for r in records
+        if r.effective_from <= valuation_date
+        and (r.effective_to is None or r.effective_to >= valuation_date)
+    ]
+    if covering:
+        return max(covering, key=lambda r: r.effective_from), True
+    fallback = [r for r in records if r.effective_from <= valuation_date]
+    if fallback:
+        return max(fallback, key=lambda r: r.effective_from), False
+    return None, False
+
+
+def test_index_matches_linear_scan():
+    rng = random.Random(7)
+    base = date(2023, 1, 1)
+    records = []
+    for i in range(40):
+        start = base + timedelta(days=rng.randrange(0, 900))
+        end = None if rng.random() < 0.2 else start + timedelta(days=rng.randrange(0, 200))
+        records.append(EffectiveDateRecord(data=i, effective_from=start, effective_to=end))
+    index = EffectiveDateIntervalIndex(records)
+
+    for offset in range(-10, 1200, 3):
+        valuation_date = base + timedelta(days=offset)
+        expected, covered = _linear_select(records, valuation_date)
+        if covered:
+            assert index.covering(valuation_date) is expected
+        else:
+            assert index.covering(valuation_date) is None
+            assert index.latest_on_or_before(valuation_date) is expected
+
+
+def test_selector_fallback_and_strict_mode():
+    records = [
+        EffectiveDateRecord(data="q1", effective_from=date(2025, 1, 1), effective_to=date(2025, 3, 31)),
+        EffectiveDateRecord(data="q3", effective_from=date(2025, 7, 1), effective_to=date(2025, 9, 30)),
+    ]
+    selector = EffectiveDateSelector()
+
+    assert selector.select_for_valuation_date(records, date(2025, 8, 1)).data == "q3"
+    assert selector.select_for_valuation_date(records, date(2025, 5, 1)).data == "q1"
+    assert selector.select_for_valuation_date(records, date(2024, 12, 31)) is None
+    with pytest.raises(ValueError):
+        selector.select_for_valuation_date(records, date(2025, 5, 1), strict_mode=True)
+
+    index = EffectiveDateIntervalIndex(records)
+    assert index.for_quarter(2025, 3).data == "q3"
+    assert [r.data for r in index.overlapping(*year_window(2025))] == ["q1", "q3"]
+
+
+def test_index_cache_reuses_digest_keyed_index():
+    cache = IntervalIndexCache(ttl_seconds=0)
+    records = [EffectiveDateRecord(data=1, effective_from=date(2025, 1, 1), effective_to=None)]
+
+    first = cache.get_or_build("MPFS", "digest-a", lambda: records)
+    assert cache.get_or_build("MPFS", "digest-a", lambda: records) is first
+    assert cache.get_or_build("MPFS", "digest-b", lambda: records) is not first
+    assert cache.builds == 2
+
+    cache.invalidate("MPFS")
+    assert cache.get_or_build("MPFS", "digest-a", lambda: records) is not first
+
+
+def test_selector_reuses_precomputed_digest():
+    records = [EffectiveDateRecord(data=1, effective_from=date(2025, 1, 1), effective_to=None, dataset_digest="a")]
+    selector = EffectiveDateSelector()
+    digest = records_digest(records)
+
+    index = selector.build_index(records, "TEST_DIGEST", digest)
+
+    assert selector.build_index(records, "TEST_DIGEST") is index
+    assert records_digest(records[:0]) != digest
+    interval_index_cache.invalidate("TEST_DIGEST")
+
+
+def test_memoized_windows_are_not_shared_mutably():
+    selector = EffectiveDateSelector()
+    params = selector.determine_effective_date(2025, 2)
+    params["note"] = "caller annotation"
+
+    assert "note" not in selector.determine_effective_date(2025, 2)
+    assert quarter_window(2025, 2) == (date(2025, 4, 1), date(2025, 6, 30))
+    with pytest.raises(ValueError):
+        quarter_window(2025, 5)
+
+
+def _geography_row(zip5, locality_id, effective_from, effective_to, digest):
+    return Geography(
+        id=uuid.uuid4(), zip5=zip5, has_plus4=0, state="CA", locality_id=locality_id,
+        effective_from=effective_from, effective_to=effective_to,
+        dataset_digest=digest, created_at=date(2025, 1, 1),
+    )
+
+
+@pytest.fixture
+def geography_db():
+    engine = create_engine("sqlite://")
+    # SQLite cannot render the Postgres UUID primary key in DDL
+    metadata = MetaData()
+    Geography.__table__.to_metadata(metadata).c.id.type = String(36)
+    metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    session.add_all([
+        _geography_row("94110", "05", date(2024, 1, 1), date(2024, 12, 31), "d2024"),
+        _geography_row("94110", "06", date(2025, 1, 1), None, "d2025"),
+    ])
+    session.commit()
+    interval_index_cache.invalidate(GEOGRAPHY_DATASET)
+    try:
+        yield session
+    finally:
+        interval_index_cache.invalidate(GEOGRAPHY_DATASET)
+        session.close()
+
+
+def test_geography_filters_on_resolved_vintage(geography_db):
+    service = GeographyService(db=geography_db)
+
+    def locality(params):
+        record = geography_db.query(Geography).filter(
+            Geography.zip5 == "94110", service._vintage_filter(params)
+        ).first()
+        return record.locality_id if record else None
+
+    selector = service.effective_date_selector
+    assert locality(selector.determine_effective_date(valuation_date=date(2024, 6, 1))) == "05"
+    assert locality(selector.determine_effective_date(valuation_date=date(2026, 6, 1))) == "06"
+    assert locality(selector.determine_effective_date(2025, 3)) == "06"
+    assert locality(selector.determine_effective_date(valuation_date=date(2023, 6, 1))) is None
+    assert len(service._vintage_index()) == 2
+
+
+def test_vintage_probe_runs_once_per_refresh_window(geography_db):
+    service = GeographyService(db=geography_db)
+    probes = interval_index_cache.probes
+    assert len(service._vintage_index()) == 2
+    assert len(service._vintage_index()) == 2
+    assert interval_index_cache.probes == probes + 1
+
+    geography_db.add(_geography_row("94110", "07", date(2026, 1, 1), None, "d2026"))
+    geography_db.commit()
+    assert len(service._vintage_index()) == 2
+
+    # Next window (or an explicit invalidate) picks up the new vintage
+    interval_index_cache.invalidate(GEOGRAPHY_DATASET)
+    assert len(service._vintage_index()) == 3
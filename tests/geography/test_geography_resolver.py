@@ -284,7 +284,7 @@ class TestGeographyInputNormalization:
     
     def test_normalize_dash_format(self):
         """Test normalization of 94110-1234 format"""
-        service = GeographyService()
+        service = GeographyService(db=Mock())
         zip5, plus4 = service._normalize_zip_input("94110-1234")
         
         assert zip5 == "94110"
@@ -292,7 +292,7 @@ class TestGeographyInputNormalization:
     
     def test_normalize_combined_format(self):
         """Test normalization of 941101234 format"""
-        service = GeographyService()
+        service = GeographyService(db=Mock())
         zip5, plus4 = service._normalize_zip_input("941101234")
         
         assert zip5 == "94110"
@@ -300,7 +300,7 @@ class TestGeographyInputNormalization:
     
     def test_normalize_separate_params(self):
         """Test normalization with separate zip5 and plus4"""
-        service = GeographyService()
+        service = GeographyService(db=Mock())
         zip5, plus4 = service._normalize_zip_input("94110", "1234")
         
         assert zip5 == "94110"
@@ -308,7 +308,7 @@ class TestGeographyInputNormalization:
     
     def test_normalize_leading_zeros(self):
         """Test preservation of leading zeros in plus4"""
-        service = GeographyService()
+        service = GeographyService(db=Mock())
         zip5, plus4 = service._normalize_zip_input("94110", "0001")
         
         assert zip5 == "94110"
@@ -316,7 +316,7 @@ class TestGeographyInputNormalization:
     
     def test_normalize_zip5_only(self):
         """Test ZIP5-only normalization"""
-        service = GeographyService()
+        service = GeographyService(db=Mock())
         zip5, plus4 = service._normalize_zip_input("94110")
         
         assert zip5 == "94110"
@@ -324,14 +324,14 @@ class TestGeographyInputNormalization:
     
     def test_invalid_zip5_length(self):
         """Test error for invalid ZIP5 length"""
-        service = GeographyService()
+        service = GeographyService(db=Mock())
         
         with pytest.raises(ValueError):
             service._normalize_zip_input("123")
     
     def test_invalid_zip4_length(self):
         """Test error for invalid ZIP+4 length"""
-        service = GeographyService()
+        service = GeographyService(db=Mock())
         
         with pytest.raises(ValueError):
             service._normalize_zip_input("94110", "12345")  # Too long
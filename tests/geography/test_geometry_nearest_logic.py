@@ -377,7 +377,7 @@ class TestGeometryIntegration:
     
     def test_distance_calculation_accuracy(self):
         """Test distance calculation accuracy with known distances"""
-        service = GeographyService()
+        service = GeographyService(db=Mock())
         
         # Test cases with known approximate distances
         test_cases = [
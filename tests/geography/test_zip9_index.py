@@ -0,0 +1,146 @@
+"""Tests for the in-memory ZIP9 override interval index"""
+
+import asyncio
+import random
+import uuid
+from datetime import date
+
+import pytest
+from sqlalchemy import MetaData, String, create_engine
+from sqlalchemy.orm import sessionmaker
+
+from cms_pricing.models.geography import Geography
+from cms_pricing.models.nearest_zip import ZIP9Overrides
+from cms_pricing.services.effective_dates import interval_index_cache
+from cms_pricing.services.geography import GEOGRAPHY_DATASET, GeographyService
+from cms_pricing.services.nearest_zip_resolver import NearestZipResolver
+from cms_pricing.services.zip9_index import ZIP9IndexCache, ZIP9IntervalIndex, zip9_index_cache
+
+
+def test_index_matches_range_scan():
+    rng = random.Random(11)
+    rows = []
+    for i in range(200):
+        low = 941000000 + rng.randrange(0, 20000)
+        high = low + rng.randrange(0, 300)
+        rows.append((f"{low:09d}", f"{high:09d}", "CA", f"{i:02d}", None))
+    index = ZIP9IntervalIndex(rows, vintage="2025")
+
+    for value in range(940999990, 941020400, 7):
+        zip9 = f"{value:09d}"
+        covering = [r for r in rows if r[0] <= zip9 <= r[1]]
+        hit = index.lookup(zip9)
+        if not covering:
+            assert hit is None
+        else:
+            assert hit["locality"] in {r[3] for r in covering}
+            latest_start = max(r[0] for r in covering)
+            assert hit["locality"] in {r[3] for r in covering if r[0] == latest_start}
+
+    assert index.lookup("94107") is None
+    assert index.lookup("") is None
+
+
+def test_malformed_rows_are_skipped():
+    rows = [
+        ("941070000", "941079999", "CA", "02", None),
+        (None, "941089999", "CA", "03", None),
+        ("94108-0000", "941089999", "CA", "04", None),
+        ("941099999", "941090000", "CA", "05", None),
+    ]
+    index = ZIP9IntervalIndex(rows, vintage="2025")
+
+    assert len(index) == 1
+    assert index.lookup("941071234")["locality"] == "02"
+    assert index.lookup("941081234") is None
+
+
+def _override(low, high, locality, vintage):
+    return ZIP9Overrides(
+        id=uuid.uuid4(), zip9_low=low, zip9_high=high, state="CA",
+        locality=locality, rural_flag=True, vintage=vintage,
+    )
+
+
+@pytest.fixture
+def zip9_db():
+    engine = create_engine("sqlite://")
+    # SQLite cannot render the Postgres UUID columns in DDL
+    metadata = MetaData()
+    overrides = ZIP9Overrides.__table__.to_metadata(metadata)
+    overrides.c.id.type = String(36)
+    overrides.c.ingest_run_id.type = String(36)
+    Geography.__table__.to_metadata(metadata).c.id.type = String(36)
+    metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    session.add(_override("941070000", "941079999", "02", "2025Q1"))
+    session.commit()
+    zip9_index_cache.invalidate()
+    interval_index_cache.invalidate(GEOGRAPHY_DATASET)
+    try:
+        yield session
+    finally:
+        zip9_index_cache.invalidate()
+        interval_index_cache.invalidate(GEOGRAPHY_DATASET)
+        session.close()
+
+
+def test_cache_rebuilds_only_for_new_vintage(zip9_db):
+    cache = ZIP9IndexCache(refresh_seconds=0)
+
+    first = cache.get(zip9_db)
+    assert cache.get(zip9_db) is first
+    assert first.lookup("941071234")["locality"] == "02"
+
+    zip9_db.add(_override("941070000", "941074999", "03", "2025Q2"))
+    zip9_db.commit()
+    second = cache.get(zip9_db)
+
+    assert cache.builds == 2
+    assert second.vintage == "2025Q2"
+    assert second.lookup("941071234")["locality"] == "03"
+    assert second.lookup("941079000") is None
+
+
+def test_resolvers_use_override_index(zip9_db):
+    builds = zip9_index_cache.builds
+    result = NearestZipResolver(zip9_db)._get_state_and_locality("94107", "941071234")
+    assert result == {"state": "CA", "locality": "02", "zip9_hit": True}
+
+    service = GeographyService(db=zip9_db)
+    params = service.effective_date_selector.determine_effective_date(2025, 1)
+    match = asyncio.run(service._resolve_zip_plus4_exact("94107", "1234", params, False))
+
+    assert match["locality_id"] == "02"
+    assert match["match_level"] == "zip+4"
+    assert match["rural_flag"] == "R"
+    assert asyncio.run(service._resolve_zip_plus4_exact("94108", "1234", params, False)) is None
+    assert zip9_index_cache.builds == builds + 1
+
+
+def test_resolvers_fall_back_without_overrides_table():
+    engine = create_engine("sqlite://")
+    metadata = MetaData()
+    Geography.__table__.to_metadata(metadata).c.id.type = String(36)
+    metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    session.add(Geography(
+        id=uuid.uuid4(), zip5="94107", has_plus4=0, state="CA", locality_id="05",
+        effective_from=date(2025, 1, 1), dataset_digest="d2025", created_at=date(2025, 1, 1),
+    ))
+    zip9_index_cache.invalidate()
+    interval_index_cache.invalidate(GEOGRAPHY_DATASET)
+    try:
+        service = GeographyService(db=session)
+        params = service.effective_date_selector.determine_effective_date(2025, 1)
+        failures = zip9_index_cache.failures
+
+        assert zip9_index_cache.get_or_none(session) is None
+        assert asyncio.run(service._resolve_zip_plus4_exact("94107", "1234", params, False)) is None
+        # The failure is cached, and the caller's pending work survives it
+        assert zip9_index_cache.failures == failures + 1
+        assert session.query(Geography).filter(Geography.zip5 == "94107").count() == 1
+    finally:
+        zip9_index_cache.invalidate()
+        interval_index_cache.invalidate(GEOGRAPHY_DATASET)
+        session.close()
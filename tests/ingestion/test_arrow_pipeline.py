@@ -0,0 +1,99 @@
+"""Tests for Arrow-backed dtypes and copy-free handoffs in the ingestion path"""
+
+from datetime import date
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from cms_pricing.ingestion.parsers._parser_kit import (
+    ARROW_STRING,
+    add_constant_columns,
+    compute_row_id,
+    compute_row_ids,
+    enforce_categorical_dtypes,
+    inject_metadata,
+    to_arrow_strings,
+)
+from cms_pricing.ingestion.publishers.data_publishers import ParquetPublisher, PublishSpec
+
+
+def _frame():
+    return pd.DataFrame({
+        "hcpcs": ["99213", "99214", "99215", "99213"],
+        "modifier": ["", "26", "XX", None],
+        "effective_from": pd.to_datetime(["2025-01-01"] * 4),
+        "work_rvu": [1.3, 1.92, 2.8, 1.3],
+    })
+
+
+def test_metadata_is_dictionary_encoded_and_input_untouched():
+    df = _frame()
+    metadata = {
+        "vintage_date": "2025-01-15", "product_year": "2025", "quarter_vintage": "2025Q1",
+        "release_id": "mpfs_2025_q1", "file_sha256": "abc",
+    }
+
+    out = inject_metadata(df, metadata, "PPRRVU2025.txt")
+
+    assert list(df.columns) == ["hcpcs", "modifier", "effective_from", "work_rvu"]
+    assert isinstance(out["release_id"].dtype, pd.CategoricalDtype)
+    assert list(out["release_id"].cat.categories) == ["mpfs_2025_q1"]
+    assert (out["source_filename"] == "PPRRVU2025.txt").all()
+    assert pd.api.types.is_datetime64_any_dtype(out["parsed_at"])
+
+    empty = add_constant_columns(df, {"source_uri": None})
+    assert empty["source_uri"].isna().all()
+
+
+def test_columnar_row_ids_match_row_wise():
+    df = _frame()
+    keys = ["hcpcs", "modifier", "effective_from"]
+
+    expected = [compute_row_id(row, keys) for _, row in df.iterrows()]
+
+    assert compute_row_ids(df, keys).tolist() == expected
+
+
+def test_enforce_categorical_filters_once_and_keeps_reject_order():
+    df = _frame()
+    schema = {
+        "columns": {
+            "hcpcs": {"type": "string", "nullable": False},
+            "modifier": {"type": "categorical", "enum": ["", "26"], "nullable": False},
+        },
+        "column_order": ["hcpcs", "modifier"],
+    }
+
+    result = enforce_categorical_dtypes(df, schema, ["hcpcs", "modifier"])
+
+    assert result.valid_df["hcpcs"].tolist() == ["99213", "99214"]
+    assert isinstance(result.valid_df["modifier"].dtype, pd.CategoricalDtype)
+    assert result.rejects_df["validation_rule_id"].tolist() == ["CAT_NULL_NOT_ALLOWED", "CAT_UNKNOWN_VALUE"]
+    assert df["modifier"].dtype == object
+
+
+def test_to_arrow_strings_skips_mixed_columns():
+    df = pd.DataFrame({"code": ["A", None], "when": [date(2025, 1, 1), None]})
+
+    out = to_arrow_strings(df)
+
+    assert out["code"].dtype == ARROW_STRING
+    assert out["when"].dtype == object
+
+
+def test_parquet_publisher_writes_arrow_constants(tmp_path):
+    df = pd.DataFrame({"zip5": ["94103", "10001", "94110"], "state": ["CA", "NY", "CA"]})
+    spec = PublishSpec(
+        table_name="cms_zip_locality", partition_columns=["state"],
+        output_format="parquet", create_latest_view=False,
+    )
+
+    result = ParquetPublisher(str(tmp_path)).publish_snapshot(df, spec, date(2025, 1, 1), "rel_1")
+
+    assert sorted(p.split("/")[-2] for p in result.file_paths) == ["state=CA", "state=NY"]
+    assert list(df.columns) == ["zip5", "state"]
+    ca = pq.read_table([p for p in result.file_paths if "state=CA" in p][0])
+    assert ca.column("zip5").to_pylist() == ["94103", "94110"]
+    assert pa.types.is_dictionary(ca.schema.field("release_id").type)
+    assert ca.schema.field("vintage_date").type == pa.date32()
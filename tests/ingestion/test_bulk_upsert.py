@@ -0,0 +1,65 @@
+"""Tests for set-based bulk upserts"""
+
+from datetime import date
+
+from sqlalchemy import Column, Date, MetaData, String, Table, create_engine, select
+from sqlalchemy.orm import sessionmaker
+
+from cms_pricing.ingestion.publishers.bulk_upsert import bulk_upsert
+
+metadata = MetaData()
+zip_locality = Table(
+    "zip_locality",
+    metadata,
+    Column("zip5", String(5), primary_key=True),
+    Column("locality", String(10), nullable=False),
+    Column("effective_from", Date, nullable=False),
+    Column("run_id", String(36)),
+)
+
+
+def _session():
+    engine = create_engine("sqlite://")
+    metadata.create_all(engine)
+    return sessionmaker(bind=engine)()
+
+
+def _rows(run_id, localities):
+    return [
+        {"zip5": zip5, "locality": locality, "effective_from": date(2025, 1, 1), "run_id": run_id}
+        for zip5, locality in localities.items()
+    ]
+
+
+def test_rerun_reports_unchanged_and_keeps_rows():
+    db = _session()
+    first = bulk_upsert(db, zip_locality, _rows("r1", {"94103": "05", "10001": "01"}), ["zip5"],
+                        compare_columns=["locality", "effective_from"], batch_size=1)
+    db.commit()
+    second = bulk_upsert(db, zip_locality, _rows("r2", {"94103": "05", "10001": "01"}), ["zip5"],
+                         compare_columns=["locality", "effective_from"], batch_size=1)
+    db.commit()
+
+    assert first.to_dict() == {"inserted": 2, "updated": 0, "unchanged": 0, "total": 2}
+    assert second.to_dict() == {"inserted": 0, "updated": 0, "unchanged": 2, "total": 2}
+    assert set(db.execute(select(zip_locality.c.run_id)).scalars()) == {"r1"}
+
+
+def test_changed_rows_are_updated_and_new_rows_inserted():
+    db = _session()
+    bulk_upsert(db, zip_locality, _rows("r1", {"94103": "05", "10001": "01"}), ["zip5"],
+                compare_columns=["locality", "effective_from"])
+    db.commit()
+
+    result = bulk_upsert(db, zip_locality, _rows("r2", {"94103": "06", "10001": "01", "60601": "16"}), ["zip5"],
+                         compare_columns=["locality", "effective_from"])
+    db.commit()
+
+    assert (result.inserted, result.updated, result.unchanged) == (1, 1, 1)
+    rows = {row.zip5: (row.locality, row.run_id) for row in db.execute(select(zip_locality))}
+    assert rows == {"94103": ("06", "r2"), "10001": ("01", "r1"), "60601": ("16", "r2")}
+
+
+def test_empty_records_are_a_no_op():
+    db = _session()
+    assert bulk_upsert(db, zip_locality, [], ["zip5"]).total == 0
@@ -0,0 +1,107 @@
+"""Tests for per-column profiles and profile-based drift detection"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from cms_pricing.ingestion.observability.column_profiles import (
+    DatasetProfile, HyperLogLog, ProfileStore, compare_profiles, profile_frame
+)
+from cms_pricing.ingestion.validators.validation_engine import StatisticalValidator
+
+
+def _gpci(n=2000, seed=0, shift=0.0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "locality_id": [f"{i % 90:02d}" for i in range(n)],
+        "state": rng.choice(["CA", "NY", "TX"], size=n, p=[0.5, 0.3, 0.2]),
+        "work_gpci": rng.normal(1.0 + shift, 0.05, size=n),
+    })
+
+
+def test_hyperloglog_estimates_distinct_counts():
+    values = pd.Series(np.arange(50_000) % 20_000)
+    hll = HyperLogLog().add_series(values)
+
+    assert abs(hll.estimate() - 20_000) / 20_000 < 0.05
+    restored = HyperLogLog.from_string(hll.to_string())
+    assert restored.estimate() == hll.estimate()
+    assert HyperLogLog().add_series(pd.Series(["a", "b", "a"])).estimate() == pytest.approx(2, rel=0.01)
+
+
+def test_profile_round_trips_and_is_compact(tmp_path):
+    profile = profile_frame(_gpci(), "cms_rvu_gpci", "2025-01-01")
+    columns = profile.columns
+
+    assert profile.row_count == 2000
+    assert len(columns["work_gpci"].quantiles) == 101
+    assert columns["work_gpci"].top_k is None
+    assert set(columns["state"].top_k) == {"CA", "NY", "TX"}
+    assert columns["locality_id"].distinct_estimate == pytest.approx(90, rel=0.05)
+
+    store = ProfileStore(str(tmp_path))
+    path = store.save(profile)
+    assert path.stat().st_size < 64_000
+    assert store.load("cms_rvu_gpci", "2025-01-01") == DatasetProfile.from_dict(profile.to_dict())
+
+
+def test_same_distribution_has_no_drift():
+    report = compare_profiles(
+        profile_frame(_gpci(seed=1), "gpci", "2025-04-01"),
+        profile_frame(_gpci(seed=2), "gpci", "2025-01-01")
+    )
+
+    assert not report.drift_detected
+
+
+def test_shifted_distribution_and_nulls_are_flagged():
+    current = _gpci(seed=1, shift=0.1)
+    current.loc[:400, "state"] = None
+    report = compare_profiles(
+        profile_frame(current, "gpci", "2025-04-01"),
+        profile_frame(_gpci(seed=2), "gpci", "2025-01-01")
+    )
+    metrics = {(finding.column, finding.metric) for finding in report.findings}
+
+    assert ("work_gpci", "distribution") in metrics
+    assert ("state", "null_rate") in metrics
+
+
+def test_store_compares_against_latest_earlier_vintage(tmp_path):
+    store = ProfileStore(str(tmp_path))
+
+    first = store.record(profile_frame(_gpci(), "gpci", "2025-01-01"))
+    assert first.reference_vintage is None
+
+    second = store.record(profile_frame(_gpci(n=1000), "gpci", "2025-04-01"))
+    assert second.reference_vintage == "2025-01-01"
+    assert [finding.metric for finding in second.findings][:1] == ["row_count"]
+    assert store.vintages("gpci") == ["2025-01-01", "2025-04-01"]
+
+
+def test_validate_drift_accepts_stored_profile():
+    reference = profile_frame(_gpci(seed=2), "gpci", "2025-01-01")
+
+    assert StatisticalValidator.validate_drift(_gpci(seed=1), reference).passed
+    result = StatisticalValidator.validate_drift(_gpci(seed=1, shift=0.1), reference)
+    assert not result.passed
+    assert result.details["column_drift"][0]["column"] == "work_gpci"
+
+
+def test_provenance_columns_are_not_profiled():
+    def release(seed, release_id):
+        df = _gpci(seed=seed)
+        return df.assign(
+            release_id=release_id, source_filename=f"{release_id}.zip", parsed_at=release_id,
+            row_content_hash=[f"{release_id}{i}" for i in range(len(df))],
+            vintage_date=release_id, _batch_id=release_id,
+        )
+
+    current = profile_frame(release(1, "2025q2"), "gpci", "2025-04-01")
+    reference = profile_frame(release(2, "2025q1"), "gpci", "2025-01-01", exclude=["state"])
+
+    assert set(current.columns) == {"locality_id", "state", "work_gpci"}
+    assert set(reference.columns) == {"locality_id", "work_gpci"}
+    reference.columns["_created_at"] = reference.columns["work_gpci"]
+    findings = compare_profiles(current, reference).findings
+    assert [(f.column, f.metric) for f in findings] == [("state", "column_added")]
@@ -0,0 +1,91 @@
+"""Tests for nearest neighbor and interpolation DIS enrichment strategies"""
+
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from cms_pricing.ingestion.enrichers.dis_reference_data_integration import (
+    DISReferenceDataEnricher, EnrichmentRule, EnrichmentStrategy, ReferenceDataManager
+)
+
+
+def _enricher(tmp_path, source_name, data):
+    manager = ReferenceDataManager(str(tmp_path))
+    manager.load_reference_data(source_name, data)
+    return DISReferenceDataEnricher(manager)
+
+
+def _rule(strategy, join_keys, target_columns, reference_source, **kwargs):
+    return EnrichmentRule(
+        rule_id="r1", name="rule", description="", source_columns=[k for k, _ in join_keys],
+        target_columns=target_columns, join_keys=join_keys, strategy=strategy,
+        reference_source=reference_source, confidence_threshold=0.9, **kwargs
+    )
+
+
+def test_nearest_neighbor_on_sorted_key_honors_group_and_tolerance(tmp_path):
+    ref = pd.DataFrame({
+        "state": ["CA", "CA", "NY"],
+        "zip5": ["94103", "94110", "10001"],
+        "cbsa": ["41860", "41861", "35620"],
+    })
+    enricher = _enricher(tmp_path, "zip_cbsa", ref)
+    source = pd.DataFrame({"state": ["CA", "NY", "CA", "CA"], "zip5": ["94109", "10003", "94104", "96000"]})
+    rule = _rule(
+        EnrichmentStrategy.NEAREST_NEIGHBOR, [("state", "state"), ("zip5", "zip5")], ["cbsa"], "zip_cbsa",
+        tolerance=100
+    )
+
+    enriched, result = enricher._apply_nearest_neighbor_enrichment(source, ref, rule, datetime.utcnow())
+
+    assert enriched["cbsa"].tolist()[:3] == ["41861", "35620", "41860"]
+    assert pd.isna(enriched["cbsa"].iloc[3])
+    assert result.records_enriched == 3
+    assert list(enriched.index) == list(source.index)
+
+
+def test_nearest_neighbor_on_coordinates_uses_great_circle_tolerance(tmp_path):
+    pytest.importorskip("scipy")
+    ref = pd.DataFrame({
+        "lat": [37.7749, 34.0522, 40.7128],
+        "lon": [-122.4194, -118.2437, -74.0060],
+        "zcta": ["94103", "90012", "10007"],
+    })
+    enricher = _enricher(tmp_path, "zcta_centroids", ref)
+    source = pd.DataFrame({"latitude": [37.80, 40.70, 47.60], "longitude": [-122.27, -74.01, -122.33]})
+    rule = _rule(
+        EnrichmentStrategy.NEAREST_NEIGHBOR, [("latitude", "lat"), ("longitude", "lon")], ["zcta"],
+        "zcta_centroids", coordinate_keys=True, tolerance=50
+    )
+
+    enriched, result = enricher._apply_nearest_neighbor_enrichment(source, ref, rule, datetime.utcnow())
+
+    assert enriched["zcta"].tolist()[:2] == ["94103", "10007"]
+    assert pd.isna(enriched["zcta"].iloc[2])  # Seattle is far beyond 50 miles
+    assert result.records_enriched == 2
+
+
+def test_interpolation_is_linear_within_groups(tmp_path):
+    ref = pd.DataFrame({
+        "locality": ["01", "01", "02"],
+        "year": [2020, 2024, 2020],
+        "gpci_work": [1.0, 1.4, 0.9],
+    })
+    enricher = _enricher(tmp_path, "gpci_series", ref)
+    source = pd.DataFrame({"locality": ["01", "01", "02", "01"], "year": [2022, 2024, 2020, 2026]})
+    rule = _rule(
+        EnrichmentStrategy.INTERPOLATION, [("locality", "locality"), ("year", "year")], ["gpci_work"],
+        "gpci_series"
+    )
+
+    enriched, result = enricher._apply_interpolation_enrichment(source, ref, rule, datetime.utcnow())
+
+    np.testing.assert_allclose(enriched["gpci_work"].to_numpy()[:3], [1.2, 1.4, 0.9])
+    assert np.isnan(enriched["gpci_work"].iloc[3])
+    assert result.records_enriched == 3
+
+    rule.tolerance = 2
+    enriched, _ = enricher._apply_interpolation_enrichment(source, ref, rule, datetime.utcnow())
+    assert enriched["gpci_work"].iloc[3] == pytest.approx(1.4)
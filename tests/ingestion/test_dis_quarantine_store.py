@@ -0,0 +1,91 @@
+"""Tests for the columnar DIS quarantine store"""
+
+import json
+
+from cms_pricing.ingestion.quarantine.dis_quarantine import (
+    QuarantineManager, QuarantineSeverity, QuarantineStatus, QuarantineTriage
+)
+
+
+def _validation_results():
+    return {
+        "validation_rules": [
+            {"rule_id": "R1", "name": "Null check", "message": "null value found", "violations": 3},
+            {"rule_id": "R2", "name": "Format check", "message": "bad format", "violations": 2},
+            {"rule_id": "R3", "name": "Passing rule", "message": "ok", "violations": 0},
+        ]
+    }
+
+
+RAW = [
+    {"hcpcs": "99213", "locality": "01", "amount": 10},
+    {"zip5": "94110", "plus4": "1234", "amount": 12},
+    {"zip5": "94103"},
+]
+
+
+def test_quarantine_writes_one_segment_per_batch(tmp_path):
+    manager = QuarantineManager(str(tmp_path))
+
+    batch = manager.quarantine_records("zip9", "b1", "2025q1", _validation_results(), RAW)
+
+    release_dir = tmp_path / "zip9" / "2025q1"
+    assert [p.name for p in (release_dir / "records").iterdir()] == ["part-b1.parquet"]
+    metadata = json.loads((release_dir / "quarantine_batch_b1.json").read_text())
+    assert metadata["records"] == []
+    assert batch.total_records == 5
+    assert batch.summary["by_rule"] == {"Null check": 3, "Format check": 2}
+    assert batch.triage_priority == "high"
+
+
+def test_vectorized_triage_matches_per_record_triage(tmp_path):
+    manager = QuarantineManager(str(tmp_path))
+    manager.quarantine_records("zip9", "b1", "2025q1", _validation_results(), RAW)
+
+    triage = QuarantineTriage()
+    records = manager.load_records("zip9", "2025q1")
+    for record in records:
+        expected = triage.triage_record(record.rule_id, record.error_message, record.raw_data)
+        assert record.severity == expected["severity"]
+        assert record.category == expected["category"]
+        assert record.remediation_actions == expected["remediation_suggestions"]
+    assert [r.severity for r in records[:3]] == [
+        QuarantineSeverity.HIGH, QuarantineSeverity.MEDIUM, QuarantineSeverity.MEDIUM
+    ]
+
+
+def test_remediation_updates_survive_reload(tmp_path):
+    manager = QuarantineManager(str(tmp_path))
+    manager.quarantine_records("zip9", "b1", "2025q1", _validation_results(), RAW)
+    record_id = manager.load_records("zip9", "2025q1")[2].record_id
+
+    assert manager.escalate_record("zip9", "2025q1", "b1", record_id, "needs owner", "analyst")
+    assert not manager.remediate_record("zip9", "2025q1", "b1", "missing", "n/a", "analyst")
+    metrics = manager.get_quarantine_metrics()
+    assert metrics.total_quarantined == 5
+    assert metrics.by_status == {"new": 4, "escalated": 1}
+    assert metrics.escalation_rate == 0.2
+
+    reloaded = QuarantineManager(str(tmp_path)).load_records("zip9", "2025q1", batch_id="b1")
+    escalated = [r for r in reloaded if r.status == QuarantineStatus.ESCALATED]
+    assert [r.record_id for r in escalated] == [record_id]
+    assert escalated[0].remediation_notes == "ESCALATED: needs owner"
+
+
+def test_updates_are_scoped_to_batch_and_reach_persisted_segments(tmp_path):
+    manager = QuarantineManager(str(tmp_path))
+    manager.quarantine_records("zip9", "b1", "2025q1", _validation_results(), RAW)
+    manager.quarantine_records("zip9", "b2", "2025q1", _validation_results(), RAW)
+    record_id = manager.load_records("zip9", "2025q1", batch_id="b1")[2].record_id
+
+    # A fresh manager has an empty index; the update is found in the b2 segment
+    restarted = QuarantineManager(str(tmp_path))
+    assert restarted.remediate_record("zip9", "2025q1", "b2", record_id, "fixed", "analyst")
+    assert not restarted.remediate_record("zip9", "2025q1", "b3", record_id, "fixed", "analyst")
+
+    statuses = {
+        batch_id: {r.status for r in restarted.load_records("zip9", "2025q1", batch_id=batch_id)
+                   if r.record_id == record_id}
+        for batch_id in ("b1", "b2")
+    }
+    assert statuses == {"b1": {QuarantineStatus.NEW}, "b2": {QuarantineStatus.REMEDIATED}}
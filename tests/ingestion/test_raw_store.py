@@ -0,0 +1,82 @@
+"""Tests for the content-addressed raw file store"""
+
+import os
+
+import httpx
+import pytest
+
+from cms_pricing.ingestion.cms_downloader import CMSDownloader
+from cms_pricing.ingestion.raw_store import RawStore
+
+BUNDLE = b"PK\x03\x04 rvu25a bundle bytes"
+
+
+def test_identical_content_is_stored_once(tmp_path):
+    store = RawStore(tmp_path / "store")
+
+    first = store.put_bytes(BUNDLE, url="https://www.cms.gov/a.zip")
+    second = store.put_bytes(BUNDLE, url="https://www.cms.gov/mirror/a.zip")
+
+    assert first.new and not second.new
+    assert first.sha256 == second.sha256
+    assert len(list((tmp_path / "store" / "objects").rglob("*"))) == 2  # fan-out dir + object
+
+
+def test_store_is_created_on_first_use(tmp_path):
+    store = RawStore(tmp_path / "store")
+    assert not (tmp_path / "store").exists()
+
+    assert store.lookup_url("https://www.cms.gov/a.zip") is None
+    assert store.index_path.exists()
+    assert store.put_bytes(BUNDLE).path.exists()
+
+
+def test_landing_paths_link_to_one_object(tmp_path):
+    store = RawStore(tmp_path / "store")
+    stored = store.put_bytes(BUNDLE)
+
+    rvu = store.link(stored.sha256, tmp_path / "cms_rvu" / "RVU25A.zip")
+    historical = store.link(stored.sha256, tmp_path / "historical_rvu" / "2025" / "RVU25A.zip")
+
+    assert rvu.read_bytes() == historical.read_bytes() == BUNDLE
+    assert os.path.samefile(rvu, stored.path)
+    assert store.references(stored.sha256) == sorted([str(rvu), str(historical)])
+
+
+@pytest.mark.asyncio
+async def test_download_revalidates_known_urls(tmp_path):
+    requests = []
+
+    def server(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if request.headers.get("if-none-match") == '"abc"':
+            return httpx.Response(304)
+        return httpx.Response(200, content=BUNDLE, headers={"etag": '"abc"'})
+
+    store = RawStore(tmp_path / "store")
+    async with httpx.AsyncClient(transport=httpx.MockTransport(server)) as client:
+        first = await store.download(client, "https://www.cms.gov/a.zip", tmp_path / "land" / "a.zip")
+        again = await store.download(client, "https://www.cms.gov/a.zip", tmp_path / "other" / "a.zip")
+
+    assert first.new and not first.not_modified
+    assert again.not_modified and again.sha256 == first.sha256
+    assert (tmp_path / "other" / "a.zip").read_bytes() == BUNDLE
+    assert len(requests) == 2
+
+
+@pytest.mark.asyncio
+async def test_downloader_lands_through_store(tmp_path, monkeypatch):
+    store = RawStore(tmp_path / "store")
+    downloader = CMSDownloader(str(tmp_path / "cms_raw"), raw_store=store)
+
+    async def fake_download(client, url, dest=None, **kwargs):
+        stored = store.put_bytes(BUNDLE, url=url)
+        store.link(stored.sha256, dest)
+        return stored
+
+    monkeypatch.setattr(store, "download", fake_download)
+    result = await downloader.download_file("https://www.cms.gov/a.zip", "a.zip")
+
+    assert result["success"]
+    assert result["checksum"] == store.lookup_url("https://www.cms.gov/a.zip").sha256
+    assert os.path.samefile(result["local_path"], store.object_path(result["checksum"]))
@@ -0,0 +1,78 @@
+"""Tests for the indexed, effective-dated DIS reference store"""
+
+from datetime import date
+
+import pandas as pd
+
+from cms_pricing.ingestion.enrichers.dis_reference_data_integration import (
+    DISReferenceDataEnricher, EnrichmentRule, EnrichmentStrategy, ReferenceDataManager,
+    ReferenceDataSource
+)
+from cms_pricing.ingestion.enrichers.reference_store import ReferenceTable, content_digest
+
+
+def _gpci():
+    return pd.DataFrame({
+        "locality_code": ["01", "01", "02", "02"],
+        "state_fips": ["06", "06", "06", "36"],
+        "gpci_work": [1.1, 1.2, 1.0, 1.3],
+        "effective_from": [date(2025, 1, 1), date(2024, 1, 1), date(2025, 1, 1), date(2024, 1, 1)],
+        "effective_to": [None, date(2024, 12, 31), None, None],
+    })
+
+
+def _manager(tmp_path):
+    manager = ReferenceDataManager(str(tmp_path))
+    manager.register_reference_source(
+        "cms_gpci", ReferenceDataSource.CMS_OFFICIAL, "2025", date(2024, 1, 1), None, 0, 1.0
+    )
+    manager.load_reference_data("cms_gpci", _gpci())
+    return manager
+
+
+def test_effective_date_view_is_a_slice_of_the_sorted_table():
+    table = ReferenceTable("cms_gpci", _gpci())
+
+    view_2024 = table.view(date(2024, 6, 1))
+    assert sorted(view_2024["gpci_work"]) == [1.2, 1.3]
+    assert table.view(date(2024, 6, 1)) is view_2024
+    assert sorted(table.view(date(2025, 6, 1))["gpci_work"]) == [1.0, 1.1, 1.3]
+    assert len(table.view()) == 4
+
+
+def test_exact_match_is_one_multi_key_join(tmp_path):
+    enricher = DISReferenceDataEnricher(_manager(tmp_path))
+    source = pd.DataFrame({"locality_code": ["01", "02", "09"], "state_fips": ["06", "36", "06"]})
+    rule = EnrichmentRule(
+        rule_id="r1", name="gpci", description="", source_columns=["locality_code", "state_fips"],
+        target_columns=["gpci_work"],
+        join_keys=[("locality_code", "locality_code"), ("state_fips", "state_fips")],
+        strategy=EnrichmentStrategy.EXACT_MATCH, reference_source="cms_gpci", confidence_threshold=0.9
+    )
+
+    enriched, results = enricher.enrich_data(source, [rule], effective_date=date(2025, 3, 1))
+
+    assert len(enriched) == 3
+    assert enriched["gpci_work"].tolist()[:2] == [1.1, 1.3]
+    assert pd.isna(enriched["gpci_work"].iloc[2])
+    assert results[0].records_enriched == 2
+    assert "gpci_work" not in source.columns
+
+
+def test_indexed_table_is_reused_by_digest(tmp_path):
+    manager = _manager(tmp_path)
+    digest = manager.reference_sources["cms_gpci"].content_digest
+    assert digest == content_digest(_gpci())
+    assert (tmp_path / "indexes" / "cms_gpci" / f"{digest}.parquet").exists()
+
+    reloaded = ReferenceDataManager(str(tmp_path))
+    metadata = reloaded.reference_sources["cms_gpci"]
+    assert metadata.source_type is ReferenceDataSource.CMS_OFFICIAL
+    assert metadata.effective_from == date(2024, 1, 1)
+    assert metadata.content_digest == digest
+    assert reloaded.get_reference_table("cms_gpci") is manager.get_reference_table("cms_gpci")
+
+    reloaded.reference_store.clear()
+    reopened = reloaded.get_reference_table("cms_gpci")
+    assert reopened.digest == digest
+    assert len(reopened.view(date(2024, 6, 1))) == 2
@@ -0,0 +1,157 @@
+"""Tests for planned, concurrent validation rule execution"""
+
+import threading
+
+import pandas as pd
+
+from cms_pricing.ingestion.validators.cms_zip_locality_validator import CMSZipLocalityValidator
+from cms_pricing.ingestion.validators.rule_planner import PlannedRule, RulePlan, ValidationContext
+from cms_pricing.ingestion.validators.validation_engine import ValidationEngine, ValidationSeverity
+
+
+def _zip_frame():
+    return pd.DataFrame({
+        "zip5": ["94105", "1002", "10001"],
+        "state": ["CA", "ZZ", "NY"],
+        "locality": ["05", "01", "x1"],
+        "effective_from": ["2025-01-01", "2025-01-01", "2025-01-01"],
+        "effective_to": [None, None, None],
+        "vintage": ["2025-01-01", "2025-01-01", "2025-01-01"],
+    })
+
+
+def test_outcomes_keep_rule_order_across_threads():
+    rules = [
+        PlannedRule(f"rule_{i}", lambda ctx, i=i: i, frozenset({f"col_{i % 3}"}))
+        for i in range(9)
+    ]
+    outcomes = RulePlan(rules, max_workers=3).run(pd.DataFrame({"col_0": [1]}), lambda result: False)
+
+    assert [outcome.result for outcome in outcomes] == list(range(9))
+
+
+def test_failed_blocking_rule_skips_the_rest():
+    calls = []
+    rules = [
+        PlannedRule("gate", lambda ctx: False, blocking=True),
+        PlannedRule("domain", lambda ctx: calls.append("domain"), frozenset({"a"})),
+    ]
+    outcomes = RulePlan(rules).run(pd.DataFrame({"a": [1]}), lambda result: not result)
+
+    assert outcomes[0].result is False
+    assert outcomes[1].skipped
+    assert calls == []
+
+
+def test_rule_errors_are_captured_per_rule():
+    def broken(ctx):
+        raise ValueError("boom")
+
+    outcomes = RulePlan([PlannedRule("broken", broken), PlannedRule("ok", lambda ctx: 1)]).run(
+        pd.DataFrame(), lambda result: False
+    )
+
+    assert isinstance(outcomes[0].error, ValueError)
+    assert outcomes[1].result == 1
+
+
+def test_context_builds_each_intermediate_once():
+    ctx = ValidationContext(pd.DataFrame({"zip5": ["94105", "abc"]}))
+    builds = []
+    barrier = threading.Barrier(4)
+
+    def build():
+        builds.append(1)
+        return object()
+
+    def worker(values):
+        barrier.wait()
+        values.append(ctx.memo("key", build))
+
+    values = []
+    threads = [threading.Thread(target=worker, args=(values,)) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(builds) == 1
+    assert all(value is values[0] for value in values)
+    assert ctx.matches("zip5", r"^\d{5}$").tolist() == [True, False]
+    assert ctx.matches("zip5", r"^\d{5}$") is ctx.matches("zip5", r"^\d{5}$")
+
+
+def test_zip_locality_validator_reports_rule_failures():
+    report = CMSZipLocalityValidator().validate(_zip_frame(), "2025-01-01")
+    results = {result["rule_name"]: result for result in report.validation_results}
+
+    assert results["required_fields"]["passed"]
+    assert results["zip5_format"]["failed_count"] == 1
+    assert results["zip5_format"]["sample_failures"] == [{"zip5": "1002"}]
+    assert results["state_codes"]["failed_count"] == 1
+    assert results["locality_format"]["failed_count"] == 1
+    assert [result["rule_name"] for result in report.validation_results] == [
+        rule.name for rule in CMSZipLocalityValidator().validation_rules
+    ]
+
+
+def test_zip_locality_validator_stops_after_missing_fields():
+    report = CMSZipLocalityValidator().validate(_zip_frame().drop(columns=["vintage"]), "2025-01-01")
+    results = report.validation_results
+
+    assert not results[0]["passed"]
+    assert all(result.get("skipped") for result in results[1:])
+    assert report.business_rules_applied == ["required_fields"]
+
+
+def test_validation_engine_skips_checks_after_structural_failure():
+    engine = ValidationEngine()
+    report = engine.validate_dataset(
+        _zip_frame(), "zip_locality", schema={"required_columns": ["zip5", "missing"]}
+    )
+
+    assert report.results[0].rule_name == "required_columns"
+    assert not report.results[0].passed
+    assert report.failed_checks == 1
+    assert all(result.severity == ValidationSeverity.INFO for result in report.results[1:])
+    assert all(result.skipped for result in report.results[1:])
+    assert report.skipped_checks == len(report.results) - 1
+    assert report.quality_score == 0.0
+
+
+def test_validation_engine_domain_checks_are_vectorized():
+    report = ValidationEngine().validate_dataset(_zip_frame(), "zip_locality")
+    results = {result.rule_name: result for result in report.results}
+
+    assert results["zip_codes"].details["invalid_zips"] == [(1, "1002")]
+    assert results["locality_codes"].details["invalid_localities"] == [(2, "x1")]
+
+
+def test_business_rules_run_in_order():
+    def has_rows(df):
+        return len(df) > 0
+
+    def explodes(df):
+        raise RuntimeError("bad rule")
+
+    results = ValidationEngine().validate_business_rules(_zip_frame(), [has_rows, explodes])
+
+    assert [result.rule_name for result in results] == ["has_rows", "explodes"]
+    assert results[0].passed
+    assert "bad rule" in results[1].message
+
+
+def test_frame_level_rules_run_in_separate_groups():
+    def has_rows(df):
+        return len(df) > 0
+
+    def zip_present(df):
+        return df["zip5"].notna().all()
+    zip_present.columns = {"zip5"}
+
+    rules = [PlannedRule(f"frame_{i}", lambda ctx: True) for i in range(3)]
+    rules += [PlannedRule(f"zip_{i}", lambda ctx: True, frozenset({"zip5"})) for i in range(2)]
+
+    assert RulePlan(rules).groups == [[0], [1], [2], [3, 4]]
+    results = ValidationEngine().validate_business_rules(_zip_frame(), [has_rows, zip_present])
+    assert [result.passed for result in results] == [True, True]
@@ -0,0 +1,88 @@
+"""Tests for the vectorized ZIP9 overrides validator"""
+
+import numpy as np
+import pandas as pd
+
+from cms_pricing.ingestion.quarantine.dis_quarantine import QuarantineManager
+from cms_pricing.ingestion.validators.zip9_overrides_validator import ZIP9OverridesValidator
+
+
+def _row(low, high, state="CA", locality="01"):
+    return {
+        "zip9_low": low, "zip9_high": high, "state": state, "locality": locality,
+        "rural_flag": None, "effective_from": "2025-01-01", "effective_to": None, "vintage": "2025",
+    }
+
+
+def _details(results):
+    return {detail["rule"]: detail for detail in results["details"]}
+
+
+def test_overlap_sweep_flags_conflicts_and_duplicates():
+    df = pd.DataFrame([
+        _row("902100000", "902100999", locality="01"),
+        _row("902101000", "902101999", locality="02"),  # adjacent, no overlap
+        _row("902101500", "902102999", locality="03"),  # conflicts with row 1
+        _row("902102000", "902102100", locality="03"),  # duplicates row 2's mapping
+        _row("902110000", "902119999", locality="01"),  # different ZIP5
+    ])
+    validator = ZIP9OverridesValidator()
+
+    details = _details(validator.validate(df))
+
+    overlap = details["zip9_range_overlap"]
+    assert overlap["status"] == "failed"
+    assert overlap["violation_count"] == 2
+    violations = validator.violations["zip9_range_overlap"].set_index("row")
+    assert violations.loc[2, "overlaps_row"] == 1 and violations.loc[2, "conflict"]
+    assert violations.loc[3, "overlaps_row"] == 2 and not violations.loc[3, "conflict"]
+
+
+def test_overlap_sweep_matches_pairwise_check():
+    rng = np.random.default_rng(3)
+    lows = rng.integers(902100000, 902100000 + 5000, 300)
+    df = pd.DataFrame([
+        _row(f"{low:09d}", f"{low + int(rng.integers(0, 40)):09d}") for low in lows
+    ])
+
+    _, violations = ZIP9OverridesValidator()._validate_zip9_range_overlaps(df)
+
+    order = sorted(range(len(df)), key=lambda i: (int(df.zip9_low[i]), int(df.zip9_high[i])))
+    expected, max_high = set(), None
+    for i in order:
+        if max_high is not None and int(df.zip9_low[i]) <= max_high:
+            expected.add(i)
+        max_high = max(max_high or 0, int(df.zip9_high[i]))
+    assert set(violations["row"]) == expected
+
+
+def test_errors_are_capped_samples_with_full_counts():
+    df = pd.DataFrame([_row("902100000", "902100999", state="ZZ") for _ in range(25)])
+    validator = ZIP9OverridesValidator(max_error_samples=5)
+
+    state = _details(validator.validate(df))["state_code_validation"]
+
+    assert state["violation_count"] == 25
+    assert len(state["errors"]) == 5
+    assert state["errors"][0]["error"] == "Invalid state code: ZZ"
+    assert "zip5_low" not in df.columns
+
+
+def test_quarantine_results_carry_rejected_rows(tmp_path):
+    df = pd.DataFrame([
+        _row("902100000", "902100999"),
+        _row("9021", "902109999"),
+        _row("902101000", "902101999", state="ZZ"),
+    ])
+    validator = ZIP9OverridesValidator()
+    validator.validate(df)
+
+    results = validator.build_quarantine_results(df)
+    batch = QuarantineManager(str(tmp_path)).quarantine_records(
+        "zip9_overrides", "b1", "r1", results, raw_data=[]
+    )
+
+    by_rule = {rule["rule_id"]: rule for rule in results["validation_rules"]}
+    assert by_rule["zip9_format_validation"]["rejects"][0]["zip9_low"] == "9021"
+    assert by_rule["state_code_validation"]["rejects"][0]["state"] == "ZZ"
+    assert batch.summary["by_rule"]["state_code_validation"] == 1
@@ -0,0 +1,108 @@
+"""Tests for lazy ZIP member routing, streaming and parallel parsing"""
+
+import io
+import os
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from cms_pricing.ingestion.parsers.zip_bundle import MemberCache, ZipBundle
+
+
+def _bundle_bytes() -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("RVU25A/PPRRVU25_JAN.csv", "HCPCS,WORK_RVU\n99213,1.30\n99214,1.92\n")
+        zf.writestr("RVU25A/GPCI2025.csv", "LOCALITY,WORK_GPCI\n01,1.000\n")
+        zf.writestr("RVU25A/25LOCCO.csv", "LOCALITY,COUNTY\n01,001\n")
+        zf.writestr("RVU25A/RVU25A.pdf", b"%PDF-1.7")
+    return buffer.getvalue()
+
+
+def read_csv_member(file_obj, filename):
+    return pd.read_csv(file_obj, dtype=str).assign(source_filename=filename)
+
+
+def test_members_are_routed_by_name_without_reading():
+    with ZipBundle(_bundle_bytes()) as bundle:
+        datasets = {member.basename: member.dataset for member in bundle.members()}
+        wanted = bundle.members(datasets={"gpci", "locality"}, suffixes=(".csv",))
+
+    assert datasets == {
+        "PPRRVU25_JAN.csv": "pprrvu",
+        "GPCI2025.csv": "gpci",
+        "25LOCCO.csv": "locality",
+        "RVU25A.pdf": None,
+    }
+    assert [member.basename for member in wanted] == ["GPCI2025.csv", "25LOCCO.csv"]
+
+
+def test_fallback_dataset_applies_to_unrouted_members():
+    with ZipBundle(_bundle_bytes(), fallback_dataset="pprrvu") as bundle:
+        members = bundle.members(datasets={"pprrvu"})
+
+    assert [member.basename for member in members] == ["PPRRVU25_JAN.csv", "RVU25A.pdf"]
+
+
+def test_parse_per_dataset_parsers_concurrently_in_member_order():
+    with ZipBundle(_bundle_bytes()) as bundle, ThreadPoolExecutor(max_workers=2) as executor:
+        members = bundle.members(suffixes=(".csv",))
+        results = bundle.parse(
+            members,
+            {"pprrvu": read_csv_member, "locality": read_csv_member},
+            executor=executor
+        )
+
+    assert [r.member.basename for r in results] == ["PPRRVU25_JAN.csv", "25LOCCO.csv"]
+    assert results[0].frame["HCPCS"].tolist() == ["99213", "99214"]
+    assert results[1].frame["source_filename"].iloc[0] == "RVU25A/25LOCCO.csv"
+
+
+def test_process_pool_parses_spooled_bytes():
+    bundle = ZipBundle(_bundle_bytes())
+    results = bundle.parse(bundle.members(suffixes=(".csv",)), read_csv_member, max_workers=2)
+    spooled = bundle._spooled
+    bundle.close()
+
+    assert [len(r.frame) for r in results] == [2, 1, 1]
+    assert spooled is not None
+    assert not os.path.exists(spooled)
+
+
+def test_cache_skips_unchanged_members(tmp_path):
+    calls = []
+
+    def counting_parser(file_obj, filename):
+        calls.append(filename)
+        return read_csv_member(file_obj, filename)
+
+    cache = MemberCache(tmp_path / "members")
+    with ZipBundle(_bundle_bytes()) as bundle:
+        members = bundle.members(datasets={"gpci"})
+        first = bundle.parse(members, counting_parser, max_workers=1, cache=cache)
+        first[0].frame["WORK_GPCI"] = "changed by caller"
+
+    # A fresh cache over the same directory reads the parquet entry
+    with ZipBundle(_bundle_bytes()) as bundle:
+        again = bundle.parse(
+            bundle.members(datasets={"gpci"}), counting_parser, max_workers=1,
+            cache=MemberCache(tmp_path / "members")
+        )
+
+    assert calls == ["RVU25A/GPCI2025.csv"]
+    assert again[0].cached
+    assert again[0].frame["WORK_GPCI"].tolist() == ["1.000"]
+
+
+def test_cache_key_changes_with_parser_version(tmp_path):
+    cache = MemberCache(tmp_path / "members")
+    with ZipBundle(_bundle_bytes()) as bundle:
+        members = bundle.members(datasets={"gpci"})
+        bundle.parse(members, read_csv_member, max_workers=1, cache=cache, versions={"gpci": "1+1.0"})
+        same = bundle.parse(members, read_csv_member, max_workers=1, cache=cache, versions={"gpci": "1+1.0"})
+        bumped = bundle.parse(members, read_csv_member, max_workers=1, cache=cache, versions={"gpci": "2+1.0"})
+
+    assert same[0].cached
+    assert not bumped[0].cached
+    assert MemberCache.key(read_csv_member, members[0], "a") != MemberCache.key(read_csv_member, members[0], "b")
@@ -0,0 +1,80 @@
+"""Tests for the parallel OPPS backfill executor"""
+
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from cms_pricing.ingestion.run.opps_backfill import OPPSBackfillExecutor, plan_batch_ids
+
+
+def _fake_worker(batch_id, reference_data):
+    if batch_id == "opps_2024q3_r01":
+        raise RuntimeError("download failed")
+    return {
+        "batch_id": batch_id,
+        "status": "success",
+        "records_published": len(reference_data["wage_index"]),
+        "seconds": 0.0,
+    }
+
+
+def _executor(tmp_path, loaded_years, worker=_fake_worker):
+    async def load_reference(year):
+        loaded_years.append(year)
+        return {"wage_index": pd.DataFrame({"ccn": ["1", "2"]}), "si_lookup": pd.DataFrame()}
+
+    return OPPSBackfillExecutor(
+        output_dir=tmp_path,
+        reference_loader=load_reference,
+        max_workers=3,
+        executor_factory=lambda: ThreadPoolExecutor(max_workers=3),
+        batch_worker=worker,
+    )
+
+
+def test_plan_batch_ids_stops_after_last_quarter():
+    assert plan_batch_ids(2024, 2025, quarters=2) == [
+        "opps_2024q1_r01", "opps_2024q2_r01", "opps_2024q3_r01", "opps_2024q4_r01",
+        "opps_2025q1_r01", "opps_2025q2_r01",
+    ]
+
+
+def test_backfill_loads_reference_once_per_year_and_checkpoints(tmp_path):
+    loaded_years = []
+    batch_ids = plan_batch_ids(2024, 2025, quarters=2)
+
+    report = asyncio.run(_executor(tmp_path, loaded_years).run(batch_ids))
+
+    assert loaded_years == [2024, 2025]
+    assert report.failed == ["opps_2024q3_r01"]
+    assert sorted(report.succeeded) == sorted(set(batch_ids) - {"opps_2024q3_r01"})
+    assert report.records_published == 2 * 5
+    assert report.to_dict()["batches_per_minute"] > 0
+
+    checkpoint = json.loads((tmp_path / "backfill" / "opps_checkpoint.json").read_text())
+    assert checkpoint["batches"]["opps_2024q3_r01"]["error"] == "download failed"
+
+
+def test_backfill_resumes_from_checkpoint(tmp_path):
+    batch_ids = plan_batch_ids(2024, 2025, quarters=2)
+    asyncio.run(_executor(tmp_path, []).run(batch_ids))
+
+    loaded_years = []
+    retried = []
+
+    def recovered_worker(batch_id, reference_data):
+        retried.append(batch_id)
+        return {"batch_id": batch_id, "status": "success", "records_published": 1}
+
+    report = asyncio.run(_executor(tmp_path, loaded_years, recovered_worker).run(batch_ids))
+
+    assert retried == ["opps_2024q3_r01"]
+    assert loaded_years == [2024]
+    assert report.skipped == 5
+    assert report.failed == []
+
+    report = asyncio.run(_executor(tmp_path, [], recovered_worker).run(batch_ids, resume=False))
+    assert report.skipped == 0
+    assert len(report.succeeded) == 6
@@ -62,7 +62,8 @@ class TestOPPSIngestorE2E:
         """Create OPPS ingester instance."""
         return OPPSIngestor(
             output_dir=test_environment["output_dir"],
-            cpt_masking_enabled=True
+            cpt_masking_enabled=True,
+            curated_root=test_environment["output_dir"]
         )
     
     @pytest.fixture
@@ -49,7 +49,8 @@ class TestRVUIngestorSimpleE2E:
     @pytest.fixture
     def rvu_ingestor(self, test_data_dir):
         """Create RVU ingestor for testing"""
-        return RVUIngestor(str(test_data_dir / "ingested_data"))
+        output_dir = str(test_data_dir / "ingested_data")
+        return RVUIngestor(output_dir, curated_root=output_dir)
     
     @pytest.fixture
     def scraper(self, test_data_dir):
@@ -0,0 +1,77 @@
+"""
+FIPS crosswalk artifact caching tests
+"""
+
+import io
+
+import pandas as pd
+import pytest
+
+from cms_pricing.ingestion.normalize import normalize_locality_fips as nlf
+
+STATES_CSV = "state_fips,state_abbr,state_name\n22,LA,Louisiana\n35,NM,New Mexico\n"
+COUNTIES_CSV = (
+    "state_fips,county_fips,county_geoid,county_name,county_name_canonical,county_type\n"
+    "22,071,22071,Orleans Parish,Orleans Parish,Parish\n"
+    "35,013,35013,Doña Ana,Doña Ana County,County\n"
+    "35,028,35028,Los  (Alamos),Los Alamos County,County\n"
+)
+ALIASES_YML = "aliases:\n  default:\n    ST.: SAINT\n  by_state: {}\n"
+
+
+@pytest.fixture
+def ref_dir(tmp_path):
+    root = tmp_path / "reference"
+    files = {
+        "census/fips_states/2025/us_states.csv": STATES_CSV,
+        "census/fips_counties/2025/us_counties.csv": COUNTIES_CSV,
+        "cms/county_aliases/2025/county_aliases.yml": ALIASES_YML,
+    }
+    for relative, content in files.items():
+        path = root / relative
+        path.parent.mkdir(parents=True)
+        path.write_text(content, encoding="utf-8")
+    return root
+
+
+def test_vectorized_keys_match_normalize_key():
+    counties = pd.read_csv(io.StringIO(COUNTIES_CSV), dtype=str)
+    keys = nlf.normalize_keys(counties["county_name"], counties["state_fips"])
+
+    expected = [nlf.normalize_key(n, s) for n, s in zip(counties["county_name"], counties["state_fips"])]
+    assert keys.tolist() == expected == ["ORLEANS", "DONA ANA", "LOS ALAMOS"]
+
+
+def test_artifact_is_reused_across_processes(ref_dir, tmp_path, monkeypatch):
+    built = nlf.load_crosswalk_artifact(ref_dir, cache_dir=tmp_path / "cache")
+    assert (tmp_path / "cache" / built.source_digest / "index.pkl").exists()
+    assert built.county_index[("35", "DONA ANA")] == (1,)
+
+    # A fresh process has no in-memory crosswalk and must not rebuild
+    monkeypatch.setattr(nlf, "_crosswalks", {})
+    monkeypatch.setattr(nlf, "_build_crosswalk", lambda *args: pytest.fail("crosswalk rebuilt"))
+    loaded = nlf.load_crosswalk_artifact(ref_dir, cache_dir=tmp_path / "cache")
+
+    assert loaded.fingerprint == built.fingerprint
+    assert loaded.counties["county_name_key"].tolist() == built.counties["county_name_key"].tolist()
+    assert nlf.load_crosswalk_artifact(ref_dir, cache_dir=tmp_path / "cache") is loaded
+
+
+def test_changed_source_builds_new_artifact(ref_dir, tmp_path):
+    first = nlf.load_crosswalk_artifact(ref_dir, cache_dir=tmp_path / "cache")
+
+    counties_path = ref_dir / "census/fips_counties/2025/us_counties.csv"
+    counties_path.write_text(COUNTIES_CSV + "35,001,35001,Bernalillo,Bernalillo County,County\n", encoding="utf-8")
+    second = nlf.load_crosswalk_artifact(ref_dir, cache_dir=tmp_path / "cache")
+
+    assert second.source_digest != first.source_digest
+    assert second.fingerprint["total_counties"] == 4
+
+
+def test_match_exact_uses_index(ref_dir, tmp_path):
+    crosswalk = nlf.load_crosswalk_artifact(ref_dir, cache_dir=tmp_path / "cache")
+
+    match = nlf.match_exact("ORLEANS", "22", crosswalk.counties, county_index=crosswalk.county_index)
+
+    assert match == ("071", "22071", "Orleans Parish", "Parish")
+    assert nlf.match_exact("ORLEANS", "35", crosswalk.counties, county_index=crosswalk.county_index) is None
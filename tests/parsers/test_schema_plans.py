@@ -0,0 +1,91 @@
+"""Tests for compiled schema and layout plans"""
+
+import json
+
+import pandas as pd
+import pytest
+
+from cms_pricing.ingestion.contracts.schema_registry import (
+    CONTRACTS_DIR, ColumnSpec, SchemaContract, SchemaPlan, SchemaRegistry,
+    compile_schema_plan, load_schema_plan
+)
+from cms_pricing.ingestion.parsers._parser_kit import (
+    LayoutMismatchError, build_precision_map, compute_row_hashes_vectorized,
+    enforce_categorical_dtypes, get_categorical_columns, validate_layout_schema_alignment
+)
+from cms_pricing.ingestion.parsers.layout_registry import get_layout, get_layout_plan
+
+
+def test_plans_are_cached_and_immutable():
+    plan = load_schema_plan("cms_conversion_factor_v2.0")
+
+    assert load_schema_plan("cms_conversion_factor_v2.0") is plan
+    assert plan.precision["cf_value"] == (4, "HALF_UP")
+    assert plan.natural_keys == ("cf_type", "effective_from")
+    with pytest.raises(TypeError):
+        plan.precision["cf_value"] = (2, "HALF_UP")
+
+    # Filenames carry the MAJOR version only
+    assert load_schema_plan("cms_pprrvu_v1.1").columns == load_schema_plan("cms_pprrvu_v1.0").columns
+    with pytest.raises(FileNotFoundError):
+        load_schema_plan("cms_missing_v1.0")
+
+
+def test_plan_and_dict_inputs_agree():
+    with open(CONTRACTS_DIR / "cms_conversion_factor_v2.0.json") as f:
+        contract = json.load(f)
+    contract["columns"]["cf_type"]["type"] = "categorical"
+    contract["columns"]["cf_type"]["enum"] = ["physician", "anesthesia"]
+    plan = compile_schema_plan(contract)
+    df = pd.DataFrame({
+        "cf_type": ["physician", "anesthesia", "dental"],
+        "cf_value": [32.3465, 20.3178, 1.0],
+        "cf_description": ["a", "b", "c"],
+        "effective_from": ["2025-01-01"] * 3,
+    })
+
+    assert build_precision_map(plan) == build_precision_map(contract)
+    assert get_categorical_columns(plan) == get_categorical_columns(contract)
+    order = list(plan.column_order)
+    assert compute_row_hashes_vectorized(df, order, plan).equals(
+        compute_row_hashes_vectorized(df, order, contract)
+    )
+
+    result = enforce_categorical_dtypes(df, plan, natural_keys=["cf_type", "effective_from"])
+    assert list(result.valid_df["cf_type"]) == ["physician", "anesthesia"]
+    assert result.rejects_df["validation_context"].tolist() == ["dental"]
+
+
+def test_layout_plan_alignment():
+    layout_plan = get_layout_plan("2025", "2025Q4", "pprrvu")
+    layout = get_layout("2025", "2025Q4", "pprrvu")
+
+    assert get_layout_plan("2025", "2025Q4", "pprrvu") is layout_plan
+    assert layout_plan.names == tuple(layout["columns"])
+    assert layout_plan.spans[0] == (layout_plan.names[0], *layout_plan.colspecs[0])
+
+    schema = {"columns": {name: {"type": "str"} for name in layout_plan.names}}
+    validate_layout_schema_alignment(layout_plan, schema)
+    schema["columns"]["extra_col"] = {"type": "str"}
+    with pytest.raises(LayoutMismatchError, match="extra_col"):
+        validate_layout_schema_alignment(layout_plan, compile_schema_plan(schema))
+
+
+def test_registry_loads_lazily_and_recompiles_on_register(tmp_path):
+    contracts_dir = tmp_path / "contracts"
+    registry = SchemaRegistry(str(contracts_dir))
+    assert not contracts_dir.exists()
+
+    schema = SchemaContract(
+        dataset_name="sample_zip", version="1.0", generated_at="2025-01-01T00:00:00",
+        columns={"zip5": ColumnSpec(name="zip5", type="object", nullable=False, description="ZIP5")},
+        primary_keys=["zip5"], partition_columns=[], business_rules=[], quality_thresholds={},
+    )
+    registry.register_schema(schema)
+    plan = registry.get_plan("sample_zip")
+    assert isinstance(plan, SchemaPlan)
+    assert registry.get_plan("sample_zip") is plan
+
+    registry.register_schema(schema)
+    assert registry.get_plan("sample_zip") is not plan
+    assert SchemaRegistry(str(contracts_dir)).list_schemas() == ["sample_zip"]
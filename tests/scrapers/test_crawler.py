@@ -0,0 +1,95 @@
+"""Tests for the cached, conditional crawler used by CMS discovery scrapers"""
+
+import httpx
+import pytest
+
+from cms_pricing.ingestion.scrapers.cms_rvu_scraper import CMSRVUScraper
+from cms_pricing.ingestion.scrapers.crawler import Crawler, extract_links
+
+LISTING = b"""
+<html><body>
+  <a href="/files/zip/rvu25a.zip">RVU25A <b>(ZIP)</b></a>
+  <table><tr><td><a href="https://www.cms.gov/files/zip/rvu24d.zip">RVU24D</a></td></tr></table>
+  <a href="/about">About CMS</a>
+</body></html>
+"""
+
+
+class FixtureServer:
+    """Serves one listing page with an ETag and counts full responses"""
+
+    def __init__(self, body: bytes = LISTING, etag: str = '"v1"'):
+        self.body = body
+        self.etag = etag
+        self.requests = 0
+        self.full_responses = 0
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        if self.etag and request.headers.get("if-none-match") == self.etag:
+            return httpx.Response(304)
+        self.full_responses += 1
+        headers = {"content-type": "text/html"}
+        if self.etag:
+            headers["etag"] = self.etag
+        return httpx.Response(200, content=self.body, headers=headers)
+
+
+def _client(server: FixtureServer) -> httpx.AsyncClient:
+    return httpx.AsyncClient(transport=httpx.MockTransport(server))
+
+
+def test_extract_links_resolves_urls_and_strips_text():
+    links = extract_links(LISTING, "https://www.cms.gov/listing")
+
+    assert [link.text for link in links] == ["RVU25A(ZIP)", "RVU24D", "About CMS"]
+    assert links[0].url == "https://www.cms.gov/files/zip/rvu25a.zip"
+
+
+@pytest.mark.asyncio
+async def test_unchanged_page_is_revalidated_not_refetched(tmp_path):
+    server = FixtureServer()
+    async with _client(server) as client:
+        crawler = Crawler(tmp_path, client=client)
+        first = await crawler.fetch("https://www.cms.gov/listing")
+        crawler.links(first)
+
+        # A new crawler over the same cache directory sends If-None-Match
+        second = await Crawler(tmp_path, client=client).fetch("https://www.cms.gov/listing")
+
+    assert first.changed
+    assert not second.changed
+    assert second.content == LISTING
+    assert "links" in second.annotations
+    assert server.requests == 2
+    assert server.full_responses == 1
+
+
+@pytest.mark.asyncio
+async def test_changed_content_drops_annotations(tmp_path):
+    server = FixtureServer(etag=None)
+    async with _client(server) as client:
+        crawler = Crawler(tmp_path, client=client)
+        crawler.annotate(await crawler.fetch("https://www.cms.gov/listing"), "parsed", [1])
+
+        same = await crawler.fetch("https://www.cms.gov/listing")
+        server.body = LISTING.replace(b"RVU24D", b"RVU24C")
+        updated = await crawler.fetch("https://www.cms.gov/listing")
+
+    assert not same.changed and same.annotations["parsed"] == [1]
+    assert updated.changed and "parsed" not in updated.annotations
+
+
+@pytest.mark.asyncio
+async def test_rvu_scraper_uses_cached_listing(tmp_path):
+    server = FixtureServer()
+    async with _client(server) as client:
+        scraper = CMSRVUScraper(str(tmp_path))
+        scraper.crawler = Crawler(tmp_path / "page_cache", client=client)
+
+        files = await scraper.scrape_rvu_files(2024, 2025)
+        again = await scraper.scrape_rvu_files(2024, 2025)
+
+    assert [(f.year, f.quarter) for f in files] == [(2024, "D"), (2025, "A")]
+    assert [f.url for f in again] == [f.url for f in files]
+    assert server.full_responses == 1